@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Agregador multi-fuente de noticias
+Consulta en paralelo todas las APIs configuradas (NewsAPI, Newsdata, WorldNews
+y APITube), cada una con su cuota de artículos y su tiempo máximo, y entrega
+un único flujo de artículos normalizados conforme cada fuente responde. Una
+fuente lenta o caída no retrasa a las demás y las fuentes sin clave en .env
+simplemente se omiten.
+
+Una fuente que agota su tiempo sigue descargando en segundo plano y, al
+terminar, avanza su cursor y registra sus artículos como vistos. Por eso sus
+artículos no se descartan: se entregan a on_late (o se recogen con wait_late).
+"""
+
+import importlib
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, Iterator, List
+from dotenv import load_dotenv
+
+# Agregar directorio padre al path para imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.utils import print_summary
+from utils.article_store import ArticleStore, store_path
+
+load_dotenv()
+
+# Fuentes: nombre -> variable de la clave, función de descarga, cuota y timeout.
+# 'params' traduce la consulta común a los argumentos de cada cliente.
+SOURCES = {
+    'newsapi': {
+        'env_key': 'NEWSAPI_KEY',
+        'module': 'api.newsapi',
+        'function': 'fetch_newsapi',
+        'quota': 20,
+        'timeout': 90.0,  # Incluye la extracción de texto completo
+        'params': lambda q, n: {'query': q['query'], 'language': q['language'], 'page_size': n, 'enrich': True},
+    },
+    'newsdata': {
+        'env_key': 'NEWSDATA_KEY',
+        'module': 'api.newsdata',
+        'function': 'fetch_newsdata',
+        'quota': 10,  # Máximo del plan gratuito
+        'timeout': 30.0,
+        'params': lambda q, n: {'query': q['query'], 'country': q['country'], 'language': q['language'],
+                                'category': q['category'], 'page_size': n},
+    },
+    'worldnews': {
+        'env_key': 'WORLDNEWS_KEY',
+        'module': 'api.worldnews',
+        'function': 'fetch_worldnews',
+        'quota': 20,
+        'timeout': 30.0,
+        'params': lambda q, n: {'query': q['query'], 'source_country': q['country'], 'language': q['language'],
+                                'number': n},
+    },
+    'apitube': {
+        'env_key': 'APITUBE_KEY',
+        'module': 'api.apitube',
+        'function': 'fetch_apitube',
+        'quota': 20,
+        'timeout': 30.0,
+        'params': lambda q, n: {'country': q['country'], 'category': q['category'], 'language': q['language'],
+                                'page_size': n},
+    },
+}
+
+
+class NewsAggregator:
+    """Descarga concurrente de varias fuentes con un solo flujo de salida"""
+
+    def __init__(self, sources: List[str] = None, query: str = 'tecnología', language: str = 'es',
+                 country: str = 'mx', category: str = 'technology', limit: int = None,
+                 quotas: Dict[str, int] = None, timeouts: Dict[str, float] = None,
+                 dedup: bool = True, incremental: bool = True, verbose: bool = True,
+                 on_late: Callable[[List[Dict]], object] = None):
+        """
+        Inicializa el agregador
+
+        Args:
+            sources: Fuentes a consultar (default: todas las de SOURCES)
+            query: Términos de búsqueda (las fuentes sin búsqueda lo ignoran)
+            language: Código de idioma
+            country: Código de país
+            category: Categoría de noticias
+            limit: Máximo de artículos por fuente (además de su cuota)
+            quotas: Cuotas por fuente que reemplazan las de SOURCES
+            timeouts: Segundos máximos por fuente que reemplazan los de SOURCES
+            dedup: Descartar artículos ya vistos (también entre fuentes)
+            incremental: Pedir a cada fuente solo lo nuevo desde su cursor
+            verbose: Mostrar progreso
+            on_late: Recibe los artículos de una fuente que respondió después de
+                     su tiempo, desde el hilo de la descarga (p.ej.
+                     ArticleRepository.add_articles); sin él se acumulan en late
+        """
+        unknown = set(sources or []) - set(SOURCES)
+        if unknown:
+            raise ValueError(f"Fuentes desconocidas: {', '.join(sorted(unknown))}")
+
+        self.sources = list(sources or SOURCES)
+        self.query = {'query': query, 'language': language, 'country': country, 'category': category}
+        self.limit = limit
+        self.quotas = {name: SOURCES[name]['quota'] for name in self.sources}
+        self.quotas.update(quotas or {})
+        self.timeouts = {name: SOURCES[name]['timeout'] for name in self.sources}
+        self.timeouts.update(timeouts or {})
+        self.dedup = dedup
+        self.incremental = incremental
+        self.verbose = verbose
+        self.on_late = on_late
+
+        # Artículos de fuentes que respondieron tarde (si no hay on_late)
+        self.late: List[Dict] = []
+        self._late_delivered: List[threading.Event] = []
+        self._late_lock = threading.Lock()
+
+        # Resultado por fuente: status (ok, error, timeout, sin_clave), artículos y segundos
+        self.report: Dict[str, Dict] = {}
+
+    def log(self, message: str):
+        if self.verbose:
+            print(message, flush=True)
+
+    def configured_sources(self) -> List[str]:
+        """Fuentes con clave de API en el entorno"""
+        return [name for name in self.sources if os.getenv(SOURCES[name]['env_key'])]
+
+    def _fetch_source(self, name: str) -> List[Dict]:
+        source = SOURCES[name]
+        module = importlib.import_module(source['module'])
+        fetch = getattr(module, source['function'])
+
+        # La cuota es el tamaño de página pedido: no se recorta después, porque
+        # el cursor de la fuente ya avanzó sobre todo lo descargado
+        size = self.quotas[name] if self.limit is None else min(self.limit, self.quotas[name])
+        return fetch(**source['params'](self.query, size), silent=True, dedup=self.dedup,
+                     incremental=self.incremental)
+
+    def stream(self) -> Iterator[Dict]:
+        """
+        Artículos de todas las fuentes, en el orden en que cada una responde
+
+        Yields:
+            Artículos normalizados
+        """
+        configured = self.configured_sources()
+        for name in self.sources:
+            if name not in configured:
+                self.report[name] = {'status': 'sin_clave', 'articles': 0, 'seconds': 0.0}
+                self.log(f"  ⏭️  {name}: sin {SOURCES[name]['env_key']} en .env, se omite")
+
+        if not configured:
+            return
+
+        inicio = time.monotonic()
+        executor = ThreadPoolExecutor(max_workers=len(configured))
+        futures = {executor.submit(self._fetch_source, name): name for name in configured}
+        deadlines = {future: inicio + self.timeouts[name] for future, name in futures.items()}
+        not_done = set(futures)
+
+        try:
+            while not_done:
+                timeout = max(0.0, min(deadlines[f] for f in not_done) - time.monotonic())
+                done, not_done = wait(not_done, timeout=timeout, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    name = futures[future]
+                    seconds = round(time.monotonic() - inicio, 2)
+                    try:
+                        articles = future.result()
+                    except Exception as e:
+                        self.report[name] = {'status': 'error', 'articles': 0, 'seconds': seconds, 'error': str(e)}
+                        self.log(f"  ❌ {name}: {e}")
+                        continue
+
+                    self.report[name] = {'status': 'ok', 'articles': len(articles), 'seconds': seconds}
+                    self.log(f"  ✅ {name}: {len(articles)} artículos en {seconds:.1f}s")
+                    yield from articles
+
+                # Fuentes que agotaron su tiempo: se abandonan sin esperar
+                now = time.monotonic()
+                for future in [f for f in not_done if deadlines[f] <= now]:
+                    name = futures[future]
+                    not_done.discard(future)
+                    self.report[name] = {'status': 'timeout', 'articles': 0, 'seconds': self.timeouts[name]}
+                    self.log(f"  ⏱️  {name}: sin respuesta en {self.timeouts[name]:.0f}s, se entrega al terminar")
+                    delivered = threading.Event()
+                    self._late_delivered.append(delivered)
+                    future.add_done_callback(lambda f, name=name, ev=delivered: self._deliver_late(name, f, ev))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _deliver_late(self, name: str, future, delivered: threading.Event):
+        """Entrega los artículos de una fuente que terminó después de su tiempo"""
+        try:
+            articles = future.result()
+            self.report[name]['late_articles'] = len(articles)
+            self.log(f"  📬 {name}: {len(articles)} artículos tardíos")
+            if self.on_late is None:
+                with self._late_lock:
+                    self.late.extend(articles)
+            else:
+                self.on_late(articles)
+        except Exception as e:
+            self.report[name]['error'] = str(e)
+            self.log(f"  ❌ {name} (tarde): {e}")
+        finally:
+            delivered.set()
+
+    def wait_late(self, timeout: float = None) -> List[Dict]:
+        """
+        Espera a las fuentes que agotaron su tiempo
+
+        Args:
+            timeout: Segundos máximos de espera (None = hasta que terminen)
+
+        Returns:
+            Artículos tardíos acumulados (vacío si se entregan a on_late)
+        """
+        end_time = None if timeout is None else time.monotonic() + timeout
+        for delivered in self._late_delivered:
+            delivered.wait(None if end_time is None else max(0.0, end_time - time.monotonic()))
+        with self._late_lock:
+            return list(self.late)
+
+    def fetch(self) -> List[Dict]:
+        """
+        Descarga de todas las fuentes
+
+        Returns:
+            Lista de artículos normalizados
+        """
+        return list(self.stream())
+
+
+def main():
+    """Función principal para ejecutar el script"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Descargar noticias de todas las APIs configuradas')
+    parser.add_argument('--fuentes', type=str, default=None,
+                        help=f"Fuentes separadas por coma (default: {','.join(SOURCES)})")
+    parser.add_argument('--query', type=str, default='tecnología',
+                        help='Términos de búsqueda (default: "tecnología")')
+    parser.add_argument('--language', type=str, default='es',
+                        help='Código de idioma (default: es)')
+    parser.add_argument('--country', type=str, default='mx',
+                        help='Código de país (default: mx)')
+    parser.add_argument('--category', type=str, default='technology',
+                        help='Categoría (default: technology)')
+    parser.add_argument('--size', type=int, default=None,
+                        help='Máximo de artículos por fuente (default: cuota de cada fuente)')
+    parser.add_argument('--timeout', type=float, default=None,
+                        help='Segundos máximos por fuente (default: los de cada fuente)')
+    parser.add_argument('--no-incremental', action='store_true',
+                        help='Ignorar los cursores y pedir las noticias más recientes')
+    parser.add_argument('--no-dedup', action='store_true',
+                        help='No descartar artículos ya vistos en ejecuciones anteriores')
+
+    args = parser.parse_args()
+    sources = args.fuentes.split(',') if args.fuentes else None
+
+    try:
+        aggregator = NewsAggregator(
+            sources=sources,
+            query=args.query,
+            language=args.language,
+            country=args.country,
+            category=args.category,
+            limit=args.size,
+            timeouts=dict.fromkeys(sources or SOURCES, args.timeout) if args.timeout else None,
+            dedup=not args.no_dedup,
+            incremental=not args.no_incremental
+        )
+
+        print(f"\n{'='*70}")
+        print("📥 Descargando noticias de todas las fuentes")
+        print(f"{'='*70}")
+
+        with ArticleStore(store_path('aggregator')) as store:
+            articles = []
+            for article in aggregator.stream():
+                store.append(article)
+                articles.append(article)
+
+            # Las fuentes que agotaron su tiempo ya avanzaron su cursor: sus artículos se guardan igual
+            for article in aggregator.wait_late():
+                store.append(article)
+                articles.append(article)
+
+        print_summary(articles, 'Agregador', str(store.path))
+
+        if not aggregator.configured_sources():
+            print("❌ Ninguna fuente tiene clave de API en .env")
+            exit(1)
+
+    except Exception as e:
+        print(f"\n❌ Error fatal: {e}")
+        exit(1)
+
+
+if __name__ == '__main__':
+    main()
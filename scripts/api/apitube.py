@@ -13,7 +13,10 @@ from dotenv import load_dotenv
 
 # Agregar directorio padre al path para imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.utils import normalize_article, save_articles, print_summary
+from utils import http_client
+from utils.utils import normalize_articles, save_articles, print_summary
+from utils.article_store import store_path, export_csv
+from utils.fetch_cursors import open_cursor
 
 load_dotenv()
 
@@ -26,7 +29,9 @@ def fetch_apitube(country: str = 'mx',
                   category: str = 'technology',
                   language: str = 'es',
                   page_size: int = 20,
-                  silent: bool = False) -> list:
+                  silent: bool = False,
+                  dedup: bool = True,
+                  incremental: bool = True) -> list:
     """
     Descarga noticias de APITube.io
     
@@ -35,6 +40,9 @@ def fetch_apitube(country: str = 'mx',
         category: Categoría de noticias (technology, business, etc.)
         language: Código de idioma
         page_size: Número de artículos a obtener
+        dedup: Descartar artículos ya vistos (misma URL canónica o contenido)
+        incremental: Descartar lo publicado antes de la ejecución anterior
+                     (la API no filtra por fecha: el cursor se aplica aquí)
         
     Returns:
         Lista de artículos descargados
@@ -60,30 +68,38 @@ def fetch_apitube(country: str = 'mx',
     }
     
     try:
-        response = requests.get(BASE_URL, params=params, headers=HEADERS, timeout=30)
+        response = http_client.get(BASE_URL, params=params, headers=HEADERS, timeout=30)
         response.raise_for_status()
         
         data = response.json()
         articles = data.get('data', [])
         
+        cursor = open_cursor('apitube', params) if incremental else None
+        if cursor:
+            articles = [a for a in articles if cursor.accept(a.get('publishedAt'))]
+        fechas = [a.get('publishedAt') for a in articles]
+        
         if not articles:
             if not silent:
                 print("⚠️  No se encontraron artículos")
+            if cursor:
+                cursor.update(fechas, exhausted=True)
             return []
         
         if not silent:
             print(f"✅ Descargados {len(articles)} artículos con body completo")
         
-        # Normalizar estructura
-        normalized = []
-        for article in articles:
-            normalized.append(normalize_article(article, 'apitube'))
+        # Normalizar estructura y descartar lo ya visto
+        normalized = normalize_articles(articles, 'apitube', dedup=dedup, verbose=not silent)
         
         # Guardar resultados solo si no es modo silencioso
         if not silent:
-            json_file, csv_file = save_articles(normalized, 'apitube')
-            print_summary(normalized, 'APITube.io', json_file, csv_file)
+            store_file = save_articles(normalized, 'apitube')
+            print_summary(normalized, 'APITube.io', store_file)
         
+        # El cursor avanza solo cuando los artículos ya se entregan
+        if cursor:
+            cursor.update(fechas, exhausted=True)
         return normalized
         
     except requests.exceptions.RequestException as e:
@@ -107,6 +123,12 @@ def main():
                        help='Código de idioma (default: es)')
     parser.add_argument('--size', type=int, default=20,
                        help='Número de artículos (default: 20)')
+    parser.add_argument('--csv', action='store_true',
+                       help='Exportar el almacén NDJSON a CSV al terminar')
+    parser.add_argument('--no-incremental', action='store_true',
+                       help='Ignorar el cursor y pedir las noticias más recientes')
+    parser.add_argument('--no-dedup', action='store_true',
+                       help='No descartar artículos ya vistos en ejecuciones anteriores')
     
     args = parser.parse_args()
     
@@ -115,11 +137,17 @@ def main():
             country=args.country,
             category=args.category,
             language=args.language,
-            page_size=args.size
+            page_size=args.size,
+            dedup=not args.no_dedup,
+            incremental=not args.no_incremental
         )
         
         print(f"🎉 Proceso completado: {len(articles)} artículos guardados")
         
+        if args.csv:
+            csv_file = export_csv(store_path('apitube'))
+            print(f"💾 CSV: {csv_file}")
+        
     except Exception as e:
         print(f"\n❌ Error fatal: {e}")
         exit(1)
@@ -12,7 +12,10 @@ from dotenv import load_dotenv
 
 # Agregar directorio padre al path para imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.utils import enrich_with_full_text, save_articles, print_summary
+from utils import http_client
+from utils.utils import enrich_with_full_text, normalize_articles, save_articles, print_summary
+from utils.article_store import ArticleStore, store_path, export_csv
+from utils.fetch_cursors import open_cursor
 
 load_dotenv()
 
@@ -25,15 +28,23 @@ def fetch_newsapi(query: str = 'tecnología',
                   language: str = 'es',
                   page_size: int = 20,
                   enrich: bool = True,
-                  silent: bool = False) -> list:
+                  silent: bool = False,
+                  dedup: bool = True,
+                  incremental: bool = True,
+                  max_pages: int = 1) -> list:
     """
     Descarga noticias de NewsAPI.org
     
     Args:
         query: Términos de búsqueda
         language: Código de idioma
-        page_size: Número de artículos a obtener
+        page_size: Número de artículos por página
         enrich: Si debe extraer texto completo
+        dedup: Descartar artículos ya vistos (misma URL canónica o contenido)
+        incremental: Pedir solo lo publicado desde la ejecución anterior
+                     (cursor por consulta); el rezago se pagina en ejecuciones
+                     sucesivas
+        max_pages: Páginas máximas a descargar en esta ejecución
         
     Returns:
         Lista de artículos descargados
@@ -57,31 +68,66 @@ def fetch_newsapi(query: str = 'tecnología',
         'pageSize': page_size
     }
     
+    cursor = open_cursor('newsapi', params) if incremental else None
+    if cursor:
+        # NewsAPI acepta ISO 8601 sin zona horaria (UTC)
+        if cursor.since:
+            params['from'] = cursor.since.rstrip('Z')
+        if cursor.until:
+            params['to'] = cursor.until_inclusive.rstrip('Z')
+        if not silent and cursor.since:
+            rezago = f" (rezago hasta {cursor.until})" if cursor.until else ""
+            print(f"📌 Desde: {cursor.since}{rezago}")
+    
     try:
-        response = requests.get(BASE_URL, params=params, headers=HEADERS, timeout=30)
-        response.raise_for_status()
-        
-        data = response.json()
+        articles = []
+        exhausted = False
+        for page in range(1, max_pages + 1):
+            params['page'] = page
+            response = http_client.get(BASE_URL, params=params, headers=HEADERS, timeout=30)
+            response.raise_for_status()
+            
+            data = response.json()
+            
+            if data.get('status') != 'ok':
+                raise Exception(f"Error en respuesta API: {data.get('message', 'Unknown error')}")
+            
+            page_articles = data.get('articles', [])
+            articles.extend(page_articles)
+            
+            if len(page_articles) < page_size or page * page_size >= data.get('totalResults', 0):
+                exhausted = True
+                break
         
-        if data.get('status') != 'ok':
-            raise Exception(f"Error en respuesta API: {data.get('message', 'Unknown error')}")
-        
-        articles = data.get('articles', [])
+        if cursor:
+            articles = [a for a in articles if cursor.accept(a.get('publishedAt'))]
+        fechas = [a.get('publishedAt') for a in articles]
         
         if not silent:
             print(f"✅ Descargados {len(articles)} artículos")
         
-        # Enriquecer con texto completo si se solicita
+        # Enriquecer con texto completo si se solicita; fuera del modo
+        # silencioso cada artículo se anexa al almacén en cuanto está listo
         if enrich and articles:
             if not silent:
                 print(f"\n📝 Extrayendo texto completo...")
-            articles = enrich_with_full_text(articles, 'newsapi', verbose=not silent)
-        
-        # Guardar resultados solo si no es modo silencioso
-        if not silent:
-            json_file, csv_file = save_articles(articles, 'newsapi')
-            print_summary(articles, 'NewsAPI.org', json_file, csv_file)
+                with ArticleStore(store_path('newsapi')) as store:
+                    articles = enrich_with_full_text(articles, 'newsapi', verbose=True, sink=store.append,
+                                                      dedup=dedup)
+                print_summary(articles, 'NewsAPI.org', str(store.path))
+            else:
+                articles = enrich_with_full_text(articles, 'newsapi', verbose=False, dedup=dedup)
+        else:
+            articles = normalize_articles(articles, 'newsapi', dedup=dedup, verbose=not silent)
+            if not silent:
+                # Guardar resultados solo si no es modo silencioso
+                store_file = save_articles(articles, 'newsapi')
+                print_summary(articles, 'NewsAPI.org', store_file)
         
+        # El cursor avanza solo cuando los artículos ya se entregan: si algo
+        # falla antes, la siguiente ejecución vuelve a pedir la misma ventana
+        if cursor:
+            cursor.update(fechas, exhausted)
         return articles
         
     except requests.exceptions.RequestException as e:
@@ -105,6 +151,14 @@ def main():
                        help='Número de artículos (default: 20)')
     parser.add_argument('--no-enrich', action='store_true',
                        help='No extraer texto completo')
+    parser.add_argument('--csv', action='store_true',
+                       help='Exportar el almacén NDJSON a CSV al terminar')
+    parser.add_argument('--max-paginas', type=int, default=1,
+                       help='Páginas máximas por ejecución (default: 1)')
+    parser.add_argument('--no-incremental', action='store_true',
+                       help='Ignorar el cursor y pedir las noticias más recientes')
+    parser.add_argument('--no-dedup', action='store_true',
+                       help='No descartar artículos ya vistos en ejecuciones anteriores')
     
     args = parser.parse_args()
     
@@ -113,11 +167,18 @@ def main():
             query=args.query,
             language=args.language,
             page_size=args.size,
-            enrich=not args.no_enrich
+            enrich=not args.no_enrich,
+            dedup=not args.no_dedup,
+            incremental=not args.no_incremental,
+            max_pages=args.max_paginas
         )
         
         print(f"🎉 Proceso completado: {len(articles)} artículos guardados")
         
+        if args.csv:
+            csv_file = export_csv(store_path('newsapi'))
+            print(f"💾 CSV: {csv_file}")
+        
     except Exception as e:
         print(f"\n❌ Error fatal: {e}")
         exit(1)
@@ -13,7 +13,10 @@ from dotenv import load_dotenv
 
 # Agregar directorio padre al path para imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.utils import normalize_article, save_articles, print_summary
+from utils import http_client
+from utils.utils import normalize_articles, save_articles, print_summary
+from utils.article_store import store_path, export_csv
+from utils.fetch_cursors import open_cursor
 
 load_dotenv()
 
@@ -27,7 +30,10 @@ def fetch_newsdata(query: str = 'tecnología',
                    language: str = 'es',
                    category: str = 'technology',
                    page_size: int = 10,
-                   silent: bool = False) -> list:
+                   silent: bool = False,
+                   dedup: bool = True,
+                   incremental: bool = True,
+                   max_pages: int = 1) -> list:
     """
     Descarga noticias de Newsdata.io
     
@@ -37,6 +43,11 @@ def fetch_newsdata(query: str = 'tecnología',
         language: Código de idioma
         category: Categoría de noticias
         page_size: Número de artículos (máx 10 en plan gratuito)
+        dedup: Descartar artículos ya vistos (misma URL canónica o contenido)
+        incremental: Pedir solo lo publicado desde la ejecución anterior; el
+                     rezago se sigue con el token nextPage en ejecuciones
+                     sucesivas
+        max_pages: Páginas máximas a descargar en esta ejecución
         
     Returns:
         Lista de artículos descargados
@@ -62,35 +73,59 @@ def fetch_newsdata(query: str = 'tecnología',
         'apikey': API_KEY
     }
     
+    cursor = open_cursor('newsdata', params) if incremental else None
+    if cursor and cursor.page_token:
+        params['page'] = cursor.page_token
+    
     try:
-        response = requests.get(BASE_URL, params=params, headers=HEADERS, timeout=30)
-        response.raise_for_status()
-        
-        data = response.json()
+        articles = []
+        exhausted = False
+        next_page = None
+        for _ in range(max_pages):
+            response = http_client.get(BASE_URL, params=params, headers=HEADERS, timeout=30)
+            response.raise_for_status()
+            
+            data = response.json()
+            
+            if data.get('status') != 'success':
+                raise Exception(f"Error en respuesta API: {data.get('results', {}).get('message', 'Unknown error')}")
+            
+            page_articles = data.get('results', [])
+            articles.extend(page_articles)
+            next_page = data.get('nextPage')
+            
+            # Resultados del más reciente al más antiguo: al llegar a lo ya
+            # descargado no hace falta seguir paginando
+            if not next_page or (cursor and not all(cursor.accept(a.get('pubDate')) for a in page_articles)):
+                exhausted = True
+                break
+            params['page'] = next_page
         
-        if data.get('status') != 'success':
-            raise Exception(f"Error en respuesta API: {data.get('results', {}).get('message', 'Unknown error')}")
-        
-        articles = data.get('results', [])
+        if cursor:
+            articles = [a for a in articles if cursor.accept(a.get('pubDate'))]
+        fechas = [a.get('pubDate') for a in articles]
         
         if not articles:
             if not silent:
                 print("⚠️  No se encontraron artículos")
+            if cursor:
+                cursor.update(fechas, exhausted, next_token=next_page)
             return []
         
         if not silent:
             print(f"✅ Descargados {len(articles)} artículos con contenido completo")
         
-        # Normalizar estructura
-        normalized = []
-        for article in articles:
-            normalized.append(normalize_article(article, 'newsdata'))
+        # Normalizar estructura y descartar lo ya visto
+        normalized = normalize_articles(articles, 'newsdata', dedup=dedup, verbose=not silent)
         
         # Guardar resultados solo si no es modo silencioso
         if not silent:
-            json_file, csv_file = save_articles(normalized, 'newsdata')
-            print_summary(normalized, 'Newsdata.io', json_file, csv_file)
+            store_file = save_articles(normalized, 'newsdata')
+            print_summary(normalized, 'Newsdata.io', store_file)
         
+        # El cursor avanza solo cuando los artículos ya se entregan
+        if cursor:
+            cursor.update(fechas, exhausted, next_token=next_page)
         return normalized
         
     except requests.exceptions.RequestException as e:
@@ -116,6 +151,14 @@ def main():
                        help='Categoría (default: technology)')
     parser.add_argument('--size', type=int, default=10,
                        help='Número de artículos (default: 10, máx 10 en plan gratuito)')
+    parser.add_argument('--csv', action='store_true',
+                       help='Exportar el almacén NDJSON a CSV al terminar')
+    parser.add_argument('--max-paginas', type=int, default=1,
+                       help='Páginas máximas por ejecución (default: 1)')
+    parser.add_argument('--no-incremental', action='store_true',
+                       help='Ignorar el cursor y pedir las noticias más recientes')
+    parser.add_argument('--no-dedup', action='store_true',
+                       help='No descartar artículos ya vistos en ejecuciones anteriores')
     
     args = parser.parse_args()
     
@@ -125,11 +168,18 @@ def main():
             country=args.country,
             language=args.language,
             category=args.category,
-            page_size=args.size
+            page_size=args.size,
+            dedup=not args.no_dedup,
+            incremental=not args.no_incremental,
+            max_pages=args.max_paginas
         )
         
         print(f"🎉 Proceso completado: {len(articles)} artículos guardados")
         
+        if args.csv:
+            csv_file = export_csv(store_path('newsdata'))
+            print(f"💾 CSV: {csv_file}")
+        
     except Exception as e:
         print(f"\n❌ Error fatal: {e}")
         exit(1)
@@ -13,7 +13,10 @@ from dotenv import load_dotenv
 
 # Agregar directorio padre al path para imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.utils import normalize_article, save_articles, print_summary
+from utils import http_client
+from utils.utils import normalize_articles, save_articles, print_summary
+from utils.article_store import store_path, export_csv
+from utils.fetch_cursors import open_cursor
 
 load_dotenv()
 
@@ -25,12 +28,20 @@ HEADERS = {
 }
 
 
+def _api_date(date: str) -> str:
+    """Fecha ISO del cursor en el formato de WorldNewsAPI (YYYY-MM-DD HH:MM:SS)"""
+    return date.rstrip('Z').replace('T', ' ')
+
+
 def fetch_worldnews(query: str = 'tecnología',
                     source_country: str = 'mx',
                     language: str = 'es',
                     number: int = 20,
                     earliest_publish_date: str = None,
-                    silent: bool = False) -> list:
+                    silent: bool = False,
+                    dedup: bool = True,
+                    incremental: bool = True,
+                    max_pages: int = 1) -> list:
     """
     Descarga noticias de WorldNewsAPI
     
@@ -39,7 +50,12 @@ def fetch_worldnews(query: str = 'tecnología',
         source_country: Código de país
         language: Código de idioma
         number: Número de artículos a obtener
-        earliest_publish_date: Fecha mínima (YYYY-MM-DD)
+        earliest_publish_date: Fecha mínima (YYYY-MM-DD); reemplaza al cursor
+        dedup: Descartar artículos ya vistos (misma URL canónica o contenido)
+        incremental: Pedir solo lo publicado desde la ejecución anterior
+                     (cursor por consulta); el rezago se pagina en ejecuciones
+                     sucesivas
+        max_pages: Páginas máximas a descargar en esta ejecución
         
     Returns:
         Lista de artículos descargados
@@ -63,36 +79,61 @@ def fetch_worldnews(query: str = 'tecnología',
         'number': number
     }
     
+    cursor = open_cursor('worldnews', params) if incremental and not earliest_publish_date else None
+    if cursor:
+        params['sort'] = 'publish-time'
+        params['sort-direction'] = 'DESC'
+        if cursor.since:
+            params['earliest-publish-date'] = _api_date(cursor.since)
+        if cursor.until:
+            params['latest-publish-date'] = _api_date(cursor.until_inclusive)
+    
     if earliest_publish_date:
         params['earliest-publish-date'] = earliest_publish_date
-        if not silent:
-            print(f"📅 Desde: {earliest_publish_date}")
+    if not silent and params.get('earliest-publish-date'):
+        print(f"📅 Desde: {params['earliest-publish-date']}")
     
     try:
-        response = requests.get(BASE_URL, params=params, headers=HEADERS, timeout=30)
-        response.raise_for_status()
+        articles = []
+        exhausted = False
+        for page in range(max_pages):
+            params['offset'] = page * number
+            response = http_client.get(BASE_URL, params=params, headers=HEADERS, timeout=30)
+            response.raise_for_status()
+            
+            data = response.json()
+            page_articles = data.get('news', [])
+            articles.extend(page_articles)
+            
+            if len(page_articles) < number or (page + 1) * number >= data.get('available', 0):
+                exhausted = True
+                break
         
-        data = response.json()
-        articles = data.get('news', [])
+        if cursor:
+            articles = [a for a in articles if cursor.accept(a.get('publish_date'))]
+        fechas = [a.get('publish_date') for a in articles]
         
         if not articles:
             if not silent:
                 print("⚠️  No se encontraron artículos")
+            if cursor:
+                cursor.update(fechas, exhausted)
             return []
         
         if not silent:
             print(f"✅ Descargados {len(articles)} artículos")
         
-        # Normalizar estructura
-        normalized = []
-        for article in articles:
-            normalized.append(normalize_article(article, 'worldnews'))
+        # Normalizar estructura y descartar lo ya visto
+        normalized = normalize_articles(articles, 'worldnews', dedup=dedup, verbose=not silent)
         
         # Guardar resultados solo si no es modo silencioso
         if not silent:
-            json_file, csv_file = save_articles(normalized, 'worldnews')
-            print_summary(normalized, 'WorldNewsAPI', json_file, csv_file)
+            store_file = save_articles(normalized, 'worldnews')
+            print_summary(normalized, 'WorldNewsAPI', store_file)
         
+        # El cursor avanza solo cuando los artículos ya se entregan
+        if cursor:
+            cursor.update(fechas, exhausted)
         return normalized
         
     except requests.exceptions.RequestException as e:
@@ -119,6 +160,14 @@ def main():
                        help='Número de artículos (default: 20)')
     parser.add_argument('--from-date', type=str,
                        help='Fecha mínima YYYY-MM-DD (ej: 2024-01-01)')
+    parser.add_argument('--csv', action='store_true',
+                       help='Exportar el almacén NDJSON a CSV al terminar')
+    parser.add_argument('--max-paginas', type=int, default=1,
+                       help='Páginas máximas por ejecución (default: 1)')
+    parser.add_argument('--no-incremental', action='store_true',
+                       help='Ignorar el cursor y pedir las noticias más recientes')
+    parser.add_argument('--no-dedup', action='store_true',
+                       help='No descartar artículos ya vistos en ejecuciones anteriores')
     
     args = parser.parse_args()
     
@@ -128,11 +177,18 @@ def main():
             source_country=args.country,
             language=args.language,
             number=args.size,
-            earliest_publish_date=args.from_date
+            earliest_publish_date=args.from_date,
+            dedup=not args.no_dedup,
+            incremental=not args.no_incremental,
+            max_pages=args.max_paginas
         )
         
         print(f"🎉 Proceso completado: {len(articles)} artículos guardados")
         
+        if args.csv:
+            csv_file = export_csv(store_path('worldnews'))
+            print(f"💾 CSV: {csv_file}")
+        
     except Exception as e:
         print(f"\n❌ Error fatal: {e}")
         exit(1)
@@ -7,14 +7,13 @@ Genera artículos periodísticos profesionales con múltiples párrafos
 import os
 import json
 import requests
+from utils.llm_client import get_llm_client, run_in_order
 from dotenv import load_dotenv
-from typing import Dict, List
-import time
+from typing import Dict, Iterator, List, Tuple
 
 load_dotenv()
 
 API_KEY = os.getenv('BLACKBOX_API_KEY')
-API_URL = 'https://api.blackbox.ai/chat/completions'
 
 
 class ArticleExpander:
@@ -30,6 +29,9 @@ class ArticleExpander:
             'Authorization': f'Bearer {self.api_key}'
         }
         
+        # Cliente compartido: ventana de concurrencia y límite de tasa del proceso
+        self.llm = get_llm_client()
+        
         # Estructuras de artículo para variar
         self.structures = [
             "pirámide invertida clásica",  # Lo más importante primero
@@ -42,18 +44,116 @@ class ArticleExpander:
             "testimonios y voces"           # Citas y declaraciones
         ]
     
-    def expand_article(self, article: Dict, target_words: int = 800, structure: str = None) -> str:
+    def expand_article(self, article: Dict, target_words: int = 800, structure: str = None,
+                       variant: int = 0) -> str:
         """
         Expande un artículo corto a uno completo y profesional
         
+        Las respuestas se reutilizan de la caché LLM para prompts idénticos.
+        
         Args:
             article: Diccionario con datos del artículo original
             target_words: Número objetivo de palabras (default: 800)
             structure: Estructura narrativa a usar
+            variant: Número de variación para obtener otra versión con la
+                misma estructura (0 = versión por defecto)
             
         Returns:
             Artículo expandido completo
         """
+        return self._request(article, target_words, structure, variant)[0]
+    
+    async def expand_article_async(self, article: Dict, target_words: int = 800, structure: str = None) -> str:
+        """Versión asyncio de expand_article() (mismo texto de respaldo si falla)"""
+        return (await self.expand_article_result_async(article, target_words, structure))[0]
+    
+    async def expand_article_result_async(self, article: Dict, target_words: int = 800,
+                                          structure: str = None) -> Tuple[str, bool]:
+        """
+        Como expand_article_async(), indicando si se usó el texto de respaldo
+        
+        Returns:
+            Artículo expandido y True si es el texto original (la API falló)
+        """
+        try:
+            return await self.llm.acomplete(self._build_payload(article, target_words, structure),
+                                            self.headers, timeout=45), False
+        except requests.exceptions.RequestException as e:
+            print(f"❌ Error en API: {e}")
+            return self._fallback_text(article), True
+        except (KeyError, IndexError) as e:
+            print(f"❌ Error procesando respuesta: {e}")
+            return self._fallback_text(article), True
+    
+    def _request(self, article: Dict, target_words: int, structure: str, variant: int = 0) -> Tuple[str, bool]:
+        """Petición de expansión al LLM; si falla retorna el texto original y True"""
+        try:
+            return self.llm.complete(self._build_payload(article, target_words, structure), self.headers,
+                                     timeout=45, variant=variant), False
+        except requests.exceptions.RequestException as e:
+            print(f"❌ Error en API: {e}")
+            return self._fallback_text(article), True
+        except (KeyError, IndexError) as e:
+            print(f"❌ Error procesando respuesta: {e}")
+            return self._fallback_text(article), True
+    
+    def expand_article_stream(self, article: Dict, target_words: int = 800,
+                              structure: str = None) -> Iterator[str]:
+        """
+        Expande un artículo entregando fragmentos conforme se generan
+        
+        Args:
+            article: Diccionario con datos del artículo original
+            target_words: Número objetivo de palabras
+            structure: Estructura narrativa a usar
+            
+        Yields:
+            Fragmentos del artículo expandido (el texto original si la API
+            falla antes del primer fragmento)
+        """
+        started = False
+        try:
+            for chunk in self.llm.stream(self._build_payload(article, target_words, structure),
+                                         self.headers, timeout=45):
+                started = True
+                yield chunk
+        except requests.exceptions.RequestException as e:
+            print(f"❌ Error en API: {e}")
+            if not started:
+                yield self._fallback_text(article)
+        except (KeyError, IndexError, ValueError) as e:
+            print(f"❌ Error procesando respuesta: {e}")
+            if not started:
+                yield self._fallback_text(article)
+    
+    def expand_batch(self, articles: List[Dict], target_words: int = 800,
+                     structures: List[str] = None) -> List[str]:
+        """
+        Expande varios artículos concurrentemente
+        
+        La concurrencia y el ritmo los acota el cliente LLM compartido
+        (LLM_CONCURRENCY, LLM_RATE_PER_MIN).
+        
+        Args:
+            articles: Lista de artículos
+            target_words: Número objetivo de palabras
+            structures: Estructura por artículo (default: rotar self.structures)
+            
+        Returns:
+            Artículos expandidos en el mismo orden de entrada
+        """
+        structures = structures or [self.structures[i % len(self.structures)] for i in range(len(articles))]
+        return run_in_order(self.expand_article_async(article, target_words, structure)
+                            for article, structure in zip(articles, structures))
+    
+    def _fallback_text(self, article: Dict) -> str:
+        """Texto original del artículo cuando la API falla"""
+        content = article.get('content', '')
+        full_text = article.get('full_text', '')
+        return f"{article.get('title', '')}\n\n{article.get('description', '')}\n\n{content or full_text}"
+    
+    def _build_payload(self, article: Dict, target_words: int, structure: str = None) -> Dict:
+        """Petición de chat para expandir un artículo con una estructura"""
         # Extraer información del artículo
         title = article.get('title', '')
         description = article.get('description', '')
@@ -110,7 +210,7 @@ IMPORTANTE:
 
 Escribe SOLO el artículo expandido, sin introducción ni comentarios:"""
 
-        payload = {
+        return {
             "model": "blackboxai/meta-llama/llama-3.3-70b-instruct",
             "messages": [
                 {
@@ -125,21 +225,6 @@ Escribe SOLO el artículo expandido, sin introducción ni comentarios:"""
             "temperature": 0.7,
             "max_tokens": 2000
         }
-        
-        try:
-            response = requests.post(API_URL, headers=self.headers, json=payload, timeout=45)
-            response.raise_for_status()
-            
-            result = response.json()
-            expanded = result['choices'][0]['message']['content'].strip()
-            return expanded
-            
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Error en API: {e}")
-            return f"{title}\n\n{description}\n\n{content or full_text}"
-        except (KeyError, IndexError) as e:
-            print(f"❌ Error procesando respuesta: {e}")
-            return f"{title}\n\n{description}\n\n{content or full_text}"
     
     def expand_with_variations(self, article: Dict, num_variations: int = 3) -> List[Dict]:
         """
@@ -161,7 +246,8 @@ Escribe SOLO el artículo expandido, sin introducción ni comentarios:"""
             
             print(f"  [{i+1}/{num_variations}] Estructura: {structure}...", end=" ", flush=True)
             
-            expanded_text = self.expand_article(article, target_words=800, structure=structure)
+            expanded_text = self.expand_article(article, target_words=800, structure=structure,
+                                                variant=i // len(self.structures))
             
             # Extraer título y cuerpo del artículo expandido
             lines = expanded_text.split('\n\n', 1)
@@ -185,10 +271,6 @@ Escribe SOLO el artículo expandido, sin introducción ni comentarios:"""
             
             variations.append(variation)
             print(f"✅ ({variation['word_count']} palabras)")
-            
-            # Pausa para no saturar la API
-            if (i + 1) % 3 == 0:
-                time.sleep(2)
         
         return variations
     
@@ -6,7 +6,7 @@ Usa la API de Vercel para crear proyectos y subir archivos
 
 import os
 import json
-import requests
+from utils import http_client
 import time
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -56,7 +56,7 @@ class VercelDeployer:
             'publicSource': False
         }
         
-        response = requests.post(
+        response = http_client.post(
             self.base_url,
             headers=self.headers,
             json=data
@@ -74,7 +74,7 @@ class VercelDeployer:
     def obtener_proyecto(self, nombre: str) -> Optional[Dict]:
         """Obtiene información de un proyecto existente"""
         url = f"{self.base_url}/{nombre}"
-        response = requests.get(url, headers=self.headers)
+        response = http_client.get(url, headers=self.headers)
         
         if response.status_code == 200:
             return response.json()
@@ -111,10 +111,12 @@ class VercelDeployer:
         if self.team_id:
             url += f"?teamId={self.team_id}"
         
-        response = requests.post(
+        # Subida con todos los archivos: lectura más larga que el default
+        response = http_client.post(
             url,
             headers=self.headers,
-            json=deployment_data
+            json=deployment_data,
+            timeout=120
         )
         
         if response.status_code not in [200, 201]:
@@ -170,7 +172,7 @@ class VercelDeployer:
         start_time = time.time()
         
         while time.time() - start_time < timeout:
-            response = requests.get(url, headers=self.headers)
+            response = http_client.get(url, headers=self.headers)
             
             if response.status_code != 200:
                 raise Exception(f"Error obteniendo estado: {response.text}")
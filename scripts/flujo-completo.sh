@@ -48,8 +48,8 @@ echo "━━━━━━━━━━━━━━━━━━━━━━━━
 echo "✍️  PASO 2/4: Parafraseando noticias (${VARIACIONES} variaciones)"
 echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
 
-# Encontrar el último archivo de noticias
-LATEST_NEWS=$(ls -t newsapi_*.json newsdata_*.json worldnews_*.json apitube_*.json 2>/dev/null | head -1)
+# Encontrar el almacén de noticias más reciente
+LATEST_NEWS=$(ls -t ../data/raw/*.ndjson ../data/raw/*.ndjson.zst 2>/dev/null | head -1)
 
 if [ -z "$LATEST_NEWS" ]; then
     echo "❌ No se encontró archivo de noticias"
@@ -63,10 +63,10 @@ python3 -c "
 import json
 import sys
 from paraphrase import NewsParaphraser
+from utils.article_store import tail_articles
 
-# Cargar noticias
-with open('$LATEST_NEWS', 'r', encoding='utf-8') as f:
-    articles = json.load(f)
+# Cargar las noticias de esta descarga (últimas anexadas al almacén)
+articles = tail_articles('$LATEST_NEWS', $CANTIDAD_NOTICIAS)
 
 print(f'📰 Cargados {len(articles)} artículos')
 print(f'🎯 Generando ${VARIACIONES} variaciones por artículo...')
@@ -8,10 +8,10 @@ Modelo: blackboxai/black-forest-labs/flux-schnell ($0.003/imagen)
 import os
 import json
 import requests
+from utils import http_client
 from pathlib import Path
 from dotenv import load_dotenv
 from typing import List, Dict
-import time
 import base64
 
 load_dotenv()
@@ -98,7 +98,7 @@ Requirements:
         try:
             print(f"    🎨 Generando imagen con Flux Schnell...", end=" ")
             
-            response = requests.post(API_URL, headers=self.headers, json=payload, timeout=60)
+            response = http_client.post(API_URL, headers=self.headers, json=payload, timeout=60)
             response.raise_for_status()
             
             result = response.json()
@@ -130,7 +130,7 @@ Requirements:
             
             if image_url:
                 # Descargar desde URL
-                img_response = requests.get(image_url, timeout=30)
+                img_response = http_client.get(image_url, timeout=30)
                 img_response.raise_for_status()
                 
                 with open(filepath, 'wb') as f:
@@ -199,10 +199,6 @@ Requirements:
             article_with_image['image_prompt'] = prompt
             
             results.append(article_with_image)
-            
-            # Pausa para no saturar la API
-            if idx % 3 == 0:
-                time.sleep(2)
         
         print(f"\n{'='*70}")
         print(f"✨ Proceso completado")
@@ -7,10 +7,9 @@ Garantiza relevancia 100% con el contenido del artículo
 
 import os
 import json
-import requests
+from utils import http_client
 from pathlib import Path
 from typing import List, Dict
-import time
 import hashlib
 
 class NewsAPIImageGenerator:
@@ -53,7 +52,7 @@ class NewsAPIImageGenerator:
             }
             
             # Descargar imagen
-            response = requests.get(image_url, headers=headers, timeout=30, allow_redirects=True)
+            response = http_client.get(image_url, headers=headers, timeout=30, allow_redirects=True)
             response.raise_for_status()
             
             # Verificar que es una imagen válida
@@ -94,7 +93,7 @@ class NewsAPIImageGenerator:
             filename = f"article_{article_id}_{index}.jpg"
             filepath = self.output_dir / filename
             
-            response = requests.get(fallback_url, timeout=30)
+            response = http_client.get(fallback_url, timeout=30)
             response.raise_for_status()
             
             with open(filepath, 'wb') as f:
@@ -176,10 +175,6 @@ class NewsAPIImageGenerator:
             article_with_image['original_image_url'] = article.get('image_url', '')
             
             results.append(article_with_image)
-            
-            # Pausa mínima para no saturar
-            if idx % 10 == 0:
-                time.sleep(1)
         
         print(f"\n{'='*70}")
         print(f"✨ Proceso completado")
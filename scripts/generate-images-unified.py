@@ -24,13 +24,11 @@ def import_module_from_file(module_name, file_path):
 
 current_dir = Path(__file__).parent
 
-# Importar generadores
+# Importar generadores (el de IA solo se carga si se prefiere IA)
 newsapi_module = import_module_from_file('generate_images_newsapi', current_dir / 'generate-images-newsapi.py')
-ai_module = import_module_from_file('generate_images_ai', current_dir / 'generate-images-ai.py')
 unsplash_module = import_module_from_file('generate_images_unsplash', current_dir / 'generate-images-unsplash.py')
 
 NewsAPIImageGenerator = newsapi_module.NewsAPIImageGenerator
-AIImageGenerator = ai_module.AIImageGenerator
 UnsplashImageGenerator = unsplash_module.UnsplashImageGenerator
 
 
@@ -57,7 +55,8 @@ class UnifiedImageGenerator:
         # Intentar inicializar IA si se prefiere
         if prefer_ai:
             try:
-                self.ai_generator = AIImageGenerator(output_dir)
+                ai_module = import_module_from_file('generate_images_ai', current_dir / 'generate-images-ai.py')
+                self.ai_generator = ai_module.AIImageGenerator(output_dir)
                 print("🔍 Verificando disponibilidad de IA...")
                 self.ai_available = self._test_ai_availability()
             except Exception as e:
@@ -81,7 +80,7 @@ class UnifiedImageGenerator:
             True si IA está disponible
         """
         try:
-            import requests
+            from utils import http_client
             from dotenv import load_dotenv
             
             load_dotenv()
@@ -101,7 +100,7 @@ class UnifiedImageGenerator:
                 'messages': [{'role': 'user', 'content': 'test'}]
             }
             
-            response = requests.post(
+            response = http_client.post(
                 'https://api.blackbox.ai/chat/completions',
                 headers=headers,
                 json=payload,
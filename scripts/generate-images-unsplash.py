@@ -6,10 +6,9 @@ Alternativa confiable cuando los modelos de IA no están disponibles
 
 import os
 import json
-import requests
+from utils import http_client
 from pathlib import Path
 from typing import List, Dict
-import time
 import hashlib
 
 class UnsplashImageGenerator:
@@ -74,7 +73,7 @@ class UnsplashImageGenerator:
                 'content_filter': 'high'
             }
             
-            response = requests.get(url, headers=self.headers, params=params, timeout=10)
+            response = http_client.get(url, headers=self.headers, params=params, timeout=10)
             
             # Si no hay API key, usar demo mode con URLs genéricas
             if response.status_code == 401 or self.api_key == 'demo':
@@ -117,7 +116,7 @@ class UnsplashImageGenerator:
             filepath = self.output_dir / filename
             
             # Descargar imagen
-            response = requests.get(image_url, timeout=30)
+            response = http_client.get(image_url, timeout=30)
             response.raise_for_status()
             
             with open(filepath, 'wb') as f:
@@ -200,10 +199,6 @@ class UnsplashImageGenerator:
             article_with_image['image_source'] = 'unsplash'
             
             results.append(article_with_image)
-            
-            # Pausa para no saturar la API (Unsplash: 50 req/hora)
-            if idx % 5 == 0:
-                time.sleep(2)
         
         print(f"\n{'='*70}")
         print(f"✨ Proceso completado")
@@ -22,6 +22,9 @@ try:
 except ImportError:
     LAYOUTS_AVAILABLE = False
 
+from utils.site_jobs import resolve_processes, run_jobs, site_seed
+from utils.templates import Markup, render
+
 try:
     from template_combiner import TemplateCombiner
     TEMPLATE_COMBINER_AVAILABLE = True
@@ -32,7 +35,8 @@ except ImportError:
 NUM_TEMPLATES = 40  # Total de templates CSS disponibles (para modo no-interactivo)
 OUTPUT_DIR = "../sites"
 CSS_DIR = "../templates/css"
-LATEST_NEWS_FILE = "../data/noticias_final_20260107_2358.json"
+NEWS_FILE = os.getenv("NEWS_FILE")  # JSON/NDJSON explícito; por defecto, el noticias_final_* más reciente
+DATA_DIR = "../data"
 METADATA_DIR = "../data/sites_metadata"  # Directorio de metadatos de sitios
 MAX_TEMPLATES = 100  # Máximo de templates CSS disponibles
 USE_MODULAR_SYSTEM = True  # Usar sistema modular de paletas+fuentes+layouts
@@ -54,16 +58,34 @@ SITE_CONFIGS = [
 # Categorías para el menú
 CATEGORIES = ["Inicio", "Política", "Tecnología", "Deportes", "Entretenimiento", "Mundial", "Negocios"]
 
+def latest_news_file(data_dir=DATA_DIR):
+    """
+    Archivo de noticias finales (parafraseadas y con imagen) más reciente
+    
+    El repositorio de artículos solo guarda las descargas originales, así que
+    los sitios se generan desde la salida final del flujo.
+    
+    Returns:
+        Ruta del noticias_final_*.json más reciente o None
+    """
+    archivos = sorted(Path(data_dir).glob("noticias_final_*.json"))
+    return str(archivos[-1]) if archivos else None
+
 def load_news_data():
-    """Carga los datos de noticias del archivo JSON más reciente"""
-    if not os.path.exists(LATEST_NEWS_FILE):
-        print(f"❌ Error: Archivo {LATEST_NEWS_FILE} no encontrado")
-        return []
+    """Carga las noticias de NEWS_FILE o del archivo de noticias finales más reciente"""
+    from utils.article_store import load_articles
     
-    with open(LATEST_NEWS_FILE, 'r', encoding='utf-8') as f:
-        news = json.load(f)
+    news_file = NEWS_FILE or latest_news_file(DATA_DIR)
+    if not news_file:
+        print(f"❌ Error: No hay archivos noticias_final_*.json en {DATA_DIR}")
+        print("   Ejecuta primero el flujo completo o indica NEWS_FILE")
+        return []
+    if not os.path.exists(news_file):
+        print(f"❌ Error: Archivo {news_file} no encontrado")
+        return []
     
-    print(f"✅ Cargadas {len(news)} noticias")
+    news = load_articles(news_file)
+    print(f"✅ Cargadas {len(news)} noticias de {news_file}")
     return news
 
 def truncate_text(text, max_length=150):
@@ -130,188 +152,32 @@ def generate_html(template_num, site_config, news_data, max_templates=MAX_TEMPLA
                                      categorias_randomizadas, layout_config, distribucion)
     
     # Modo estático (fallback)
-    html = f"""<!DOCTYPE html>
-<html lang="es">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{site_config['title']} - Noticias de Última Hora</title>
-    <link rel="stylesheet" href="{CSS_DIR}/template{actual_template}.css">
-</head>
-<body>
-    <header class="header">
-        <div class="container">
-            <div class="logo">
-                <h1>{site_config['title']}</h1>
-                <p class="tagline">{site_config['tagline']}</p>
-            </div>
-            <nav class="nav">
-"""
-    
-    # Agregar categorías del menú
-    for category in categorias_randomizadas:
-        html += f'                <a href="#" class="nav-link">{category}</a>\n'
-    
-    html += """            </nav>
-            <div class="header-actions">
-                <input type="search" placeholder="Buscar noticias..." class="search-input">
-                <button class="btn-subscribe">Suscribirse</button>
-            </div>
-        </div>
-    </header>
-
-    <main class="main-content">
-"""
-    
-    # Sección destacada
-    if featured:
-        image_path = featured.get('ai_image_path') or 'https://via.placeholder.com/1200x600/4A90E2/ffffff?text=Noticia+Destacada'
-        if not image_path.startswith('http'):
-            image_path = f"../{image_path}"
-        
-        title = truncate_text(featured.get('title', 'Título no disponible'), 120)
-        description = truncate_text(featured.get('description', 'Descripción no disponible'), 250)
-        author = featured.get('author', 'Redacción')
-        date = translate_month(format_date(featured.get('published_at', '')))
-        
-        html += f"""        <section class="hero-section">
-            <article class="featured-article">
-                <div class="article-image">
-                    <img src="{image_path}" alt="Destacado">
-                </div>
-                <div class="article-content">
-                    <span class="category">Última Hora</span>
-                    <h2 class="article-title">{title}</h2>
-                    <p class="article-excerpt">{description}</p>
-                    <div class="article-meta">
-                        <span class="author">Por {author}</span>
-                        <span class="date">{date}</span>
-                        <span class="reading-time">5 min de lectura</span>
-                    </div>
-                </div>
-            </article>
-        </section>
-
-"""
-    
-    # Sección de noticias principales
-    html += """        <section class="news-grid">
-            <div class="main-column">
-                <h2 class="section-title">Últimos Titulares</h2>
-                
-"""
-    
-    for news in main_news:
-        image_path = news.get('ai_image_path') or 'https://via.placeholder.com/600x400/E74C3C/ffffff?text=Noticia'
-        if not image_path.startswith('http'):
-            image_path = f"../{image_path}"
-        
-        title = truncate_text(news.get('title', 'Título no disponible'), 100)
-        description = truncate_text(news.get('description', 'Descripción no disponible'), 200)
-        author = news.get('author', 'Redacción')
-        date = translate_month(format_date(news.get('published_at', '')))
-        category = news.get('category', 'General')
-        
-        html += f"""                <article class="news-card">
-                    <img src="{image_path}" alt="{category}" class="card-image">
-                    <div class="card-content">
-                        <span class="category">{category.capitalize()}</span>
-                        <h3 class="card-title">{title}</h3>
-                        <p class="card-excerpt">{description}</p>
-                        <div class="article-meta">
-                            <span class="author">Por {author}</span>
-                            <span class="date">{date}</span>
-                        </div>
-                    </div>
-                </article>
-
-"""
-    
-    # Sidebar
-    html += """            </div>
-            
-            <aside class="sidebar">
-                <section class="sidebar-section newsletter">
-                    <h3 class="sidebar-title">Boletín de Noticias</h3>
-                    <p>Recibe las noticias más importantes en tu correo</p>
-                    <form class="newsletter-form">
-                        <input type="email" placeholder="Tu correo electrónico" class="newsletter-input">
-                        <button type="submit" class="newsletter-btn">Suscribirse</button>
-                    </form>
-                </section>
+    return render(
+        'sitio_estatico.html',
+        site_config=site_config,
+        hoja_estilos=f"{CSS_DIR}/template{actual_template}.css",
+        categorias=categorias_randomizadas,
+        destacada=_news_view(featured, 120, 250, 'https://via.placeholder.com/1200x600/4A90E2/ffffff?text=Noticia+Destacada') if featured else None,
+        principales=[_news_view(news, 100, 200, 'https://via.placeholder.com/600x400/E74C3C/ffffff?text=Noticia') for news in main_news],
+        laterales=[_news_view(news, 80) for news in sidebar_news],
+        secciones=CATEGORIES[1:],
+        year=datetime.now().year,
+    )
 
-                <section class="sidebar-section">
-                    <h3 class="sidebar-title">Más Leídas</h3>
-                    <ul class="trending-list">
-"""
-    
-    for i, news in enumerate(sidebar_news, 1):
-        title = truncate_text(news.get('title', 'Título no disponible'), 80)
-        date = translate_month(format_date(news.get('published_at', '')))
-        
-        html += f"""                        <li class="trending-item">
-                            <span class="trending-number">{i}</span>
-                            <div class="trending-content">
-                                <h4>{title}</h4>
-                                <p class="trending-meta">{date}</p>
-                            </div>
-                        </li>
-"""
-    
-    html += """                    </ul>
-                </section>
-            </aside>
-        </section>
-    </main>
 
-    <footer class="footer">
-        <div class="container">
-            <div class="footer-grid">
-                <div class="footer-column">
-                    <h4>Sobre Nosotros</h4>
-                    <p>Tu fuente confiable de noticias e información actualizada las 24 horas del día.</p>
-                    <div class="social-links">
-                        <a href="#" class="social-link">Facebook</a>
-                        <a href="#" class="social-link">Twitter</a>
-                        <a href="#" class="social-link">Instagram</a>
-                    </div>
-                </div>
-                <div class="footer-column">
-                    <h4>Secciones</h4>
-                    <ul class="footer-links">
-"""
-    
-    for category in CATEGORIES[1:]:
-        html += f'                        <li><a href="#">{category}</a></li>\n'
-    
-    html += f"""                    </ul>
-                </div>
-                <div class="footer-column">
-                    <h4>Legal</h4>
-                    <ul class="footer-links">
-                        <li><a href="#">Términos de Uso</a></li>
-                        <li><a href="#">Política de Privacidad</a></li>
-                        <li><a href="#">Cookies</a></li>
-                        <li><a href="#">Contacto</a></li>
-                    </ul>
-                </div>
-                <div class="footer-column">
-                    <h4>Contacto</h4>
-                    <p>Email: contacto@{site_config['title'].lower().replace(' ', '')}.com</p>
-                    <p>Tel: +52 55 1234 5678</p>
-                    <p>Ciudad de México, México</p>
-                </div>
-            </div>
-            <div class="footer-bottom">
-                <p>&copy; {datetime.now().year} {site_config['title']}. Todos los derechos reservados.</p>
-            </div>
-        </div>
-    </footer>
-</body>
-</html>
-"""
-    
-    return html
+def _news_view(news, title_length, description_length=200, placeholder=''):
+    """Campos de una noticia ya formateados para los templates del modo estático"""
+    image_path = news.get('ai_image_path') or placeholder
+    if image_path and not image_path.startswith('http'):
+        image_path = f"../{image_path}"
+    return {
+        'image': image_path,
+        'title': truncate_text(news.get('title', 'Título no disponible'), title_length),
+        'description': truncate_text(news.get('description', 'Descripción no disponible'), description_length),
+        'author': news.get('author', 'Redacción'),
+        'date': translate_month(format_date(news.get('published_at', ''))),
+        'category': news.get('category', 'General'),
+    }
 
 
 def generate_html_dynamic(template_num, site_config, featured_news, main_news, sidebar_news,
@@ -344,63 +210,7 @@ def generate_html_dynamic(template_num, site_config, featured_news, main_news, s
     # Clases CSS dinámicas
     css_classes = generator.generar_clases_css_dinamicas(layout_config)
     
-    # Construir HTML
-    html = f"""<!DOCTYPE html>
-<html lang="es">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{site_config['title']} - Noticias de Última Hora</title>
-    <link rel="stylesheet" href="{CSS_DIR}/template{template_num}.css">
-    <meta name="description" content="{site_config['tagline']}">
-    <meta name="layout" content="{layout_config['layout_type']}">
-</head>
-<body class="{css_classes['container']}">
-
-"""
-    
-    # Header dinámico
-    html += builder.build_header(site_config, categorias)
-    
-    # Main content
-    html += '    <main class="' + css_classes['main'] + '">\n'
-    html += '        <div class="content-wrapper">\n'
-    
-    # Sección destacada
-    if featured_news:
-        html += builder.build_featured_section(featured_news)
-    
-    # Layout con o sin sidebar
-    if layout_config['sidebar_position'] != 'none':
-        html += '            <div class="main-with-sidebar">\n'
-        html += '                <div class="main-column">\n'
-    
-    # Grid de noticias principales
-    if main_news:
-        html += builder.build_news_grid(main_news, distribucion)
-    
-    if layout_config['sidebar_position'] != 'none':
-        html += '                </div>\n'
-        html += builder.build_sidebar(sidebar_news, widgets)
-        html += '            </div>\n'
-    
-    html += '        </div>\n'
-    html += '    </main>\n\n'
-    
-    # Footer
-    html += f'''    <footer class="{css_classes['footer']}">
-        <div class="container">
-            <div class="footer-grid">
-                <div class="footer-column">
-                    <h3>{site_config['title']}</h3>
-                    <p>{site_config['tagline']}</p>
-                    <div class="social-links">
-                        <a href="#" class="social-link">Facebook</a>
-                        <a href="#" class="social-link">Twitter</a>
-                        <a href="#" class="social-link">Instagram</a>
-                    </div>
-                </div>
-'''
+    con_sidebar = layout_config['sidebar_position'] != 'none'
     
     # Columnas adicionales del footer según configuración
     footer_sections = [
@@ -409,31 +219,41 @@ def generate_html_dynamic(template_num, site_config, featured_news, main_news, s
         ("Contacto", [f"Email: contacto@{site_config['title'].lower().replace(' ', '')}.com", "Tel: +52 55 1234 5678", "Ciudad de México, México"])
     ]
     
-    for i, (titulo, items) in enumerate(footer_sections[:layout_config['footer_columns'] - 1]):
-        html += f'''                <div class="footer-column">
-                    <h4>{titulo}</h4>
-                    <ul class="footer-links">
-'''
-        for item in items:
-            if isinstance(item, str) and '@' not in item and ':' not in item:
-                html += f'                        <li><a href="#">{item}</a></li>\n'
-            else:
-                html += f'                        <li>{item}</li>\n'
-        html += '                    </ul>\n'
-        html += '                </div>\n'
-    
-    html += f'''            </div>
-            <div class="footer-bottom">
-                <p>&copy; {datetime.now().year} {site_config['title']}. Todos los derechos reservados.</p>
-                <p class="layout-info">Layout: {layout_config['layout_type']} | Template: {template_num}</p>
-            </div>
-        </div>
-    </footer>
-</body>
-</html>
-'''
-    
-    return html
+    # Los bloques del HTMLLayoutBuilder ya son HTML; el resto lo arma el template
+    return render(
+        'sitio_dinamico.html',
+        site_config=site_config,
+        hoja_estilos=f"{CSS_DIR}/template{template_num}.css",
+        layout_config=layout_config,
+        css_classes=css_classes,
+        header_html=Markup(builder.build_header(site_config, categorias)),
+        featured_html=Markup(builder.build_featured_section(featured_news) if featured_news else ''),
+        grid_html=Markup(builder.build_news_grid(main_news, distribucion) if main_news else ''),
+        sidebar_html=Markup(builder.build_sidebar(sidebar_news, widgets) if con_sidebar else ''),
+        con_sidebar=con_sidebar,
+        footer_sections=footer_sections[:layout_config['footer_columns'] - 1],
+        template_num=template_num,
+        year=datetime.now().year,
+    )
+
+
+def render_site_job(job):
+    """
+    Genera y guarda el HTML de un sitio a partir de su trabajo serializable
+    
+    Se ejecuta con utils.site_jobs.run_jobs, que siembra random con la
+    semilla del trabajo: el sitio sale igual en serie o en cualquier proceso.
+    
+    Args:
+        job: template_num, site_config, news_data, output_file y seed
+        
+    Returns:
+        str: Ruta del archivo generado
+    """
+    html_content = generate_html(job['template_num'], job['site_config'], job['news_data'])
+    with open(job['output_file'], 'w', encoding='utf-8') as f:
+        f.write(html_content)
+    return job['output_file']
 
 
 def load_sites_metadata(metadata_file=None):
@@ -620,9 +440,28 @@ def main():
         action='store_true',
         help='Desactivar modo interactivo'
     )
+    parser.add_argument(
+        '--procesos',
+        type=int,
+        nargs='?',
+        const=-1,
+        default=None,
+        metavar='N',
+        help='Renderizar los sitios en N procesos (sin N: uno por núcleo; default: RENDER_PROCESSES)'
+    )
+    parser.add_argument(
+        '--seed',
+        type=str,
+        default=None,
+        help='Semilla base: con la misma semilla y noticias los sitios salen idénticos'
+    )
     
     args = parser.parse_args()
     
+    # Semilla de la ejecución: metadata, templates y cada sitio se derivan de ella
+    seed = args.seed or datetime.now().strftime("%Y%m%d_%H%M%S")
+    random.seed(seed)
+    
     # Determinar si usar modo interactivo
     modo_no_interactivo = args.no_interactivo or args.cantidad is not None or args.generar_metadata or args.metadata_file
     
@@ -729,8 +568,11 @@ def main():
     
     # Generar sitios HTML
     print(f"\n🏭 Generando {cantidad} sitios HTML...")
+    print(f"🎲 Semilla: {seed} (repetir con --seed {seed})")
     print("=" * 60)
     
+    # Cada sitio es un trabajo independiente con su propia semilla
+    trabajos = []
     for i in range(1, cantidad + 1):
         # Seleccionar configuración del sitio
         if sites_metadata and i <= len(sites_metadata):
@@ -750,13 +592,19 @@ def main():
             site_config = SITE_CONFIGS[(i - 1) % len(SITE_CONFIGS)]
             print(f"  [{i}/{cantidad}] 📦 {site_config['title']}")
         
-        # Generar HTML
-        html_content = generate_html(i, site_config, news_data)
-        
-        # Guardar archivo
-        output_file = f"{OUTPUT_DIR}/site{i}.html"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        trabajos.append({
+            'seed': site_seed(seed, i),
+            'template_num': i,
+            'site_config': site_config,
+            'news_data': news_data,
+            'output_file': f"{OUTPUT_DIR}/site{i}.html",
+        })
+    
+    # Generar y guardar el HTML de cada sitio (en serie o en un pool de procesos)
+    procesos = min(resolve_processes(args.procesos), len(trabajos))
+    if procesos > 1:
+        print(f"\n⚡ Renderizando en {procesos} procesos...")
+    run_jobs(render_site_job, trabajos, procesos)
     
     print(f"\n🎉 ¡Completado!")
     print("=" * 60)
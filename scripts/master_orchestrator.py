@@ -7,58 +7,76 @@ Orquesta todo el proceso desde descarga de noticias hasta sitios completos
 import os
 import json
 import sys
+import asyncio
 import time
 import shutil
+import functools
+import hashlib
+import itertools
+import importlib
+import importlib.util
+import random
+import threading
 from pathlib import Path
-from typing import Dict, List, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from dotenv import load_dotenv
 
-# Importar módulos del proyecto
-try:
-    import importlib.util
-    
-    def import_module_from_file(module_name, file_path):
-        """Importa un módulo desde un archivo con guiones en el nombre"""
-        spec = importlib.util.spec_from_file_location(module_name, file_path)
-        if spec and spec.loader:
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-            return module
-        raise ImportError(f"No se pudo importar {module_name} desde {file_path}")
-    
-    # Obtener directorio actual
-    current_dir = Path(__file__).parent
-    
-    # Importar módulos con guiones
-    article_expander_module = import_module_from_file(
-        'article_expander',
-        current_dir / 'article-expander.py'
-    )
-    ArticleExpander = article_expander_module.ArticleExpander
+# Los módulos del proyecto se importan bajo demanda: `--help`, una ejecución
+# desde caché o un paso aislado no pagan el costo de requests, BeautifulSoup
+# ni de construir generadores que no se usan.
+SCRIPTS_DIR = Path(__file__).parent
+
+
+@functools.lru_cache(maxsize=None)
+def import_module_from_file(module_name, file_path):
+    """Importa un módulo desde un archivo con guiones en el nombre"""
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    if spec and spec.loader:
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    raise ImportError(f"No se pudo importar {module_name} desde {file_path}")
+
+
+def cargar_clase(modulo: str, clase: str):
+    """
+    Importa una clase de un módulo del proyecto al primer uso
     
-    # Usar generador unificado (IA + fallback Unsplash)
-    generate_images_unified_module = import_module_from_file(
-        'generate_images_unified',
-        current_dir / 'generate-images-unified.py'
-    )
-    UnifiedImageGenerator = generate_images_unified_module.UnifiedImageGenerator
-    
-    # Importar módulos con guiones bajos normalmente
-    from paraphrase import NewsParaphraser
-    from site_name_generator import SiteNameGenerator
-    from domain_verifier import DomainVerifier
-    from site_pre_creation import SitePreCreation
-    from legal_pages_generator import LegalPagesGenerator
-    from template_combiner import TemplateCombiner
-    from layout_generator import LayoutGenerator, HTMLLayoutBuilder
-    
-except ImportError as e:
-    print(f"❌ Error importando módulos: {e}")
-    print(f"Directorio actual: {Path(__file__).parent}")
-    import traceback
-    traceback.print_exc()
-    sys.exit(1)
+    Args:
+        modulo: Nombre importable o archivo .py (con guiones) en scripts/
+        clase: Nombre de la clase
+        
+    Returns:
+        La clase solicitada
+    """
+    try:
+        if modulo.endswith('.py'):
+            module = import_module_from_file(modulo[:-3].replace('-', '_'), SCRIPTS_DIR / modulo)
+        else:
+            module = importlib.import_module(modulo)
+        return getattr(module, clase)
+    except ImportError as e:
+        print(f"❌ Error importando {clase} desde {modulo}: {e}")
+        print(f"Directorio actual: {SCRIPTS_DIR}")
+        raise
+
+
+# Componentes del orquestador: atributo -> (módulo, clase, kwargs)
+# Se importan y construyen la primera vez que un paso los usa
+COMPONENTES = {
+    'paraphraser': ('paraphrase', 'NewsParaphraser', {}),
+    'article_expander': ('article-expander.py', 'ArticleExpander', {}),
+    'name_generator': ('site_name_generator', 'SiteNameGenerator', {}),
+    'domain_verifier': ('domain_verifier', 'DomainVerifier', {}),
+    'template_combiner': ('template_combiner', 'TemplateCombiner', {}),
+    # Generador unificado (NewsAPI Original primero, luego fallbacks)
+    'image_generator': ('generate-images-unified.py', 'UnifiedImageGenerator', {'prefer_ai': False}),
+    'layout_generator': ('layout_generator', 'LayoutGenerator', {}),
+    'legal_generator': ('legal_pages_generator', 'LegalPagesGenerator', {}),
+    'article_repository': ('utils.article_repository', 'ArticleRepository', {}),
+}
 
 load_dotenv()
 
@@ -66,12 +84,24 @@ load_dotenv()
 class MasterOrchestrator:
     """Orquestador principal del flujo completo de generación"""
     
-    def __init__(self, output_base_dir: str = None):
+    def __init__(self, output_base_dir: str = None, llamada_unica: bool = True, streaming: bool = True,
+                 run_id: str = None, trace: bool = False, procesos: int = None):
         """
         Inicializa el orquestador
         
         Args:
             output_base_dir: Directorio base para sitios generados
+            llamada_unica: Reescribir y expandir cada noticia en una sola
+                llamada al LLM (False = parafraseo y expansión por separado)
+            streaming: En modo llamada única, recibir la respuesta en streaming
+                y empezar la imagen de cada noticia en cuanto llega su título
+            run_id: Ejecución a reanudar desde sus puntos de control (None =
+                ejecución nueva)
+            trace: Escribir además trace_{run_id}.json (trace events de
+                Chrome) junto al resumen de la ejecución
+            procesos: Procesos para renderizar los sitios en el paso 7
+                (None = RENDER_PROCESSES, negativo = uno por núcleo, 0 o 1 =
+                en serie)
         """
         # Usar rutas absolutas basadas en la ubicación del script
         script_dir = Path(__file__).parent
@@ -88,19 +118,25 @@ class MasterOrchestrator:
         self.data_dir = base_dir / "data"
         self.templates_dir = base_dir / "templates"
         
-        # Inicializar componentes
-        self.paraphraser = NewsParaphraser()
-        self.article_expander = ArticleExpander()
-        self.name_generator = SiteNameGenerator()
-        self.domain_verifier = DomainVerifier()
-        self.template_combiner = TemplateCombiner()
-        # Usar generador unificado (NewsAPI Original primero, luego fallbacks)
-        self.image_generator = UnifiedImageGenerator(prefer_ai=False)
-        self.layout_generator = LayoutGenerator()
-        self.legal_generator = LegalPagesGenerator()
+        self.llamada_unica = llamada_unica
+        self.streaming = streaming
+        self.trace = trace
+        self.procesos = procesos
+        
+        # Imágenes iniciadas durante el paso 2 (URL de la noticia -> Future)
+        self._imagenes_anticipadas: Dict[str, Future] = {}
+        self._pool_imagenes = None
+        self._contador_anticipadas = itertools.count(1)
+        
+        # Los componentes (ver COMPONENTES) se construyen al primer acceso
+        self._componentes_lock = threading.RLock()
         
-        # Timestamp para esta ejecución
-        self.run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # Timestamp para esta ejecución (o la ejecución que se reanuda)
+        self.reanudar = run_id is not None
+        self.run_id = run_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+        
+        # Puntos de control de la ejecución (utils.run_checkpoint), al primer uso
+        self._checkpoints = None
         
         # Estadísticas
         self.stats = {
@@ -110,6 +146,18 @@ class MasterOrchestrator:
             "sitios_creados": 0,
             "tiempo_inicio": time.time()
         }
+        self._stats_lock = threading.Lock()
+    
+    def __getattr__(self, name: str):
+        """Construye bajo demanda los componentes declarados en COMPONENTES"""
+        if name not in COMPONENTES:
+            raise AttributeError(f"'{type(self).__name__}' no tiene el atributo '{name}'")
+        
+        with self.__dict__['_componentes_lock']:
+            if name not in self.__dict__:
+                modulo, clase, kwargs = COMPONENTES[name]
+                self.__dict__[name] = cargar_clase(modulo, clase)(**kwargs)
+        return self.__dict__[name]
     
     def log(self, message: str, level: str = "INFO"):
         """Log con timestamp"""
@@ -124,71 +172,141 @@ class MasterOrchestrator:
         
         print(f"[{timestamp}] {prefix} {message}", flush=True)
     
+    def _puntos_de_control(self):
+        """Almacén de puntos de control (None si CHECKPOINTS=0)"""
+        with self._componentes_lock:
+            if self._checkpoints is None:
+                from utils.run_checkpoint import open_checkpoints
+                self._checkpoints = open_checkpoints(self.output_base_dir) or False
+        return self._checkpoints or None
+    
+    def _guardar_checkpoint(self, paso: str, valor, clave: str = ''):
+        """Guarda el resultado de un paso (o de un elemento del paso) bajo el run_id"""
+        store = self._puntos_de_control()
+        if store:
+            store.save(self.run_id, paso, valor, clave)
+    
+    def _cargar_checkpoint(self, paso: str, clave: str = ''):
+        """
+        Resultado guardado por la ejecución que se reanuda
+        
+        Args:
+            paso: Paso que lo produjo
+            clave: Elemento del paso (vacío = resultado del paso completo)
+            
+        Returns:
+            Valor guardado o None (ejecución nueva o elemento pendiente)
+        """
+        store = self._puntos_de_control() if self.reanudar else None
+        valor = store.load(self.run_id, paso, clave) if store else None
+        if valor is not None:
+            with self._stats_lock:
+                reanudado = self.stats.setdefault("reanudado", {})
+                reanudado[paso] = reanudado.get(paso, 0) + 1
+        return valor
+    
+    def _sumar(self, estadistica: str, cantidad: int = 1):
+        """Incrementa una estadística (los pasos del flujo corren en varios hilos)"""
+        with self._stats_lock:
+            self.stats[estadistica] = self.stats.get(estadistica, 0) + cantidad
+    
     def paso_1_descargar_noticias(self, num_noticias: int = 50, force_download: bool = False) -> List[Dict]:
         """
         Paso 1: Descarga noticias desde APIs
         
         Args:
             num_noticias: Número de noticias a descargar
-            force_download: Forzar descarga en vivo incluso si hay archivos
+            force_download: Forzar descarga en vivo incluso si hay noticias sin usar
             
         Returns:
-            Lista de noticias descargadas
+            Lista de noticias (marcadas como usadas por esta ejecución)
         """
         self.log("=" * 70)
         self.log("PASO 1: Descargando Noticias", "PROGRESS")
         self.log("=" * 70)
         
-        # Si no se fuerza descarga, intentar usar archivo existente
+        repo = self.article_repository
+        
+        # Al reanudar, las mismas noticias que eligió la ejecución original
+        if self.reanudar:
+            noticias = repo.articles_for_run(self.run_id)
+            if noticias:
+                self.stats["noticias_descargadas"] = len(noticias)
+                self.log(f"Reanudando con las {len(noticias)} noticias de la ejecución {self.run_id}", "SUCCESS")
+                return noticias
+        
+        # Si no se fuerza descarga, usar artículos del repositorio aún no usados
         if not force_download:
-            noticias_files = list(self.data_dir.glob("noticias_newsapi_*.json"))
-            if noticias_files:
-                latest_file = max(noticias_files, key=lambda p: p.stat().st_mtime)
-                self.log(f"Usando archivo existente: {latest_file.name}")
-                
-                with open(latest_file, 'r', encoding='utf-8') as f:
-                    noticias = json.load(f)
-                
+            if repo.count() == 0:
+                self._importar_archivos_legados(repo)
+            
+            noticias = repo.latest_unused(num_noticias)
+            if noticias:
+                repo.mark_used([n['id'] for n in noticias], self.run_id)
                 self.stats["noticias_descargadas"] = len(noticias)
-                self.log(f"Cargadas {len(noticias)} noticias originales", "SUCCESS")
-                return noticias[:num_noticias]
+                self.log(f"Usando {len(noticias)} noticias del repositorio ({repo.path.name})", "SUCCESS")
+                return noticias
         
-        # Descargar noticias en vivo desde NewsAPI
-        self.log("Descargando noticias en vivo desde NewsAPI...", "PROGRESS")
+        # Descargar noticias en vivo de todas las fuentes configuradas
+        self.log("Descargando noticias en vivo (NewsAPI, Newsdata, WorldNews, APITube)...", "PROGRESS")
         
         try:
-            # Importar el módulo de NewsAPI
-            import sys
-            from pathlib import Path
-            api_dir = Path(__file__).parent / "api"
-            if str(api_dir) not in sys.path:
-                sys.path.insert(0, str(api_dir))
-            
-            from newsapi import fetch_newsapi
-            
-            # Descargar noticias
-            noticias = fetch_newsapi(
-                query='tecnología',
-                language='es',
-                page_size=num_noticias,
-                enrich=True,
-                silent=False
-            )
+            NewsAggregator = cargar_clase('api.aggregator', 'NewsAggregator')
+            # Lo que llegue de una fuente después de su tiempo va directo al repositorio
+            agregador = NewsAggregator(query='tecnología', language='es', limit=num_noticias,
+                                       on_late=repo.add_articles)
+            descargadas = agregador.fetch()
+            self.stats["fuentes"] = agregador.report
             
+            nuevas = repo.add_articles(descargadas)
+            self.log(f"Descargadas {len(descargadas)} noticias ({nuevas} nuevas en el repositorio)", "SUCCESS")
+            
+            noticias = repo.latest_unused(num_noticias)
+            repo.mark_used([n['id'] for n in noticias], self.run_id)
             self.stats["noticias_descargadas"] = len(noticias)
-            self.log(f"Descargadas {len(noticias)} noticias desde NewsAPI", "SUCCESS")
             return noticias
             
         except Exception as e:
             self.log(f"Error descargando noticias: {e}", "ERROR")
             return []
     
-    def paso_2_parafrasear_noticias(self, noticias: List[Dict]) -> List[Dict]:
+    def _importar_archivos_legados(self, repo) -> int:
+        """
+        Migra al repositorio los JSON/NDJSON de descargas anteriores
+        
+        Args:
+            repo: Repositorio de artículos (vacío)
+            
+        Returns:
+            Número de artículos importados
+        """
+        archivos = sorted(self.data_dir.glob("noticias_newsapi_*.json"))
+        archivos += sorted((self.data_dir / "raw").glob("*.json"))
+        archivos += sorted((self.data_dir / "raw").glob("*.ndjson"))
+        
+        total = 0
+        for archivo in archivos:
+            try:
+                total += repo.import_file(archivo)
+            except Exception as e:
+                self.log(f"No se pudo importar {archivo.name}: {e}", "WARNING")
+        
+        if total:
+            self.log(f"Importadas {total} noticias de {len(archivos)} archivos al repositorio")
+        return total
+    
+    def paso_2_parafrasear_noticias(self, noticias: List[Dict], agrupar: bool = True,
+                                    anticipar_imagenes: bool = True) -> List[Dict]:
         """
         Paso 2: Parafrasea cada noticia 1 vez
         
         Args:
             noticias: Lista de noticias originales
+            agrupar: Agrupar antes los casi duplicados (False si ya se hizo)
+            anticipar_imagenes: En streaming, iniciar la imagen de cada noticia
+                en cuanto llegan su título y resumen, para que el paso 3 la
+                recoja (False si las imágenes ya corren en paralelo, como en
+                el grafo del flujo completo)
             
         Returns:
             Lista de noticias parafraseadas
@@ -197,31 +315,88 @@ class MasterOrchestrator:
         self.log("PASO 2: Parafraseando Noticias y Generando Artículos Completos", "PROGRESS")
         self.log("=" * 70)
         
-        noticias_parafraseadas = []
+        if agrupar:
+            noticias = self._agrupar_casi_duplicados(noticias)
+        self.stats["modo_llm"] = "llamada_unica" if self.llamada_unica else "dos_llamadas"
+        
+        # Cada noticia encadena parafraseo y expansión; las cadenas corren
+        # concurrentemente dentro de la ventana del cliente LLM compartido
+        from utils.llm_client import run_in_order
+        from utils.llm_cache import get_llm_cache
+        noticias_parafraseadas = run_in_order(
+            self._parafrasear_noticia(noticia, noticia_idx, len(noticias), anticipar_imagenes)
+            for noticia_idx, noticia in enumerate(noticias, 1)
+        )
+        
+        cache = get_llm_cache()
+        if cache:
+            self.stats["cache_llm"] = dict(cache.stats)
+            self.log(f"Caché LLM: {cache.stats['hits']} respuestas reutilizadas, {cache.stats['misses']} llamadas a la API")
+        
+        self.log(f"Parafraseado completado: {self.stats['noticias_parafraseadas']} artículos generados", "SUCCESS")
+        return noticias_parafraseadas
+    
+    async def _parafrasear_noticia(self, noticia: Dict, noticia_idx: int, total: int,
+                                   anticipar_imagenes: bool = True) -> Dict:
+        """
+        Parafrasea y expande una noticia (o usa la original si falla)
+        
+        Args:
+            noticia: Noticia original
+            noticia_idx: Posición de la noticia (1..total)
+            total: Total de noticias del lote
+            anticipar_imagenes: Iniciar la imagen al llegar la cabecera (streaming)
+            
+        Returns:
+            Datos del artículo para los sitios
+        """
+        from utils import tracing
         
-        for noticia_idx, noticia in enumerate(noticias, 1):
-            self.log(f"Procesando noticia {noticia_idx}/{len(noticias)}: {noticia.get('title', '')[:60]}...")
+        with tracing.span("parafraseo", "elemento", index=noticia_idx):
+            clave = self._clave_noticia(noticia, noticia_idx)
+            guardado = self._cargar_checkpoint("parafraseo", clave)
+            if guardado:
+                self.log(f"  [{noticia_idx}/{total}] Ya parafraseada: {guardado.get('title', '')[:60]}...")
+                return guardado
             
             try:
                 # Parafrasear con estilo aleatorio
                 style_idx = noticia_idx % len(self.paraphraser.styles)
                 style = self.paraphraser.styles[style_idx]
-                
-                self.log(f"  [{noticia_idx}/{len(noticias)}] Estilo: {style}", "PROGRESS")
-                
-                # Parafrasear título y descripción
-                paraphrased = self.paraphraser.paraphrase_article(noticia, style=style)
-                
-                # Expandir a artículo completo
+            
+                self.log(f"  [{noticia_idx}/{total}] Estilo: {style} - {noticia.get('title', '')[:60]}...", "PROGRESS")
+            
                 structure_idx = noticia_idx % len(self.article_expander.structures)
                 structure = self.article_expander.structures[structure_idx]
+            
+                if self.llamada_unica and self.streaming:
+                    # La imagen se busca en cuanto llegan título y resumen,
+                    # mientras el cuerpo sigue generándose
+                    paraphrased = await asyncio.to_thread(
+                        self.paraphraser.rewrite_article_stream,
+                        noticia, style, structure, 1000,
+                        self._anticipar_imagen if anticipar_imagenes else None
+                    )
+                    full_article = paraphrased.pop('full_article')
+                elif self.llamada_unica:
+                    # Título, resumen y cuerpo completo en una sola respuesta
+                    paraphrased = await self.paraphraser.rewrite_article_async(
+                        noticia, style=style, structure=structure, target_words=1000
+                    )
+                    full_article = paraphrased.pop('full_article')
+                else:
+                    # Parafrasear título y descripción
+                    paraphrased = await self.paraphraser.paraphrase_article_async(noticia, style=style)
                 
-                full_article = self.article_expander.expand_article(
-                    paraphrased,
-                    target_words=800,
-                    structure=structure
-                )
-                
+                    # Expandir a artículo completo
+                    full_article, respaldo = await self.article_expander.expand_article_result_async(
+                        paraphrased,
+                        target_words=800,
+                        structure=structure
+                    )
+                    if respaldo:
+                        paraphrased['llm_fallback'] = True
+            
                 # Combinar datos con autor aleatorio
                 article_data = {
                     **paraphrased,
@@ -231,25 +406,48 @@ class MasterOrchestrator:
                     "structure": structure,
                     "author": self.legal_generator.generar_autor_aleatorio()
                 }
-                
-                noticias_parafraseadas.append(article_data)
-                self.stats["noticias_parafraseadas"] += 1
-                
+                # Solo se cuentan y guardan los parafraseos logrados: los respaldos se reintentan al reanudar
+                if not article_data.pop('llm_fallback', False):
+                    self._sumar("noticias_parafraseadas")
+                    self._guardar_checkpoint("parafraseo", article_data, clave)
+                return article_data
+            
             except Exception as e:
                 self.log(f"Error parafraseando noticia {noticia_idx}: {e}", "ERROR")
                 # Usar original como fallback con autor aleatorio
-                noticias_parafraseadas.append({
+                return {
                     **noticia,
                     "full_article": noticia.get('content', noticia.get('description', '')),
                     "original_id": noticia.get('id', noticia_idx),
                     "author": self.legal_generator.generar_autor_aleatorio()
-                })
+                }
+    
+    def _agrupar_casi_duplicados(self, noticias: List[Dict]) -> List[Dict]:
+        """
+        Deja una noticia por historia antes de gastar llamadas al LLM
+        
+        Las copias sindicadas o casi idénticas (MinHash/LSH sobre título +
+        texto) se agrupan y solo se parafrasea el representante, con los
+        resúmenes de las demás versiones como contexto adicional. El umbral
+        se ajusta con NEAR_DUP_THRESHOLD (0 lo desactiva).
+        
+        Args:
+            noticias: Lista de noticias originales
             
-            # Rate limiting
-            time.sleep(0.5)
+        Returns:
+            Lista de noticias representativas
+        """
+        from utils.near_duplicates import DEFAULT_THRESHOLD, select_representatives
         
-        self.log(f"Parafraseado completado: {self.stats['noticias_parafraseadas']} artículos generados", "SUCCESS")
-        return noticias_parafraseadas
+        if DEFAULT_THRESHOLD <= 0 or len(noticias) < 2:
+            return noticias
+        
+        representantes = select_representatives(noticias, DEFAULT_THRESHOLD, merge=True)
+        agrupadas = len(noticias) - len(representantes)
+        self.stats["noticias_agrupadas"] = agrupadas
+        if agrupadas:
+            self.log(f"{len(noticias)} noticias → {len(representantes)} historias ({agrupadas} casi duplicadas)")
+        return representantes
     
     def paso_3_generar_imagenes(self, noticias: List[Dict], site_num: int) -> Dict[str, str]:
         """
@@ -266,46 +464,131 @@ class MasterOrchestrator:
         self.log("PASO 3: Generando Imágenes de Noticias", "PROGRESS")
         self.log("=" * 70)
         
-        site_images_dir = self.output_base_dir / f"site_{site_num}" / "images"
-        site_images_dir.mkdir(parents=True, exist_ok=True)
-        
         imagenes = {}
-        
         for idx, noticia in enumerate(noticias, 1):
-            try:
-                # Preparar datos del artículo para generación de imagen
-                title = noticia.get('title', '')
-                description = noticia.get('description', '')
-                category = noticia.get('category', 'tecnología')
-                
-                # Crear prompt (usado solo si IA está disponible)
-                prompt = f"""Professional news image for technology article: {title}. 
+            image_path = self._imagen_noticia(noticia, idx, site_num)
+            if image_path:
+                imagenes[f"article_{idx}"] = image_path
+        
+        self.log(f"Generación de imágenes completada: {self.stats['imagenes_generadas']} imágenes", "SUCCESS")
+        return imagenes
+    
+    @staticmethod
+    def _clave_noticia(noticia: Dict, idx: int) -> str:
+        """
+        Clave estable de una noticia para sus puntos de control
+        
+        Es el id del repositorio (o el de la original, en una parafraseada) o
+        la URL: no depende de la posición, que puede cambiar al reanudar si
+        varias noticias comparten fecha de publicación.
+        
+        Args:
+            noticia: Noticia original o parafraseada
+            idx: Posición de la noticia (solo si no tiene id ni URL)
+            
+        Returns:
+            Clave de la noticia
+        """
+        return str(noticia.get('id') or noticia.get('original_id') or noticia.get('url') or idx)
+    
+    def _imagen_noticia(self, noticia: Dict, idx: int, site_num: int = None) -> Optional[str]:
+        """
+        Obtiene la imagen de una noticia y la copia al directorio destino
+        
+        El punto de control y el archivo de la imagen usan la clave estable
+        de la noticia, así que al reanudar cada imagen guardada vuelve a su
+        noticia aunque cambie su posición.
+        
+        Args:
+            noticia: Noticia (original o parafraseada)
+            idx: Posición de la noticia (1..n), define article_{idx}
+            site_num: Número del sitio (None = conjunto compartido por todos
+                los sitios, del que el paso 7 copia las de cada uno)
+            
+        Returns:
+            Ruta de la imagen copiada o None
+        """
+        article_id = f"article_{idx}"
+        clave = self._clave_noticia(noticia, idx)
+        try:
+            guardada = self._cargar_checkpoint("imagenes", clave)
+            if guardada and Path(guardada).exists():
+                return guardada
+            
+            title = noticia.get('title', '')
+            anticipada = self._imagenes_anticipadas.pop(noticia.get('url'), None)
+            if anticipada:
+                self.log(f"  [imagen {idx}] Iniciada en el paso 2: {title[:50]}...", "PROGRESS")
+                image_path = anticipada.result()
+            else:
+                self.log(f"  [imagen {idx}] Descargando: {title[:50]}...", "PROGRESS")
+                image_path = self._generar_imagen(noticia, article_id, idx)
+            
+            # Mover a directorio del sitio
+            if image_path and Path(image_path).exists():
+                if site_num is None:
+                    images_dir = self.output_base_dir / "imagenes_compartidas"
+                else:
+                    images_dir = self.output_base_dir / f"site_{site_num}" / "images"
+                images_dir.mkdir(parents=True, exist_ok=True)
+                dest_path = images_dir / f"news_{hashlib.sha1(clave.encode('utf-8')).hexdigest()[:12]}.jpg"
+                shutil.copy2(image_path, dest_path)
+                self._sumar("imagenes_generadas")
+                self._guardar_checkpoint("imagenes", str(dest_path), clave)
+                return str(dest_path)
+            
+        except Exception as e:
+            self.log(f"Error generando imagen {idx}: {e}", "WARNING")
+        return None
+    
+    def _generar_imagen(self, noticia: Dict, article_id: str, idx: int) -> str:
+        """
+        Genera o descarga la imagen de una noticia
+        
+        Args:
+            noticia: Noticia con título y descripción finales
+            article_id: ID del artículo para el archivo
+            idx: Índice de la imagen
+            
+        Returns:
+            Ruta de la imagen o None
+        """
+        title = noticia.get('title', '')
+        description = noticia.get('description', '')
+        category = noticia.get('category', 'tecnología')
+        
+        # Crear prompt (usado solo si IA está disponible)
+        prompt = f"""Professional news image for technology article: {title}. 
 {description}. 
 Style: Modern, clean, tech-focused. Category: {category}. 
 High quality, photojournalistic, relevant to the specific topic. 
 No text, no watermarks."""
-                
-                self.log(f"  [{idx}/{len(noticias)}] Descargando imagen: {title[:50]}...", "PROGRESS")
-                
-                # Generar/descargar imagen (NewsAPI primero, luego fallbacks)
-                article_id = f"article_{idx}"
-                image_path = self.image_generator.generate_image(prompt, article_id, idx, article=noticia)
-                
-                # Mover a directorio del sitio
-                if image_path and Path(image_path).exists():
-                    dest_path = site_images_dir / f"news_{idx}.jpg"
-                    shutil.copy2(image_path, dest_path)
-                    imagenes[article_id] = str(dest_path)
-                    self.stats["imagenes_generadas"] += 1
-                
-            except Exception as e:
-                self.log(f"Error generando imagen {idx}: {e}", "WARNING")
-            
-            # Rate limiting
-            time.sleep(1)
         
-        self.log(f"Generación de imágenes completada: {self.stats['imagenes_generadas']} imágenes", "SUCCESS")
-        return imagenes
+        # Generar/descargar imagen (NewsAPI primero, luego fallbacks)
+        return self.image_generator.generate_image(prompt, article_id, idx, article=noticia)
+    
+    def _anticipar_imagen(self, noticia: Dict):
+        """
+        Inicia en segundo plano la imagen de una noticia cuyo título ya llegó
+        
+        El paso 3 recoge el resultado por la URL de la noticia; las imágenes
+        anticipadas usan un nombre de archivo propio para no pisar las del paso 3.
+        
+        Args:
+            noticia: Noticia con el título y resumen nuevos
+        """
+        from utils import tracing
+        
+        url = noticia.get('url')
+        if not url:
+            return
+        with self._componentes_lock:
+            if self._pool_imagenes is None:
+                self._pool_imagenes = ThreadPoolExecutor(max_workers=4, thread_name_prefix='imagenes')
+            numero = next(self._contador_anticipadas)
+            self._imagenes_anticipadas[url] = self._pool_imagenes.submit(
+                tracing.bind(self._generar_imagen, noticia, f"anticipada_{numero}", numero)
+            )
     
     def paso_4_crear_metadata_sitios(self, num_sitios: int, verificar_dominios: bool = False) -> List[Dict]:
         """
@@ -322,6 +605,12 @@ No text, no watermarks."""
         self.log("PASO 4: Creando Metadata de Sitios", "PROGRESS")
         self.log("=" * 70)
         
+        guardada = self._cargar_checkpoint("sitios")
+        if guardada:
+            self.log(f"Metadata de {len(guardada)} sitios recuperada de la ejecución {self.run_id}", "SUCCESS")
+            return guardada
+        
+        SitePreCreation = cargar_clase('site_pre_creation', 'SitePreCreation')
         protocolo = SitePreCreation(output_dir=str(self.data_dir / "sites_metadata"))
         
         sites_metadata = protocolo.crear_batch_sitios(
@@ -330,6 +619,7 @@ No text, no watermarks."""
             guardar_archivo=True
         )
         
+        self._guardar_checkpoint("sitios", sites_metadata)
         self.log(f"Metadata de {len(sites_metadata)} sitios creada", "SUCCESS")
         return sites_metadata
     
@@ -348,46 +638,63 @@ No text, no watermarks."""
         self.log("=" * 70)
         
         logos = {}
-        
         for idx, metadata in enumerate(sites_metadata, 1):
-            try:
-                site_name = metadata['nombre']
-                tagline = metadata['tagline']
-                domain = metadata['dominio']
-                
-                # Prompt ultra específico para logo
-                prompt = f"""Professional minimalist logo for news website "{site_name}". 
+            logo_path = self._generar_logo(metadata, idx)
+            if logo_path:
+                logos[idx] = logo_path
+        
+        self.log(f"Generación de logos completada: {len(logos)} logos", "SUCCESS")
+        return logos
+    
+    def _generar_logo(self, metadata: Dict, idx: int) -> Optional[str]:
+        """
+        Genera el logo de un sitio (prompt ultra específico)
+        
+        Args:
+            metadata: Metadata del sitio
+            idx: Número del sitio (1..n)
+            
+        Returns:
+            Ruta del logo en el directorio del sitio o None
+        """
+        guardado = self._cargar_checkpoint("logos", str(idx))
+        if guardado and Path(guardado).exists():
+            return guardado
+        
+        try:
+            site_name = metadata['nombre']
+            tagline = metadata['tagline']
+            
+            # Prompt ultra específico para logo
+            prompt = f"""Professional minimalist logo for news website "{site_name}". 
 Tagline: {tagline}. 
 Style: Modern, clean, trustworthy, media company aesthetic. 
 Simple icon or lettermark, tech-focused, credible news brand. 
 Suitable for website header. No complex details. 
 Colors: professional blue, black or modern gradient. 
 Vector style, flat design, high contrast."""
-                
-                self.log(f"  [{idx}/{len(sites_metadata)}] Generando logo: {site_name}", "PROGRESS")
-                
-                # Generar logo
-                logo_path = self.image_generator.generate_image(
-                    prompt,
-                    f"logo_site_{idx}",
-                    1
-                )
-                
-                # Mover a directorio del sitio
-                if logo_path and Path(logo_path).exists():
-                    site_dir = self.output_base_dir / f"site_{idx}"
-                    site_dir.mkdir(parents=True, exist_ok=True)
-                    dest_path = site_dir / "logo.jpg"
-                    shutil.copy2(logo_path, dest_path)
-                    logos[idx] = str(dest_path)
-                
-            except Exception as e:
-                self.log(f"Error generando logo para sitio {idx}: {e}", "WARNING")
             
-            time.sleep(1)
-        
-        self.log(f"Generación de logos completada: {len(logos)} logos", "SUCCESS")
-        return logos
+            self.log(f"  [logo {idx}] Generando logo: {site_name}", "PROGRESS")
+            
+            # Generar logo
+            logo_path = self.image_generator.generate_image(
+                prompt,
+                f"logo_site_{idx}",
+                1
+            )
+            
+            # Mover a directorio del sitio
+            if logo_path and Path(logo_path).exists():
+                site_dir = self.output_base_dir / f"site_{idx}"
+                site_dir.mkdir(parents=True, exist_ok=True)
+                dest_path = site_dir / "logo.jpg"
+                shutil.copy2(logo_path, dest_path)
+                self._guardar_checkpoint("logos", str(dest_path), str(idx))
+                return str(dest_path)
+            
+        except Exception as e:
+            self.log(f"Error generando logo para sitio {idx}: {e}", "WARNING")
+        return None
     
     def paso_6_generar_templates_css(self, num_sitios: int) -> List[Dict]:
         """
@@ -403,6 +710,12 @@ Vector style, flat design, high contrast."""
         self.log("PASO 6: Generando Templates CSS Modulares", "PROGRESS")
         self.log("=" * 70)
         
+        guardados = self._cargar_checkpoint("templates")
+        css_dir = self.templates_dir / "css"
+        if guardados and all((css_dir / f"template{n}.css").exists() for n in range(1, num_sitios + 1)):
+            self.log(f"Templates CSS recuperados de la ejecución {self.run_id}", "SUCCESS")
+            return guardados
+        
         # Generar templates únicos
         templates_metadata = self.template_combiner.generar_multiples_templates(
             num_templates=num_sitios,
@@ -410,6 +723,7 @@ Vector style, flat design, high contrast."""
             aleatorio=True
         )
         
+        self._guardar_checkpoint("templates", templates_metadata)
         self.log(f"Templates CSS generados: {len(templates_metadata)}", "SUCCESS")
         return templates_metadata
     
@@ -420,371 +734,128 @@ Vector style, flat design, high contrast."""
                                    logos: Dict[int, str],
                                    templates_metadata: List[Dict]) -> List[str]:
         """
-        Paso 7: Genera sitio HTML completo
+        Paso 7: Genera los sitios HTML completos (uno por metadata)
+        
+        Todos los sitios comparten el mismo conjunto de noticias parafraseadas
+        e imágenes; cada uno elige y ordena las suyas (ver
+        _seleccionar_noticias). Cada sitio se describe con un trabajo
+        serializable y se renderiza con site_renderer, en serie o repartido
+        en un pool de procesos (self.procesos) con el mismo resultado. Los
+        archivos cuyas entradas no cambiaron desde la ejecución anterior no
+        se vuelven a escribir (manifiesto de cada sitio).
         
         Args:
-            sites_metadata: Metadata del sitio
-            noticias: Lista de noticias parafraseadas
-            imagenes: Imágenes generadas
-            logos: Logos generados
-            templates_metadata: Metadata de templates CSS
+            sites_metadata: Metadata de los sitios
+            noticias: Noticias parafraseadas compartidas
+            imagenes: Imágenes de las noticias (article_{n} -> ruta, n desde 1)
+            logos: Logos generados (número de sitio -> ruta)
+            templates_metadata: Metadata de templates CSS (uno por sitio)
             
         Returns:
             Lista de paths de sitios generados
         """
         self.log("=" * 70)
-        self.log("PASO 7: Generando Sitio HTML", "PROGRESS")
+        self.log(f"PASO 7: Generando {len(sites_metadata)} Sitio(s) HTML", "PROGRESS")
         self.log("=" * 70)
         
-        sitios_generados = []
-        metadata = sites_metadata[0]
-        idx = 1
-        
-        try:
-            site_dir = self.output_base_dir / f"site_{idx}"
-            site_dir.mkdir(parents=True, exist_ok=True)
-            
-            template_info = templates_metadata[0]
-            logo_path = logos.get(idx)
-            
-            self.log(f"Generando: {metadata['nombre']}", "PROGRESS")
-            
-            # Generar HTML del sitio (index.html)
-            index_html = self._generar_index_html(
-                metadata, noticias, template_info, idx, logo_path
-            )
-            
-            index_path = site_dir / "index.html"
-            with open(index_path, 'w', encoding='utf-8') as f:
-                f.write(index_html)
-            
-            # Generar páginas de artículos individuales
-            self._generar_paginas_articulos(site_dir, noticias, metadata, template_info, idx, logo_path)
-            
-            # Generar páginas legales
-            self._generar_paginas_legales(site_dir, metadata)
-            
-            # Copiar CSS
-            self._copiar_css(site_dir, idx)
-            
-            sitios_generados.append(str(index_path))
-            self.stats["sitios_creados"] += 1
-            
-        except Exception as e:
-            self.log(f"Error generando sitio: {e}", "ERROR")
-        
-        self.log(f"Sitio HTML generado", "SUCCESS")
-        return sitios_generados
-    
-    def _generar_index_html(self, metadata: Dict, noticias: List[Dict], 
-                           template_info: Dict, site_num: int, logo_path: str = None) -> str:
-        """Genera el HTML del index del sitio usando generadores modulares"""
-        
-        # Generar configuración de layout
-        layout_config = self.layout_generator.generar_configuracion_layout()
+        import site_renderer
+        from utils.site_jobs import resolve_processes, run_jobs
         
-        # Crear builder con la configuración
-        builder = HTMLLayoutBuilder(layout_config)
-        
-        # Configuración del sitio
-        site_config = {
-            "title": metadata['nombre'],
-            "tagline": metadata['tagline']
-        }
+        trabajos = self._trabajos_de_sitios(sites_metadata, noticias, imagenes, logos, templates_metadata)
+        procesos = min(resolve_processes(self.procesos), len(trabajos))
+        if procesos > 1:
+            self.log(f"Renderizando {len(trabajos)} sitios en {procesos} procesos", "PROGRESS")
         
-        # Obtener categorías de las noticias
-        categorias_set = set()
-        for noticia in noticias:
-            cat = noticia.get('category', 'General')
-            if cat:
-                categorias_set.add(cat.capitalize())
-        categorias = ["Inicio"] + sorted(list(categorias_set))[:6]  # Limitar a 7 categorías
-        
-        # Generar componentes usando los nuevos generadores
-        header_html = builder.build_header(site_config, categorias, logo_path)
-        
-        # Obtener información del layout para el footer
-        layout_info = layout_config.get('layout_type', 'default')
-        footer_html = builder.build_footer(site_config, layout_info, site_num)
-        
-        # Generar sección de noticias
-        clases_css = self.layout_generator.generar_clases_css_dinamicas(layout_config)
-        
-        html = f"""<!DOCTYPE html>
-<html lang="es">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{metadata['nombre']} - {metadata['tagline']}</title>
-    <link rel="stylesheet" href="style.css">
-    <meta name="description" content="{metadata['tagline']}">
-    <meta name="layout" content="{layout_info}">
-</head>
-<body class="{clases_css['container']}">
-
-{header_html}
-
-    <main class="{clases_css['main']}">
-        <div class="content-wrapper">
-    <section class="{clases_css['featured']}">
-    </section>
-
-    <section class="news-section {layout_info}">
-        <div class="container">
-            <div class="{clases_css['news_grid']}">
-"""
-        
-        for idx, noticia in enumerate(noticias[:12], 1):
-            image_path = f"images/news_{idx}.jpg"
-            html += f"""                <article class="news-card {layout_info}">
-                    <div class="card-image-wrapper">
-                        <img src="{image_path}" alt="" style="max-height: 240px; width: 100%; object-fit: cover;">
-                        <span class="card-category-badge">{noticia.get('category', 'General')}</span>
-                    </div>
-                    <div class="card-content">
-                        <h3 class="card-title"><a href="article_{idx}.html">{noticia.get('title', '')}</a></h3>
-                        <p class="card-text">{noticia.get('description', '')[:130]}...</p>
-                        <div class="card-footer">
-                            <span class="author">{noticia.get('author', 'Redacción')}</span>
-                            <span class="date">{noticia.get('published_at', '')}</span>
-                        </div>
-                    </div>
-                </article>
-"""
-        
-        html += f"""            </div>
-        </div>
-    </section>
-
-        </div>
-    </main>
-
-{footer_html}
-</body>
-</html>
-"""
+        sitios_generados = []
+        for resultado in run_jobs(site_renderer.generar_sitio, trabajos, procesos):
+            if resultado['error']:
+                self.log(f"Error generando sitio {resultado['site_num']}: {resultado['error']}", "ERROR")
+                continue
+            self._sumar("sitios_creados")
+            self._sumar("archivos_escritos", resultado['archivos']['escritos'])
+            self._sumar("archivos_sin_cambios", resultado['archivos']['omitidos'])
+            sitios_generados.append(resultado['index_path'])
         
-        return html
+        self.log(f"Sitios HTML generados: {len(sitios_generados)}/{len(sites_metadata)}", "SUCCESS")
+        self.log(f"Archivos escritos: {self.stats.get('archivos_escritos', 0)}, "
+                 f"sin cambios: {self.stats.get('archivos_sin_cambios', 0)}")
+        return sitios_generados
     
-    def _generar_sidebar_articulos(self, otras_noticias: List[Dict], metadata: Dict) -> str:
+    def _trabajos_de_sitios(self, sites_metadata: List[Dict], noticias: List[Dict], imagenes: Dict[str, str],
+                            logos: Dict[int, str], templates_metadata: List[Dict]) -> List[Dict]:
         """
-        Genera sidebar con miniaturas de otros artículos
+        Trabajos serializables de renderizado, uno por sitio (ver site_renderer)
+        
+        Cada sitio recibe su semilla (número de sitio y huella del conjunto de
+        noticias): su selección de noticias y su configuración de layout
+        salen de ella, y con ella se siembra random al renderizarlo, en
+        cualquier proceso. No depende del run_id, así que una ejecución nueva
+        con las mismas noticias produce las mismas páginas y el manifiesto de
+        cada sitio puede omitirlas.
         
-        Args:
-            otras_noticias: Lista de otras noticias con índices
-            metadata: Metadata del sitio
-            
         Returns:
-            str: HTML del sidebar
+            Lista de trabajos en el orden de los sitios
         """
-        items_html = []
-        for i, noticia in enumerate(otras_noticias):
-            # Usar el índice de la noticia original si existe
-            article_idx = noticia.get('_display_index', i + 1)
-            title = noticia.get('title', '')
-            title_truncated = title if len(title) <= 80 else title[:80] + '...'
-            
-            items_html.append(f"""
-                    <article class="sidebar-article">
-                        <a href="article_{article_idx}.html" class="sidebar-article-link">
-                            <div class="sidebar-article-image">
-                                <img src="images/news_{article_idx}.jpg" alt="{title[:50]}">
-                                <span class="sidebar-category">{noticia.get('category', 'General')}</span>
-                            </div>
-                            <div class="sidebar-article-content">
-                                <h3 class="sidebar-article-title">{title_truncated}</h3>
-                                <span class="sidebar-article-date">{noticia.get('published_at', '')[:10]}</span>
-                            </div>
-                        </a>
-                    </article>""")
-        
-        sidebar_html = f"""
-                <aside class="article-sidebar">
-                    <div class="sidebar-section">
-                        <h2 class="sidebar-title">Más Noticias</h2>
-                        <div class="sidebar-articles">
-{''.join(items_html)}
-                        </div>
-                    </div>
-                    
-                    <div class="sidebar-section sidebar-newsletter">
-                        <h3>Suscríbete</h3>
-                        <p>Recibe las últimas noticias en tu correo</p>
-                        <form class="newsletter-form">
-                            <input type="email" placeholder="Tu email" required>
-                            <button type="submit">Suscribirse</button>
-                        </form>
-                    </div>
-                </aside>"""
-        
-        return sidebar_html
-    
-    def _formatear_contenido_html(self, texto: str) -> str:
-        """
-        Convierte texto plano en HTML con estructura semántica y marcado
-        """
-        if not texto:
-            return ""
-        
-        # Dividir por líneas vacías (doble salto de línea)
-        parrafos = texto.strip().split('\n\n')
-        
-        # Envolver cada párrafo en tags <p> con clases semánticas
-        html_parrafos = []
-        for i, parrafo in enumerate(parrafos):
-            parrafo = parrafo.strip()
-            if parrafo:
-                # Limpiar saltos de línea internos y espacios múltiples
-                parrafo = ' '.join(parrafo.split())
-                
-                # Primer párrafo como lead/intro
-                if i == 0:
-                    html_parrafos.append(f'<p class="lead">{parrafo}</p>')
-                else:
-                    html_parrafos.append(f'<p>{parrafo}</p>')
+        from utils.build_manifest import input_hash
+        from utils.site_jobs import seeded, site_seed
         
-        return '\n                    '.join(html_parrafos)
-    
-    def _generar_paginas_articulos(self, site_dir: Path, noticias: List[Dict],
-                                   metadata: Dict, template_info: Dict, site_num: int, logo_path: str = None):
-        """Genera páginas HTML individuales para cada artículo con sidebar"""
-        for idx, noticia in enumerate(noticias, 1):
-            # Generar sidebar con otros artículos (excluyendo el actual)
-            otras_noticias = []
-            for i, n in enumerate(noticias, 1):
-                if i != idx:
-                    n_copy = n.copy()
-                    n_copy['_display_index'] = i
-                    otras_noticias.append(n_copy)
-            
-            sidebar_html = self._generar_sidebar_articulos(otras_noticias[:6], metadata)
-            
-            article_html = f"""<!DOCTYPE html>
-<html lang="es">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{noticia.get('title', 'Artículo')} - {metadata['nombre']}</title>
-    <link rel="stylesheet" href="style.css">
-    <meta name="description" content="{noticia.get('description', '')[:150]}">
-</head>
-<body>
-    <header class="header">
-        <div class="container">
-            <div class="header-branding">
-                {'<img src="logo.jpg" alt="' + metadata['nombre'] + '" class="logo-img">' if logo_path else ''}
-                <h1 class="logo"><a href="index.html">{metadata['nombre']}</a></h1>
-            </div>
-            <nav class="nav">
-                <a href="index.html" class="nav-link">Inicio</a>
-            </nav>
-        </div>
-    </header>
-    
-    <main class="main article-page">
-        <div class="container">
-            <div class="article-layout">
-                <article class="article-full">
-                    <header class="article-header">
-                        <div class="article-category-badge">{noticia.get('category', 'General')}</div>
-                        <h1 class="article-title">{noticia.get('title', '')}</h1>
-                        <div class="article-meta">
-                            <span class="author">Por {noticia.get('author', 'Redacción')}</span>
-                            <span class="separator">•</span>
-                            <time class="date">{noticia.get('published_at', '')}</time>
-                        </div>
-                    </header>
-                    
-                    <figure class="article-image-wrapper">
-                        <img src="images/news_{idx}.jpg" alt="{noticia.get('title', '')}" class="article-image">
-                    </figure>
-                    
-                    <div class="article-content">
-                    {self._formatear_contenido_html(noticia.get('full_article', noticia.get('content', noticia.get('description', ''))))}
-                    </div>
-                    
-                    <footer class="article-footer">
-                        <div class="article-tags">
-                            <span class="tag">{noticia.get('category', 'General')}</span>
-                        </div>
-                        <div class="article-share">
-                            <span>Compartir:</span>
-                            <a href="#" class="share-link">Facebook</a>
-                            <a href="#" class="share-link">Twitter</a>
-                            <a href="#" class="share-link">WhatsApp</a>
-                        </div>
-                    </footer>
-                </article>
-                
-                {sidebar_html}
-            </div>
-        </div>
-    </main>
-    
-    <footer class="footer">
-        <div class="container">
-            <p><a href="index.html">← Volver al inicio</a></p>
-            <p>&copy; 2026 {metadata['nombre']}</p>
-        </div>
-    </footer>
-</body>
-</html>"""
-            
-            article_path = site_dir / f"article_{idx}.html"
-            with open(article_path, 'w', encoding='utf-8') as f:
-                f.write(article_html)
+        huella = input_hash(sorted(self._clave_noticia(n, i) for i, n in enumerate(noticias, 1)))[:16]
+        trabajos = []
+        for site_num, metadata in enumerate(sites_metadata, 1):
+            self.log(f"Generando: {metadata['nombre']}", "PROGRESS")
+            seed = site_seed(huella, site_num)
+            seleccion = self._seleccionar_noticias(len(noticias), len(sites_metadata), seed)
+            with seeded(seed):
+                layout_config = self.layout_generator.generar_configuracion_layout()
+            trabajos.append({
+                'site_num': site_num,
+                'seed': seed,
+                'site_dir': str(self.output_base_dir / f"site_{site_num}"),
+                'metadata': metadata,
+                'template_info': templates_metadata[(site_num - 1) % len(templates_metadata)] if templates_metadata else {},
+                'css_source': str(self.templates_dir / "css" / f"template{site_num}.css"),
+                'layout_config': layout_config,
+                'noticias': [noticias[j] for j in seleccion],
+                'imagenes': [imagenes.get(f"article_{j + 1}") for j in seleccion],
+                'logo_path': logos.get(site_num),
+            })
+        return trabajos
     
-    def _generar_paginas_legales(self, site_dir: Path, metadata: Dict):
+    def _seleccionar_noticias(self, total: int, num_sitios: int, semilla: str) -> List[int]:
         """
-        Genera páginas legales (Términos, Privacidad, FAQs, Acerca de)
+        Noticias del conjunto compartido que publica un sitio, en su orden
+        
+        Con un solo sitio se publican todas en el orden original. Con varios,
+        cada sitio recibe su propio orden (y, si ARTICULOS_POR_SITIO > 0, un
+        subconjunto de ese tamaño), reproducible para la misma semilla.
         
         Args:
-            site_dir: Directorio del sitio
-            metadata: Metadata del sitio
+            total: Número de noticias del conjunto compartido
+            num_sitios: Sitios de la ejecución
+            semilla: Semilla del sitio (ver _trabajos_de_sitios)
+            
+        Returns:
+            Índices (desde 0) de las noticias del sitio
         """
-        site_name = metadata['nombre']
-        domain = metadata['dominio']
-        tagline = metadata['tagline']
-        
-        # Generar Términos y Condiciones
-        terms_html = self.legal_generator.generar_terminos_condiciones(site_name, domain)
-        terms_path = site_dir / "terminos.html"
-        with open(terms_path, 'w', encoding='utf-8') as f:
-            f.write(terms_html)
-        
-        # Generar Política de Privacidad
-        privacy_html = self.legal_generator.generar_politica_privacidad(site_name, domain)
-        privacy_path = site_dir / "privacidad.html"
-        with open(privacy_path, 'w', encoding='utf-8') as f:
-            f.write(privacy_html)
-        
-        # Generar FAQs
-        faqs_html = self.legal_generator.generar_faqs(site_name)
-        faqs_path = site_dir / "faqs.html"
-        with open(faqs_path, 'w', encoding='utf-8') as f:
-            f.write(faqs_html)
-        
-        # Generar Acerca de
-        about_html = self.legal_generator.generar_acerca_de(site_name, tagline, domain)
-        about_path = site_dir / "acerca.html"
-        with open(about_path, 'w', encoding='utf-8') as f:
-            f.write(about_html)
-    
-    def _copiar_css(self, site_dir: Path, site_num: int):
-        """Copia el CSS del template al directorio del sitio"""
-        css_source = self.templates_dir / "css" / f"template{site_num}.css"
-        css_dest = site_dir / "style.css"
-        
-        if css_source.exists():
-            shutil.copy2(css_source, css_dest)
+        por_sitio = int(os.getenv('ARTICULOS_POR_SITIO', '0'))
+        cantidad = min(total, por_sitio) if por_sitio > 0 else total
+        if num_sitios <= 1 and cantidad == total:
+            return list(range(total))
+        rng = random.Random(semilla)
+        return rng.sample(range(total), cantidad)
     
-    def ejecutar_flujo_completo(self, verificar_dominios: bool = False, force_download: bool = True) -> Dict:
+    def ejecutar_flujo_completo(self, verificar_dominios: bool = False, force_download: bool = True,
+                                num_sitios: int = 1) -> Dict:
         """
         Ejecuta el flujo completo de generación
         
+        Las noticias se parafrasean y las imágenes se descargan una sola vez;
+        los num_sitios sitios las comparten.
+        
         Args:
             verificar_dominios: Si True, verifica disponibilidad de dominios
             force_download: Si True, descarga noticias en vivo desde NewsAPI
+            num_sitios: Número de sitios a generar
             
         Returns:
             Diccionario con resultados y estadísticas
@@ -795,37 +866,45 @@ Vector style, flat design, high contrast."""
         self.log(f"Run ID: {self.run_id}")
         self.log(f"Verificar dominios: {verificar_dominios}")
         self.log(f"Descarga en vivo: {force_download}")
+        self.log(f"Sitios: {num_sitios}")
+        
+        store = self._puntos_de_control()
         
         try:
-            # Paso 1: Descargar noticias
-            noticias = self.paso_1_descargar_noticias(num_noticias=20, force_download=force_download)
-            if not noticias:
-                raise Exception("No hay noticias disponibles")
-            
-            # Paso 2: Parafrasear noticias (1 vez cada una)
-            noticias_parafraseadas = self.paso_2_parafrasear_noticias(noticias)
-            
-            # Paso 3: Generar imágenes
-            imagenes = self.paso_3_generar_imagenes(noticias_parafraseadas, 1)
-            
-            # Paso 4: Crear metadata del sitio
-            sites_metadata = self.paso_4_crear_metadata_sitios(1, verificar_dominios)
+            if self.reanudar:
+                if not store or store.run_status(self.run_id) is None:
+                    raise Exception(f"No hay puntos de control de la ejecución {self.run_id}")
+                self.log(f"Reanudando ejecución {self.run_id}: se omite lo ya completado", "PROGRESS")
+            if store:
+                store.start_run(self.run_id)
             
-            # Paso 5: Generar logo
-            logos = self.paso_5_generar_logos(sites_metadata)
+            # Pasos 1-7 como grafo de dependencias: lo que no depende entre sí se solapa
+            pipeline = self._construir_pipeline(verificar_dominios, force_download, num_sitios)
             
-            # Paso 6: Generar template CSS
-            templates_metadata = self.paso_6_generar_templates_css(1)
-            
-            # Paso 7: Generar sitio HTML
-            sitios_generados = self.paso_7_generar_sitios_html(
-                sites_metadata, noticias_parafraseadas, imagenes,
-                logos, templates_metadata
-            )
+            # Tiempos, bytes, tokens, caché y reintentos por etapa y por elemento
+            from utils.tracing import Tracer
+            tracer = Tracer()
+            try:
+                with tracer.activate():
+                    sitios_generados = pipeline.run()["html"]
+            finally:
+                self.stats["pipeline"] = pipeline.report()
+                self.stats["trazas"] = tracer.summary()
+                self._escribir_traza(tracer)
             
             # Calcular estadísticas finales
             tiempo_total = time.time() - self.stats["tiempo_inicio"]
             
+            # Proveedores que tuvieron que frenarse (429, cuota o presupuesto)
+            from utils.rate_limit import get_rate_limiter
+            limiter = get_rate_limiter()
+            if limiter:
+                self.stats["limites_de_tasa"] = limiter.report()
+            
+            # Proveedores caídos durante la corrida (circuitos abiertos, respaldos usados)
+            from utils.circuit_breaker import circuits_report
+            self.stats["circuitos"] = circuits_report()
+            
             resultado = {
                 "success": True,
                 "run_id": self.run_id,
@@ -840,11 +919,13 @@ Vector style, flat design, high contrast."""
             
             # Guardar resumen
             self._guardar_resumen(resultado)
+            if store:
+                store.finish_run(self.run_id)
             
             self.log("=" * 70)
             self.log("🎉 FLUJO COMPLETADO EXITOSAMENTE", "SUCCESS")
             self.log("=" * 70)
-            self.log(f"Sitio creado: {self.stats['sitios_creados']}")
+            self.log(f"Sitios creados: {self.stats['sitios_creados']}")
             self.log(f"Noticias procesadas: {self.stats['noticias_parafraseadas']}")
             self.log(f"Imágenes generadas: {self.stats['imagenes_generadas']}")
             self.log(f"Tiempo total: {tiempo_total/60:.2f} minutos")
@@ -857,12 +938,83 @@ Vector style, flat design, high contrast."""
             import traceback
             traceback.print_exc()
             
+            if store and store.run_status(self.run_id):
+                from utils.run_checkpoint import FAILED
+                store.finish_run(self.run_id, FAILED)
+                self.log(f"Lo completado quedó guardado; reanudar con: --resume {self.run_id}")
+            
             return {
                 "success": False,
                 "error": str(e),
+                "run_id": self.run_id,
                 "stats": self.stats
             }
     
+    def _construir_pipeline(self, verificar_dominios: bool, force_download: bool, num_sitios: int = 1):
+        """
+        Expresa los pasos 1-7 como grafo de tareas (utils.pipeline)
+        
+        Las imágenes solo necesitan la noticia original (su image_url), y la
+        metadata, logos y CSS de los sitios no dependen de las noticias: todo
+        eso corre mientras el LLM parafrasea. Imágenes y logos son una tarea
+        por elemento; solo el HTML espera a que termine todo.
+        
+        Args:
+            verificar_dominios: Si True, verifica disponibilidad de dominios
+            force_download: Si True, descarga noticias en vivo
+            num_sitios: Número de sitios (comparten noticias e imágenes)
+            
+        Returns:
+            Pipeline listo para ejecutarse; el resultado de "html" son los
+            paths de los sitios generados
+        """
+        from utils.pipeline import Pipeline
+        
+        pipeline = Pipeline()
+        pipeline.add("noticias", functools.partial(self._noticias_del_flujo, force_download))
+        pipeline.add("agrupadas", self._agrupar_casi_duplicados, deps=["noticias"])
+        # La etapa "imagenes" arranca con las noticias originales, en paralelo al
+        # parafraseo y antes de que llegue cualquier título: anticipar las
+        # imágenes en el streaming solo duplicaría esas búsquedas
+        pipeline.add("parafraseadas", functools.partial(self.paso_2_parafrasear_noticias, agrupar=False,
+                                                        anticipar_imagenes=False),
+                     deps=["agrupadas"])
+        pipeline.map("imagenes", self._imagen_noticia, over="agrupadas")
+        pipeline.add("sitios", functools.partial(self.paso_4_crear_metadata_sitios, num_sitios, verificar_dominios))
+        pipeline.map("logos", self._generar_logo, over="sitios")
+        pipeline.add("templates", functools.partial(self.paso_6_generar_templates_css, num_sitios))
+        pipeline.add("html", self._sitios_desde_pipeline,
+                     deps=["sitios", "parafraseadas", "imagenes", "logos", "templates"])
+        return pipeline
+    
+    def _noticias_del_flujo(self, force_download: bool) -> List[Dict]:
+        """Paso 1 del flujo completo: falla si no hay noticias con qué trabajar"""
+        noticias = self.paso_1_descargar_noticias(num_noticias=20, force_download=force_download)
+        if not noticias:
+            raise Exception("No hay noticias disponibles")
+        return noticias
+    
+    def _sitios_desde_pipeline(self, sites_metadata: List[Dict], noticias: List[Dict],
+                               imagenes: List[Optional[str]], logos: List[Optional[str]],
+                               templates_metadata: List[Dict]) -> List[str]:
+        """Paso 7 con los resultados por elemento del grafo (listas en orden) como diccionarios"""
+        return self.paso_7_generar_sitios_html(
+            sites_metadata, noticias,
+            {f"article_{idx}": path for idx, path in enumerate(imagenes, 1) if path},
+            {idx: path for idx, path in enumerate(logos, 1) if path},
+            templates_metadata
+        )
+    
+    def _escribir_traza(self, tracer):
+        """Escribe trace_{run_id}.json (trace events de Chrome) si se pidió"""
+        if not self.trace:
+            return
+        try:
+            trace_path = tracer.write_chrome_trace(self.output_base_dir / f"trace_{self.run_id}.json")
+            self.log(f"Traza de la ejecución: {trace_path} (abrir en chrome://tracing o ui.perfetto.dev)")
+        except OSError as e:
+            self.log(f"No se pudo escribir la traza: {e}", "WARNING")
+    
     def _guardar_resumen(self, resultado: Dict):
         """Guarda un resumen de la ejecución"""
         resumen_path = self.output_base_dir / f"run_summary_{self.run_id}.json"
@@ -875,19 +1027,39 @@ def main():
     import argparse
     
     parser = argparse.ArgumentParser(description="Master Orchestrator - Generación Completa de Sitio")
+    parser.add_argument('--sitios', type=int, default=1,
+                        help='Número de sitios a generar (comparten noticias e imágenes)')
     parser.add_argument('--verificar-dominios', action='store_true', help='Verificar disponibilidad de dominios')
     parser.add_argument('--output-dir', type=str, default=None, help='Directorio de salida')
     parser.add_argument('--usar-cache', action='store_true', help='Usar noticias en cache en lugar de descargar nuevas')
+    parser.add_argument('--dos-llamadas', action='store_true',
+                        help='Parafrasear y expandir con dos llamadas al LLM por noticia (modo anterior)')
+    parser.add_argument('--sin-streaming', action='store_true',
+                        help='Esperar cada respuesta completa del LLM en lugar de recibirla en streaming')
+    parser.add_argument('--resume', type=str, default=None, metavar='RUN_ID',
+                        help='Reanudar una ejecución interrumpida omitiendo lo ya completado')
+    parser.add_argument('--trace', action='store_true',
+                        help='Escribir trace_RUN_ID.json (trace events de Chrome) con los tiempos por etapa')
+    parser.add_argument('--procesos', type=int, nargs='?', const=-1, default=None, metavar='N',
+                        help='Renderizar los sitios en N procesos (sin N: uno por núcleo; default: RENDER_PROCESSES)')
     
     args = parser.parse_args()
     
     # Crear orquestador
-    orchestrator = MasterOrchestrator(output_base_dir=args.output_dir)
+    orchestrator = MasterOrchestrator(
+        output_base_dir=args.output_dir,
+        llamada_unica=not args.dos_llamadas,
+        streaming=not args.sin_streaming,
+        run_id=args.resume,
+        trace=args.trace,
+        procesos=args.procesos
+    )
     
     # Ejecutar flujo (por defecto descarga en vivo)
     resultado = orchestrator.ejecutar_flujo_completo(
         verificar_dominios=args.verificar_dominios,
-        force_download=not args.usar_cache
+        force_download=not args.usar_cache,
+        num_sitios=max(1, args.sitios)
     )
     
     # Retornar código de salida
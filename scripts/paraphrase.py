@@ -7,14 +7,64 @@ Genera múltiples variaciones de artículos de noticias
 import os
 import json
 import requests
+from utils.llm_client import get_llm_client, run_in_order
 from dotenv import load_dotenv
-from typing import List, Dict
-import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 load_dotenv()
 
 API_KEY = os.getenv('BLACKBOX_API_KEY')
-API_URL = 'https://api.blackbox.ai/chat/completions'
+
+
+class StructuredStreamParser:
+    """
+    Lee de forma incremental una respuesta [TÍTULO]/[RESUMEN]/[ARTÍCULO]
+    
+    El título queda listo en cuanto empieza la sección siguiente y la
+    cabecera (título + resumen) en cuanto empieza [ARTÍCULO], mucho antes de
+    que termine de generarse el cuerpo.
+    """
+    
+    def __init__(self):
+        self.text = ''
+        self.title: Optional[str] = None
+        self.summary: Optional[str] = None
+        self.header_done = False
+    
+    def feed(self, chunk: str) -> List[str]:
+        """
+        Agrega un fragmento del stream
+        
+        Args:
+            chunk: Texto recibido
+            
+        Returns:
+            Eventos completados con este fragmento: 'title' y/o 'header'
+        """
+        self.text += chunk
+        if self.header_done:
+            return []
+        
+        events = []
+        start = self.text.find('[TÍTULO]')
+        if start < 0:
+            return events
+        
+        if self.title is None:
+            ends = [i for i in (self.text.find(m, start) for m in ('[RESUMEN]', '[ARTÍCULO]')) if i >= 0]
+            if ends:
+                self.title = self.text[start + len('[TÍTULO]'):min(ends)].strip().strip('[]').strip()
+                events.append('title')
+        
+        body = self.text.find('[ARTÍCULO]', start)
+        if self.title is not None and body >= 0:
+            summary = self.text.find('[RESUMEN]', start, body)
+            if summary >= 0:
+                self.summary = self.text[summary + len('[RESUMEN]'):body].strip()
+            self.header_done = True
+            events.append('header')
+        return events
+
 
 class NewsParaphraser:
     """Genera variaciones de artículos usando IA"""
@@ -29,6 +79,9 @@ class NewsParaphraser:
             'Authorization': f'Bearer {self.api_key}'
         }
         
+        # Cliente compartido: ventana de concurrencia y límite de tasa del proceso
+        self.llm = get_llm_client()
+        
         # Estilos de parafraseado para generar variaciones
         self.styles = [
             "formal y objetivo",
@@ -41,17 +94,86 @@ class NewsParaphraser:
             "editorial con opinión"
         ]
     
-    def paraphrase_text(self, text: str, style: str = "neutral") -> str:
+    def paraphrase_text(self, text: str, style: str = "neutral", variant: int = 0) -> str:
         """
         Parafrasea un texto usando la API de Blackbox
         
+        Las respuestas se reutilizan de la caché LLM para prompts idénticos.
+        
         Args:
             text: Texto original a parafrasear
             style: Estilo de escritura deseado
+            variant: Número de variación para obtener otra versión del mismo
+                texto y estilo (0 = versión por defecto)
             
         Returns:
             Texto parafraseado
         """
+        return self._request(self._build_payload(text, style), text, timeout=90, variant=variant)[0]
+    
+    async def paraphrase_text_async(self, text: str, style: str = "neutral") -> str:
+        """Versión asyncio de paraphrase_text() (mismo fallback al texto original)"""
+        return (await self._request_async(self._build_payload(text, style), text, timeout=90))[0]
+    
+    def paraphrase_text_stream(self, text: str, style: str = "neutral") -> Iterator[str]:
+        """
+        Parafrasea un texto entregando fragmentos conforme se generan
+        
+        Args:
+            text: Texto original a parafrasear
+            style: Estilo de escritura deseado
+            
+        Yields:
+            Fragmentos del texto parafraseado (el original completo si la API
+            falla antes del primer fragmento)
+        """
+        yield from self._request_stream(self._build_payload(text, style), text, timeout=90)
+    
+    def _request_stream(self, payload: Dict, fallback: str, timeout: float) -> Iterator[str]:
+        """Stream de una petición al LLM; si falla antes de empezar entrega el respaldo"""
+        started = False
+        try:
+            for chunk in self.llm.stream(payload, self.headers, timeout=timeout):
+                started = True
+                yield chunk
+        except requests.exceptions.RequestException as e:
+            print(f"❌ Error en API: {e}")
+            if not started:
+                yield fallback
+        except (KeyError, IndexError, ValueError) as e:
+            print(f"❌ Error procesando respuesta: {e}")
+            if not started:
+                yield fallback
+    
+    def _request(self, payload: Dict, fallback: str, timeout: float, variant: int = 0) -> Tuple[str, bool]:
+        """
+        Ejecuta una petición al LLM; si falla retorna el texto de respaldo
+        
+        Returns:
+            Texto y True si es el respaldo (la API falló)
+        """
+        try:
+            return self.llm.complete(payload, self.headers, timeout=timeout, variant=variant), False
+        except requests.exceptions.RequestException as e:
+            print(f"❌ Error en API: {e}")
+            return fallback, True  # Retornar texto original si falla
+        except (KeyError, IndexError) as e:
+            print(f"❌ Error procesando respuesta: {e}")
+            return fallback, True
+    
+    async def _request_async(self, payload: Dict, fallback: str, timeout: float) -> Tuple[str, bool]:
+        """Versión asyncio de _request()"""
+        try:
+            return await self.llm.acomplete(payload, self.headers, timeout=timeout), False
+        except requests.exceptions.RequestException as e:
+            print(f"❌ Error en API: {e}")
+            return fallback, True
+        except (KeyError, IndexError) as e:
+            print(f"❌ Error procesando respuesta: {e}")
+            return fallback, True
+    
+    def _build_payload(self, text: str, style: str) -> Dict:
+        """Petición de chat para parafrasear un texto con un estilo"""
         prompt = f"""Eres un periodista especializado en tecnología. Reescribe el siguiente artículo de noticias con un estilo {style}.
 
 INSTRUCCIONES CRÍTICAS:
@@ -82,7 +204,7 @@ Artículo original:
 
 Artículo expandido:"""
 
-        payload = {
+        return {
             "model": "blackboxai/meta-llama/llama-3.3-70b-instruct",
             "messages": [
                 {
@@ -97,21 +219,6 @@ Artículo expandido:"""
             "temperature": 0.7,
             "max_tokens": 3000
         }
-        
-        try:
-            response = requests.post(API_URL, headers=self.headers, json=payload, timeout=90)
-            response.raise_for_status()
-            
-            result = response.json()
-            paraphrased = result['choices'][0]['message']['content'].strip()
-            return paraphrased
-            
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Error en API: {e}")
-            return text  # Retornar texto original si falla
-        except (KeyError, IndexError) as e:
-            print(f"❌ Error procesando respuesta: {e}")
-            return text
     
     def paraphrase_article(self, article: Dict, style: str = "neutral") -> Dict:
         """
@@ -124,35 +231,191 @@ Artículo expandido:"""
         Returns:
             Diccionario con artículo parafraseado
         """
+        text = self._base_text(article)
+        paraphrased, fallback = self._request(self._build_payload(text, style), text, timeout=90)
+        return self._apply_paraphrase(article, paraphrased, fallback)
+    
+    async def paraphrase_article_async(self, article: Dict, style: str = "neutral") -> Dict:
+        """Versión asyncio de paraphrase_article()"""
+        text = self._base_text(article)
+        paraphrased, fallback = await self._request_async(self._build_payload(text, style), text, timeout=90)
+        return self._apply_paraphrase(article, paraphrased, fallback)
+    
+    def paraphrase_batch(self, articles: List[Dict], styles: List[str] = None) -> List[Dict]:
+        """
+        Parafrasea varios artículos concurrentemente
+        
+        La concurrencia y el ritmo los acota el cliente LLM compartido
+        (LLM_CONCURRENCY, LLM_RATE_PER_MIN).
+        
+        Args:
+            articles: Lista de artículos
+            styles: Estilo por artículo (default: rotar self.styles)
+            
+        Returns:
+            Artículos parafraseados en el mismo orden de entrada
+        """
+        styles = styles or [self.styles[i % len(self.styles)] for i in range(len(articles))]
+        return run_in_order(self.paraphrase_article_async(article, style)
+                            for article, style in zip(articles, styles))
+    
+    def rewrite_article(self, article: Dict, style: str = "neutral", structure: str = None,
+                        target_words: int = 1000) -> Dict:
+        """
+        Reescribe y expande un artículo en una sola llamada al LLM
+        
+        Reemplaza la secuencia paraphrase_article() + expand_article(): una
+        petición estructurada devuelve título, resumen y cuerpo completo, con
+        la mitad de viajes y de tokens generados por artículo.
+        
+        Args:
+            article: Diccionario con datos del artículo
+            style: Estilo de escritura deseado
+            structure: Estructura narrativa (ver ArticleExpander.structures)
+            target_words: Número objetivo de palabras del cuerpo
+            
+        Returns:
+            Diccionario con artículo reescrito; 'full_article' lleva el cuerpo
+        """
+        base_text = self._base_text(article, max_chars=3000)
+        response, fallback = self._request(self._build_combined_payload(base_text, style, structure, target_words),
+                                           base_text, timeout=90)
+        return self._apply_rewrite(article, response, fallback)
+    
+    async def rewrite_article_async(self, article: Dict, style: str = "neutral", structure: str = None,
+                                    target_words: int = 1000) -> Dict:
+        """Versión asyncio de rewrite_article()"""
+        base_text = self._base_text(article, max_chars=3000)
+        response, fallback = await self._request_async(
+            self._build_combined_payload(base_text, style, structure, target_words), base_text, timeout=90)
+        return self._apply_rewrite(article, response, fallback)
+    
+    def rewrite_article_stream(self, article: Dict, style: str = "neutral", structure: str = None,
+                               target_words: int = 1000,
+                               on_header: Callable[[Dict], None] = None) -> Dict:
+        """
+        Como rewrite_article(), pero en streaming con aviso temprano de la cabecera
+        
+        En cuanto llegan el título y el resumen se llama a on_header con una
+        copia del artículo que ya los tiene, para que el llamador empiece
+        tareas que solo dependen de ellos (búsqueda de imagen, maquetado)
+        mientras el cuerpo sigue generándose.
+        
+        Args:
+            article: Diccionario con datos del artículo
+            style: Estilo de escritura deseado
+            structure: Estructura narrativa (ver ArticleExpander.structures)
+            target_words: Número objetivo de palabras del cuerpo
+            on_header: Función que recibe el artículo con título y resumen nuevos
+            
+        Returns:
+            Diccionario con artículo reescrito (igual que rewrite_article)
+        """
+        base_text = self._base_text(article, max_chars=3000)
+        payload = self._build_combined_payload(base_text, style, structure, target_words)
+        parser = StructuredStreamParser()
+        fallback = False
+        
+        try:
+            for chunk in self.llm.stream(payload, self.headers, timeout=90):
+                if 'header' in parser.feed(chunk) and on_header:
+                    header = article.copy()
+                    header['title'] = parser.title[:150] or article.get('title', '')[:150]
+                    header['description'] = (parser.summary or article.get('description', ''))[:300]
+                    on_header(header)
+            response = parser.text
+        except requests.exceptions.RequestException as e:
+            print(f"❌ Error en API: {e}")
+            response, fallback = base_text, True  # Un cuerpo cortado a medias no se publica
+        except (KeyError, IndexError, ValueError) as e:
+            print(f"❌ Error procesando respuesta: {e}")
+            response, fallback = base_text, True
+        
+        return self._apply_rewrite(article, response, fallback)
+    
+    def _apply_rewrite(self, article: Dict, response: str, fallback: bool = False) -> Dict:
+        """Artículo reescrito con el cuerpo también como 'full_article'"""
+        result = self._apply_paraphrase(article, response, fallback)
+        result['full_article'] = result['full_text']
+        return result
+    
+    def _build_combined_payload(self, text: str, style: str, structure: str, target_words: int) -> Dict:
+        """Petición de chat para reescribir y expandir un artículo en una sola respuesta"""
+        structure = structure or "pirámide invertida clásica"
+        prompt = f"""Eres un periodista especializado en tecnología. Reescribe y expande la siguiente noticia como un artículo completo con un estilo {style} y un enfoque de {structure}.
+
+INSTRUCCIONES CRÍTICAS:
+1. TÍTULO: Crea un título informativo y descriptivo (60-120 caracteres) que capture la esencia de la noticia
+2. RESUMEN: Una o dos oraciones (máximo 300 caracteres) que resuman la noticia
+3. CUERPO: Artículo de aproximadamente {target_words} palabras en 6-10 párrafos bien desarrollados con:
+   - Párrafo introductorio sólido que contextualice la noticia
+   - Desarrollo detallado de cada aspecto mencionado
+   - Antecedentes relevantes y contexto de la industria
+   - Análisis de implicaciones técnicas, comerciales y para los usuarios
+   - Conclusión que sintetice los puntos clave
+4. FORMATO DE RESPUESTA (usa exactamente estas marcas):
+   [TÍTULO]
+   Título aquí
+   
+   [RESUMEN]
+   Resumen aquí
+   
+   [ARTÍCULO]
+   Contenido completo del artículo aquí
+5. Mantén TODOS los hechos del original; NO inventes cifras, nombres, fechas ni declaraciones
+6. Escribe como el periodista que reporta directamente: sin "según el artículo" ni comentarios sobre la reescritura
+
+Noticia original:
+{text}"""
+
+        return {
+            "model": "blackboxai/meta-llama/llama-3.3-70b-instruct",
+            "messages": [
+                {
+                    "role": "system",
+                    "content": "Eres un periodista senior especializado en tecnología. Escribes artículos profundos, detallados y técnicamente precisos con autoridad y rigor periodístico."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "temperature": 0.7,
+            "max_tokens": 3000
+        }
+    
+    def _base_text(self, article: Dict, max_chars: int = 1000) -> str:
+        """Texto base para parafrasear: título, descripción y hasta max_chars caracteres del cuerpo"""
         # Detectar formato del artículo
         is_normalized = isinstance(article.get('source'), str)
         
         # Extraer campos según formato
+        title = article.get('title', '')
+        description = article.get('description', '')
+        content = article.get('content', '')
         if is_normalized:
-            title = article.get('title', '')
-            description = article.get('description', '')
-            content = article.get('content', '')
             full_text = article.get('full_text', '')
         else:
-            title = article.get('title', '')
-            description = article.get('description', '')
-            content = article.get('content', '')
             full_text = article.get('full_text', article.get('content', ''))
         
-        # Texto base para parafrasear
         text_parts = [title, description]
         if full_text:
-            text_parts.append(full_text[:1000])
+            text_parts.append(full_text[:max_chars])
         elif content:
-            text_parts.append(content[:1000])
+            text_parts.append(content[:max_chars])
         
-        base_text = '\n\n'.join(filter(None, text_parts))
-        
-        # Parafrasear
-        paraphrased = self.paraphrase_text(base_text, style)
+        return '\n\n'.join(filter(None, text_parts))
+    
+    def _apply_paraphrase(self, article: Dict, paraphrased: str, fallback: bool = False) -> Dict:
+        """
+        Copia del artículo con el título y el texto de la respuesta del LLM
         
-        # Crear copia del artículo con texto parafraseado
+        Si la API falló (fallback=True) se marca con 'llm_fallback' para que
+        el llamador sepa que el texto es el original.
+        """
         result = article.copy()
+        if fallback:
+            result['llm_fallback'] = True
         
         # Extraer título y artículo del formato estructurado
         if '[TÍTULO]' in paraphrased and '[ARTÍCULO]' in paraphrased:
@@ -160,11 +423,19 @@ Artículo expandido:"""
             title_section = parts[0].replace('[TÍTULO]', '').strip()
             article_body = parts[1].strip() if len(parts) > 1 else paraphrased
             
+            # Resumen opcional (modo de una sola llamada) entre título y artículo
+            summary = ''
+            if '[RESUMEN]' in title_section:
+                title_section, summary = (part.strip() for part in title_section.split('[RESUMEN]', 1))
+            
             title_section = title_section.strip('[]').strip()
             
             result['title'] = title_section[:150] if title_section else article.get('title', '')[:150]
             result['full_text'] = article_body
-            result['description'] = article_body[:300] + '...' if len(article_body) > 300 else article_body
+            if summary:
+                result['description'] = summary[:300]
+            else:
+                result['description'] = article_body[:300] + '...' if len(article_body) > 300 else article_body
         else:
             lines = paraphrased.split('\n\n')
             result['title'] = lines[0][:150] if lines else article.get('title', '')[:150]
@@ -225,7 +496,8 @@ Artículo expandido:"""
             
             print(f"  [{i+1}/{num_variations}] Estilo: {style}...", end=" ")
             
-            paraphrased = self.paraphrase_text(base_text, style)
+            # Cada vuelta completa de estilos pide una versión distinta a la caché
+            paraphrased = self.paraphrase_text(base_text, style, variant=i // len(self.styles))
             
             # Crear copia del artículo con texto parafraseado
             variation = article.copy()
@@ -260,10 +532,6 @@ Artículo expandido:"""
             
             variations.append(variation)
             print("✅")
-            
-            # Pequeña pausa para no saturar la API
-            if (i + 1) % 5 == 0:
-                time.sleep(1)
         
         return variations
     
@@ -310,9 +578,11 @@ def main():
     
     # Cargar artículos de prueba
     import glob
+    from utils.article_store import RAW_DIR, load_articles, tail_articles
     
-    # Buscar archivos de diferentes patrones
-    patterns = ['noticias_mx_*.json', 'newsapi_*.json', 'newsdata_*.json', 'worldnews_*.json', 'apitube_*.json']
+    # Buscar almacenes NDJSON y archivos JSON antiguos
+    patterns = ['noticias_mx_*.json', 'newsapi_*.json', 'newsdata_*.json', 'worldnews_*.json', 'apitube_*.json',
+                str(RAW_DIR / '*.ndjson'), str(RAW_DIR / '*.ndjson.zst')]
     json_files = []
     for pattern in patterns:
         json_files.extend(glob.glob(pattern))
@@ -322,11 +592,13 @@ def main():
         print("💡 Ejecuta primero: python3 api/newsapi.py --size 5")
         return
     
-    latest_file = sorted(json_files)[-1]
+    latest_file = max(json_files, key=os.path.getmtime)
     print(f"📂 Cargando: {latest_file}")
     
-    with open(latest_file, 'r', encoding='utf-8') as f:
-        articles = json.load(f)
+    if latest_file.endswith('.json'):
+        articles = load_articles(latest_file)
+    else:
+        articles = tail_articles(latest_file, 2)
     
     # Procesar solo los primeros 2 artículos para prueba
     print(f"\n⚠️  MODO PRUEBA: Procesando solo 2 artículos con 5 variaciones cada uno")
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Renderizado de un sitio completo a partir de un trabajo serializado
+Genera index, páginas de artículos, páginas legales, CSS e imágenes de un
+sitio sin depender del orquestador: todo lo que necesita viaja en el trabajo
+(un dict serializable), de modo que los sitios pueden renderizarse en otros
+procesos con utils.site_jobs.run_jobs.
+
+La regeneración es incremental (utils.build_manifest): cada archivo se
+escribe solo si cambiaron sus entradas desde la ejecución anterior.
+
+Trabajo de un sitio:
+    site_num       Número del sitio
+    seed           Semilla del sitio (utils.site_jobs.site_seed)
+    site_dir       Directorio de salida del sitio
+    metadata       nombre, dominio y tagline
+    template_info  Metadata de su template CSS
+    css_source     CSS a copiar como style.css
+    layout_config  Configuración de layout (LayoutGenerator)
+    noticias       Artículos del sitio, en su orden
+    imagenes       Imagen de cada artículo (ruta o None), en el mismo orden
+    logo_path      Logo del sitio o None
+"""
+
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from layout_generator import HTMLLayoutBuilder, LayoutGenerator
+from legal_pages_generator import LegalPagesGenerator
+from utils import tracing
+from utils.build_manifest import BuildManifest
+from utils.templates import Markup, get_environment, render
+
+# Artículos que muestra el sidebar de cada página de artículo
+SIDEBAR_ARTICULOS = 6
+
+# Campos de cada noticia que muestra el index (parciales/tarjeta_noticia.html)
+CAMPOS_TARJETA_INDEX = ('title', 'description', 'category', 'author', 'published_at')
+
+# Versión del generador: entra en el hash de cada archivo, así que subirla
+# cuando cambie el código que genera los sitios regenera todos los archivos
+GENERATOR_VERSION = '1'
+
+
+def generar_sitio(trabajo: Dict) -> Dict:
+    """
+    Genera un sitio completo: index, artículos, páginas legales, CSS e imágenes
+
+    Args:
+        trabajo: Trabajo del sitio (ver el docstring del módulo)
+
+    Returns:
+        site_num, index_path (None si falló), error y archivos (escritos,
+        omitidos y eliminados según el manifiesto del sitio)
+    """
+    site_num = trabajo['site_num']
+    with tracing.span("sitio", "elemento", index=site_num):
+        try:
+            site_dir = Path(trabajo['site_dir'])
+            images_dir = site_dir / "images"
+            images_dir.mkdir(parents=True, exist_ok=True)
+
+            metadata = trabajo['metadata']
+            noticias = trabajo['noticias']
+            logo_path = trabajo.get('logo_path')
+            layout_config = trabajo['layout_config']
+            manifiesto = BuildManifest(site_dir, GENERATOR_VERSION)
+
+            # Imágenes numeradas en el orden del sitio. Un artículo sin imagen no
+            # conserva la de su posición: sería la de otro artículo de la ejecución
+            # anterior, así que save() la elimina
+            for posicion, origen in enumerate(trabajo['imagenes'], 1):
+                relativa = f"images/news_{posicion}.jpg"
+                if not origen or not Path(origen).exists():
+                    continue
+                if Path(origen).resolve() == (site_dir / relativa).resolve():
+                    manifiesto.keep(relativa)
+                else:
+                    manifiesto.copy(relativa, Path(origen))
+
+            # El header y el footer usan random: la semilla del sitio también es entrada del index
+            digest = manifiesto.hash(
+                get_environment().get_template('index.html').digest, trabajo.get('seed'), site_num,
+                metadata, layout_config, logo_path, categorias_menu(noticias),
+                [{campo: n.get(campo) for campo in CAMPOS_TARJETA_INDEX} for n in noticias[:12]],
+            )
+            manifiesto.write("index.html", digest, lambda: generar_index_html(
+                metadata, noticias, layout_config, site_num, logo_path))
+
+            generar_paginas_articulos(site_dir, noticias, metadata, logo_path, manifiesto)
+            generar_paginas_legales(site_dir, metadata, manifiesto)
+            copiar_css(trabajo.get('css_source'), site_dir, manifiesto)
+            manifiesto.save()
+
+            return {'site_num': site_num, 'index_path': str(site_dir / "index.html"), 'error': None,
+                    'archivos': manifiesto.stats}
+        except Exception as e:
+            return {'site_num': site_num, 'index_path': None, 'error': str(e), 'archivos': None}
+
+
+def categorias_menu(noticias: List[Dict]) -> List[str]:
+    """Categorías del menú del index: Inicio y hasta 6 categorías de las noticias"""
+    categorias_set = set()
+    for noticia in noticias:
+        cat = noticia.get('category', 'General')
+        if cat:
+            categorias_set.add(cat.capitalize())
+    return ["Inicio"] + sorted(list(categorias_set))[:6]  # Limitar a 7 categorías
+
+
+def generar_index_html(metadata: Dict, noticias: List[Dict], layout_config: Dict,
+                       site_num: int, logo_path: Optional[str] = None) -> str:
+    """
+    Genera el HTML del index del sitio (templates/html/index.html)
+
+    Args:
+        metadata: Metadata del sitio
+        noticias: Artículos del sitio (se muestran los primeros 12)
+        layout_config: Configuración de layout del sitio
+        site_num: Número del sitio
+        logo_path: Logo del sitio o None
+
+    Returns:
+        str: HTML del index
+    """
+    builder = HTMLLayoutBuilder(layout_config)
+
+    # Configuración del sitio
+    site_config = {
+        "title": metadata['nombre'],
+        "tagline": metadata['tagline']
+    }
+
+    categorias = categorias_menu(noticias)
+
+    # Header y footer de los generadores modulares (ya son HTML)
+    header_html = builder.build_header(site_config, categorias, logo_path)
+    layout_info = layout_config.get('layout_type', 'default')
+    footer_html = builder.build_footer(site_config, layout_info, site_num)
+
+    return render(
+        'index.html',
+        site_name=metadata['nombre'],
+        tagline=metadata['tagline'],
+        layout=layout_info,
+        clases_css=LayoutGenerator().generar_clases_css_dinamicas(layout_config),
+        header_html=Markup(header_html),
+        footer_html=Markup(footer_html),
+        noticias=noticias[:12],
+    )
+
+
+def generar_sidebar_articulos(tarjetas: List[str]) -> str:
+    """
+    Genera sidebar con miniaturas de otros artículos
+
+    Args:
+        tarjetas: HTML ya renderizado de la tarjeta de cada artículo a mostrar
+
+    Returns:
+        str: HTML del sidebar
+    """
+    return render('parciales/sidebar.html', tarjetas=tarjetas)
+
+
+def generar_paginas_articulos(site_dir: Path, noticias: List[Dict], metadata: Dict,
+                              logo_path: Optional[str] = None, manifiesto: Optional[BuildManifest] = None):
+    """
+    Genera páginas HTML individuales para cada artículo con sidebar (templates/html/articulo.html)
+
+    El sidebar muestra los primeros SIDEBAR_ARTICULOS artículos del sitio
+    salvo el actual: sus tarjetas se renderizan una sola vez y cada página
+    arma el suyo por índice, así que el costo crece linealmente con el
+    número de artículos. Con manifiesto, una página solo se renderiza y
+    escribe si cambió su artículo, su sidebar, el template o el sitio.
+    """
+    entorno = get_environment()
+    template = entorno.get_template('articulo.html')
+    tarjeta = entorno.get_template('parciales/tarjeta_sidebar.html')
+    contexto = {'site_name': metadata['nombre'], 'logo': bool(logo_path), 'year': datetime.now().year}
+
+    # Solo los primeros SIDEBAR_ARTICULOS + 1 pueden aparecer en algún sidebar
+    tarjetas = [tarjeta.render(noticia=n, indice=i)
+                for i, n in enumerate(noticias[:SIDEBAR_ARTICULOS + 1], 1)]
+    # Las páginas fuera de ese rango comparten el mismo sidebar (clave 0)
+    sidebars = {}
+
+    for idx, noticia in enumerate(noticias, 1):
+        clave = idx if idx <= len(tarjetas) else 0
+        sidebar_html = sidebars.get(clave)
+        if sidebar_html is None:
+            otras = [html for i, html in enumerate(tarjetas, 1) if i != idx][:SIDEBAR_ARTICULOS]
+            sidebar_html = sidebars[clave] = generar_sidebar_articulos(otras)
+
+        def article_html(noticia=noticia, idx=idx, sidebar_html=sidebar_html):
+            return template.render(
+                contexto,
+                noticia=noticia,
+                indice=idx,
+                contenido=noticia.get('full_article', noticia.get('content', noticia.get('description', ''))),
+                sidebar_html=sidebar_html,
+            )
+
+        if manifiesto is None:
+            with open(site_dir / f"article_{idx}.html", 'w', encoding='utf-8') as f:
+                f.write(article_html())
+        else:
+            digest = manifiesto.hash(template.digest, contexto, idx, noticia, sidebar_html)
+            manifiesto.write(f"article_{idx}.html", digest, article_html)
+
+
+def generar_paginas_legales(site_dir: Path, metadata: Dict, manifiesto: Optional[BuildManifest] = None):
+    """
+    Genera páginas legales (Términos, Privacidad, FAQs, Acerca de)
+
+    Llevan la fecha de actualización del día, así que se renderizan siempre
+    (son cuatro páginas) y con manifiesto solo se escriben si el HTML cambió.
+
+    Args:
+        site_dir: Directorio del sitio
+        metadata: Metadata del sitio
+        manifiesto: Manifiesto del sitio (None = escribir siempre)
+    """
+    legal_generator = LegalPagesGenerator()
+    site_name = metadata['nombre']
+    domain = metadata['dominio']
+
+    paginas = {
+        "terminos.html": legal_generator.generar_terminos_condiciones(site_name, domain),
+        "privacidad.html": legal_generator.generar_politica_privacidad(site_name, domain),
+        "faqs.html": legal_generator.generar_faqs(site_name),
+        "acerca.html": legal_generator.generar_acerca_de(site_name, metadata['tagline'], domain),
+    }
+    for nombre, html in paginas.items():
+        if manifiesto is None:
+            with open(site_dir / nombre, 'w', encoding='utf-8') as f:
+                f.write(html)
+        else:
+            manifiesto.write(nombre, manifiesto.hash(html), lambda html=html: html)
+
+
+def copiar_css(css_source: Optional[str], site_dir: Path, manifiesto: Optional[BuildManifest] = None):
+    """Copia el CSS del template al directorio del sitio como style.css (si cambió, con manifiesto)"""
+    if not css_source or not Path(css_source).exists():
+        if manifiesto is not None:
+            manifiesto.keep("style.css")
+    elif manifiesto is not None:
+        manifiesto.copy("style.css", Path(css_source))
+    else:
+        shutil.copy2(css_source, site_dir / "style.css")
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark de motores de extracción de texto
+Compara el throughput de bs4 (implementación original), stream y lxml sobre
+las páginas HTML guardadas en test/fixtures/html
+
+Uso:
+    python3 test/bench_extraction.py [--iteraciones N] [--max-paragraphs N] [--max-chars N]
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Agregar directorio padre al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.extraction import ENGINES, extract_text, _lxml_available
+
+FIXTURES_DIR = Path(__file__).parent / 'fixtures' / 'html'
+
+
+def medir(engine: str, paginas: dict, iteraciones: int, max_paragraphs: int, max_chars: int) -> dict:
+    """
+    Mide el tiempo de extracción de un motor sobre todas las páginas
+
+    Returns:
+        Diccionario con páginas/s, MB/s y ms por página
+    """
+    total_bytes = sum(len(html) for html in paginas.values()) * iteraciones
+    total_paginas = len(paginas) * iteraciones
+
+    inicio = time.perf_counter()
+    for _ in range(iteraciones):
+        for html in paginas.values():
+            extract_text(html, max_paragraphs, max_chars, engine)
+    duracion = time.perf_counter() - inicio
+
+    return {
+        'paginas_s': total_paginas / duracion,
+        'mb_s': total_bytes / duracion / (1024 * 1024),
+        'ms_pagina': duracion / total_paginas * 1000
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de motores de extracción')
+    parser.add_argument('--iteraciones', type=int, default=20, help='Repeticiones por página (default: 20)')
+    parser.add_argument('--max-paragraphs', type=int, default=10, help='Párrafos a extraer (default: 10)')
+    parser.add_argument('--max-chars', type=int, default=5000, help='Caracteres máximos (default: 5000)')
+    args = parser.parse_args()
+
+    paginas = {path.name: path.read_bytes() for path in sorted(FIXTURES_DIR.glob('*.html'))}
+    if not paginas:
+        print(f"❌ No hay fixtures en {FIXTURES_DIR}")
+        sys.exit(1)
+
+    engines = [name for name in ENGINES if name != 'lxml' or _lxml_available()]
+
+    print(f"\n{'='*70}")
+    print("⏱️  BENCHMARK DE EXTRACCIÓN DE TEXTO")
+    print(f"{'='*70}")
+    print(f"📄 Fixtures: {len(paginas)} ({sum(len(h) for h in paginas.values()) / 1024:.0f} KB)")
+    print(f"🔁 Iteraciones: {args.iteraciones}")
+    print(f"📏 Límites: {args.max_paragraphs} párrafos / {args.max_chars} caracteres\n")
+
+    resultados = {}
+    for engine in engines:
+        resultados[engine] = medir(engine, paginas, args.iteraciones, args.max_paragraphs, args.max_chars)
+
+    base = resultados['bs4']['paginas_s']
+    print(f"{'Motor':<10}{'páginas/s':>12}{'MB/s':>10}{'ms/página':>12}{'vs bs4':>10}")
+    for engine, r in resultados.items():
+        print(f"{engine:<10}{r['paginas_s']:>12.1f}{r['mb_s']:>10.2f}{r['ms_pagina']:>12.2f}{r['paginas_s'] / base:>9.1f}x")
+
+    if 'lxml' not in engines:
+        print("\n💡 lxml no instalado: pip install lxml para el motor más rápido")
+    print(f"{'='*70}\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Medición del renderizado de sitios (index, artículos y páginas legales)
+Genera un sitio sintético con N artículos en un directorio temporal, sin red
+ni imágenes, y reporta el tiempo total y por página. Con varios tamaños se ve
+si el costo crece linealmente con el número de artículos. Con --en-memoria
+las páginas se escriben a StringIO, para medir solo el renderizado sin el
+ruido del disco.
+
+Uso:
+    python3 test/bench_render.py [--articulos 100,500,2000] [--repeat N] [--en-memoria] [--json reporte.json]
+"""
+
+import io
+import sys
+import json
+import time
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Dict
+
+# Agregar directorio padre al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import site_renderer
+from layout_generator import LayoutGenerator
+
+METADATA = {'nombre': 'Diario de Prueba', 'tagline': 'Noticias & <análisis>', 'dominio': 'diarioprueba.com'}
+
+
+def noticias_sinteticas(cantidad: int):
+    """Artículos con cuerpo de varios párrafos, como los del parafraseo"""
+    cuerpo = '\n\n'.join(f'Párrafo {p} con texto suficiente para parecerse a una nota real, '
+                         f'con "comillas" y algún <b>marcado</b> que hay que escapar.' for p in range(8))
+    return [{
+        'title': f'Titular número {i} sobre la actualidad del día',
+        'description': f'Resumen de la noticia {i}, lo bastante largo para recortarse en la tarjeta del index.',
+        'category': ('tecnología', 'política', 'deportes')[i % 3],
+        'author': 'Redacción',
+        'published_at': '2026-01-16T10:00:00Z',
+        'full_article': cuerpo,
+    } for i in range(1, cantidad + 1)]
+
+
+class _Memoria(io.StringIO):
+    """Archivo en memoria que reemplaza a open() de site_renderer con --en-memoria"""
+
+    escritas = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        _Memoria.escritas += 1
+
+
+def medir(cantidad: int, repeat: int, en_memoria: bool = False) -> Dict:
+    """
+    Renderiza un sitio de `cantidad` artículos varias veces y conserva la más rápida
+
+    Returns:
+        Páginas escritas, tiempo total (ms) y tiempo por página (ms)
+    """
+    noticias = noticias_sinteticas(cantidad)
+    layout_config = LayoutGenerator().generar_configuracion_layout()
+    mejor = None
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as tmp:
+            site_dir = Path(tmp) / 'site_1'
+            site_dir.mkdir()
+            _Memoria.escritas = 0
+            if en_memoria:
+                site_renderer.open = _Memoria
+            inicio = time.perf_counter()
+            index_html = site_renderer.generar_index_html(METADATA, noticias, layout_config, 1)
+            (site_dir / 'index.html').write_text(index_html, encoding='utf-8')
+            site_renderer.generar_paginas_articulos(site_dir, noticias, METADATA)
+            site_renderer.generar_paginas_legales(site_dir, METADATA)
+            site_renderer.__dict__.pop('open', None)
+            total_ms = (time.perf_counter() - inicio) * 1000
+            paginas = len(list(site_dir.glob('*.html'))) if not en_memoria else _Memoria.escritas + 1
+        if mejor is None or total_ms < mejor['total_ms']:
+            mejor = {'paginas': paginas, 'total_ms': round(total_ms, 1),
+                     'ms_por_pagina': round(total_ms / paginas, 3)}
+    return mejor
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tiempo de renderizado de sitios')
+    parser.add_argument('--articulos', type=str, default='100,500,2000',
+                        help='Tamaños de sitio a medir, separados por coma (default: 100,500,2000)')
+    parser.add_argument('--repeat', type=int, default=3, help='Ejecuciones por tamaño (default: 3)')
+    parser.add_argument('--en-memoria', action='store_true', help='No escribir a disco (solo renderizado)')
+    parser.add_argument('--json', type=str, default=None, help='Guardar reporte JSON')
+    args = parser.parse_args()
+
+    print(f"\n{'='*70}")
+    print("⏱️  RENDERIZADO DE SITIOS")
+    print(f"{'='*70}")
+
+    reporte = {}
+    for cantidad in (int(n) for n in args.articulos.split(',')):
+        resultado = medir(cantidad, args.repeat, args.en_memoria)
+        reporte[str(cantidad)] = resultado
+        print(f"   {cantidad:>6} artículos: {resultado['paginas']:>6} páginas en "
+              f"{resultado['total_ms']:>9.1f} ms ({resultado['ms_por_pagina']:.3f} ms/página)")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(reporte, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Reporte: {args.json}")
+
+    print(f"{'='*70}\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Medición del tiempo de arranque de los CLIs (python -X importtime)
+Ejecuta cada comando en un proceso nuevo, mide el tiempo total y desglosa las
+importaciones más costosas. Con --json guarda el reporte para que CI lo
+compare entre commits y con --max-ms falla si se excede el presupuesto.
+
+Uso:
+    python3 test/bench_startup.py [--repeat N] [--top N] [--json reporte.json] [--max-ms MS]
+"""
+
+import sys
+import json
+import time
+import argparse
+import subprocess
+from pathlib import Path
+from typing import Dict, List
+
+SCRIPTS_DIR = Path(__file__).parent.parent
+
+# Comandos medidos: nombre -> argumentos de python
+COMANDOS = {
+    'orchestrator --help': ['master_orchestrator.py', '--help'],
+    'newsapi --help': ['api/newsapi.py', '--help'],
+    'import master_orchestrator': ['-c', 'import master_orchestrator'],
+    'import utils.utils': ['-c', 'import utils.utils'],
+}
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """
+    Parsea la salida de -X importtime
+
+    Returns:
+        Lista de módulos con tiempo propio y acumulado (µs) y profundidad
+    """
+    modulos = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line.split(':', 1)[1].split('|')
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        modulos.append({
+            'module': name.strip(),
+            'self_us': int(self_us),
+            'cumulative_us': int(cumulative_us),
+            'depth': depth
+        })
+    return modulos
+
+
+def medir(args: List[str], repeat: int) -> Dict:
+    """
+    Ejecuta un comando varias veces y conserva la ejecución más rápida
+
+    Returns:
+        Diccionario con tiempo total (ms), tiempo de imports (ms) y módulos
+    """
+    mejor = None
+    for _ in range(repeat):
+        inicio = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', *args],
+            cwd=SCRIPTS_DIR, capture_output=True, text=True
+        )
+        wall_ms = (time.perf_counter() - inicio) * 1000
+        modulos = parse_importtime(proc.stderr)
+        import_ms = sum(m['cumulative_us'] for m in modulos if m['depth'] == 0) / 1000
+
+        if mejor is None or wall_ms < mejor['wall_ms']:
+            mejor = {
+                'wall_ms': round(wall_ms, 1),
+                'import_ms': round(import_ms, 1),
+                'returncode': proc.returncode,
+                'modules': modulos
+            }
+    return mejor
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tiempo de arranque de los CLIs')
+    parser.add_argument('--repeat', type=int, default=3, help='Ejecuciones por comando (default: 3)')
+    parser.add_argument('--top', type=int, default=8, help='Imports más costosos a mostrar (default: 8)')
+    parser.add_argument('--json', type=str, default=None, help='Guardar reporte JSON')
+    parser.add_argument('--max-ms', type=float, default=None,
+                        help='Falla si algún comando tarda más (wall time)')
+    args = parser.parse_args()
+
+    print(f"\n{'='*70}")
+    print("⏱️  TIEMPO DE ARRANQUE (python -X importtime)")
+    print(f"{'='*70}")
+
+    reporte = {}
+    excedidos = []
+
+    for nombre, comando in COMANDOS.items():
+        resultado = medir(comando, args.repeat)
+        top = sorted((m for m in resultado['modules'] if m['depth'] == 0),
+                     key=lambda m: m['cumulative_us'], reverse=True)[:args.top]
+
+        print(f"\n▶ {nombre}")
+        print(f"   Total: {resultado['wall_ms']:.1f} ms | Imports: {resultado['import_ms']:.1f} ms")
+        for m in top:
+            print(f"   {m['cumulative_us'] / 1000:>8.1f} ms  {m['module']}")
+
+        if resultado['returncode'] != 0:
+            print(f"   ⚠️  Código de salida {resultado['returncode']}")
+
+        reporte[nombre] = {
+            'wall_ms': resultado['wall_ms'],
+            'import_ms': resultado['import_ms'],
+            'returncode': resultado['returncode'],
+            'top_imports': [{'module': m['module'], 'cumulative_ms': m['cumulative_us'] / 1000} for m in top]
+        }
+
+        if args.max_ms is not None and resultado['wall_ms'] > args.max_ms:
+            excedidos.append(nombre)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(reporte, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Reporte: {args.json}")
+
+    print(f"{'='*70}\n")
+
+    if excedidos:
+        print(f"❌ Presupuesto de {args.max_ms:.0f} ms excedido: {', '.join(excedidos)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
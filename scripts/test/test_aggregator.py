@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test del agregador multi-fuente
+Verifica descarga concurrente, cuotas, timeouts (y la entrega de lo que llega
+tarde) y fuentes sin clave, con clientes falsos (sin red)
+"""
+
+import sys
+import time
+import types
+from pathlib import Path
+
+import pytest
+
+# Agregar directorio padre al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api import aggregator
+from api.aggregator import NewsAggregator
+
+
+def _fuente(nombre, retardo=0.0, error=None, total=5):
+    def fetch(page_size, silent, dedup, incremental):
+        time.sleep(retardo)
+        if error:
+            raise error
+        return [{'source': nombre, 'title': f'{nombre} {i}'} for i in range(total)][:page_size]
+
+    modulo = types.ModuleType(f'fuente_{nombre}')
+    modulo.fetch = fetch
+    return modulo, {
+        'env_key': f'{nombre.upper()}_KEY',
+        'module': modulo.__name__,
+        'function': 'fetch',
+        'quota': 3,
+        'timeout': 5.0,
+        'params': lambda q, n: {'page_size': n},
+    }
+
+
+@pytest.fixture
+def fuentes(monkeypatch):
+    def configurar(**definiciones):
+        sources = {}
+        for nombre, kwargs in definiciones.items():
+            modulo, source = _fuente(nombre, **kwargs)
+            monkeypatch.setitem(sys.modules, modulo.__name__, modulo)
+            monkeypatch.setenv(source['env_key'], 'clave')
+            sources[nombre] = source
+        monkeypatch.setattr(aggregator, 'SOURCES', sources)
+        return sources
+    return configurar
+
+
+def test_fuente_lenta_no_retrasa_a_las_demas(fuentes):
+    """Cada fuente se entrega al responder y las cuotas limitan el total"""
+    fuentes(lenta={'retardo': 0.3}, rapida={}, otra={})
+    agregador = NewsAggregator(verbose=False)
+
+    inicio = time.monotonic()
+    flujo = agregador.stream()
+    primero = next(flujo)
+    assert time.monotonic() - inicio < 0.2
+    assert primero['source'] in ('rapida', 'otra')
+
+    resto = list(flujo)
+    assert len(resto) + 1 == 9
+    assert resto[-1]['source'] == 'lenta'
+    assert {n: r['status'] for n, r in agregador.report.items()} == {'lenta': 'ok', 'rapida': 'ok', 'otra': 'ok'}
+
+
+def test_timeout_y_errores_no_detienen_el_flujo(fuentes):
+    """Una fuente que excede su tiempo o falla se reporta y se omite"""
+    fuentes(colgada={'retardo': 2.0}, rota={'error': RuntimeError('HTTP 500')}, sana={})
+    agregador = NewsAggregator(timeouts={'colgada': 0.2}, quotas={'sana': 5}, verbose=False)
+
+    inicio = time.monotonic()
+    articles = agregador.fetch()
+
+    assert time.monotonic() - inicio < 1.0
+    assert [a['source'] for a in articles] == ['sana'] * 5
+    assert agregador.report['colgada']['status'] == 'timeout'
+    assert agregador.report['rota'] == {'status': 'error', 'articles': 0,
+                                        'seconds': agregador.report['rota']['seconds'], 'error': 'HTTP 500'}
+
+
+def test_fuente_que_agota_su_tiempo_se_entrega_al_terminar(fuentes):
+    """Los artículos tardíos no se pierden: su cursor ya avanzó"""
+    fuentes(colgada={'retardo': 0.4}, sana={})
+    recibidos = []
+    agregador = NewsAggregator(timeouts={'colgada': 0.1}, verbose=False, on_late=recibidos.extend)
+
+    assert [a['source'] for a in agregador.fetch()] == ['sana'] * 3
+    assert agregador.wait_late(timeout=5) == []
+    assert [a['source'] for a in recibidos] == ['colgada'] * 3
+    assert agregador.report['colgada']['status'] == 'timeout'
+    assert agregador.report['colgada']['late_articles'] == 3
+
+    # Sin on_late se recogen con wait_late
+    agregador = NewsAggregator(timeouts={'colgada': 0.1}, verbose=False)
+    assert len(agregador.fetch()) == 3
+    assert [a['source'] for a in agregador.wait_late(timeout=5)] == ['colgada'] * 3
+
+
+def test_fuente_sin_clave_se_omite(fuentes, monkeypatch):
+    """Sin clave en el entorno la fuente no se consulta"""
+    fuentes(con_clave={}, sin_clave={})
+    monkeypatch.delenv('SIN_CLAVE_KEY')
+    agregador = NewsAggregator(limit=2, verbose=False)
+
+    assert [a['source'] for a in agregador.fetch()] == ['con_clave'] * 2
+    assert agregador.report['sin_clave']['status'] == 'sin_clave'
+
+
+def test_fuente_desconocida(fuentes):
+    fuentes(unica={})
+    with pytest.raises(ValueError):
+        NewsAggregator(sources=['inexistente'])
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Test de importación y construcción diferida del orquestador
+Verifica que importar master_orchestrator no cargue dependencias pesadas y que
+los componentes se construyan solo al usarse
+"""
+
+import sys
+import subprocess
+from pathlib import Path
+
+scripts_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(scripts_dir))
+
+
+def test_importar_no_carga_dependencias_pesadas():
+    """Importar el orquestador no importa requests, bs4 ni los generadores"""
+    codigo = (
+        "import sys, master_orchestrator; "
+        "print(','.join(m for m in ('requests', 'bs4', 'paraphrase', 'template_combiner') if m in sys.modules))"
+    )
+    proc = subprocess.run([sys.executable, '-c', codigo], cwd=scripts_dir, capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.strip() == ''
+
+
+def test_componentes_bajo_demanda(tmp_path):
+    """Solo se construyen los componentes que se usan, una sola vez"""
+    import master_orchestrator
+
+    orchestrator = master_orchestrator.MasterOrchestrator(output_base_dir=str(tmp_path))
+    assert 'layout_generator' not in orchestrator.__dict__
+
+    primero = orchestrator.layout_generator
+    assert orchestrator.layout_generator is primero
+    assert 'image_generator' not in orchestrator.__dict__
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test del repositorio SQLite de artículos
+Verifica inserción incremental, "últimos N sin usar" e importación de archivos
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Agregar directorio padre al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.article_repository import ArticleRepository, normalize_published_at
+from utils.article_store import ArticleStore
+
+
+def _noticia(i, **extra):
+    noticia = {
+        'source': 'newsapi',
+        'title': f'Noticia {i}',
+        'url': f'https://diario.mx/{i}',
+        'published_at': f'2026-01-{i + 1:02d}T10:00:00Z',
+        'full_text': 'Texto no disponible',
+    }
+    noticia.update(extra)
+    return noticia
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = ArticleRepository(tmp_path / 'articles.sqlite')
+    yield repo
+    repo.close()
+
+
+def test_insercion_incremental(repo):
+    """Una URL ya conocida no se duplica, pero se completa su texto"""
+    assert repo.add_articles(_noticia(i) for i in range(3)) == 3
+    assert repo.add_articles([_noticia(2, full_text='Texto completo'), _noticia(3)]) == 1
+
+    assert repo.count() == 4
+    assert repo.latest(1)[0]['title'] == 'Noticia 3'
+    assert repo.latest(2)[1]['full_text'] == 'Texto completo'
+
+
+def test_ultimos_sin_usar(repo):
+    """latest_unused ordena por fecha y excluye lo que otra ejecución ya usó"""
+    repo.add_articles(_noticia(i) for i in range(5))
+
+    primeros = repo.latest_unused(2)
+    assert [n['title'] for n in primeros] == ['Noticia 4', 'Noticia 3']
+    assert repo.mark_used([n['id'] for n in primeros], 'run_1') == 2
+
+    assert [n['title'] for n in repo.latest_unused(2)] == ['Noticia 2', 'Noticia 1']
+    assert [n['title'] for n in repo.articles_for_run('run_1')] == ['Noticia 4', 'Noticia 3']
+    assert repo.count(unused_only=True) == 3
+
+
+def test_orden_estable_con_fechas_iguales(repo):
+    """Las noticias con la misma fecha salen siempre en el mismo orden (por id)"""
+    repo.add_articles(_noticia(i, published_at='2026-01-07T10:00:00Z') for i in range(6))
+    repo.mark_used([n['id'] for n in repo.latest(6)], 'run_1')
+
+    ids = [n['id'] for n in repo.articles_for_run('run_1')]
+    assert ids == sorted(ids)
+    assert [n['id'] for n in repo.latest(6)] == ids
+
+
+def test_filtros_y_campos_extra(repo):
+    """Los campos sin columna propia se conservan y los filtros usan índices"""
+    repo.add_articles([
+        _noticia(0, source='newsdata', category='tecnologia', keywords=['ia']),
+        _noticia(1, source='newsapi', category='deportes'),
+    ])
+
+    [noticia] = repo.latest(5, source='newsdata')
+    assert noticia['keywords'] == ['ia']
+    assert [n['title'] for n in repo.latest(5, category='deportes')] == ['Noticia 1']
+
+    plan = ' '.join(row[-1] for row in repo._conn.execute(
+        'EXPLAIN QUERY PLAN SELECT * FROM articles WHERE used_at IS NULL ORDER BY published_at DESC LIMIT 5'
+    ))
+    assert 'idx_articles_unused' in plan
+
+
+def test_normaliza_fechas():
+    """Fechas de distintas APIs quedan en el mismo formato ordenable"""
+    assert normalize_published_at('2026-01-07 22:51:00') == '2026-01-07T22:51:00Z'
+    assert normalize_published_at('2026-01-07T16:51:00-06:00') == '2026-01-07T22:51:00Z'
+    assert normalize_published_at('ayer') == 'ayer'
+
+
+def test_importa_ndjson(repo, tmp_path):
+    """Los almacenes NDJSON de las descargas se importan sin duplicados"""
+    path = tmp_path / 'newsapi.ndjson'
+    with ArticleStore(path) as store:
+        store.extend(_noticia(i) for i in range(3))
+
+    assert repo.import_file(path) == 3
+    assert repo.import_file(path) == 0
+
+
+def test_importa_json_crudo_de_newsapi(repo, tmp_path):
+    """Los JSON antiguos con artículos crudos de NewsAPI se normalizan; un registro malo no tira el archivo"""
+    crudo = {
+        'source': {'id': None, 'name': 'El Financiero'},
+        'author': 'Redacción',
+        'title': 'Noticia cruda',
+        'description': 'Resumen',
+        'url': 'https://www.elfinanciero.com.mx/nacional/1',
+        'urlToImage': 'https://www.elfinanciero.com.mx/foto.jpg',
+        'publishedAt': '2026-01-07T05:36:52Z',
+        'content': 'Contenido… [+3506 chars]',
+        'full_text': 'Texto completo de la nota',
+        'category': 'política',
+    }
+    malo = dict(crudo, url='https://www.elfinanciero.com.mx/nacional/2', title='Título \ud800 inválido')
+    path = tmp_path / 'noticias_newsapi_20260107.json'
+    path.write_text(json.dumps([crudo, malo, _noticia(1, tags={'a': 1})]), encoding='utf-8')
+
+    assert repo.import_file(path) == 2
+    noticia = repo.latest(5, source='newsapi')[0]
+    assert noticia['source_name'] == 'El Financiero'
+    assert noticia['image_url'] == 'https://www.elfinanciero.com.mx/foto.jpg'
+    assert noticia['published_at'] == '2026-01-07T05:36:52Z'
+    assert noticia['full_text'] == 'Texto completo de la nota' and noticia['category'] == 'política'
+    assert 'urlToImage' not in noticia and 'publishedAt' not in noticia
+
+
+def test_columnas_vacias_no_aparecen(repo):
+    """Un campo NULL no llega como None: .get(campo, default) recibe su default"""
+    repo.add_articles([_noticia(0)])
+
+    [noticia] = repo.latest(1)
+    assert 'category' not in noticia and 'image_url' not in noticia
+    assert noticia.get('category', 'tecnología') == 'tecnología'
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test del almacén NDJSON de artículos
+Verifica anexado en streaming, compresión zstd opcional y exportación CSV
+"""
+
+import csv
+import sys
+from pathlib import Path
+
+import pytest
+
+# Agregar directorio padre al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils import utils
+from utils.article_store import ArticleStore, export_csv, iter_articles, load_articles, store_path, tail_articles
+
+
+def _generador(n, inicio=0):
+    for i in range(inicio, inicio + n):
+        yield {'title': f'Noticia {i}', 'url': f'https://diario.mx/{i}', 'source': {'name': 'Diario'}}
+
+
+def test_anexa_entre_ejecuciones(tmp_path):
+    """Cada guardado anexa al mismo archivo por fuente"""
+    primero = utils.save_articles(_generador(3), 'newsapi', output_dir=str(tmp_path), compress=False)
+    segundo = utils.save_articles(_generador(2, inicio=3), 'newsapi', output_dir=str(tmp_path), compress=False)
+
+    assert primero == segundo == str(tmp_path / 'newsapi.ndjson')
+    titulos = [a['title'] for a in iter_articles(primero)]
+    assert titulos == [f'Noticia {i}' for i in range(5)]
+    assert [a['title'] for a in tail_articles(primero, 2)] == ['Noticia 3', 'Noticia 4']
+
+
+def test_zstd_multiples_frames(tmp_path):
+    """Los archivos .zst admiten varias sesiones de escritura"""
+    pytest.importorskip('zstandard')
+    path = store_path('newsdata', str(tmp_path), compress=True)
+
+    with ArticleStore(path) as store:
+        store.extend(_generador(2))
+    with ArticleStore(path) as store:
+        store.extend(_generador(2, inicio=2))
+
+    assert path.name == 'newsdata.ndjson.zst'
+    assert len(load_articles(path)) == 4
+
+
+def test_exporta_csv(tmp_path):
+    """El CSV reúne todas las columnas y serializa los valores anidados"""
+    path = tmp_path / 'apitube.ndjson'
+    with ArticleStore(path) as store:
+        store.append({'title': 'A', 'url': 'u1'})
+        store.append({'title': 'B', 'author': 'Ana', 'source': {'name': 'X'}})
+
+    csv_file = export_csv(path)
+
+    with open(csv_file, encoding='utf-8') as f:
+        filas = list(csv.DictReader(f))
+    assert csv_file == tmp_path / 'apitube.csv'
+    assert list(filas[0].keys()) == ['title', 'url', 'author', 'source']
+    assert filas[1]['source'] == '{"name": "X"}'
+
+
+def test_enrich_escribe_al_almacen(monkeypatch, tmp_path):
+    """enrich_with_full_text entrega cada artículo al sink en cuanto está listo"""
+    monkeypatch.setattr(utils, 'get_full_text', lambda url: f'texto {url}')
+    articles = [{'title': f'N{i}', 'url': f'https://d{i}.mx'} for i in range(4)]
+
+    with ArticleStore(tmp_path / 'newsapi.ndjson') as store:
+        enriched = utils.enrich_with_full_text(articles, 'newsapi', verbose=False, sink=store.append)
+
+    guardados = load_articles(tmp_path / 'newsapi.ndjson')
+    assert sorted(a['url'] for a in guardados) == sorted(a['url'] for a in enriched)
+    assert all(a['full_text'].startswith('texto') for a in guardados)
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Test de ejecuciones reanudables
+Verifica que cada paso guarda sus resultados bajo el run_id y que al reanudar
+solo se rehace lo que faltaba, con una API y un generador de imágenes falsos
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+import requests
+
+# Agregar directorio padre al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils import llm_client
+from utils.llm_client import LLMClient
+from utils.run_checkpoint import CheckpointStore
+from paraphrase import NewsParaphraser
+
+import master_orchestrator
+
+RESPUESTA = "[TÍTULO]\nTítulo nuevo\n\n[RESUMEN]\nResumen nuevo.\n\n[ARTÍCULO]\nCuerpo del artículo."
+
+TEMAS = ['nuevo procesador para teléfonos', 'ley de datos personales aprobada', 'lanzamiento de cohete reutilizable']
+NOTICIAS = [{'id': f'id{i}', 'source': 'diario', 'title': tema, 'full_text': f'Nota sobre {tema}',
+             'url': f'https://diario.mx/{i}'} for i, tema in enumerate(TEMAS)]
+
+
+class _Respuesta:
+    status_code = 200
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {'choices': [{'message': {'content': RESPUESTA}}]}
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """API falsa; las notas con un tema en 'caidas' fallan con error de conexión"""
+    estado = {'llamadas': 0, 'caidas': set()}
+
+    def fake_post(url, headers=None, json=None, timeout=None):
+        estado['llamadas'] += 1
+        prompt = json['messages'][-1]['content']
+        if any(tema in prompt for tema in estado['caidas']):
+            raise requests.exceptions.ConnectionError('sin conexión')
+        return _Respuesta()
+
+    monkeypatch.setenv('LLM_CACHE', '0')
+    monkeypatch.setattr(llm_client.http_client, 'post', fake_post)
+    monkeypatch.setattr(llm_client, '_default_client', LLMClient(rate_per_minute=0))
+    return estado
+
+
+def _orquestador(tmp_path, run_id=None):
+    orquestador = master_orchestrator.MasterOrchestrator(output_base_dir=str(tmp_path), streaming=False,
+                                                         run_id=run_id)
+    orquestador.paraphraser = NewsParaphraser(api_key='clave')
+    orquestador.article_expander = master_orchestrator.cargar_clase(
+        'article-expander.py', 'ArticleExpander')(api_key='clave')
+    return orquestador
+
+
+def test_almacen_por_run_y_paso(tmp_path):
+    store = CheckpointStore(tmp_path / 'checkpoints.sqlite')
+    assert store.run_status('r1') is None
+
+    store.start_run('r1')
+    store.save('r1', 'imagenes', '/tmp/a.jpg', 'article_1')
+    store.save('r1', 'sitios', [{'nombre': 'Sitio'}])
+    store.save('r2', 'imagenes', '/tmp/b.jpg', 'article_1')
+
+    assert store.run_status('r1') == 'en_curso'
+    assert store.load('r1', 'sitios') == [{'nombre': 'Sitio'}]
+    assert store.load_stage('r1', 'imagenes') == {'article_1': '/tmp/a.jpg'}
+    assert store.load('r1', 'logos', '1') is None
+
+    store.finish_run('r1')
+    assert store.run_status('r1') == 'completada'
+
+
+def test_reanudar_solo_rehace_lo_pendiente(api, tmp_path):
+    """Una noticia que falló se reintenta; las ya parafraseadas no se vuelven a pagar"""
+    api['caidas'] = {TEMAS[2]}
+    primera = _orquestador(tmp_path)
+    resultado = primera.paso_2_parafrasear_noticias(NOTICIAS)
+    assert api['llamadas'] == 3
+    assert resultado[2]['title'] == TEMAS[2]  # Respaldo: la original
+
+    api['caidas'] = set()
+    api['llamadas'] = 0
+    segunda = _orquestador(tmp_path, run_id=primera.run_id)
+    reanudado = segunda.paso_2_parafrasear_noticias(NOTICIAS)
+
+    assert api['llamadas'] == 1
+    assert [a['title'] for a in reanudado] == ['Título nuevo'] * 3
+    assert [a['author'] for a in reanudado[:2]] == [a['author'] for a in resultado[:2]]
+    assert segunda.stats['reanudado'] == {'parafraseo': 2}
+
+
+def test_reanudar_no_repite_imagenes(tmp_path):
+    generadas = []
+    imagen = tmp_path / 'imagen.jpg'
+    imagen.write_bytes(b'jpg')
+
+    class _Imagenes:
+        def generate_image(self, prompt, article_id, index, article=None):
+            generadas.append(article_id)
+            return str(imagen)
+
+    primera = master_orchestrator.MasterOrchestrator(output_base_dir=str(tmp_path))
+    primera.image_generator = _Imagenes()
+    imagenes = primera.paso_3_generar_imagenes(NOTICIAS, 1)
+
+    segunda = master_orchestrator.MasterOrchestrator(output_base_dir=str(tmp_path), run_id=primera.run_id)
+    segunda.image_generator = _Imagenes()
+    assert segunda.paso_3_generar_imagenes(NOTICIAS, 1) == imagenes
+    assert len(generadas) == 3
+
+
+def test_imagenes_siguen_a_su_noticia_al_reanudar(tmp_path):
+    """Si el orden de las noticias cambia al reanudar, cada imagen guardada vuelve a su noticia"""
+    class _Imagenes:
+        def generate_image(self, prompt, article_id, index, article=None):
+            imagen = tmp_path / f"{article['id']}.jpg"
+            imagen.write_bytes(article['id'].encode())
+            return str(imagen)
+
+    primera = master_orchestrator.MasterOrchestrator(output_base_dir=str(tmp_path))
+    primera.image_generator = _Imagenes()
+    primera.paso_3_generar_imagenes(NOTICIAS[:2], None)
+
+    segunda = master_orchestrator.MasterOrchestrator(output_base_dir=str(tmp_path), run_id=primera.run_id)
+    segunda.image_generator = _Imagenes()
+    imagenes = segunda.paso_3_generar_imagenes([NOTICIAS[2], NOTICIAS[1], NOTICIAS[0]], None)
+
+    contenidos = [Path(imagenes[f'article_{i}']).read_bytes() for i in range(1, 4)]
+    assert contenidos == [b'id2', b'id1', b'id0']
+    assert segunda.stats['imagenes_generadas'] == 1
+
+
+def test_reanudar_ejecucion_desconocida(tmp_path):
+    orquestador = master_orchestrator.MasterOrchestrator(output_base_dir=str(tmp_path), run_id='19990101_000000')
+    resultado = orquestador.ejecutar_flujo_completo()
+
+    assert resultado['success'] is False
+    assert '19990101_000000' in resultado['error']
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test del circuit breaker por proveedor
+Verifica que tras varios fallos seguidos las peticiones fallan al instante,
+que el semiabierto deja pasar una sola prueba y que el LLM usa su respaldo
+sin esperar turno, con respuestas falsas (sin red)
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+import requests
+
+# Agregar directorio padre al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils import circuit_breaker, http_client, llm_client
+from utils.circuit_breaker import CircuitBreaker, CircuitOpen
+from utils.llm_client import LLMClient
+
+URL = 'https://api.caida.com/v1/recurso'
+
+
+class _Respuesta:
+    def __init__(self, status_code=200):
+        self.status_code = status_code
+        self.headers = {}
+
+    def close(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def circuitos_limpios(monkeypatch):
+    monkeypatch.setenv('RATE_LIMIT', '0')
+    circuit_breaker.reset_circuits()
+    yield
+    circuit_breaker.reset_circuits()
+
+
+@pytest.fixture
+def sesion(monkeypatch):
+    """Sesión falsa: cada petición toma el siguiente resultado (respuesta o excepción)"""
+    estado = {'resultados': [], 'enviadas': 0}
+
+    class _Sesion:
+        def request(self, method, url, timeout=None, **kwargs):
+            estado['enviadas'] += 1
+            resultado = estado['resultados'].pop(0) if estado['resultados'] else _Respuesta()
+            if isinstance(resultado, Exception):
+                raise resultado
+            return resultado
+
+    monkeypatch.setattr(http_client, 'get_session', lambda: _Sesion())
+    return estado
+
+
+def test_se_abre_tras_fallos_consecutivos(sesion):
+    sesion['resultados'] = [requests.exceptions.ConnectTimeout('lento'), _Respuesta(503), _Respuesta(502)]
+    with pytest.raises(requests.exceptions.Timeout):
+        http_client.get(URL)
+    assert http_client.get(URL).status_code == 503
+    assert http_client.get(URL).status_code == 502
+
+    inicio = time.monotonic()
+    with pytest.raises(CircuitOpen):
+        http_client.get(URL)
+    assert time.monotonic() - inicio < 0.05
+    assert sesion['enviadas'] == 3
+
+    # Otros proveedores no se ven afectados
+    assert http_client.get('https://api.sana.com/x').status_code == 200
+    reporte = circuit_breaker.circuits_report()
+    assert list(reporte) == ['https://api.caida.com']
+    assert reporte['https://api.caida.com']['state'] == 'abierto'
+
+
+def test_errores_del_pedido_no_abren(sesion):
+    """404, 400 o 429 son respuestas del proveedor, no caídas"""
+    sesion['resultados'] = [_Respuesta(404), _Respuesta(400), _Respuesta(429), _Respuesta(404)]
+    for _ in range(4):
+        http_client.get(URL)
+    assert circuit_breaker.circuits_report() == {}
+
+
+def test_semiabierto_una_sola_prueba():
+    breaker = CircuitBreaker('api', failure_threshold=1, reset_timeout=0.1)
+    breaker.failure()
+    with pytest.raises(CircuitOpen):
+        breaker.allow()
+
+    time.sleep(0.12)
+    breaker.check()               # Ya toca probar: check() no reserva la prueba
+    breaker.allow()               # Primera petición: la prueba
+    with pytest.raises(CircuitOpen):
+        breaker.allow()           # Las demás esperan su resultado
+    breaker.success()
+    breaker.allow()
+    assert breaker.state == 'cerrado'
+
+
+def test_prueba_fallida_duplica_la_espera():
+    breaker = CircuitBreaker('api', failure_threshold=1, reset_timeout=0.1, max_reset_timeout=0.15)
+    breaker.failure()
+    time.sleep(0.12)
+    breaker.allow()
+    breaker.failure()
+
+    time.sleep(0.12)
+    with pytest.raises(CircuitOpen):
+        breaker.allow()           # Ahora abierto 0.15s (el doble, con tope)
+    time.sleep(0.05)
+    breaker.allow()
+    assert breaker.report()['opened'] == 2
+
+
+def test_llm_usa_el_respaldo_sin_esperar_turno(monkeypatch):
+    """Con la API caída el parafraseo devuelve el original sin consumir el límite"""
+    from paraphrase import NewsParaphraser
+
+    monkeypatch.setenv('LLM_CACHE', '0')
+    cliente = LLMClient(rate_per_minute=1, burst=1)
+    monkeypatch.setattr(llm_client, '_default_client', cliente)
+    for _ in range(circuit_breaker.DEFAULT_FAILURES):
+        circuit_breaker.get_circuit_breaker(cliente.api_url).failure()
+
+    inicio = time.monotonic()
+    paraphraser = NewsParaphraser(api_key='clave')
+    textos = [paraphraser.paraphrase_text(f'Texto {i}') for i in range(3)]
+
+    assert textos == ['Texto 0', 'Texto 1', 'Texto 2']
+    assert time.monotonic() - inicio < 0.5
+
+
+def test_desactivable(monkeypatch):
+    monkeypatch.setenv('CIRCUIT_BREAKER', '0')
+    assert circuit_breaker.get_circuit_breaker(URL) is None
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Test de los cursores de descarga incremental
+Verifica que cada ejecución pide solo el delta y que el rezago se pagina en
+ejecuciones sucesivas, con un servidor NewsAPI falso (sin red)
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Agregar directorio padre al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api import newsapi
+from utils import fetch_cursors
+from utils.fetch_cursors import CursorStore, query_key
+
+
+class _Respuesta:
+    status_code = 200
+
+    def __init__(self, data):
+        self._data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._data
+
+
+class _NewsAPIFalsa:
+    """Servidor NewsAPI en memoria: respeta from, to, page y pageSize"""
+
+    def __init__(self):
+        self.articulos = []
+        self.peticiones = []
+
+    def publicar(self, *horas):
+        for hora in horas:
+            self.articulos.append({
+                'title': f'Nota {hora:02d}',
+                'url': f'https://diario.mx/{hora}',
+                'publishedAt': f'2026-01-10T{hora:02d}:00:00Z',
+                'source': {'name': 'Diario'},
+            })
+
+    def get(self, url, params=None, **kwargs):
+        self.peticiones.append(dict(params))
+        ventana = [a for a in self.articulos
+                   if a['publishedAt'].rstrip('Z') >= params.get('from', '')
+                   and a['publishedAt'].rstrip('Z') <= params.get('to', '9999')]
+        ventana.sort(key=lambda a: a['publishedAt'], reverse=True)
+        inicio = (params['page'] - 1) * params['pageSize']
+        return _Respuesta({'status': 'ok', 'totalResults': len(ventana),
+                           'articles': ventana[inicio:inicio + params['pageSize']]})
+
+
+@pytest.fixture
+def servidor(monkeypatch, tmp_path):
+    servidor = _NewsAPIFalsa()
+    monkeypatch.setattr(newsapi, 'API_KEY', 'clave')
+    monkeypatch.setattr(newsapi.http_client, 'get', servidor.get)
+    monkeypatch.setattr(fetch_cursors, '_default_store', CursorStore(tmp_path / 'cursors.sqlite'))
+    return servidor
+
+
+def _descargar(**kwargs):
+    articles = newsapi.fetch_newsapi(query='ia', enrich=False, silent=True, dedup=False, **kwargs)
+    return sorted(a['title'] for a in articles)
+
+
+def test_solo_el_delta_entre_ejecuciones(servidor):
+    """La primera ejecución fija el punto de partida y la siguiente pide desde ahí"""
+    servidor.publicar(1, 2, 3)
+    assert _descargar(page_size=10) == ['Nota 01', 'Nota 02', 'Nota 03']
+
+    servidor.publicar(4)
+    assert _descargar(page_size=10) == ['Nota 04']
+    assert servidor.peticiones[-1]['from'] == '2026-01-10T03:00:00'
+
+    assert _descargar(page_size=10) == []
+
+
+def test_rezago_se_pagina_en_ejecuciones_sucesivas(servidor):
+    """Un delta mayor a una página se completa en las ejecuciones siguientes"""
+    servidor.publicar(1)
+    _descargar(page_size=2)
+
+    servidor.publicar(2, 3, 4, 5, 6)
+    assert _descargar(page_size=2) == ['Nota 05', 'Nota 06']
+    servidor.publicar(7)  # Llega mientras se agota el rezago
+    assert _descargar(page_size=2) == ['Nota 03', 'Nota 04']
+    assert _descargar(page_size=2) == ['Nota 02']
+    assert _descargar(page_size=2) == ['Nota 07']
+
+
+def test_varias_paginas_en_una_ejecucion(servidor):
+    servidor.publicar(1)
+    _descargar(page_size=2)
+    servidor.publicar(2, 3, 4, 5, 6)
+
+    assert len(_descargar(page_size=2, max_pages=5)) == 5
+    assert [p['page'] for p in servidor.peticiones[-3:]] == [1, 2, 3]
+
+
+def test_cursor_no_avanza_si_la_descarga_falla(servidor, monkeypatch):
+    """Si algo falla después de descargar, la siguiente ejecución repite la ventana"""
+    servidor.publicar(1)
+    _descargar(page_size=10)
+    servidor.publicar(2, 3)
+
+    def falla(*args, **kwargs):
+        raise RuntimeError('normalización rota')
+
+    with monkeypatch.context() as m:
+        m.setattr(newsapi, 'normalize_articles', falla)
+        with pytest.raises(RuntimeError):
+            _descargar(page_size=10)
+
+    assert _descargar(page_size=10) == ['Nota 02', 'Nota 03']
+
+
+def test_sin_incremental_no_usa_cursor(servidor):
+    servidor.publicar(1, 2)
+    _descargar(page_size=10)
+    assert _descargar(page_size=10, incremental=False) == ['Nota 01', 'Nota 02']
+    assert 'from' not in servidor.peticiones[-1]
+
+
+def test_clave_de_consulta_ignora_credenciales_y_paginacion():
+    assert query_key({'q': 'ia', 'apiKey': 'x', 'page': 3, 'pageSize': 20}) == query_key({'q': 'ia'})
+    assert query_key({'q': 'ia'}) != query_key({'q': 'robots'})
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test de la deduplicación de artículos
+Verifica URLs canónicas, huella de contenido y el conjunto persistente de vistos
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Agregar directorio padre al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils import dedup, utils
+from utils.dedup import SeenStore, canonicalize_url, content_fingerprint
+
+
+@pytest.mark.parametrize('url', [
+    'http://www.diario.mx/tec/nota-1/?utm_source=tw&utm_medium=social',
+    'https://diario.mx/tec/nota-1#comentarios',
+    'https://m.diario.mx/tec/nota-1/amp/',
+    'https://DIARIO.mx:443/tec//nota-1?fbclid=abc',
+])
+def test_url_canonica(url):
+    """Variantes de la misma página comparten URL canónica"""
+    assert canonicalize_url(url) == 'https://diario.mx/tec/nota-1'
+
+
+def test_url_conserva_query_relevante():
+    """Los parámetros que no son de tracking se conservan ordenados"""
+    assert canonicalize_url('https://diario.mx/nota?id=7&utm_campaign=x&page=2') == \
+        'https://diario.mx/nota?id=7&page=2'
+    assert canonicalize_url('https://diario.mx/nota?id=7') != canonicalize_url('https://diario.mx/nota?id=8')
+
+
+def test_huella_ignora_formato():
+    """Mayúsculas, acentos y puntuación no cambian la huella"""
+    a = {'title': 'Lanzan «nuevo» chip de IA', 'description': 'La empresa anunció...'}
+    b = {'title': 'lanzan nuevo chip de ia', 'description': 'La empresa anuncio'}
+    assert content_fingerprint(a) == content_fingerprint(b)
+    assert content_fingerprint({'title': ''}) is None
+
+
+def test_descarta_vistos_entre_ejecuciones(tmp_path):
+    """Repetidos en el lote, por URL o por contenido, se descartan y persisten"""
+    path = tmp_path / 'seen.sqlite'
+    store = SeenStore(path)
+    lote = [
+        {'source': 'newsapi', 'title': 'Nota A', 'url': 'https://a.mx/1?utm_source=x'},
+        {'source': 'newsdata', 'title': 'Nota A', 'url': 'https://a.mx/1'},
+        {'source': 'apitube', 'title': 'Nota A', 'url': 'https://espejo.mx/a'},
+        {'source': 'newsapi', 'title': 'Nota B', 'url': 'https://a.mx/2'},
+    ]
+
+    assert [a['source'] for a in store.filter_new(lote)] == ['newsapi', 'newsapi']
+    assert store.stats == {'new': 2, 'dup_url': 1, 'dup_content': 1}
+    store.close()
+
+    store = SeenStore(path)
+    assert store.filter_new(lote) == []
+    assert len(store.filter_new([{'title': 'Nota C', 'url': 'https://a.mx/3'}])) == 1
+    store.close()
+
+
+def test_normalize_articles_con_dedup(monkeypatch, tmp_path):
+    """normalize_articles filtra tras normalizar y enrich no descarga duplicados"""
+    monkeypatch.setattr(dedup, '_default_store', SeenStore(tmp_path / 'seen.sqlite'))
+    descargas = []
+    monkeypatch.setattr(utils, 'get_full_text', lambda url: descargas.append(url) or 'texto')
+
+    raw = [{'title': 'N1', 'url': 'https://d.mx/1'}, {'title': 'N2', 'url': 'https://d.mx/2'}]
+    assert len(utils.enrich_with_full_text(raw, 'newsapi', verbose=False, dedup=True)) == 2
+    assert utils.enrich_with_full_text(raw, 'newsapi', verbose=False, dedup=True) == []
+    assert len(descargas) == 2
+
+    assert len(utils.normalize_articles(raw, 'newsapi')) == 2
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test de extracción concurrente de texto completo
+Verifica orden, límite por dominio y plazo global de enrich_with_full_text
+"""
+
+import sys
+import time
+import threading
+from pathlib import Path
+
+# Agregar directorio padre al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils import utils
+
+
+def _articulos(urls):
+    return [{'title': f'Noticia {i}', 'url': url} for i, url in enumerate(urls)]
+
+
+def test_conserva_orden_y_estructura(monkeypatch):
+    """Los resultados respetan el orden de entrada aunque terminen desordenados"""
+    def fake_get_full_text(url):
+        time.sleep(0.05 if url.endswith('/0') else 0.01)
+        return f"texto {url}"
+
+    monkeypatch.setattr(utils, 'get_full_text', fake_get_full_text)
+
+    urls = [f'https://sitio{i}.mx/{i}' for i in range(6)]
+    enriched = utils.enrich_with_full_text(_articulos(urls), 'newsapi', verbose=False)
+
+    assert [a['full_text'] for a in enriched] == [f"texto {u}" for u in urls]
+    assert set(enriched[0].keys()) == set(utils.normalize_article({}, 'newsapi').keys())
+
+
+def test_limite_por_dominio(monkeypatch):
+    """Nunca hay más de per_host descargas simultáneas al mismo dominio"""
+    activos = {'max': 0, 'actual': 0}
+    lock = threading.Lock()
+
+    def fake_get_full_text(url):
+        with lock:
+            activos['actual'] += 1
+            activos['max'] = max(activos['max'], activos['actual'])
+        time.sleep(0.02)
+        with lock:
+            activos['actual'] -= 1
+        return "ok"
+
+    monkeypatch.setattr(utils, 'get_full_text', fake_get_full_text)
+
+    urls = [f'https://mismo.mx/{i}' for i in range(10)]
+    utils.enrich_with_full_text(_articulos(urls), 'newsapi', verbose=False,
+                                max_workers=8, per_host=2)
+
+    assert activos['max'] <= 2
+
+
+def test_dominio_saturado_no_bloquea_el_pool(monkeypatch):
+    """Las URLs de un dominio sin cupo no ocupan hilos: los demás dominios avanzan"""
+    def fake_get_full_text(url):
+        time.sleep(0.1 if 'saturado' in url else 0.01)
+        return "ok"
+
+    monkeypatch.setattr(utils, 'get_full_text', fake_get_full_text)
+
+    urls = [f'https://saturado.mx/{i}' for i in range(6)] + [f'https://otro{i}.mx/' for i in range(3)]
+    listos = []
+    utils.enrich_with_full_text(_articulos(urls), 'newsapi', verbose=False, max_workers=4, per_host=1,
+                                sink=lambda articulo: listos.append(articulo['url']))
+
+    # Los otros dominios terminan antes de la primera descarga del dominio saturado
+    assert sorted(listos[:3]) == sorted(urls[6:])
+    assert len(listos) == 9
+
+
+def test_plazo_global(monkeypatch):
+    """Los artículos que no terminan a tiempo quedan como no disponibles"""
+    def fake_get_full_text(url):
+        time.sleep(2 if 'lento' in url else 0.01)
+        return "ok"
+
+    monkeypatch.setattr(utils, 'get_full_text', fake_get_full_text)
+
+    # lento.mx/4 ni siquiera sale de la cola de su dominio (per_host=1)
+    urls = ['https://rapido.mx/1', 'https://lento.mx/2', 'https://rapido2.mx/3', 'https://lento.mx/4']
+    inicio = time.monotonic()
+    enriched = utils.enrich_with_full_text(_articulos(urls), 'newsapi', verbose=False,
+                                           deadline=0.3, per_host=1)
+
+    assert time.monotonic() - inicio < 1.5
+    assert [a['full_text'] for a in enriched] == ['ok', utils.TEXT_UNAVAILABLE, 'ok', utils.TEXT_UNAVAILABLE]
+
+
+def test_no_descarga_si_ya_hay_texto(monkeypatch):
+    """Fuentes con texto completo (newsdata) no disparan descargas"""
+    def fake_get_full_text(url):
+        raise AssertionError("no debería descargar")
+
+    monkeypatch.setattr(utils, 'get_full_text', fake_get_full_text)
+
+    articles = [{'title': 'A', 'link': 'https://x.mx/a', 'content': 'cuerpo'}]
+    enriched = utils.enrich_with_full_text(articles, 'newsdata', verbose=False)
+
+    assert enriched[0]['full_text'] == 'cuerpo'
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test de motores de extracción de texto
+Verifica que stream y lxml respeten las reglas de la implementación original
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Agregar directorio padre al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils import extraction
+from utils.extraction import ENGINES, TEXT_UNAVAILABLE, extract_text
+
+FIXTURES_DIR = Path(__file__).parent / 'fixtures' / 'html'
+
+HTML = """<html><head><title>t</title><script>var x = "<p>oculto</p>";</script>
+<style>p { color: red }</style></head><body>
+<header><p>Cabecera</p></header><nav><p>Menú</p></nav>
+<p>Primer <b>párrafo</b> con   espacios.</p>
+<aside><p>Relacionado</p></aside>
+<p>Segundo párrafo.</p><p></p><p>Tercer párrafo.</p>
+<footer><p>Pie</p></footer></body></html>""".encode('utf-8')
+
+STREAMING = [name for name in ('stream', 'lxml') if name != 'lxml' or extraction._lxml_available()]
+
+
+@pytest.mark.parametrize('engine', STREAMING)
+def test_omite_elementos_no_deseados(engine):
+    """Solo se extraen párrafos fuera de script/nav/header/aside/footer"""
+    texto = extract_text(HTML, engine=engine)
+    assert texto == 'Primer párrafo con espacios. Segundo párrafo. Tercer párrafo.'
+
+
+@pytest.mark.parametrize('engine', STREAMING)
+def test_limites(engine):
+    """max_paragraphs y max_chars se respetan"""
+    assert extract_text(HTML, max_paragraphs=1, engine=engine) == 'Primer párrafo con espacios.'
+    assert extract_text(HTML, max_chars=6, engine=engine) == 'Primer'
+
+
+@pytest.mark.parametrize('engine', list(ENGINES))
+def test_sin_parrafos(engine):
+    """Sin párrafos se retorna el marcador de texto no disponible"""
+    assert extract_text(b'<html><body><div>nada</div></body></html>', engine=engine) == TEXT_UNAVAILABLE
+
+
+def test_espacios_entre_elementos_en_linea():
+    """Los motores en streaming conservan el espacio del HTML; bs4 pega las palabras"""
+    html = '<p>Ganó 5 <b>millones</b> la <a href="#">empresa</a>\n anunció<i>hoy</i>.</p>'.encode('utf-8')
+    for engine in STREAMING:
+        assert extract_text(html, engine=engine) == 'Ganó 5 millones la empresa anuncióhoy.'
+
+    pytest.importorskip('bs4')
+    assert extract_text(html, engine='bs4') == 'Ganó 5milloneslaempresaanuncióhoy.'
+
+
+def test_corta_el_parseo(monkeypatch):
+    """El motor stream deja de alimentar el parser al llegar al límite"""
+    bloques = []
+    original = extraction._StdlibParser.feed
+
+    def feed(self, data):
+        bloques.append(len(data))
+        return original(self, data)
+
+    monkeypatch.setattr(extraction._StdlibParser, 'feed', feed)
+    html = b'<p>uno</p><p>dos</p>' + b'<div>' + b'x' * (extraction.CHUNK_SIZE * 10) + b'</div>'
+
+    assert extract_text(html, max_paragraphs=2, engine='stream') == 'uno dos'
+    assert len(bloques) == 1
+
+
+def test_charset_declarado():
+    """Se respeta el charset declarado en la página"""
+    html = '<meta charset="iso-8859-1"><p>Tecnología</p>'.encode('iso-8859-1')
+    for engine in STREAMING:
+        assert extract_text(html, engine=engine) == 'Tecnología'
+
+
+@pytest.mark.skipif(not extraction._lxml_available(), reason='lxml no instalado')
+def test_fixtures_lxml_igual_a_stream():
+    """Ambos motores en streaming producen el mismo texto en las páginas guardadas"""
+    for path in FIXTURES_DIR.glob('*.html'):
+        html = path.read_bytes()
+        assert extract_text(html, engine='lxml') == extract_text(html, engine='stream')
@@ -94,9 +94,9 @@ def test_flujo_completo():
         # Modificar paso 2 para procesar solo 2
         original_paso_2 = orchestrator.paso_2_parafrasear_noticias
         
-        def paso_2_limitado(noticias):
+        def paso_2_limitado(noticias, **opciones):
             noticias_limitadas = noticias[:2]
-            return original_paso_2(noticias_limitadas)
+            return original_paso_2(noticias_limitadas, **opciones)
         
         orchestrator.paso_2_parafrasear_noticias = paso_2_limitado
         
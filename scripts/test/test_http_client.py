@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test del cliente HTTP compartido
+Verifica sesión única, pools por host, backoff con jitter y timeouts
+"""
+
+import sys
+from pathlib import Path
+
+# Agregar directorio padre al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils import http_client
+
+
+def test_sesion_compartida():
+    """Todas las llamadas usan la misma sesión hasta cerrarla"""
+    http_client.close_session()
+    primera = http_client.get_session()
+    assert http_client.get_session() is primera
+    http_client.close_session()
+    assert http_client.get_session() is not primera
+    http_client.close_session()
+
+
+def test_pool_por_host():
+    """Los hosts configurados tienen su propio adaptador y tamaño de pool"""
+    session = http_client.build_session(host_pool_sizes={'https://api.blackbox.ai': 16})
+    blackbox = session.get_adapter('https://api.blackbox.ai/chat/completions')
+    generico = session.get_adapter('https://ejemplo.mx/nota')
+
+    assert blackbox is not generico
+    assert blackbox._pool_maxsize == 16
+    assert generico._pool_maxsize == http_client.DEFAULT_POOL_SIZE
+    session.close()
+
+
+def test_backoff_con_jitter():
+    """El backoff nunca supera el exponencial base"""
+    retry = http_client.build_retry(retries=5, backoff=1.0)
+    for _ in range(3):
+        retry = retry.increment(method='GET', url='/x')
+    base = http_client.Retry(total=5, backoff_factor=1.0)
+    for _ in range(3):
+        base = base.increment(method='GET', url='/x')
+
+    tiempos = {retry.get_backoff_time() for _ in range(20)}
+    assert all(0 <= t <= base.get_backoff_time() for t in tiempos)
+    assert len(tiempos) > 1
+
+
+def test_timeout_por_defecto(monkeypatch):
+    """Un timeout numérico se convierte en (conexión, lectura)"""
+    capturado = {}
+
+    class FakeSession:
+        def request(self, method, url, timeout=None, **kwargs):
+            capturado['timeout'] = timeout
+            return None
+
+    monkeypatch.setattr(http_client, 'get_session', lambda: FakeSession())
+
+    http_client.get('https://ejemplo.mx')
+    assert capturado['timeout'] == (http_client.DEFAULT_CONNECT_TIMEOUT, http_client.DEFAULT_READ_TIMEOUT)
+
+    http_client.post('https://ejemplo.mx', timeout=90)
+    assert capturado['timeout'] == (http_client.DEFAULT_CONNECT_TIMEOUT, 90)
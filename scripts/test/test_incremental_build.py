@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Test de la regeneración incremental de sitios
+Verifica que con el manifiesto de cada sitio una segunda ejecución solo
+escribe los archivos cuyas entradas cambiaron (artículo, imagen, CSS, versión
+del generador), que elimina las páginas e imágenes que ya no se generan y que
+INCREMENTAL_BUILDS=false vuelve a escribir todo, sin red
+"""
+
+import copy
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Agregar directorio padre al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import master_orchestrator
+import site_renderer
+from layout_generator import LayoutGenerator
+from utils.build_manifest import MANIFEST_NAME
+from utils.site_jobs import seeded
+
+METADATA = {'nombre': 'Diario Incremental', 'tagline': 'Noticias', 'dominio': 'diarioincremental.com'}
+
+
+@pytest.fixture
+def trabajo(tmp_path):
+    origen = tmp_path / 'origen'
+    origen.mkdir()
+    (origen / 'template1.css').write_text('body { color: black; }', encoding='utf-8')
+    imagenes = []
+    for i in range(1, 16):
+        ruta = origen / f'news_{i}.jpg'
+        ruta.write_bytes(f'imagen {i}'.encode())
+        imagenes.append(str(ruta))
+    with seeded('20260101_000000:1'):
+        layout_config = LayoutGenerator().generar_configuracion_layout()
+    return {
+        'site_num': 1,
+        'seed': '20260101_000000:1',
+        'site_dir': str(tmp_path / 'site_1'),
+        'metadata': METADATA,
+        'template_info': {},
+        'css_source': str(origen / 'template1.css'),
+        'layout_config': layout_config,
+        'noticias': [{'title': f'Noticia {i}', 'description': f'Resumen {i}', 'category': 'tecnología',
+                      'full_article': f'Cuerpo {i}.', 'author': 'Redacción'} for i in range(1, 16)],
+        'imagenes': imagenes,
+        'logo_path': None,
+    }
+
+
+def _reconstruir(trabajo):
+    """Marca los archivos del sitio como viejos, regenera y retorna los que se escribieron"""
+    site_dir = Path(trabajo['site_dir'])
+    for ruta in site_dir.rglob('*'):
+        if ruta.is_file():
+            os.utime(ruta, ns=(0, 0))
+    resultado = site_renderer.generar_sitio(trabajo)
+    assert resultado['error'] is None
+    escritos = {str(ruta.relative_to(site_dir)) for ruta in site_dir.rglob('*')
+                if ruta.is_file() and ruta.stat().st_mtime_ns != 0 and ruta.name != MANIFEST_NAME}
+    return escritos, resultado['archivos']
+
+
+def test_sin_cambios_no_escribe_nada(trabajo):
+    resultado = site_renderer.generar_sitio(trabajo)
+    assert resultado['archivos']['escritos'] == 1 + 15 + 4 + 1 + 15
+
+    escritos, archivos = _reconstruir(trabajo)
+    assert escritos == set()
+    assert archivos == {'escritos': 0, 'omitidos': 36, 'eliminados': 0}
+
+
+def test_solo_se_escriben_los_cambios(trabajo):
+    site_renderer.generar_sitio(trabajo)
+    site_dir = Path(trabajo['site_dir'])
+
+    # Un artículo que no aparece en el index ni en ningún sidebar: solo su página
+    trabajo['noticias'][13]['full_article'] = 'Cuerpo corregido.'
+    escritos, _ = _reconstruir(trabajo)
+    assert escritos == {'article_14.html'}
+    assert 'Cuerpo corregido.' in (site_dir / 'article_14.html').read_text(encoding='utf-8')
+
+    # Imagen y CSS: solo se copian si cambió su contenido
+    Path(trabajo['imagenes'][4]).write_bytes(b'imagen nueva')
+    Path(trabajo['css_source']).write_text('body { color: red; }', encoding='utf-8')
+    escritos, _ = _reconstruir(trabajo)
+    assert escritos == {'images/news_5.jpg', 'style.css'}
+
+    # Un campo que el index no muestra no lo reescribe
+    trabajo['noticias'][0]['style'] = 'formal'
+    escritos, _ = _reconstruir(trabajo)
+    assert 'index.html' not in escritos
+
+    # Un título del sidebar cambia las páginas que lo muestran y el index
+    trabajo['noticias'][1]['title'] = 'Noticia 2 actualizada'
+    escritos, _ = _reconstruir(trabajo)
+    assert escritos == {'index.html'} | {f'article_{i}.html' for i in range(1, 16)}
+
+
+def test_elimina_paginas_que_ya_no_se_generan(trabajo):
+    site_renderer.generar_sitio(trabajo)
+    site_dir = Path(trabajo['site_dir'])
+    (site_dir / 'notas.txt').write_text('no es del generador', encoding='utf-8')
+
+    reducido = copy.deepcopy(trabajo)
+    reducido['noticias'] = reducido['noticias'][:10]
+    reducido['imagenes'] = reducido['imagenes'][:10]
+    escritos, archivos = _reconstruir(reducido)
+
+    # El index mostraba 12 artículos y ahora 10; las demás páginas no cambian
+    assert escritos == {'index.html'} and archivos['eliminados'] == 10
+    assert not (site_dir / 'article_11.html').exists() and not (site_dir / 'images' / 'news_11.jpg').exists()
+    assert (site_dir / 'article_10.html').exists() and (site_dir / 'notas.txt').exists()
+
+
+def test_articulo_sin_imagen_no_hereda_la_anterior(trabajo):
+    site_renderer.generar_sitio(trabajo)
+    site_dir = Path(trabajo['site_dir'])
+
+    # En la posición 3 entra otro artículo, que no tiene imagen
+    trabajo['noticias'][2] = dict(trabajo['noticias'][2], title='Noticia sin foto')
+    trabajo['imagenes'][2] = None
+    _, archivos = _reconstruir(trabajo)
+
+    assert archivos['eliminados'] == 1
+    assert not (site_dir / 'images' / 'news_3.jpg').exists()
+    assert (site_dir / 'images' / 'news_4.jpg').read_bytes() == b'imagen 4'
+
+    # Si la imagen vuelve, se copia de nuevo
+    trabajo['imagenes'][2] = str(Path(trabajo['imagenes'][3]).with_name('news_3.jpg'))
+    escritos, _ = _reconstruir(trabajo)
+    assert 'images/news_3.jpg' in escritos
+    assert (site_dir / 'images' / 'news_3.jpg').read_bytes() == b'imagen 3'
+
+
+def test_version_y_desactivado_reescriben_todo(trabajo, monkeypatch):
+    site_renderer.generar_sitio(trabajo)
+
+    monkeypatch.setattr(site_renderer, 'GENERATOR_VERSION', '2')
+    escritos, _ = _reconstruir(trabajo)
+    assert len(escritos) == 36
+
+    monkeypatch.setenv('INCREMENTAL_BUILDS', 'false')
+    escritos, _ = _reconstruir(trabajo)
+    assert len(escritos) == 36
+
+
+def test_paso_7_cuenta_archivos(tmp_path):
+    noticias = [{'title': f'Noticia {i}', 'description': f'Resumen {i}', 'category': 'tecnología',
+                 'full_article': f'Cuerpo {i}.', 'author': 'Redacción'} for i in range(1, 4)]
+    sitios = [METADATA, dict(METADATA, nombre='Otro Diario', dominio='otrodiario.com')]
+    ejecuciones = []
+    # Dos ejecuciones distintas (otro run_id) con las mismas noticias
+    for run_id in ('20260101_000000', '20260102_000000'):
+        orquestador = master_orchestrator.MasterOrchestrator(output_base_dir=str(tmp_path), run_id=run_id,
+                                                             procesos=0)
+        orquestador.paso_7_generar_sitios_html(sitios, noticias, {}, {}, [{}])
+        ejecuciones.append(orquestador.stats)
+
+    # index, artículos y legales de cada sitio (más el CSS del template, si existe)
+    assert ejecuciones[0]['archivos_escritos'] >= 2 * (1 + 3 + 4)
+    assert ejecuciones[1]['sitios_creados'] == 2 and ejecuciones[1]['archivos_escritos'] == 0
+    assert ejecuciones[1]['archivos_sin_cambios'] == ejecuciones[0]['archivos_escritos']
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test de la caché de respuestas del LLM
+Verifica que un prompt repetido no vuelve a la API, la clave por contenido,
+las variaciones, el TTL y la expulsión LRU por tamaño
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Agregar directorio padre al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils import llm_cache, llm_client
+from utils.llm_cache import LLMCache, cache_key
+from utils.llm_client import LLMClient
+from paraphrase import NewsParaphraser
+
+
+class _Respuesta:
+    status_code = 200
+
+    def __init__(self, content):
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {'choices': [{'message': {'content': self.content}}]}
+
+
+@pytest.fixture
+def cache(monkeypatch, tmp_path):
+    cache = LLMCache(str(tmp_path / 'llm.sqlite'))
+    llamadas = []
+
+    def fake_post(url, headers=None, json=None, timeout=None):
+        llamadas.append(json)
+        return _Respuesta(f"[TÍTULO]\nTítulo {len(llamadas)}\n\n[ARTÍCULO]\nCuerpo {len(llamadas)}")
+
+    monkeypatch.setattr(llm_cache, '_default_cache', cache)
+    monkeypatch.setattr(llm_client.http_client, 'post', fake_post)
+    monkeypatch.setattr(llm_client, '_default_client', LLMClient(rate_per_minute=0))
+    cache.llamadas = llamadas
+    return cache
+
+
+def _payload(user='Nota', **kwargs):
+    payload = {'model': 'm', 'messages': [{'role': 'system', 'content': 'Eres periodista'},
+                                          {'role': 'user', 'content': user}],
+               'temperature': 0.7, 'max_tokens': 3000}
+    payload.update(kwargs)
+    return payload
+
+
+def test_ejecucion_repetida_no_llama_a_la_api(cache):
+    """El mismo artículo y estilo se sirven de la caché, también en lotes"""
+    paraphraser = NewsParaphraser(api_key='clave')
+    articulo = {'source': 'diario', 'title': 'Nota', 'description': 'Resumen'}
+
+    primero = paraphraser.paraphrase_article(articulo, 'formal y objetivo')
+    segundo = paraphraser.paraphrase_batch([articulo], ['formal y objetivo'])[0]
+
+    assert primero == segundo
+    assert len(cache.llamadas) == 1
+    assert cache.stats['hits'] == 1
+
+    # Otro estilo es otro prompt
+    paraphraser.paraphrase_article(articulo, 'casual y cercano')
+    assert len(cache.llamadas) == 2
+
+
+def test_clave_por_contenido():
+    """Cambian la clave modelo, prompts, temperatura, max_tokens y variación; no el timeout ni el stream"""
+    base = cache_key(_payload())
+    assert cache_key(_payload(stream=False)) == base
+    assert cache_key(_payload(user='Otra nota')) != base
+    assert cache_key(_payload(model='otro')) != base
+    assert cache_key(_payload(temperature=0.2)) != base
+    assert cache_key(_payload(max_tokens=2000)) != base
+    assert cache_key(_payload(), variant=1) != base
+    assert cache_key(_payload(), variant=0) == base
+
+
+def test_ttl(tmp_path):
+    cache = LLMCache(str(tmp_path / 'llm.sqlite'), ttl=0.05)
+    cache.put('k', 'respuesta')
+    assert cache.get('k') == 'respuesta'
+    time.sleep(0.06)
+    assert cache.get('k') is None
+    assert cache.stats['expired'] == 1
+
+
+def test_expulsion_lru(tmp_path):
+    """Al exceder el tamaño se expulsa la respuesta usada hace más tiempo"""
+    cache = LLMCache(str(tmp_path / 'llm.sqlite'), max_bytes=10**6)
+    texto = lambda i: os.urandom(300).hex() + str(i)  # Poco compresible
+    cache.put('a', texto(1))
+    time.sleep(0.01)
+    cache.put('b', texto(2))
+    time.sleep(0.01)
+    cache.get('a')
+
+    cache.max_bytes = cache.total_size() + 100
+    cache.put('c', texto(3))
+
+    assert cache.get('b') is None
+    assert cache.get('a') and cache.get('c')
+    assert cache.stats['evicted'] == 1
+
+
+def test_desactivable(monkeypatch):
+    monkeypatch.setenv('LLM_CACHE', '0')
+    assert llm_cache.get_llm_cache() is None
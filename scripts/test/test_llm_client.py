@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test del cliente LLM asíncrono
+Verifica ventana de concurrencia, token bucket, orden de resultados y los
+lotes de NewsParaphraser y ArticleExpander, con una API falsa (sin red)
+"""
+
+import importlib.util
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+import requests
+
+# Agregar directorio padre al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils import llm_client
+from utils.llm_client import LLMClient, TokenBucket, run_in_order
+from paraphrase import NewsParaphraser
+
+_spec = importlib.util.spec_from_file_location('article_expander', Path(__file__).parent.parent / 'article-expander.py')
+article_expander = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(article_expander)
+
+
+class _Respuesta:
+    def __init__(self, content, status=200):
+        self.content = content
+        self.status_code = status
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f'HTTP {self.status_code}')
+
+    def json(self):
+        return {'choices': [{'message': {'content': self.content}}]}
+
+
+class _APIFalsa:
+    """Responde con el eco del prompt tras un retardo variable y cuenta la concurrencia"""
+
+    def __init__(self, retardo=0.05, fallar_si=None):
+        self.retardo = retardo
+        self.fallar_si = fallar_si
+        self.en_vuelo = 0
+        self.max_en_vuelo = 0
+        self.llamadas = 0
+        self._lock = threading.Lock()
+
+    def post(self, url, headers=None, json=None, timeout=None):
+        prompt = json['messages'][-1]['content']
+        with self._lock:
+            self.llamadas += 1
+            self.en_vuelo += 1
+            self.max_en_vuelo = max(self.max_en_vuelo, self.en_vuelo)
+        try:
+            # Las primeras peticiones tardan más: el orden de llegada se invierte
+            time.sleep(self.retardo * (1 + (hash(prompt) % 3)))
+            if self.fallar_si and self.fallar_si in prompt:
+                return _Respuesta('', status=503)
+            marca = next(line for line in prompt.splitlines() if line.startswith(('Nota', 'Título: Nota')))
+            return _Respuesta(f"[TÍTULO]\n{marca}\n\n[ARTÍCULO]\nCuerpo de {marca}")
+        finally:
+            with self._lock:
+                self.en_vuelo -= 1
+
+
+@pytest.fixture
+def api(monkeypatch):
+    monkeypatch.setenv('LLM_CACHE', '0')
+
+    def configurar(concurrency=3, rate_per_minute=0, **kwargs):
+        falsa = _APIFalsa(**kwargs)
+        monkeypatch.setattr(llm_client.http_client, 'post', falsa.post)
+        monkeypatch.setattr(llm_client, '_default_client',
+                            LLMClient(concurrency=concurrency, rate_per_minute=rate_per_minute, burst=1))
+        return falsa
+    return configurar
+
+
+def _articulos(n):
+    return [{'source': 'diario', 'title': f'Nota {i}', 'description': f'Resumen {i}'} for i in range(n)]
+
+
+def test_lote_respeta_orden_y_ventana(api):
+    """Los resultados salen en orden de entrada y nunca hay más de N peticiones en vuelo"""
+    falsa = api(concurrency=3)
+    paraphraser = NewsParaphraser(api_key='clave')
+
+    inicio = time.monotonic()
+    resultado = paraphraser.paraphrase_batch(_articulos(9))
+    duracion = time.monotonic() - inicio
+
+    assert [a['title'] for a in resultado] == [f'Nota {i}' for i in range(9)]
+    assert [a['full_text'] for a in resultado] == [f'Cuerpo de Nota {i}' for i in range(9)]
+    assert falsa.max_en_vuelo == 3
+    # En serie serían al menos 9 x 0.05s; con ventana de 3, alrededor de un tercio
+    assert duracion < 9 * 0.05 * 2
+
+
+def test_error_de_una_peticion_no_afecta_al_lote(api):
+    """Una respuesta 503 usa el texto de respaldo solo en ese artículo"""
+    api(fallar_si='Nota 1\n')
+    expander = article_expander.ArticleExpander(api_key='clave')
+
+    textos = expander.expand_batch(_articulos(3))
+
+    assert textos[0].endswith('Cuerpo de Título: Nota 0')
+    assert textos[1].startswith('Nota 1\n\nResumen 1')
+    assert textos[2].endswith('Cuerpo de Título: Nota 2')
+
+
+def test_token_bucket_espacia_peticiones():
+    """Tras la ráfaga, cada reserva espera 1/rate más que la anterior"""
+    bucket = TokenBucket(rate=10, capacity=2)
+    esperas = [bucket.reserve() for _ in range(4)]
+
+    assert esperas[:2] == [0.0, 0.0]
+    assert esperas[2] == pytest.approx(0.1, abs=0.01)
+    assert esperas[3] == pytest.approx(0.2, abs=0.01)
+    assert TokenBucket(rate=0, capacity=1).reserve() == 0.0
+
+
+def test_limite_de_tasa_en_lote(api):
+    falsa = api(concurrency=8, rate_per_minute=600, retardo=0.0)
+    cliente = llm_client.get_llm_client()
+    payload = {'messages': [{'role': 'user', 'content': 'Nota 0'}]}
+
+    inicio = time.monotonic()
+    run_in_order(cliente.acomplete(payload, {}) for _ in range(4))
+
+    # 600/min = una cada 0.1s tras la primera
+    assert time.monotonic() - inicio >= 0.28
+    assert falsa.llamadas == 4
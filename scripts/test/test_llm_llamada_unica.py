@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Test del modo de una sola llamada (parafraseo + expansión)
+Verifica el formato [TÍTULO]/[RESUMEN]/[ARTÍCULO], la compatibilidad con
+article_data y que el paso 2 hace una llamada por noticia, con una API falsa
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+import requests
+
+# Agregar directorio padre al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils import llm_client
+from utils.llm_client import LLMClient
+from paraphrase import NewsParaphraser
+
+RESPUESTA = """[TÍTULO]
+Nuevo chip acelera la IA en teléfonos
+
+[RESUMEN]
+Un fabricante presentó un procesador que duplica el rendimiento en tareas de IA.
+
+[ARTÍCULO]
+Primer párrafo del artículo.
+
+Segundo párrafo del artículo."""
+
+
+class _Respuesta:
+    status_code = 200
+
+    def __init__(self, content):
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {'choices': [{'message': {'content': self.content}}]}
+
+
+@pytest.fixture
+def llamadas(monkeypatch):
+    llamadas = []
+
+    def fake_post(url, headers=None, json=None, timeout=None):
+        llamadas.append(json)
+        return _Respuesta(RESPUESTA)
+
+    monkeypatch.setenv('LLM_CACHE', '0')
+    monkeypatch.setattr(llm_client.http_client, 'post', fake_post)
+    monkeypatch.setattr(llm_client, '_default_client', LLMClient(rate_per_minute=0))
+    return llamadas
+
+
+ARTICULO = {'source': 'diario', 'title': 'Chip nuevo', 'description': 'Resumen original',
+            'content': 'Texto corto', 'full_text': 'Texto completo de la nota'}
+
+
+def test_respuesta_estructurada(llamadas):
+    """Título, resumen y cuerpo salen de sus marcas; el cuerpo también es full_article"""
+    resultado = NewsParaphraser(api_key='clave').rewrite_article(ARTICULO, 'formal y objetivo', 'enfoque analítico')
+
+    assert len(llamadas) == 1
+    assert resultado['title'] == 'Nuevo chip acelera la IA en teléfonos'
+    assert resultado['description'].startswith('Un fabricante presentó')
+    assert resultado['full_text'] == 'Primer párrafo del artículo.\n\nSegundo párrafo del artículo.'
+    assert resultado['full_article'] == resultado['full_text'] == resultado['content']
+
+    prompt = llamadas[0]['messages'][-1]['content']
+    assert 'enfoque analítico' in prompt and 'formal y objetivo' in prompt
+    assert 'Texto completo de la nota' in prompt
+
+
+def test_sin_resumen_usa_el_inicio_del_cuerpo(llamadas):
+    """El parafraseo de dos llamadas (sin [RESUMEN]) conserva su comportamiento"""
+    paraphraser = NewsParaphraser(api_key='clave')
+    resultado = paraphraser._apply_paraphrase(ARTICULO, '[TÍTULO]\nTítulo\n\n[ARTÍCULO]\n' + 'x' * 400)
+
+    assert resultado['title'] == 'Título'
+    assert resultado['description'] == 'x' * 300 + '...'
+
+
+@pytest.mark.parametrize('llamada_unica, esperadas', [(True, 1), (False, 2)])
+def test_paso_2_llamadas_por_noticia(llamadas, tmp_path, llamada_unica, esperadas):
+    import master_orchestrator
+
+    orquestador = master_orchestrator.MasterOrchestrator(output_base_dir=str(tmp_path),
+                                                         llamada_unica=llamada_unica, streaming=False)
+    orquestador.paraphraser = NewsParaphraser(api_key='clave')
+    orquestador.article_expander = master_orchestrator.cargar_clase(
+        'article-expander.py', 'ArticleExpander')(api_key='clave')
+    temas = ['nuevo procesador para teléfonos', 'ley de datos personales aprobada', 'lanzamiento de cohete reutilizable']
+    noticias = [dict(ARTICULO, title=tema, full_text=f'Nota sobre {tema}', url=f'https://diario.mx/{i}')
+                for i, tema in enumerate(temas)]
+    resultado = orquestador.paso_2_parafrasear_noticias(noticias)
+
+    assert len(llamadas) == 3 * esperadas
+    assert [set(a) >= {'title', 'description', 'full_text', 'full_article', 'original_id',
+                       'style', 'structure', 'author'} for a in resultado] == [True] * 3
+    assert orquestador.stats['noticias_parafraseadas'] == 3
+
+
+def test_paso_2_no_cuenta_los_respaldos(llamadas, tmp_path):
+    """Una noticia que quedó con el texto original no cuenta como parafraseada"""
+    import master_orchestrator
+
+    async def reescribir(noticia, **opciones):
+        if 'falla' in noticia['title']:
+            return {**noticia, 'full_article': noticia['full_text'], 'llm_fallback': True}
+        return {**noticia, 'title': 'Reescrita', 'full_article': 'Cuerpo nuevo.'}
+
+    orquestador = master_orchestrator.MasterOrchestrator(output_base_dir=str(tmp_path),
+                                                         llamada_unica=True, streaming=False)
+    orquestador.paraphraser = NewsParaphraser(api_key='clave')
+    orquestador.paraphraser.rewrite_article_async = reescribir
+    orquestador.article_expander = master_orchestrator.cargar_clase(
+        'article-expander.py', 'ArticleExpander')(api_key='clave')
+    noticias = [dict(ARTICULO, title=titulo, url=f'https://diario.mx/{i}')
+                for i, titulo in enumerate(['la API falla aquí', 'robots en fábricas', 'nueva vacuna aprobada'])]
+    resultado = orquestador.paso_2_parafrasear_noticias(noticias)
+
+    assert len(resultado) == 3 and all('llm_fallback' not in a for a in resultado)
+    assert orquestador.stats['noticias_parafraseadas'] == 2
+
+
+def test_respaldo_se_marca_explicitamente(llamadas, monkeypatch):
+    """El respaldo no se deduce del texto: una respuesta igual al original no es respaldo"""
+    import master_orchestrator
+
+    paraphraser = NewsParaphraser(api_key='clave')
+    expander = master_orchestrator.cargar_clase('article-expander.py', 'ArticleExpander')(api_key='clave')
+    original = paraphraser._base_text(ARTICULO, max_chars=3000)
+
+    monkeypatch.setattr(paraphraser.llm, 'complete', lambda *args, **kwargs: original.strip())
+    assert 'llm_fallback' not in paraphraser.rewrite_article(ARTICULO)
+
+    def caida(*args, **kwargs):
+        raise requests.exceptions.ConnectionError('sin red')
+
+    async def caida_async(*args, **kwargs):
+        caida()
+
+    monkeypatch.setattr(paraphraser.llm, 'complete', caida)
+    monkeypatch.setattr(paraphraser.llm, 'acomplete', caida_async)
+    assert paraphraser.rewrite_article(ARTICULO)['llm_fallback'] is True
+    assert paraphraser.paraphrase_article(ARTICULO)['llm_fallback'] is True
+    assert asyncio.run(paraphraser.rewrite_article_async(ARTICULO))['llm_fallback'] is True
+
+    texto, respaldo = asyncio.run(expander.expand_article_result_async(ARTICULO))
+    assert respaldo and texto == expander._fallback_text(ARTICULO)
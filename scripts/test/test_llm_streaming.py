@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Test del modo streaming del LLM
+Verifica la lectura de eventos SSE, el parser incremental de título y que la
+imagen de cada noticia empieza antes de que termine el cuerpo, con una API
+falsa (sin red)
+"""
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Agregar directorio padre al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils import llm_client
+from utils.llm_client import LLMClient, iter_sse_content
+from paraphrase import NewsParaphraser, StructuredStreamParser
+
+FRAGMENTOS = ['[TÍT', 'ULO]\nChip ', 'veloz\n\n[RESU', 'MEN]\nBreve.\n\n[ARTÍCULO]\n',
+              'Primer párrafo.', '\n\nSegundo párrafo.']
+
+
+class _RespuestaSSE:
+    """Respuesta en streaming: un evento 'data:' por fragmento, con pausas"""
+
+    status_code = 200
+    headers = {'Content-Type': 'text/event-stream'}
+
+    def __init__(self, fragmentos, pausa=0.0, cortar_en=None, terminar=True):
+        self.fragmentos = fragmentos
+        self.pausa = pausa
+        self.cortar_en = cortar_en
+        self.terminar = terminar
+        self.cerrada = False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_lines(self):
+        yield b': comentario del servidor'
+        for i, fragmento in enumerate(self.fragmentos):
+            if i == self.cortar_en:
+                raise llm_client.http_client.requests.exceptions.ChunkedEncodingError('conexión cortada')
+            time.sleep(self.pausa)
+            yield ('data: ' + json.dumps({'choices': [{'delta': {'content': fragmento}}]})).encode('utf-8')
+            yield b''
+        if self.terminar:
+            yield b'data: {"choices": []}'
+            yield b'data: [DONE]'
+
+    def close(self):
+        self.cerrada = True
+
+
+@pytest.fixture
+def servidor(monkeypatch):
+    estado = {'respuestas': [], 'pausa': 0.0, 'cortar_en': None, 'terminar': True}
+
+    def fake_post(url, headers=None, json=None, timeout=None, stream=False):
+        assert stream and json['stream'] is True
+        respuesta = _RespuestaSSE(FRAGMENTOS, estado['pausa'], estado['cortar_en'], estado['terminar'])
+        estado['respuestas'].append(respuesta)
+        return respuesta
+
+    monkeypatch.setenv('LLM_CACHE', '0')
+    monkeypatch.setattr(llm_client.http_client, 'post', fake_post)
+    monkeypatch.setattr(llm_client, '_default_client', LLMClient(rate_per_minute=0))
+    return estado
+
+
+def test_lectura_de_eventos_sse(servidor):
+    fragmentos = list(llm_client.get_llm_client().stream({'messages': []}, {}))
+    assert fragmentos == FRAGMENTOS
+    assert servidor['respuestas'][0].cerrada
+
+
+def test_respuesta_json_sin_streaming():
+    """Si el servidor ignora stream=True, el mensaje completo es un solo fragmento"""
+    class _JSON:
+        headers = {'Content-Type': 'application/json; charset=utf-8'}
+
+        def json(self):
+            return {'choices': [{'message': {'content': 'completo'}}]}
+
+    assert list(iter_sse_content(_JSON())) == ['completo']
+
+
+def test_parser_incremental_de_titulo():
+    """El título se conoce al empezar [RESUMEN] y la cabecera al empezar [ARTÍCULO]"""
+    parser = StructuredStreamParser()
+    eventos = [parser.feed(f) for f in FRAGMENTOS]
+
+    assert eventos[:4] == [[], [], [], ['title', 'header']]
+    assert parser.title == 'Chip veloz'
+    assert parser.summary == 'Breve.'
+    assert eventos[4:] == [[], []]
+
+    parser = StructuredStreamParser()
+    assert parser.feed('[TÍTULO]\nOtro título\n\n[RESUMEN]\nUna') == ['title']
+    assert parser.feed(' línea.\n[ARTÍCULO]') == ['header']
+    assert (parser.title, parser.summary) == ('Otro título', 'Una línea.')
+
+
+def test_cabecera_antes_del_cuerpo(servidor):
+    """on_header recibe título y resumen mientras el cuerpo aún se genera"""
+    servidor['pausa'] = 0.05
+    cabeceras = []
+    inicio = time.monotonic()
+
+    resultado = NewsParaphraser(api_key='clave').rewrite_article_stream(
+        {'source': 'diario', 'title': 'Original', 'url': 'https://diario.mx/1'},
+        on_header=lambda a: cabeceras.append((a['title'], a['description'], time.monotonic() - inicio))
+    )
+    total = time.monotonic() - inicio
+
+    assert cabeceras[0][:2] == ('Chip veloz', 'Breve.')
+    assert cabeceras[0][2] < total - 0.08  # Faltaban al menos dos fragmentos
+    assert resultado['title'] == 'Chip veloz'
+    assert resultado['full_article'] == 'Primer párrafo.\n\nSegundo párrafo.'
+
+
+def test_corte_a_mitad_usa_el_texto_original(servidor):
+    """Un cuerpo cortado a medias no se publica"""
+    servidor['cortar_en'] = 5
+    resultado = NewsParaphraser(api_key='clave').rewrite_article_stream(
+        {'source': 'diario', 'title': 'Original', 'description': 'Resumen original'})
+
+    assert resultado['title'] == 'Original'
+    assert 'Primer párrafo' not in resultado['full_article']
+
+
+def test_stream_sin_fin_no_se_publica_ni_se_cachea(servidor, monkeypatch, tmp_path):
+    """Un stream que se cierra sin [DONE] ni finish_reason está truncado: respaldo y nada en caché"""
+    from utils import llm_cache
+
+    cache = llm_cache.LLMCache(str(tmp_path / 'llm.sqlite'))
+    monkeypatch.setenv('LLM_CACHE', '1')
+    monkeypatch.setattr(llm_cache, '_default_cache', cache)
+    servidor['terminar'] = False
+
+    resultado = NewsParaphraser(api_key='clave').rewrite_article_stream(
+        {'source': 'diario', 'title': 'Original', 'description': 'Resumen original'})
+
+    assert resultado['title'] == 'Original' and resultado.get('llm_fallback')
+    assert 'Segundo párrafo' not in resultado['full_article']
+    assert cache._conn.execute('SELECT COUNT(*) FROM completions').fetchone()[0] == 0
+
+    # Con finish_reason en el último delta el stream está completo aunque falte [DONE]
+    evento = {'choices': [{'delta': {'content': 'fin'}, 'finish_reason': 'stop'}]}
+    completo = _RespuestaSSE([])
+    completo.iter_lines = lambda: iter([('data: ' + json.dumps(evento)).encode('utf-8')])
+    assert list(iter_sse_content(completo)) == ['fin']
+
+
+def test_paso_2_anticipa_imagenes(servidor, tmp_path):
+    """El paso 3 recoge las imágenes que el paso 2 inició al llegar cada título"""
+    import master_orchestrator
+
+    orquestador = master_orchestrator.MasterOrchestrator(output_base_dir=str(tmp_path))
+    orquestador.paraphraser = NewsParaphraser(api_key='clave')
+    orquestador.article_expander = master_orchestrator.cargar_clase(
+        'article-expander.py', 'ArticleExpander')(api_key='clave')
+
+    generadas = []
+    imagen = tmp_path / 'imagen.jpg'
+    imagen.write_bytes(b'jpg')
+
+    class _Imagenes:
+        def generate_image(self, prompt, article_id, index, article=None):
+            generadas.append((article['title'], threading.current_thread().name))
+            return str(imagen)
+
+    orquestador.image_generator = _Imagenes()
+    noticias = [{'source': 'diario', 'title': 'Original', 'url': 'https://diario.mx/1', 'full_text': 'Texto'}]
+
+    resultado = orquestador.paso_2_parafrasear_noticias(noticias)
+    orquestador._imagenes_anticipadas['https://diario.mx/1'].result(timeout=5)
+    assert generadas and generadas[0][0] == 'Chip veloz'
+    assert generadas[0][1].startswith('imagenes')
+
+    imagenes = orquestador.paso_3_generar_imagenes(resultado, 1)
+    assert len(generadas) == 1  # No se volvió a generar
+    assert list(imagenes) == ['article_1']
+
+
+def test_flujo_completo_no_duplica_imagenes(servidor, tmp_path):
+    """En el grafo del flujo completo las imágenes tienen su propia etapa: el paso 2 no las anticipa"""
+    import master_orchestrator
+
+    orquestador = master_orchestrator.MasterOrchestrator(output_base_dir=str(tmp_path))
+    orquestador.paraphraser = NewsParaphraser(api_key='clave')
+    orquestador.article_expander = master_orchestrator.cargar_clase(
+        'article-expander.py', 'ArticleExpander')(api_key='clave')
+    noticias = [{'source': 'diario', 'title': 'Original', 'url': 'https://diario.mx/1', 'full_text': 'Texto'}]
+
+    parafrasear = orquestador._construir_pipeline(False, False)._nodes['parafraseadas'].fn
+    assert parafrasear(noticias)[0]['title'] == 'Chip veloz'
+    assert orquestador._imagenes_anticipadas == {}
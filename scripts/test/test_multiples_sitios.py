@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test de generación de varios sitios en una ejecución
+Verifica que los sitios comparten las noticias e imágenes del paso 2-3, que
+cada uno tiene su propio orden reproducible y que se generan todos, sin red
+"""
+
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+# Agregar directorio padre al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import master_orchestrator
+
+NOTICIAS = [{'title': f'Noticia {i}', 'description': f'Resumen {i}', 'category': 'tecnología',
+             'full_article': f'Cuerpo de la noticia {i}.', 'author': 'Redacción'} for i in range(1, 6)]
+SITIOS = [{'nombre': f'Sitio {n}', 'tagline': 'Noticias', 'dominio': f'sitio{n}.com'} for n in range(1, 4)]
+
+
+@pytest.fixture
+def imagenes(tmp_path):
+    compartidas = tmp_path / 'imagenes_compartidas'
+    compartidas.mkdir()
+    rutas = {}
+    for i in range(1, 6):
+        ruta = compartidas / f'news_{i}.jpg'
+        ruta.write_bytes(f'imagen {i}'.encode())
+        rutas[f'article_{i}'] = str(ruta)
+    return rutas
+
+
+def _titulos(site_dir: Path):
+    return [(site_dir / f'article_{k}.html').read_text(encoding='utf-8').split('<h1 class="article-title">')[1]
+            .split('</h1>')[0] for k in range(1, 6) if (site_dir / f'article_{k}.html').exists()]
+
+
+def test_varios_sitios_comparten_noticias(tmp_path, imagenes):
+    orquestador = master_orchestrator.MasterOrchestrator(output_base_dir=str(tmp_path))
+    sitios = orquestador.paso_7_generar_sitios_html(SITIOS, NOTICIAS, imagenes, {}, [{}] * 3)
+
+    assert len(sitios) == 3 and orquestador.stats['sitios_creados'] == 3
+    ordenes = []
+    for n in range(1, 4):
+        site_dir = tmp_path / f'site_{n}'
+        titulos = _titulos(site_dir)
+        assert sorted(titulos) == sorted(noticia['title'] for noticia in NOTICIAS)
+        # Cada imagen corresponde a la noticia que ocupa esa posición en el sitio
+        for k, titulo in enumerate(titulos, 1):
+            numero = re.search(r'\d+', titulo).group()
+            assert (site_dir / 'images' / f'news_{k}.jpg').read_bytes() == f'imagen {numero}'.encode()
+        ordenes.append(titulos)
+    assert len({tuple(orden) for orden in ordenes}) > 1
+
+
+def test_orden_reproducible_y_subconjunto(tmp_path, monkeypatch):
+    monkeypatch.setenv('ARTICULOS_POR_SITIO', '3')
+    orquestador = master_orchestrator.MasterOrchestrator(output_base_dir=str(tmp_path), run_id='20260101_000000')
+    otro = master_orchestrator.MasterOrchestrator(output_base_dir=str(tmp_path), run_id='20260202_000000')
+
+    seleccion = orquestador._seleccionar_noticias(20, 5, 'huella:2')
+    assert len(seleccion) == 3 == len(set(seleccion))
+    # Depende de la semilla del sitio, no de la ejecución
+    assert otro._seleccionar_noticias(20, 5, 'huella:2') == seleccion
+    assert [orquestador._seleccionar_noticias(20, 5, f'huella:{n}') for n in range(1, 6)].count(seleccion) == 1
+
+
+def test_un_sitio_conserva_el_orden(tmp_path):
+    orquestador = master_orchestrator.MasterOrchestrator(output_base_dir=str(tmp_path))
+    assert orquestador._seleccionar_noticias(6, 1, 'huella:1') == list(range(6))
+
+
+def test_misma_semilla_con_las_mismas_noticias(tmp_path):
+    """Las semillas salen del conjunto de noticias: otra ejecución con las mismas da los mismos sitios"""
+    noticias = [dict(noticia, original_id=f'id{i}') for i, noticia in enumerate(NOTICIAS)]
+    trabajos = [
+        master_orchestrator.MasterOrchestrator(output_base_dir=str(tmp_path))
+        ._trabajos_de_sitios(SITIOS, orden, {}, {}, [{}])
+        for orden in (noticias, noticias, list(reversed(noticias)))
+    ]
+    assert [t['seed'] for t in trabajos[0]] == [t['seed'] for t in trabajos[1]]
+    assert [t['layout_config'] for t in trabajos[0]] == [t['layout_config'] for t in trabajos[1]]
+    assert [t['noticias'] for t in trabajos[0]] == [t['noticias'] for t in trabajos[1]]
+    # Mismo conjunto en otro orden: misma semilla
+    assert [t['seed'] for t in trabajos[2]] == [t['seed'] for t in trabajos[0]]
+
+    otras = noticias[:-1] + [dict(noticias[-1], original_id='id_nueva')]
+    distintos = master_orchestrator.MasterOrchestrator(output_base_dir=str(tmp_path))._trabajos_de_sitios(
+        SITIOS, otras, {}, {}, [{}])
+    assert [t['seed'] for t in distintos] != [t['seed'] for t in trabajos[0]]
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test de la agrupación de noticias casi duplicadas (MinHash + LSH)
+Verifica que las copias sindicadas se agrupan, que las historias distintas no,
+y que el agrupamiento escala a miles de artículos
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Agregar directorio padre al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.near_duplicates import NearDuplicateDetector, cluster_articles, optimal_bands, select_representatives
+
+VOCABULARIO = [f'palabra{i}' for i in range(5000)]
+
+
+def _texto(rng, n=300):
+    return ' '.join(rng.choices(VOCABULARIO, k=n))
+
+
+def _copia(texto, rng, cambios=10):
+    """Misma nota con algunas palabras cambiadas (como una reedición ligera)"""
+    palabras = texto.split()
+    for idx in rng.sample(range(len(palabras)), cambios):
+        palabras[idx] = 'editado'
+    return ' '.join(palabras)
+
+
+def test_agrupa_copias_sindicadas():
+    """Las versiones de la misma nota quedan juntas y las demás separadas"""
+    rng = random.Random(1)
+    nota = _texto(rng)
+    articles = [
+        {'title': 'Lanzan chip', 'full_text': nota, 'url': 'https://a.mx/1'},
+        {'title': 'Otra historia', 'full_text': _texto(rng), 'url': 'https://b.mx/1'},
+        {'title': 'Lanzan chip', 'full_text': _copia(nota, rng), 'url': 'https://c.mx/1'},
+    ]
+
+    grupos = cluster_articles(articles)
+
+    assert [[a['url'] for a in g] for g in grupos] == [
+        ['https://a.mx/1', 'https://c.mx/1'],
+        ['https://b.mx/1'],
+    ]
+
+
+def test_representante_con_contexto():
+    """El representante es la versión más completa y lleva las URLs de las copias"""
+    rng = random.Random(2)
+    nota = _texto(rng)
+    articles = [
+        {'title': 'Nota', 'full_text': _copia(nota, rng)[:1500], 'description': 'Resumen corto', 'url': 'u1'},
+        {'title': 'Nota', 'full_text': nota, 'description': 'Resumen largo', 'url': 'u2'},
+    ]
+
+    [representante] = select_representatives(articles, merge=True)
+
+    assert representante['url'] == 'u2'
+    assert representante['cluster_size'] == 2
+    assert representante['duplicate_urls'] == ['u1']
+    assert representante['full_text'].endswith('Resumen corto')
+
+
+def test_umbral_configurable():
+    """Con un umbral alto una reedición fuerte ya no se agrupa"""
+    rng = random.Random(3)
+    nota = _texto(rng)
+    textos = [nota, _copia(nota, rng, cambios=60)]
+
+    assert len(NearDuplicateDetector(threshold=0.3).cluster(textos)) == 1
+    assert len(NearDuplicateDetector(threshold=0.9).cluster(textos)) == 2
+    assert optimal_bands(0.5, 64) == (16, 4)
+    with pytest.raises(ValueError):
+        NearDuplicateDetector(threshold=0)
+
+
+def test_miles_de_articulos_en_menos_de_un_segundo():
+    """2000 artículos de 300 palabras se agrupan en menos de un segundo"""
+    rng = random.Random(4)
+    articles = []
+    for i in range(1800):
+        texto = _texto(rng)
+        articles.append({'title': f'Nota {i}', 'full_text': texto})
+        if i % 9 == 0:
+            articles.append({'title': f'Nota {i}', 'full_text': _copia(texto, rng)})
+
+    inicio = time.perf_counter()
+    grupos = cluster_articles(articles)
+    duracion = time.perf_counter() - inicio
+
+    assert len(grupos) == 1800
+    assert duracion < 1.0
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test del ejecutor de tareas en grafo
+Verifica el orden por dependencias, el solapamiento de tareas independientes,
+las tareas por elemento y que el flujo completo del orquestador tarde cerca
+del camino crítico, con pasos falsos (sin red)
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Agregar directorio padre al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.pipeline import Pipeline
+
+
+def _tarda(segundos, valor=None):
+    def tarea(*args):
+        time.sleep(segundos)
+        return valor
+    return tarea
+
+
+def test_dependencias_y_resultados():
+    orden = []
+    pipeline = Pipeline()
+    pipeline.add('a', lambda: orden.append('a') or 2)
+    pipeline.add('b', lambda a: orden.append('b') or a * 10, deps=['a'])
+    pipeline.add('c', lambda a, b: orden.append('c') or a + b, deps=['a', 'b'])
+
+    assert pipeline.run() == {'a': 2, 'b': 20, 'c': 22}
+    assert orden == ['a', 'b', 'c']
+
+
+def test_tareas_independientes_se_solapan():
+    pipeline = Pipeline(max_workers=4)
+    for nombre in 'abc':
+        pipeline.add(nombre, _tarda(0.2, nombre))
+    pipeline.add('fin', lambda a, b, c: a + b + c, deps=['a', 'b', 'c'])
+
+    inicio = time.monotonic()
+    assert pipeline.run()['fin'] == 'abc'
+    assert time.monotonic() - inicio < 0.35
+
+    reporte = pipeline.report()
+    assert reporte['sum_seconds'] > 0.55 > reporte['wall_seconds']
+    assert reporte['tasks']['fin']['start'] >= 0.19
+
+
+def test_map_por_elemento_en_orden():
+    hilos = set()
+
+    def duplicar(x, idx, factor):
+        hilos.add(threading.current_thread().name)
+        time.sleep(0.05 * (4 - idx))  # Los últimos terminan primero
+        return (idx, x * factor)
+
+    pipeline = Pipeline(max_workers=4)
+    pipeline.add('lista', lambda: [5, 6, 7])
+    pipeline.add('factor', lambda: 2)
+    pipeline.map('dobles', duplicar, over='lista', deps=['factor'])
+    pipeline.map('vacio', duplicar, over='nada', deps=['factor'])
+    pipeline.add('nada', lambda: [])
+
+    resultados = pipeline.run()
+    assert resultados['dobles'] == [(1, 10), (2, 12), (3, 14)]
+    assert resultados['vacio'] == []
+    assert len(hilos) == 3
+    assert pipeline.report()['tasks']['dobles']['items'] == 3
+
+
+def test_funciones_async():
+    async def doble(x):
+        return x * 2
+
+    pipeline = Pipeline()
+    pipeline.add('x', lambda: 21)
+    pipeline.add('y', doble, deps=['x'])
+    assert pipeline.run()['y'] == 42
+
+
+def test_error_detiene_lo_que_depende():
+    ejecutadas = []
+
+    def falla():
+        raise RuntimeError('sin noticias')
+
+    pipeline = Pipeline()
+    pipeline.add('falla', falla)
+    pipeline.add('despues', lambda x: ejecutadas.append(x), deps=['falla'])
+
+    with pytest.raises(RuntimeError, match='sin noticias'):
+        pipeline.run()
+    assert ejecutadas == []
+
+
+def test_grafo_invalido():
+    pipeline = Pipeline().add('a', lambda b: b, deps=['b']).add('b', lambda a: a, deps=['a'])
+    with pytest.raises(ValueError, match='Ciclo'):
+        pipeline.run()
+
+    with pytest.raises(ValueError, match='inexistentes'):
+        Pipeline().add('a', lambda x: x, deps=['x']).run()
+
+
+def test_flujo_completo_se_acerca_al_camino_critico(tmp_path, monkeypatch):
+    """Imágenes, metadata, logos y CSS corren mientras se parafrasea"""
+    import master_orchestrator
+
+    monkeypatch.setenv('CHECKPOINTS', '0')
+    orquestador = master_orchestrator.MasterOrchestrator(output_base_dir=str(tmp_path))
+    noticias = [{'id': f'n{i}', 'title': f'Noticia {i}', 'url': f'https://diario.mx/{i}'} for i in range(4)]
+    sitios = [{'nombre': 'Sitio'}]
+
+    orquestador._noticias_del_flujo = lambda force_download: noticias
+    orquestador._agrupar_casi_duplicados = lambda n: n
+    orquestador.paso_2_parafrasear_noticias = lambda n, **opciones: time.sleep(0.3) or n
+    orquestador._imagen_noticia = lambda noticia, idx: time.sleep(0.2) or f'/img/{idx}.jpg'
+    orquestador.paso_4_crear_metadata_sitios = lambda num, verificar: time.sleep(0.1) or sitios
+    orquestador._generar_logo = lambda metadata, idx: time.sleep(0.1) or '/logo.jpg'
+    orquestador.paso_6_generar_templates_css = lambda num: time.sleep(0.2) or [{}]
+    recibido = {}
+
+    def paso_7(sites_metadata, noticias, imagenes, logos, templates):
+        recibido.update(imagenes=imagenes, logos=logos)
+        return ['index.html']
+
+    orquestador.paso_7_generar_sitios_html = paso_7
+
+    inicio = time.monotonic()
+    resultado = orquestador.ejecutar_flujo_completo()
+    total = time.monotonic() - inicio
+
+    assert resultado['success'], resultado.get('error')
+    assert resultado['sitios_generados'] == ['index.html']
+    assert recibido['imagenes'] == {f'article_{i}': f'/img/{i}.jpg' for i in range(1, 5)}
+    assert recibido['logos'] == {1: '/logo.jpg'}
+    # En serie: 0.3 + 4 × 0.2 + 0.1 + 0.1 + 0.2 = 1.5 s; camino crítico 0.3 s
+    assert total < 0.8
+    reporte = resultado['stats']['pipeline']
+    assert reporte['wall_seconds'] < 0.6 < reporte['sum_seconds']
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test del límite de tasa adaptativo
+Verifica que solo se espera cuando el proveedor lo pide (429, Retry-After,
+cabeceras de cuota) o se agota su presupuesto, y que los POST se reintentan
+tras un 429, con respuestas falsas (sin red)
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+import requests
+
+# Agregar directorio padre al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils import http_client, rate_limit
+from utils.rate_limit import AdaptiveRateLimiter, RateLimited, provider_for
+
+URL = 'https://api.proveedor.com/v1/recurso'
+
+
+class _Respuesta:
+    def __init__(self, status_code=200, headers=None):
+        self.status_code = status_code
+        self.headers = requests.structures.CaseInsensitiveDict(headers or {})
+        self.cerrada = False
+
+    def close(self):
+        self.cerrada = True
+
+
+def _cronometrar(funcion, *args):
+    inicio = time.monotonic()
+    funcion(*args)
+    return time.monotonic() - inicio
+
+
+def test_sin_senales_no_espera():
+    """Sin presupuesto ni respuestas de límite, cientos de turnos son inmediatos"""
+    limiter = AdaptiveRateLimiter(budgets={})
+    inicio = time.monotonic()
+    for _ in range(300):
+        limiter.acquire(URL)
+        limiter.observe(URL, _Respuesta())
+    assert time.monotonic() - inicio < 0.1
+    assert limiter.report() == {}
+
+
+def test_retry_after_bloquea_al_proveedor():
+    """Un 429 con Retry-After frena al proveedor, no a los demás"""
+    limiter = AdaptiveRateLimiter(budgets={})
+    assert limiter.observe(URL, _Respuesta(429, {'Retry-After': '0.2'}))
+
+    assert _cronometrar(limiter.acquire, 'https://otro.com/x') < 0.05
+    assert _cronometrar(limiter.acquire, URL) >= 0.15
+    assert limiter.report()[provider_for(URL)]['throttled'] == 1
+
+
+def test_espera_excesiva_falla_de_inmediato():
+    """Si el proveedor exige más que max_wait se lanza RateLimited (RequestException)"""
+    limiter = AdaptiveRateLimiter(budgets={}, max_wait=1)
+    limiter.observe(URL, _Respuesta(429, {'Retry-After': '3600'}))
+
+    with pytest.raises(requests.exceptions.RequestException) as error:
+        limiter.acquire(URL)
+    assert isinstance(error.value, RateLimited)
+
+
+def test_cabeceras_de_cuota():
+    """Cuota agotada bloquea hasta el reset; pocas restantes se reparten en la ventana"""
+    limiter = AdaptiveRateLimiter(budgets={})
+    limiter.observe(URL, _Respuesta(200, {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': '0.15'}))
+    assert _cronometrar(limiter.acquire, URL) >= 0.1
+
+    limiter = AdaptiveRateLimiter(budgets={})
+    limiter.observe(URL, _Respuesta(200, {'ratelimit-remaining': '2', 'ratelimit-reset': '0.2'}))
+    limiter.acquire(URL)
+    assert _cronometrar(limiter.acquire, URL) >= 0.08
+
+    # Con cuota holgada vuelve a ir a toda velocidad
+    limiter.observe(URL, _Respuesta(200, {'X-RateLimit-Remaining': '500', 'X-RateLimit-Reset': '60'}))
+    time.sleep(0.11)
+    assert _cronometrar(limiter.acquire, URL) < 0.05
+
+
+def test_presupuesto_por_proveedor():
+    limiter = AdaptiveRateLimiter(budgets={'https://api.proveedor.com': (2, 0.2)})
+    limiter.acquire(URL)
+    limiter.acquire(URL)
+    assert _cronometrar(limiter.acquire, URL) >= 0.08
+
+
+def test_post_se_reintenta_tras_429(monkeypatch):
+    """El cliente HTTP reintenta un POST con 429 tras esperar el Retry-After"""
+    respuestas = [_Respuesta(429, {'Retry-After': '0.1'}), _Respuesta(200)]
+    enviadas = []
+
+    class _Sesion:
+        def request(self, method, url, timeout=None, **kwargs):
+            enviadas.append(time.monotonic())
+            return respuestas.pop(0)
+
+    monkeypatch.setattr(http_client, 'get_session', lambda: _Sesion())
+    monkeypatch.setattr(rate_limit, '_default_limiter', AdaptiveRateLimiter(budgets={}))
+
+    response = http_client.post(URL, json={})
+
+    assert response.status_code == 200
+    assert len(enviadas) == 2 and enviadas[1] - enviadas[0] >= 0.08
+
+
+def test_desactivable(monkeypatch):
+    monkeypatch.setenv('RATE_LIMIT', '0')
+    assert rate_limit.get_rate_limiter() is None
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test del renderizado de sitios en un pool de procesos
+Verifica que los trabajos se ejecutan con su semilla y en orden, y que el
+paso 7 genera exactamente los mismos archivos en serie que en varios
+procesos para el mismo run_id, sin red
+"""
+
+import os
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Agregar directorio padre al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import master_orchestrator
+from utils import tracing
+from utils.site_jobs import resolve_processes, run_jobs, site_seed
+
+NOTICIAS = [{'title': f'Noticia {i}', 'description': f'Resumen {i}', 'category': c,
+             'full_article': f'Cuerpo de la noticia {i}.', 'author': 'Redacción'}
+            for i, c in zip(range(1, 7), ['tecnología', 'política', 'economía'] * 2)]
+SITIOS = [{'nombre': f'Sitio {n}', 'tagline': 'Noticias', 'dominio': f'sitio{n}.com'} for n in range(1, 5)]
+
+
+def _medir(job):
+    """Trabajo de prueba que abre un span y suma una métrica en el proceso hijo"""
+    with tracing.span("sitio", "elemento", index=job['site_num']):
+        tracing.add('archivos', job['site_num'])
+    return job['site_num']
+
+
+def _sortear(job):
+    """Trabajo de prueba (de nivel de módulo para poder enviarse a otro proceso)"""
+    return job['site_num'], [random.random() for _ in range(3)]
+
+
+def _archivos(directorio: Path):
+    return {str(p.relative_to(directorio)): p.read_bytes() for p in sorted(directorio.rglob('*')) if p.is_file()}
+
+
+def test_trabajos_sembrados_y_en_orden():
+    trabajos = [{'site_num': n, 'seed': site_seed('20260101_000000', n)} for n in range(1, 5)]
+    estado = random.getstate()
+
+    en_serie = run_jobs(_sortear, trabajos, 0)
+    assert random.getstate() == estado
+    assert [n for n, _ in en_serie] == [1, 2, 3, 4]
+    assert len({tuple(valores) for _, valores in en_serie}) == 4
+    assert run_jobs(_sortear, trabajos, 2) == en_serie
+    assert run_jobs(_sortear, list(reversed(trabajos)), 2) == list(reversed(en_serie))
+
+
+def test_spans_de_los_procesos_llegan_a_la_traza():
+    trabajos = [{'site_num': n, 'seed': site_seed('20260101_000000', n)} for n in range(1, 4)]
+    tracer = tracing.Tracer()
+    with tracer.activate():
+        with tracing.span("html") as etapa:
+            assert run_jobs(_medir, trabajos, 2) == [1, 2, 3]
+
+    resumen = tracer.summary()
+    assert resumen['stages']['sitio']['count'] == 3
+    assert resumen['stages']['sitio']['archivos'] == 6
+    assert resumen['stages']['html']['archivos'] == 6 and resumen['totals']['archivos'] == 6
+    sitios = [span for span in tracer.spans if span.name == 'sitio']
+    assert all(span.parent is etapa and span.end >= span.start for span in sitios)
+    assert len(tracer.chrome_trace()['traceEvents']) > 4
+
+
+def test_resolver_procesos(monkeypatch):
+    assert resolve_processes(3) == 3
+    assert resolve_processes(-1) >= 1
+    if 'RENDER_PROCESSES' not in os.environ:
+        # Por defecto, uno por núcleo
+        assert resolve_processes() == (os.cpu_count() or 1)
+    monkeypatch.setattr('utils.site_jobs.DEFAULT_PROCESSES', 2)
+    assert resolve_processes() == 2
+
+
+@pytest.fixture
+def imagenes(tmp_path):
+    compartidas = tmp_path / 'imagenes_compartidas'
+    compartidas.mkdir()
+    rutas = {}
+    for i in range(1, 7):
+        ruta = compartidas / f'news_{i}.jpg'
+        ruta.write_bytes(f'imagen {i}'.encode())
+        rutas[f'article_{i}'] = str(ruta)
+    return rutas
+
+
+def test_paso_7_igual_en_serie_y_en_procesos(tmp_path, imagenes):
+    salidas = {}
+    for procesos in (0, 2):
+        salida = tmp_path / f'procesos_{procesos}'
+        orquestador = master_orchestrator.MasterOrchestrator(output_base_dir=str(salida),
+                                                             run_id='20260101_000000', procesos=procesos)
+        sitios = orquestador.paso_7_generar_sitios_html(SITIOS, NOTICIAS, imagenes, {}, [{}] * 4)
+
+        assert len(sitios) == 4 and orquestador.stats['sitios_creados'] == 4
+        salidas[procesos] = {nombre: contenido for nombre, contenido in _archivos(salida).items()
+                             if nombre.startswith('site_')}
+
+    assert len([n for n in salidas[0] if n.endswith('index.html')]) == 4
+    assert salidas[0] == salidas[2]
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test del sidebar de las páginas de artículo
+Verifica que las tarjetas del sidebar se renderizan una sola vez por sitio
+(no una vez por página), que no se copian los artículos y que cada página
+muestra los primeros artículos del sitio salvo el propio
+"""
+
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+# Agregar directorio padre al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import site_renderer
+from utils.templates import get_environment
+
+METADATA = {'nombre': 'Diario de Prueba', 'tagline': 'Noticias', 'dominio': 'diarioprueba.com'}
+
+
+class _SinCopia(dict):
+    """Artículo que falla si alguien lo copia"""
+
+    def copy(self):
+        raise AssertionError("el artículo no debe copiarse")
+
+
+def _noticias(cantidad):
+    return [_SinCopia(title=f'Noticia {i}', description=f'Resumen {i}', category='tecnología',
+                      full_article=f'Cuerpo {i}.', published_at='2026-01-16T10:00:00Z')
+            for i in range(1, cantidad + 1)]
+
+
+def _enlaces_sidebar(html):
+    return [int(n) for n in re.findall(r'href="article_(\d+)\.html" class="sidebar-article-link"', html)]
+
+
+@pytest.fixture
+def conteo(monkeypatch):
+    """Cuenta los renders de la tarjeta del sidebar y del sidebar completo"""
+    entorno = get_environment()
+    renders = {'tarjeta': 0, 'sidebar': 0}
+    for nombre, parcial in (('tarjeta', 'parciales/tarjeta_sidebar.html'), ('sidebar', 'parciales/sidebar.html')):
+        template = entorno.get_template(parcial)
+        original = template.render
+
+        def contar(*args, _nombre=nombre, _original=original, **kwargs):
+            renders[_nombre] += 1
+            return _original(*args, **kwargs)
+
+        monkeypatch.setattr(template, 'render', contar)
+    return renders
+
+
+def test_cada_pagina_muestra_los_primeros_salvo_la_propia(tmp_path):
+    site_renderer.generar_paginas_articulos(tmp_path, _noticias(10), METADATA)
+
+    limite = site_renderer.SIDEBAR_ARTICULOS
+    for idx in range(1, 11):
+        html = (tmp_path / f'article_{idx}.html').read_text(encoding='utf-8')
+        esperado = [i for i in range(1, limite + 2) if i != idx][:limite]
+        assert _enlaces_sidebar(html) == esperado
+        assert f'<h1 class="article-title">Noticia {idx}</h1>' in html
+
+
+def test_tarjetas_se_renderizan_una_vez(tmp_path, conteo):
+    site_renderer.generar_paginas_articulos(tmp_path, _noticias(300), METADATA)
+
+    limite = site_renderer.SIDEBAR_ARTICULOS
+    assert len(list(tmp_path.glob('article_*.html'))) == 300
+    # Una tarjeta por artículo que puede aparecer en un sidebar, sin importar el tamaño del sitio
+    assert conteo['tarjeta'] == limite + 1
+    # Un sidebar distinto por cada uno de esos artículos más el que comparten los demás
+    assert conteo['sidebar'] == limite + 2
+
+
+def test_sitio_mas_chico_que_el_sidebar(tmp_path, conteo):
+    site_renderer.generar_paginas_articulos(tmp_path, _noticias(3), METADATA)
+
+    assert conteo['tarjeta'] == 3
+    assert _enlaces_sidebar((tmp_path / 'article_2.html').read_text(encoding='utf-8')) == [1, 3]
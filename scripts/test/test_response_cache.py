@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test de la caché persistente de respuestas HTTP
+Verifica TTL, revalidación condicional (304) y expulsión LRU por tamaño
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+# Agregar directorio padre al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils import response_cache, utils
+from utils.response_cache import ResponseCache
+
+HTML = b"<html><body><nav>menu</nav><p>Primer parrafo.</p><p>Segundo.</p></body></html>"
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, content=HTML, headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise utils.requests.exceptions.HTTPError(str(self.status_code))
+
+
+def _instalar(monkeypatch, tmp_path, respuestas, ttl=3600):
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite'), ttl=ttl)
+    llamadas = []
+
+    def fake_get(url, headers=None, timeout=None):
+        llamadas.append(dict(headers or {}))
+        return respuestas.pop(0)
+
+    monkeypatch.setattr(utils, 'get_response_cache', lambda: cache)
+    monkeypatch.setattr(utils.http_client, 'get', fake_get)
+    return cache, llamadas
+
+
+def test_hit_dentro_de_ttl(monkeypatch, tmp_path):
+    """Dentro del TTL no hay petición ni parseo"""
+    cache, llamadas = _instalar(monkeypatch, tmp_path, [FakeResponse(headers={'ETag': '"v1"'})])
+
+    primero = utils.get_full_text('https://diario.mx/nota')
+    monkeypatch.setattr(utils, 'extract_text', lambda *a, **k: 1 / 0)
+    segundo = utils.get_full_text('https://diario.mx/nota')
+
+    assert primero == segundo == 'Primer parrafo. Segundo.'
+    assert len(llamadas) == 1
+    assert cache.stats['hits'] == 1
+
+
+def test_revalidacion_condicional(monkeypatch, tmp_path):
+    """Al vencer el TTL se envía If-None-Match y un 304 reutiliza el texto"""
+    cache, llamadas = _instalar(
+        monkeypatch, tmp_path,
+        [FakeResponse(headers={'ETag': '"v1"', 'Last-Modified': 'Mon, 05 Jan 2026 10:00:00 GMT'}),
+         FakeResponse(status_code=304, content=b'')],
+        ttl=0
+    )
+
+    utils.get_full_text('https://diario.mx/nota')
+    texto = utils.get_full_text('https://diario.mx/nota')
+
+    assert texto == 'Primer parrafo. Segundo.'
+    assert llamadas[1]['If-None-Match'] == '"v1"'
+    assert llamadas[1]['If-Modified-Since'] == 'Mon, 05 Jan 2026 10:00:00 GMT'
+    assert cache.stats['revalidated'] == 1
+
+
+def test_304_guarda_los_validadores_nuevos(monkeypatch, tmp_path):
+    """Un 304 con otro ETag lo reemplaza; sin Last-Modified conserva el anterior"""
+    cache, llamadas = _instalar(
+        monkeypatch, tmp_path,
+        [FakeResponse(headers={'ETag': '"v1"', 'Last-Modified': 'Mon, 05 Jan 2026 10:00:00 GMT'}),
+         FakeResponse(status_code=304, content=b'', headers={'ETag': '"v2"'}),
+         FakeResponse(status_code=304, content=b'')],
+        ttl=0
+    )
+
+    for _ in range(3):
+        utils.get_full_text('https://diario.mx/nota')
+
+    assert llamadas[2]['If-None-Match'] == '"v2"'
+    assert llamadas[2]['If-Modified-Since'] == 'Mon, 05 Jan 2026 10:00:00 GMT'
+
+
+def test_hit_no_descomprime_el_html(monkeypatch, tmp_path):
+    """Con el texto ya extraído el HTML guardado no se descomprime"""
+    _instalar(monkeypatch, tmp_path, [FakeResponse()])
+    utils.get_full_text('https://diario.mx/nota')
+
+    monkeypatch.setattr(response_cache, 'zlib', None)
+    assert utils.get_full_text('https://diario.mx/nota') == 'Primer parrafo. Segundo.'
+
+
+def test_reextrae_con_otros_limites(monkeypatch, tmp_path):
+    """Con otros max_paragraphs se re-extrae del HTML guardado sin red"""
+    _, llamadas = _instalar(monkeypatch, tmp_path, [FakeResponse()])
+
+    utils.get_full_text('https://diario.mx/nota')
+    texto = utils.get_full_text('https://diario.mx/nota', max_paragraphs=1)
+
+    assert texto == 'Primer parrafo.'
+    assert len(llamadas) == 1
+
+
+def test_expulsion_lru(tmp_path):
+    """Se expulsan primero las entradas menos usadas recientemente"""
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite'), max_bytes=2500)
+    cuerpo = os.urandom(1000)  # ~1 KB incompresible
+
+    cache.put('https://a.mx', cuerpo)
+    time.sleep(0.01)
+    cache.put('https://b.mx', cuerpo)
+    time.sleep(0.01)
+    cache.get('https://a.mx')  # 'a' pasa a ser la más reciente
+    time.sleep(0.01)
+    cache.put('https://c.mx', cuerpo)
+
+    assert cache.get('https://b.mx') is None
+    assert cache.get('https://a.mx') is not None
+    assert cache.get('https://c.mx') is not None
+    assert cache.total_size() <= 2500
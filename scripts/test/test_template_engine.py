@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Test del motor de templates compilados
+Verifica el escape automático, los bloques, los parciales insertados al
+compilar, la caché de templates y que las páginas de los sitios y las
+legales salen de los templates compartidos con el contenido escapado
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Agregar directorio padre al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import site_renderer
+from layout_generator import LayoutGenerator
+from legal_pages_generator import LegalPagesGenerator
+from utils.templates import Markup, Template, TemplateEnvironment, TemplateError, escape
+
+METADATA = {'nombre': 'Diario <B> & Cía', 'tagline': 'Lo "último"', 'dominio': 'diariob.com'}
+
+
+def test_escape_automatico_y_markup():
+    template = Template('<p title="{{ valor }}">{{ valor }}</p>{{ html }}{{ crudo|safe }}{{ nada }}')
+    salida = template.render(valor='<a href="x">O\'Neil & co</a>', html=Markup('<b>ok</b>'),
+                             crudo='<i>sin escapar</i>', nada=None)
+
+    assert salida == ('<p title="&lt;a href=&quot;x&quot;&gt;O&#x27;Neil &amp; co&lt;/a&gt;">'
+                      '&lt;a href=&quot;x&quot;&gt;O&#x27;Neil &amp; co&lt;/a&gt;</p><b>ok</b><i>sin escapar</i>')
+    assert isinstance(salida, Markup)
+    assert escape(salida) == salida
+    assert escape(3) == '3'
+
+
+def test_bloques_y_lineas_de_bloque():
+    template = Template(
+        '<ul>\n'
+        '{% for i, nombre in enumerate(nombres, 1) %}\n'
+        '{% set impar = i % 2 %}\n'
+        '    <li{% if impar %} class="impar"{% endif %}>{{ i }}. {{ nombre.upper() }}</li>\n'
+        '{% endfor %}\n'
+        '</ul>\n'
+        '{% if not nombres %}\n'
+        'vacío\n'
+        '{% elif len(nombres) > 2 %}\n'
+        'muchos\n'
+        '{% else %}\n'
+        'pocos\n'
+        '{% endif %}\n'
+    )
+
+    assert template.render(nombres=['ana', 'luis']) == (
+        '<ul>\n    <li class="impar">1. ANA</li>\n    <li>2. LUIS</li>\n</ul>\npocos\n')
+    assert template.render(nombres=[]) == '<ul>\n</ul>\nvacío\n'
+    assert template.render(nombres=['a', 'b', 'c']).endswith('</ul>\nmuchos\n')
+
+
+def test_errores_de_sintaxis():
+    with pytest.raises(TemplateError, match='falta endif'):
+        Template('{% if x %}sin cerrar')
+    with pytest.raises(TemplateError, match='endfor sin for'):
+        Template('{% endfor %}')
+    with pytest.raises(TemplateError, match='expresión inválida'):
+        Template('{{ 1 + }}')
+    with pytest.raises(TemplateError, match='bloque desconocido'):
+        Template('{% macro x %}')
+
+
+def test_parciales_y_cache(tmp_path):
+    (tmp_path / 'parciales').mkdir()
+    (tmp_path / 'parciales' / 'item.html').write_text('<li>{{ item }}</li>\n', encoding='utf-8')
+    (tmp_path / 'lista.html').write_text(
+        '{% for item in items %}\n{% include "parciales/item.html" %}\n{% endfor %}\n', encoding='utf-8')
+    (tmp_path / 'ciclo.html').write_text('{% include "ciclo.html" %}', encoding='utf-8')
+
+    entorno = TemplateEnvironment(str(tmp_path))
+    lecturas = []
+    cargar = entorno._load_source
+    entorno._load_source = lambda nombre: lecturas.append(nombre) or cargar(nombre)
+
+    for _ in range(50):
+        salida = entorno.render('lista.html', items=['<uno>', 'dos'])
+    assert salida == '<li>&lt;uno&gt;</li>\n<li>dos</li>\n'
+    # Se compila una sola vez, con el parcial insertado en la misma función
+    assert lecturas == ['lista.html', 'parciales/item.html']
+    assert entorno.get_template('lista.html') is entorno.get_template('lista.html')
+
+    with pytest.raises(TemplateError, match='circular'):
+        entorno.get_template('ciclo.html')
+    with pytest.raises(TemplateError, match='no encontrado'):
+        entorno.get_template('no_existe.html')
+
+
+def test_paginas_del_sitio_escapan_contenido(tmp_path):
+    noticias = [
+        {'title': '<script>alert(1)</script>', 'description': 'A & B', 'category': 'tecnología',
+         'full_article': 'Primer párrafo.\n\nSegundo <b>párrafo</b>.', 'author': 'Redacción'},
+        {'title': 'Otra noticia', 'description': 'Resumen', 'category': 'política',
+         'full_article': 'Texto.', 'author': 'Redacción'},
+    ]
+
+    layout_config = LayoutGenerator().generar_configuracion_layout()
+    index_html = site_renderer.generar_index_html(METADATA, noticias, layout_config, 1)
+    site_renderer.generar_paginas_articulos(tmp_path, noticias, METADATA, logo_path='logo.jpg')
+    articulo = (tmp_path / 'article_1.html').read_text(encoding='utf-8')
+
+    for html in (index_html, articulo):
+        assert '<script>' not in html
+        assert '&lt;script&gt;alert(1)&lt;/script&gt;' in html
+    assert '<title>Diario &lt;B&gt; &amp; Cía - Lo &quot;último&quot;</title>' in index_html
+    assert '<p class="lead">Primer párrafo.</p>' in articulo
+    assert '<p>Segundo &lt;b&gt;párrafo&lt;/b&gt;.</p>' in articulo
+    assert 'alt="Diario &lt;B&gt; &amp; Cía" class="logo-img"' in articulo
+    # El sidebar enlaza a los demás artículos del sitio por su número
+    assert 'href="article_2.html" class="sidebar-article-link"' in articulo
+    assert 'href="article_1.html" class="sidebar-article-link"' not in articulo
+
+
+def test_paginas_legales_desde_templates():
+    generador = LegalPagesGenerator()
+    paginas = [
+        generador.generar_terminos_condiciones(METADATA['nombre'], METADATA['dominio']),
+        generador.generar_politica_privacidad(METADATA['nombre'], METADATA['dominio']),
+        generador.generar_faqs(METADATA['nombre']),
+        generador.generar_acerca_de(METADATA['nombre'], METADATA['tagline'], METADATA['dominio']),
+    ]
+
+    for html in paginas:
+        assert html.startswith('<!DOCTYPE html>') and html.rstrip().endswith('</html>')
+        assert 'Diario &lt;B&gt; &amp; Cía' in html and '<B>' not in html
+        assert '{{' not in html and '{%' not in html
+    assert 'legal@diariob.com' in paginas[0]
+    assert paginas[2].count('class="faq-item"') == 10
+    assert 'Lo &quot;último&quot;' in paginas[3]
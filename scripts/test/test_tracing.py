@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Test de las trazas por etapa y por elemento
+Verifica el anidamiento de spans, que las métricas (bytes, tokens, caché,
+reintentos) se suman al span activo y sus ancestros aun entre hilos, y el
+formato de trace events de Chrome, sin red
+"""
+
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+# Agregar directorio padre al path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils import http_client, llm_client, tracing
+from utils.llm_cache import LLMCache
+from utils.llm_client import LLMClient
+from utils.tracing import Tracer
+
+
+def test_sin_tracer_activo_no_hace_nada():
+    with tracing.span('etapa') as span:
+        tracing.add('http_bytes', 100)
+    assert span is None
+
+
+def test_metricas_suben_a_los_ancestros():
+    tracer = Tracer()
+    with tracer.activate():
+        with tracing.span('imagenes'):
+            for i in range(1, 4):
+                with tracing.span('imagen', 'elemento', index=i):
+                    tracing.add('http_bytes', 100 * i)
+                    tracing.add('llm_cache_hits' if i > 1 else 'llm_cache_misses')
+                    time.sleep(0.01)
+
+    resumen = tracer.summary()
+    assert resumen['totals']['http_bytes'] == 600
+    assert resumen['totals']['llm_cache_hit_rate'] == pytest.approx(0.667, abs=0.001)
+    imagen, imagenes = resumen['stages']['imagen'], resumen['stages']['imagenes']
+    assert imagen['count'] == 3 and imagen['http_bytes'] == 600 and imagen['per_second'] > 0
+    assert imagenes['count'] == 1 and imagenes['http_bytes'] == 600
+    assert imagenes['seconds'] >= imagen['seconds'] >= 0.03
+
+
+def test_bind_conserva_el_span_en_otro_hilo():
+    tracer = Tracer()
+    with tracer.activate(), tracing.span('etapa'), ThreadPoolExecutor(2) as pool:
+        pool.submit(tracing.bind(tracing.add, 'llm_requests')).result()
+        pool.submit(tracing.add, 'perdida').result()  # Sin bind: sin contexto
+
+    assert tracer.summary()['stages']['etapa'] == {'count': 1, 'seconds': pytest.approx(0, abs=0.1),
+                                                   'wall_seconds': pytest.approx(0, abs=0.1),
+                                                   'llm_requests': 1}
+    assert 'perdida' not in tracer.totals
+
+
+def test_cliente_http_registra_bytes_y_reintentos(monkeypatch):
+    class _Reintentos:
+        history = ('primer intento', 'segundo intento')
+
+    class _Raw:
+        retries = _Reintentos()
+
+    class _Respuesta:
+        status_code = 200
+        headers = {}
+        content = b'x' * 2048
+        raw = _Raw()
+
+    class _Sesion:
+        def request(self, method, url, timeout=None, **kwargs):
+            return _Respuesta()
+
+    monkeypatch.setattr(http_client, 'get_session', lambda: _Sesion())
+    tracer = Tracer()
+    with tracer.activate(), tracing.span('descarga'):
+        http_client.get('https://ejemplo.mx/pagina')
+
+    assert dict(tracer.totals) == {'http_requests': 1, 'http_bytes': 2048, 'http_retries': 2}
+
+
+def test_tokens_y_cache_del_llm(monkeypatch, tmp_path):
+    class _Respuesta:
+        status_code = 200
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return {'choices': [{'message': {'content': 'respuesta'}}],
+                    'usage': {'prompt_tokens': 120, 'completion_tokens': 30}}
+
+    monkeypatch.setattr(llm_client.http_client, 'post', lambda *a, **k: _Respuesta())
+    monkeypatch.setattr(llm_client, 'get_llm_cache', lambda: cache)
+    cache = LLMCache(str(tmp_path / 'llm.sqlite'))
+    cliente = LLMClient(rate_per_minute=0)
+    payload = {'model': 'm', 'messages': [{'role': 'user', 'content': 'hola'}]}
+
+    tracer = Tracer()
+    with tracer.activate(), tracing.span('parafraseo'):
+        cliente.complete(payload, {})
+        cliente.complete(payload, {})  # De la caché: sin tokens
+
+    etapa = tracer.summary()['stages']['parafraseo']
+    assert (etapa['llm_requests'], etapa['llm_tokens_in'], etapa['llm_tokens_out']) == (1, 120, 30)
+    assert (etapa['llm_cache_hits'], etapa['llm_cache_misses'], etapa['llm_cache_hit_rate']) == (1, 1, 0.5)
+
+
+def test_trace_events_de_chrome(tmp_path):
+    tracer = Tracer()
+    with tracer.activate():
+        with tracing.span('sitio', 'elemento', index=2):
+            tracing.add('http_bytes', 10)
+
+    ruta = tracer.write_chrome_trace(tmp_path / 'trace.json')
+    eventos = json.loads(ruta.read_text())['traceEvents']
+    completo = [e for e in eventos if e['ph'] == 'X'][0]
+    assert completo['name'] == 'sitio #2' and completo['cat'] == 'elemento'
+    assert completo['args'] == {'index': 2, 'http_bytes': 10}
+    assert completo['dur'] >= 0 and any(e['ph'] == 'M' for e in eventos)
+
+
+def test_resumen_de_la_ejecucion(tmp_path, monkeypatch):
+    """El run_summary incluye las etapas y, con trace=True, se escribe el trace"""
+    import master_orchestrator
+
+    monkeypatch.setenv('CHECKPOINTS', '0')
+    orquestador = master_orchestrator.MasterOrchestrator(output_base_dir=str(tmp_path), trace=True)
+    noticias = [{'id': f'n{i}', 'title': f'Noticia {i}'} for i in range(3)]
+
+    def imagen(noticia, idx):
+        tracing.add('http_bytes', 1000)
+        return None
+
+    orquestador._noticias_del_flujo = lambda force_download: noticias
+    orquestador._agrupar_casi_duplicados = lambda n: n
+    orquestador.paso_2_parafrasear_noticias = lambda n, **opciones: n
+    orquestador._imagen_noticia = imagen
+    orquestador.paso_4_crear_metadata_sitios = lambda num, verificar: [{'nombre': 'Sitio'}]
+    orquestador._generar_logo = lambda metadata, idx: None
+    orquestador.paso_6_generar_templates_css = lambda num: [{}]
+    orquestador.paso_7_generar_sitios_html = lambda *args: ['index.html']
+
+    resultado = orquestador.ejecutar_flujo_completo()
+
+    etapas = resultado['stats']['trazas']['stages']
+    assert etapas['imagenes']['count'] == 3 and etapas['imagenes']['http_bytes'] == 3000
+    assert {'noticias', 'parafraseadas', 'sitios', 'templates', 'html'} <= set(etapas)
+    resumen = json.loads((tmp_path / f"run_summary_{orquestador.run_id}.json").read_text())
+    assert resumen['stats']['trazas']['totals']['http_bytes'] == 3000
+    assert (tmp_path / f"trace_{orquestador.run_id}.json").exists()
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Repositorio local de artículos en SQLite
+Reemplaza la búsqueda de archivos JSON en data/: los artículos descargados se
+insertan de forma incremental (sin duplicar URLs) y los pasos posteriores
+consultan "los N más recientes sin usar" con un índice, sin cargar archivos
+completos. La tabla sigue de cerca a `articles` de workers/schema.sql.
+
+Uso:
+    python3 utils/article_repository.py import data/raw/newsapi.ndjson
+    python3 utils/article_repository.py count
+    python3 utils/article_repository.py latest 10
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+# Ejecutado como script: el paquete utils está en el directorio padre
+if __name__ == '__main__':
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.dedup import url_hash
+
+DEFAULT_DB_PATH = Path(__file__).resolve().parents[2] / 'data' / 'articles.sqlite'
+
+# Columnas propias de la tabla; el resto de campos del artículo va en `extra`
+COLUMNS = (
+    'url', 'source', 'source_name', 'title', 'description', 'content', 'full_text',
+    'image_url', 'author', 'category', 'published_at'
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id TEXT PRIMARY KEY,
+    url TEXT,
+    source TEXT,
+    source_name TEXT,
+    title TEXT NOT NULL,
+    description TEXT,
+    content TEXT,
+    full_text TEXT,
+    image_url TEXT,
+    author TEXT,
+    category TEXT,
+    published_at TEXT,
+    extra TEXT,
+    created_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%SZ', 'now')),
+    used_at TEXT,
+    used_run TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_articles_published_at ON articles(published_at DESC);
+CREATE INDEX IF NOT EXISTS idx_articles_source ON articles(source, published_at DESC);
+CREATE INDEX IF NOT EXISTS idx_articles_category ON articles(category, published_at DESC);
+CREATE INDEX IF NOT EXISTS idx_articles_unused ON articles(published_at DESC) WHERE used_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_articles_used_run ON articles(used_run);
+"""
+
+# Campos de un artículo crudo de NewsAPI que normalize_article ya traduce
+NEWSAPI_RAW_KEYS = ('source', 'author', 'title', 'description', 'url', 'urlToImage', 'publishedAt', 'content')
+
+
+def article_id(article: Dict) -> str:
+    """
+    Identificador estable de un artículo: hash SHA-1 de su URL canónica
+
+    Los artículos sin URL se identifican por fuente y título.
+
+    Args:
+        article: Diccionario normalizado del artículo
+
+    Returns:
+        Hash hexadecimal
+    """
+    if article.get('url'):
+        return url_hash(article['url'])
+    key = f"{article.get('source', '')}|{article.get('title', '')}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def normalize_published_at(value: Optional[str]) -> Optional[str]:
+    """
+    Normaliza la fecha de publicación a ISO 8601 en UTC para ordenar como texto
+
+    Cada API usa un formato distinto ('2026-01-07T22:51:00Z',
+    '2026-01-07 22:51:00', con zona horaria...); si no se reconoce se
+    conserva tal cual.
+
+    Args:
+        value: Fecha como la entrega la API
+
+    Returns:
+        Fecha 'YYYY-MM-DDTHH:MM:SSZ' o el valor original
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    except ValueError:
+        return value
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc)
+    return parsed.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def normalize_record(article: Dict) -> Dict:
+    """
+    Lleva un registro a la forma normalizada antes de guardarlo
+
+    Los JSON antiguos de data/ guardan artículos crudos de NewsAPI ('source'
+    es un dict, 'publishedAt', 'urlToImage'): pasan por normalize_article y
+    conservan los campos agregados después (full_text, category...). Los ya
+    normalizados se devuelven tal cual.
+
+    Args:
+        article: Artículo normalizado o crudo de NewsAPI
+
+    Returns:
+        Artículo normalizado
+    """
+    if not isinstance(article.get('source'), dict):
+        return article
+    from utils.utils import normalize_article
+
+    normalized = normalize_article(article, 'newsapi')
+    normalized.update({k: v for k, v in article.items() if k not in NEWSAPI_RAW_KEYS and v not in (None, '')})
+    return normalized
+
+
+def _scalar(value):
+    """Valor que SQLite puede guardar: listas y dicts se guardan como JSON"""
+    if value is None or isinstance(value, (str, int, float, bytes)):
+        return value
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+class ArticleRepository:
+    """Artículos en SQLite con inserción incremental y consultas por índice"""
+
+    def __init__(self, path: str = None):
+        """
+        Inicializa el repositorio
+
+        Args:
+            path: Ruta del archivo SQLite (default: ARTICLES_DB o data/articles.sqlite)
+        """
+        self.path = Path(path or os.getenv('ARTICLES_DB') or DEFAULT_DB_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+
+    @staticmethod
+    def _to_row(article: Dict) -> tuple:
+        extra = {k: v for k, v in article.items() if k not in COLUMNS and k != 'id'}
+        values = [_scalar(article.get(column)) for column in COLUMNS]
+        values[COLUMNS.index('title')] = article.get('title') or ''
+        values[COLUMNS.index('published_at')] = normalize_published_at(article.get('published_at'))
+        return (article_id(article), *values, json.dumps(extra, ensure_ascii=False, default=str) if extra else None)
+
+    @staticmethod
+    def _to_article(row: sqlite3.Row) -> Dict:
+        # Las columnas vacías no se copian: quien hace .get(campo, default) recibe su default
+        article = {'id': row['id']}
+        article.update({column: row[column] for column in COLUMNS if row[column] is not None})
+        if row['extra']:
+            article.update(json.loads(row['extra']))
+        return article
+
+    def add_articles(self, articles: Iterable[Dict]) -> int:
+        """
+        Inserta artículos nuevos; los ya conocidos (misma URL) se ignoran
+
+        Si un artículo existente no tenía texto completo y el nuevo sí, se
+        completa. Los artículos crudos de NewsAPI se normalizan y los que no
+        se pueden guardar se omiten uno a uno, sin perder el resto del lote.
+
+        Args:
+            articles: Artículos normalizados o crudos de NewsAPI (cualquier iterable)
+
+        Returns:
+            Número de artículos insertados
+        """
+        rows = []
+        for article in articles:
+            try:
+                rows.append(self._to_row(normalize_record(article)))
+            except (AttributeError, TypeError, ValueError) as e:
+                print(f"⚠️  Artículo omitido ({e}): {str(article)[:80]}")
+        if not rows:
+            return 0
+
+        insert = (f"INSERT OR IGNORE INTO articles (id, {', '.join(COLUMNS)}, extra) "
+                  f"VALUES ({', '.join('?' * (len(COLUMNS) + 2))})")
+        with self._lock:
+            try:
+                inserted = self._conn.executemany(insert, rows).rowcount
+            except (sqlite3.Error, ValueError):
+                # Un registro inválido no descarta el lote: se insertan de a uno
+                self._conn.rollback()
+                inserted, validas = 0, []
+                for row in rows:
+                    try:
+                        inserted += self._conn.execute(insert, row).rowcount
+                        validas.append(row)
+                    except (sqlite3.Error, ValueError) as e:
+                        print(f"⚠️  Artículo omitido ({e}): {row[1 + COLUMNS.index('title')][:80]}")
+                rows = validas
+
+            full_text_index = 1 + COLUMNS.index('full_text')
+            self._conn.executemany(
+                "UPDATE articles SET full_text = ? WHERE id = ? "
+                "AND (full_text IS NULL OR full_text = '' OR full_text = 'Texto no disponible')",
+                [(row[full_text_index], row[0]) for row in rows if row[full_text_index]]
+            )
+            self._conn.commit()
+        return inserted
+
+    def _select(self, where: List[str], params: list, limit: int = None) -> List[Dict]:
+        sql = 'SELECT * FROM articles'
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        # id desempata las fechas iguales: el orden es el mismo en cada consulta
+        sql += ' ORDER BY published_at DESC, id'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params = [*params, limit]
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._to_article(row) for row in rows]
+
+    def latest(self, n: int, source: str = None, category: str = None, unused_only: bool = False) -> List[Dict]:
+        """
+        Los n artículos más recientes por fecha de publicación
+
+        Args:
+            n: Número máximo de artículos
+            source: Filtrar por fuente (newsapi, newsdata, ...)
+            category: Filtrar por categoría
+            unused_only: Solo artículos que ninguna ejecución ha usado
+
+        Returns:
+            Lista de artículos (cada uno con su 'id')
+        """
+        where, params = [], []
+        if unused_only:
+            where.append('used_at IS NULL')
+        if source:
+            where.append('source = ?')
+            params.append(source)
+        if category:
+            where.append('category = ?')
+            params.append(category)
+        return self._select(where, params, n)
+
+    def latest_unused(self, n: int, source: str = None, category: str = None) -> List[Dict]:
+        """Los n artículos más recientes que aún no se han usado"""
+        return self.latest(n, source=source, category=category, unused_only=True)
+
+    def mark_used(self, ids: Iterable[str], run_id: str = None) -> int:
+        """
+        Marca artículos como usados por una ejecución
+
+        Args:
+            ids: Identificadores de los artículos
+            run_id: Ejecución que los usa
+
+        Returns:
+            Número de artículos marcados
+        """
+        now = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        with self._lock:
+            cursor = self._conn.executemany(
+                'UPDATE articles SET used_at = ?, used_run = ? WHERE id = ?',
+                [(now, run_id, article_id) for article_id in ids]
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+    def articles_for_run(self, run_id: str) -> List[Dict]:
+        """Artículos que usó una ejecución"""
+        return self._select(['used_run = ?'], [run_id])
+
+    def count(self, unused_only: bool = False) -> int:
+        """Número de artículos (o solo los no usados)"""
+        sql = 'SELECT COUNT(*) FROM articles'
+        if unused_only:
+            sql += ' WHERE used_at IS NULL'
+        with self._lock:
+            return self._conn.execute(sql).fetchone()[0]
+
+    def import_file(self, path: str) -> int:
+        """
+        Importa artículos de un almacén NDJSON o de los JSON antiguos
+
+        Args:
+            path: Ruta del archivo (.ndjson, .ndjson.zst o .json)
+
+        Returns:
+            Número de artículos insertados
+        """
+        from utils.article_store import iter_articles, load_articles
+
+        path = Path(path)
+        articles = load_articles(path) if path.suffix == '.json' else iter_articles(path)
+        return self.add_articles(articles)
+
+    def close(self):
+        """Cierra la conexión a SQLite"""
+        with self._lock:
+            self._conn.close()
+
+
+def main():
+    """Función principal: importación y consultas desde la terminal"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Repositorio SQLite de artículos')
+    parser.add_argument('--db', default=None, help='Ruta del SQLite (default: data/articles.sqlite)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    importar = subparsers.add_parser('import', help='Importar archivos NDJSON o JSON')
+    importar.add_argument('paths', nargs='+', help='Archivos a importar')
+
+    subparsers.add_parser('count', help='Contar artículos')
+
+    latest = subparsers.add_parser('latest', help='Mostrar los artículos más recientes sin usar')
+    latest.add_argument('n', type=int, nargs='?', default=10)
+
+    args = parser.parse_args()
+    repo = ArticleRepository(args.db)
+
+    if args.command == 'import':
+        for path in args.paths:
+            inserted = repo.import_file(path)
+            print(f"📥 {path}: {inserted} artículos nuevos")
+    elif args.command == 'count':
+        print(f"📰 Artículos: {repo.count()} ({repo.count(unused_only=True)} sin usar)")
+    elif args.command == 'latest':
+        for article in repo.latest_unused(args.n):
+            print(f"  {article.get('published_at', '?'):<22}{article.get('source', '?'):<12}{article['title'][:70]}")
+
+    repo.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Almacén de artículos en NDJSON (un JSON por línea), solo de anexado
+Los artículos se escriben conforme se descargan, sin cargar la lista completa
+en memoria ni depender de pandas. La exportación a CSV es un paso aparte,
+bajo demanda. Con el paquete opcional `zstandard` los archivos .ndjson.zst
+se comprimen con zstd (cada sesión de escritura agrega un frame).
+
+Uso:
+    python3 utils/article_store.py export-csv data/raw/newsapi.ndjson
+"""
+
+import csv
+import io
+import json
+import os
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List
+
+RAW_DIR = Path(__file__).resolve().parents[2] / 'data' / 'raw'
+
+NDJSON_SUFFIX = '.ndjson'
+ZSTD_SUFFIX = '.ndjson.zst'
+
+
+def _require_zstd():
+    try:
+        import zstandard
+        return zstandard
+    except ImportError:
+        raise ImportError("❌ Compresión zstd requiere el paquete opcional: pip install zstandard")
+
+
+def store_path(prefix: str, output_dir: str = None, compress: bool = None) -> Path:
+    """
+    Ruta del almacén de una fuente
+
+    Args:
+        prefix: Nombre de la fuente (newsapi, newsdata, ...)
+        output_dir: Directorio (default: data/raw)
+        compress: Usar zstd (default: variable ARTICLE_STORE_ZSTD)
+
+    Returns:
+        Ruta del archivo NDJSON
+    """
+    if compress is None:
+        compress = os.getenv('ARTICLE_STORE_ZSTD', '0') == '1'
+    suffix = ZSTD_SUFFIX if compress else NDJSON_SUFFIX
+    return Path(output_dir or RAW_DIR) / f'{prefix}{suffix}'
+
+
+class ArticleStore:
+    """Escritura y lectura en streaming de artículos en NDJSON"""
+
+    def __init__(self, path: str):
+        """
+        Inicializa el almacén
+
+        Args:
+            path: Ruta del archivo (.ndjson o .ndjson.zst)
+        """
+        self.path = Path(path)
+        self.compressed = self.path.name.endswith(ZSTD_SUFFIX)
+        self.count = 0
+        self._lock = threading.Lock()
+        self._raw = None
+        self._writer = None
+
+    def open(self) -> 'ArticleStore':
+        """Abre el archivo en modo anexado"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._raw = open(self.path, 'ab')
+        if self.compressed:
+            zstandard = _require_zstd()
+            self._writer = zstandard.ZstdCompressor().stream_writer(self._raw, closefd=False)
+        else:
+            self._writer = self._raw
+        return self
+
+    def append(self, article: Dict):
+        """Escribe un artículo (seguro entre hilos)"""
+        line = (json.dumps(article, ensure_ascii=False) + '\n').encode('utf-8')
+        with self._lock:
+            if self._writer is None:
+                self.open()
+            self._writer.write(line)
+            self.count += 1
+
+    def extend(self, articles: Iterable[Dict]) -> int:
+        """
+        Escribe artículos desde cualquier iterable, uno a uno
+
+        Returns:
+            Número de artículos escritos
+        """
+        written = 0
+        for article in articles:
+            self.append(article)
+            written += 1
+        return written
+
+    def close(self):
+        """Cierra el archivo (y el frame zstd si aplica)"""
+        with self._lock:
+            if self._writer is not None and self._writer is not self._raw:
+                self._writer.close()
+            if self._raw is not None:
+                self._raw.close()
+            self._writer = None
+            self._raw = None
+
+    def __enter__(self) -> 'ArticleStore':
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter_articles(self.path)
+
+    def export_csv(self, csv_path: str = None) -> Path:
+        """Exporta el almacén a CSV (ver export_csv)"""
+        return export_csv(self.path, csv_path)
+
+
+def _open_text(path: Path) -> io.TextIOBase:
+    if path.name.endswith(ZSTD_SUFFIX):
+        zstandard = _require_zstd()
+        raw = open(path, 'rb')
+        reader = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True, closefd=True)
+        return io.TextIOWrapper(reader, encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+def iter_articles(path: str) -> Iterator[Dict]:
+    """
+    Lee artículos de un NDJSON sin cargar el archivo completo
+
+    Args:
+        path: Ruta del archivo (.ndjson o .ndjson.zst)
+
+    Yields:
+        Diccionario por artículo
+    """
+    with _open_text(Path(path)) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def tail_articles(path: str, n: int) -> List[Dict]:
+    """
+    Últimos n artículos anexados, leyendo en streaming
+
+    Args:
+        path: Ruta del archivo (.ndjson o .ndjson.zst)
+        n: Número de artículos
+
+    Returns:
+        Lista con los n artículos más recientes
+    """
+    return list(deque(iter_articles(path), maxlen=n))
+
+
+def load_articles(path: str) -> List[Dict]:
+    """
+    Carga artículos desde NDJSON o desde los JSON antiguos (lista)
+
+    Args:
+        path: Ruta del archivo
+
+    Returns:
+        Lista de artículos
+    """
+    path = Path(path)
+    if path.suffix == '.json':
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return list(iter_articles(path))
+
+
+def export_csv(path: str, csv_path: str = None) -> Path:
+    """
+    Exporta un NDJSON a CSV en dos pasadas de streaming
+
+    La primera pasada reúne las columnas (en orden de aparición) y la segunda
+    escribe las filas, sin materializar la lista de artículos.
+
+    Args:
+        path: Ruta del NDJSON
+        csv_path: Ruta del CSV (default: misma ruta con extensión .csv)
+
+    Returns:
+        Ruta del CSV generado
+    """
+    path = Path(path)
+    if csv_path is None:
+        base = path.name[:-len(ZSTD_SUFFIX)] if path.name.endswith(ZSTD_SUFFIX) else path.stem
+        csv_path = path.with_name(f'{base}.csv')
+
+    fieldnames = {}
+    for article in iter_articles(path):
+        for key in article:
+            fieldnames.setdefault(key, None)
+
+    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(fieldnames), extrasaction='ignore')
+        writer.writeheader()
+        for article in iter_articles(path):
+            writer.writerow({
+                key: json.dumps(value, ensure_ascii=False) if isinstance(value, (dict, list)) else value
+                for key, value in article.items()
+            })
+
+    return Path(csv_path)
+
+
+def main():
+    """Función principal: exportación bajo demanda"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Almacén NDJSON de artículos')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    export = subparsers.add_parser('export-csv', help='Exportar un NDJSON a CSV')
+    export.add_argument('path', help='Archivo .ndjson o .ndjson.zst')
+    export.add_argument('--output', default=None, help='Ruta del CSV')
+
+    count = subparsers.add_parser('count', help='Contar artículos de un NDJSON')
+    count.add_argument('path', help='Archivo .ndjson o .ndjson.zst')
+
+    args = parser.parse_args()
+
+    if args.command == 'export-csv':
+        csv_file = export_csv(args.path, args.output)
+        print(f"💾 CSV: {csv_file}")
+    elif args.command == 'count':
+        total = sum(1 for _ in iter_articles(args.path))
+        print(f"📰 Artículos: {total}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Manifiesto de construcción de un sitio para regenerarlo de forma incremental
+Cada archivo de salida del sitio (HTML, CSS, imágenes) queda registrado en
+site_dir/.build_manifest.json con el hash de sus entradas: datos del artículo,
+template, configuración de layout, versión del generador o el contenido del
+archivo de origen. En la siguiente ejecución un archivo solo se escribe si el
+hash de sus entradas cambió (o si el archivo ya no está), así que los
+despliegues y observadores de archivos solo ven los cambios reales.
+
+Los archivos que registró la ejecución anterior y que esta ya no produce
+(por ejemplo, un sitio con menos artículos) se eliminan al guardar.
+
+Configuración (.env):
+    INCREMENTAL_BUILDS   Regenerar solo lo que cambió (default: true; false =
+                         reescribir todos los archivos en cada ejecución)
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+MANIFEST_NAME = '.build_manifest.json'
+
+_CHUNK = 1 << 20
+
+
+def input_hash(*parts: Any) -> str:
+    """Hash estable de las entradas de un archivo (valores serializables a JSON)"""
+    data = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str, separators=(',', ':'))
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def file_hash(path: Path) -> str:
+    """Hash del contenido de un archivo"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def incremental_enabled() -> bool:
+    """Indica si INCREMENTAL_BUILDS permite saltar archivos sin cambios"""
+    return os.getenv('INCREMENTAL_BUILDS', 'true').lower() not in ('0', 'false', 'no')
+
+
+class BuildManifest:
+    """Archivos de un sitio y el hash de las entradas con que se generaron"""
+
+    def __init__(self, site_dir: Path, version: str, enabled: Optional[bool] = None):
+        """
+        Carga el manifiesto de la ejecución anterior (si existe)
+
+        Args:
+            site_dir: Directorio del sitio
+            version: Versión del generador (entra en todos los hashes: cambiarla
+                regenera todo el sitio)
+            enabled: Saltar archivos sin cambios (default: INCREMENTAL_BUILDS)
+        """
+        self.site_dir = Path(site_dir)
+        self.version = version
+        self.enabled = incremental_enabled() if enabled is None else enabled
+        self.path = self.site_dir / MANIFEST_NAME
+        self.previous: Dict[str, str] = self._load()
+        self.current: Dict[str, str] = {}
+        self.stats = {'escritos': 0, 'omitidos': 0, 'eliminados': 0}
+
+    def _load(self) -> Dict[str, str]:
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+        archivos = data.get('archivos') if isinstance(data, dict) else None
+        return archivos if isinstance(archivos, dict) else {}
+
+    def hash(self, *parts: Any) -> str:
+        """Hash de las entradas de un archivo, incluida la versión del generador"""
+        return input_hash(self.version, *parts)
+
+    def _pending(self, relpath: str, digest: str) -> bool:
+        """Registra el hash del archivo e indica si hay que (re)escribirlo"""
+        self.current[relpath] = digest
+        if self.enabled and self.previous.get(relpath) == digest and (self.site_dir / relpath).exists():
+            self.stats['omitidos'] += 1
+            return False
+        self.stats['escritos'] += 1
+        return True
+
+    def write(self, relpath: str, digest: str, produce: Callable[[], str]) -> bool:
+        """
+        Escribe un archivo de texto si sus entradas cambiaron
+
+        Args:
+            relpath: Ruta relativa al sitio
+            digest: Hash de sus entradas (ver hash)
+            produce: Genera el contenido (solo se llama si hay que escribirlo)
+
+        Returns:
+            True si se escribió
+        """
+        if not self._pending(relpath, digest):
+            return False
+        with open(self.site_dir / relpath, 'w', encoding='utf-8') as f:
+            f.write(produce())
+        return True
+
+    def copy(self, relpath: str, source: Path) -> bool:
+        """
+        Copia un archivo al sitio si su contenido de origen cambió
+
+        Args:
+            relpath: Ruta de destino relativa al sitio
+            source: Archivo de origen
+
+        Returns:
+            True si se copió
+        """
+        if not self._pending(relpath, self.hash(file_hash(source))):
+            return False
+        shutil.copy2(source, self.site_dir / relpath)
+        return True
+
+    def keep(self, relpath: str):
+        """Conserva un archivo de la ejecución anterior sin volver a generarlo"""
+        if relpath in self.previous:
+            self.current[relpath] = self.previous[relpath]
+
+    def save(self):
+        """Elimina los archivos que ya no se generan y guarda el manifiesto"""
+        for relpath in self.previous.keys() - self.current.keys():
+            try:
+                (self.site_dir / relpath).unlink()
+                self.stats['eliminados'] += 1
+            except FileNotFoundError:
+                pass
+        temporal = self.path.with_name(self.path.name + '.tmp')
+        temporal.write_text(json.dumps({'version': self.version, 'archivos': self.current},
+                                       ensure_ascii=False, indent=1, sort_keys=True), encoding='utf-8')
+        os.replace(temporal, self.path)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Circuit breaker por proveedor
+Cuando un proveedor (Blackbox, Unsplash, el host de una imagen...) encadena
+fallos (errores de conexión, timeouts, 5xx o 402 por saldo agotado), su
+circuito se abre y las peticiones siguientes fallan al instante con
+CircuitOpen, una RequestException, de modo que cada llamador toma su camino
+de respaldo en milisegundos en lugar de esperar el timeout completo. Pasado
+un tiempo el circuito queda semiabierto y deja pasar una sola petición de
+prueba: si funciona se cierra, si falla se vuelve a abrir por más tiempo.
+
+Configuración (.env):
+    CIRCUIT_BREAKER          0 desactiva los circuitos
+    CIRCUIT_FAILURES         Fallos consecutivos para abrir (default: 3)
+    CIRCUIT_RESET_SECONDS    Segundos abierto antes de probar (default: 30)
+    CIRCUIT_MAX_RESET        Máximo tras pruebas fallidas sucesivas (default: 300)
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+
+from utils.rate_limit import provider_for
+
+DEFAULT_FAILURES = int(os.getenv('CIRCUIT_FAILURES', '3'))
+DEFAULT_RESET_SECONDS = float(os.getenv('CIRCUIT_RESET_SECONDS', '30'))
+DEFAULT_MAX_RESET = float(os.getenv('CIRCUIT_MAX_RESET', '300'))
+
+CLOSED = 'cerrado'
+OPEN = 'abierto'
+HALF_OPEN = 'semiabierto'
+
+
+class CircuitOpen(requests.exceptions.RequestException):
+    """El circuito del proveedor está abierto: se usa el respaldo sin esperar"""
+
+
+def is_failure_status(status: int) -> bool:
+    """True si la respuesta indica un proveedor caído o sin saldo (no un error del pedido)"""
+    return status >= 500 or status == 402
+
+
+class CircuitBreaker:
+    """Circuito de un proveedor: cerrado, abierto o semiabierto"""
+
+    def __init__(self, name: str, failure_threshold: int = DEFAULT_FAILURES,
+                 reset_timeout: float = DEFAULT_RESET_SECONDS, max_reset_timeout: float = DEFAULT_MAX_RESET):
+        """
+        Inicializa el circuito cerrado
+
+        Args:
+            name: Nombre del proveedor
+            failure_threshold: Fallos consecutivos para abrir
+            reset_timeout: Segundos abierto antes de la primera prueba
+            max_reset_timeout: Máximo al duplicarse tras pruebas fallidas
+        """
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+
+        self.state = CLOSED
+        self._failures = 0
+        self._open_for = reset_timeout
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+        self.stats = {'failures': 0, 'opened': 0, 'short_circuited': 0}
+
+    def _probe_due(self, now: float) -> bool:
+        return self.state == OPEN and now - self._opened_at >= self._open_for
+
+    def check(self):
+        """
+        Falla si el circuito está abierto (sin reservar la petición de prueba)
+
+        Raises:
+            CircuitOpen: Abierto y aún no toca probar, o hay una prueba en curso
+        """
+        with self._lock:
+            if self.state == CLOSED or self._probe_due(time.monotonic()):
+                return
+            if self.state == HALF_OPEN and not self._probing:
+                return
+            self.stats['short_circuited'] += 1
+        raise CircuitOpen(f"{self.name}: circuito abierto tras fallos consecutivos")
+
+    def allow(self):
+        """
+        Autoriza una petición; en semiabierto solo una de prueba a la vez
+
+        Quien recibe autorización debe llamar luego a success(), failure()
+        o release() si al final no hizo la petición.
+
+        Raises:
+            CircuitOpen: La petición no debe hacerse
+        """
+        with self._lock:
+            if self._probe_due(time.monotonic()):
+                self.state = HALF_OPEN
+            if self.state == CLOSED:
+                return
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            self.stats['short_circuited'] += 1
+        raise CircuitOpen(f"{self.name}: circuito abierto tras fallos consecutivos")
+
+    def success(self):
+        """Registra una respuesta sana: cierra el circuito"""
+        with self._lock:
+            if self.state != CLOSED:
+                print(f"🟢 {self.name}: responde de nuevo, circuito cerrado", flush=True)
+            self.state = CLOSED
+            self._failures = 0
+            self._open_for = self.reset_timeout
+            self._probing = False
+
+    def failure(self):
+        """Registra un fallo: abre el circuito al llegar al umbral o si falla la prueba"""
+        with self._lock:
+            self.stats['failures'] += 1
+            self._failures += 1
+            if self.state == HALF_OPEN:
+                # La prueba falló: abierto de nuevo, por el doble de tiempo
+                self._open_for = min(self.max_reset_timeout, self._open_for * 2)
+            elif self.state == OPEN or self._failures < self.failure_threshold:
+                return
+            self.state = OPEN
+            self._opened_at = time.monotonic()
+            self._probing = False
+            self.stats['opened'] += 1
+            open_for = self._open_for
+        print(f"🔴 {self.name}: {self.failure_threshold}+ fallos seguidos, circuito abierto "
+              f"{open_for:.0f}s (se usa el respaldo)", flush=True)
+
+    def release(self):
+        """Libera la autorización de una petición que no llegó a hacerse"""
+        with self._lock:
+            self._probing = False
+
+    def report(self) -> Dict:
+        """Estado y contadores del circuito"""
+        with self._lock:
+            return {'state': self.state, **self.stats}
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(url: str) -> Optional[CircuitBreaker]:
+    """
+    Circuito compartido del proveedor de una URL
+
+    Se desactiva con CIRCUIT_BREAKER=0.
+
+    Args:
+        url: URL de la petición (el proveedor es esquema + host)
+
+    Returns:
+        Circuito del proveedor o None si están desactivados
+    """
+    if os.getenv('CIRCUIT_BREAKER', '1') == '0':
+        return None
+    provider = provider_for(url)
+    breaker = _breakers.get(provider)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(provider, CircuitBreaker(provider))
+    return breaker
+
+
+def circuits_report() -> Dict[str, Dict]:
+    """Estado de los circuitos de proveedores que tuvieron fallos"""
+    with _breakers_lock:
+        breakers = list(_breakers.items())
+    return {name: breaker.report() for name, breaker in breakers if breaker.stats['failures']}
+
+
+def reset_circuits():
+    """Olvida todos los circuitos (pruebas y nuevas ejecuciones en el mismo proceso)"""
+    with _breakers_lock:
+        _breakers.clear()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Deduplicación de artículos entre fuentes y entre ejecuciones
+Después de normalize_article cada artículo se identifica por el hash de su URL
+canónica (sin parámetros de tracking, www, /amp, ...) y por una huella de
+título + resumen. Ambas claves se consultan en un conjunto persistente de
+"ya vistos" en SQLite, de modo que solo el contenido nuevo llega a la
+extracción de texto y a las llamadas al LLM.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+DEFAULT_DB_PATH = Path(__file__).resolve().parents[2] / 'data' / 'cache' / 'seen.sqlite'
+DEFAULT_MAX_AGE = float(os.getenv('DEDUP_MAX_AGE_DAYS', '30')) * 24 * 3600
+
+# Parámetros de query que no cambian el contenido de la página
+TRACKING_PARAMS = frozenset([
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'igshid', 'mc_cid', 'mc_eid',
+    'ref', 'ref_src', 'cmpid', 'ocid', 'smid', 'outputtype', 'amp',
+])
+TRACKING_PREFIXES = ('utm_', 'at_', 'pk_')
+
+# Subdominios que sirven la misma página que el dominio principal
+HOST_PREFIXES = ('www.', 'm.', 'amp.')
+
+# Caracteres del resumen que entran en la huella
+FINGERPRINT_BODY_CHARS = 300
+
+_WORD_RE = re.compile(r'\w+')
+_COMBINING_RE = re.compile('[\u0300-\u036f]')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    source TEXT,
+    first_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_seen_first_seen ON seen(first_seen);
+"""
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Forma canónica de una URL de artículo
+
+    Ignora esquema http/https, mayúsculas del host, subdominios www/m/amp,
+    puerto por defecto, fragmento, sufijo /amp, barra final y parámetros de
+    tracking; el resto de la query se ordena.
+
+    Args:
+        url: URL tal como la entrega la API
+
+    Returns:
+        URL canónica ('' si no hay URL)
+    """
+    if not url:
+        return ''
+    parts = urlsplit(url.strip())
+
+    host = (parts.hostname or '').lower()
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    if parts.port and parts.port not in (80, 443):
+        host = f'{host}:{parts.port}'
+
+    path = re.sub(r'/{2,}', '/', parts.path or '/')
+    if path.endswith('/amp') or path.endswith('/amp/'):
+        path = path.rstrip('/')[:-len('/amp')] or '/'
+    if len(path) > 1:
+        path = path.rstrip('/')
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+
+    return urlunsplit(('https', host, path, urlencode(query), ''))
+
+
+def url_hash(url: str) -> str:
+    """Hash SHA-1 de la URL canónica"""
+    return hashlib.sha1(canonicalize_url(url).encode('utf-8')).hexdigest()
+
+
+def normalize_text(text: str) -> str:
+    """Texto en minúsculas, sin acentos ni puntuación y con espacios simples"""
+    text = text or ''
+    if not text.isascii():
+        text = _COMBINING_RE.sub('', unicodedata.normalize('NFKD', text))
+    return ' '.join(_WORD_RE.findall(text.lower()))
+
+
+def content_fingerprint(article: Dict) -> Optional[str]:
+    """
+    Huella del contenido: título + inicio del resumen normalizados
+
+    Detecta el mismo artículo publicado bajo otra URL (o por otra API). Si no
+    hay resumen se usa el inicio del texto.
+
+    Args:
+        article: Artículo normalizado
+
+    Returns:
+        Hash SHA-1 o None si el artículo no tiene título
+    """
+    title = normalize_text(article.get('title'))
+    if not title:
+        return None
+    body = article.get('description') or article.get('content') or article.get('full_text') or ''
+    body = normalize_text(body)[:FINGERPRINT_BODY_CHARS]
+    return hashlib.sha1(f'{title}\n{body}'.encode('utf-8')).hexdigest()
+
+
+def article_keys(article: Dict) -> List[tuple]:
+    """
+    Claves de deduplicación de un artículo
+
+    Returns:
+        Lista de (tipo, clave) con tipo 'url' o 'content'
+    """
+    keys = []
+    if article.get('url'):
+        keys.append(('url', url_hash(article['url'])))
+    fingerprint = content_fingerprint(article)
+    if fingerprint:
+        keys.append(('content', fingerprint))
+    return keys
+
+
+class SeenStore:
+    """Conjunto persistente de artículos ya vistos (SQLite)"""
+
+    def __init__(self, path: str = None, max_age: float = DEFAULT_MAX_AGE):
+        """
+        Inicializa el conjunto
+
+        Args:
+            path: Ruta del archivo SQLite
+            max_age: Segundos tras los que una clave se olvida (None = nunca)
+        """
+        self.path = Path(path) if path else DEFAULT_DB_PATH
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+
+        self.stats = {'new': 0, 'dup_url': 0, 'dup_content': 0}
+
+        if max_age:
+            self.prune(max_age)
+
+    def _known(self, keys: List[str]) -> set:
+        known = set()
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            rows = self._conn.execute(
+                f"SELECT key FROM seen WHERE key IN ({', '.join('?' * len(chunk))})", chunk
+            ).fetchall()
+            known.update(row[0] for row in rows)
+        return known
+
+    def filter_new(self, articles: Iterable[Dict], record: bool = True) -> List[Dict]:
+        """
+        Conserva solo los artículos no vistos antes (ni repetidos en el lote)
+
+        Args:
+            articles: Artículos normalizados
+            record: Registrar los artículos nuevos como vistos
+
+        Returns:
+            Artículos nuevos, en el orden de entrada
+        """
+        articles = list(articles)
+        keyed = [(article, article_keys(article)) for article in articles]
+
+        with self._lock:
+            known = self._known([key for _, keys in keyed for _, key in keys])
+
+            nuevos = []
+            registros = []
+            now = time.time()
+            for article, keys in keyed:
+                duplicate = next((kind for kind, key in keys if key in known), None)
+                if duplicate:
+                    self.stats[f'dup_{duplicate}'] += 1
+                    continue
+                nuevos.append(article)
+                self.stats['new'] += 1
+                for kind, key in keys:
+                    known.add(key)
+                    registros.append((key, kind, article.get('source'), now))
+
+            if record and registros:
+                self._conn.executemany(
+                    'INSERT OR IGNORE INTO seen (key, kind, source, first_seen) VALUES (?, ?, ?, ?)',
+                    registros
+                )
+                self._conn.commit()
+
+        return nuevos
+
+    def prune(self, max_age: float) -> int:
+        """
+        Olvida las claves más antiguas que max_age segundos
+
+        Returns:
+            Número de claves eliminadas
+        """
+        with self._lock:
+            cursor = self._conn.execute('DELETE FROM seen WHERE first_seen < ?', (time.time() - max_age,))
+            self._conn.commit()
+        return cursor.rowcount
+
+    def clear(self):
+        """Elimina todas las claves"""
+        with self._lock:
+            self._conn.execute('DELETE FROM seen')
+            self._conn.commit()
+
+    def close(self):
+        """Cierra la conexión a SQLite"""
+        with self._lock:
+            self._conn.close()
+
+
+_default_store: Optional[SeenStore] = None
+_default_lock = threading.Lock()
+
+
+def get_seen_store() -> Optional[SeenStore]:
+    """
+    Retorna el conjunto de vistos compartido del proceso
+
+    Se desactiva con DEDUP=0 y su ubicación se cambia con DEDUP_DB.
+
+    Returns:
+        Conjunto compartido o None si está desactivado
+    """
+    global _default_store
+    if os.getenv('DEDUP', '1') == '0':
+        return None
+    if _default_store is None:
+        with _default_lock:
+            if _default_store is None:
+                _default_store = SeenStore(os.getenv('DEDUP_DB') or None)
+    return _default_store
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Motores de extracción de texto de páginas de artículos
+Todos comparten la misma regla: primeros párrafos <p> fuera de script, style,
+nav, header, footer, aside e iframe. Los motores en streaming dejan de parsear
+en cuanto se alcanzan max_paragraphs o max_chars.
+
+Motores disponibles:
+    lxml    Parser en C de lxml en modo streaming (si está instalado)
+    stream  html.parser de la librería estándar en modo streaming
+    bs4     Implementación original con BeautifulSoup (árbol completo)
+
+Espacios: lxml y stream conservan el espacio que hay en el HTML entre
+elementos en línea y colapsan cada secuencia de espacios en uno
+("5 <b>millones</b> la" -> "5 millones la"). bs4 usa get_text(strip=True),
+que pega las palabras ("5millonesla"). Ninguno inventa un espacio donde el
+HTML no lo tiene. Cambiar de bs4 a un motor en streaming cambia por tanto el
+full_text guardado y, con él, las claves de la caché LLM de esos artículos;
+la caché HTTP lleva el motor en su extract_key y re-extrae sola.
+"""
+
+import os
+import re
+from html.parser import HTMLParser
+from typing import Callable, Dict, List
+
+TEXT_UNAVAILABLE = "Texto no disponible"
+
+SKIP_TAGS = frozenset(['script', 'style', 'nav', 'header', 'footer', 'aside', 'iframe'])
+
+# Tamaño de los bloques que se entregan al parser en streaming
+CHUNK_SIZE = 16 * 1024
+
+_CHARSET_RE = re.compile(rb'charset=["\']?([\w-]+)', re.I)
+
+
+class _StopParsing(Exception):
+    """Se lanza para abortar el parseo cuando ya hay texto suficiente"""
+
+
+class ParagraphCollector:
+    """Acumula el texto de los párrafos a partir de eventos start/end/data"""
+
+    def __init__(self, max_paragraphs: int, max_chars: int):
+        self.max_paragraphs = max_paragraphs
+        self.max_chars = max_chars
+        self.paragraphs: List[str] = []
+        self.length = 0
+        self.done = False
+        self._skip_depth = 0
+        self._in_paragraph = False
+        self._current: List[str] = []
+
+    def start(self, tag: str, attrs=None):
+        tag = tag.lower()
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == 'p' and not self._skip_depth:
+            # Un <p> dentro de otro cierra implícitamente el anterior
+            if self._in_paragraph:
+                self._flush()
+            self._in_paragraph = True
+
+    def end(self, tag: str):
+        tag = tag.lower()
+        if tag in SKIP_TAGS:
+            if self._skip_depth:
+                self._skip_depth -= 1
+        elif tag == 'p' and self._in_paragraph:
+            self._flush()
+
+    def data(self, text: str):
+        if self._in_paragraph and not self._skip_depth:
+            self._current.append(text)
+
+    def close(self):
+        if self._in_paragraph:
+            self._flush()
+
+    def _flush(self):
+        self._in_paragraph = False
+        text = ' '.join(''.join(self._current).split())
+        self._current = []
+        if not text:
+            return
+        self.paragraphs.append(text)
+        self.length += len(text) + 1
+        if len(self.paragraphs) >= self.max_paragraphs or self.length >= self.max_chars:
+            self.done = True
+            raise _StopParsing()
+
+    def result(self) -> str:
+        text = ' '.join(self.paragraphs)
+        return text[:self.max_chars] if text else TEXT_UNAVAILABLE
+
+
+class _StdlibParser(HTMLParser):
+    """Adaptador de html.parser hacia ParagraphCollector"""
+
+    def __init__(self, collector: ParagraphCollector):
+        super().__init__(convert_charrefs=True)
+        self.collector = collector
+
+    def handle_starttag(self, tag, attrs):
+        self.collector.start(tag)
+
+    def handle_endtag(self, tag):
+        self.collector.end(tag)
+
+    def handle_data(self, data):
+        self.collector.data(data)
+
+
+def _detect_encoding(html: bytes) -> str:
+    """Detecta el charset declarado en los primeros bytes (utf-8 por defecto)"""
+    match = _CHARSET_RE.search(html[:4096])
+    if match:
+        encoding = match.group(1).decode('ascii', 'ignore')
+        try:
+            ''.encode(encoding)
+            return encoding
+        except LookupError:
+            pass
+    return 'utf-8'
+
+
+def extract_stream(html: bytes, max_paragraphs: int = 10, max_chars: int = 5000) -> str:
+    """Extracción en streaming con html.parser (sin dependencias)"""
+    if isinstance(html, bytes):
+        html = html.decode(_detect_encoding(html), errors='replace')
+
+    collector = ParagraphCollector(max_paragraphs, max_chars)
+    parser = _StdlibParser(collector)
+    try:
+        for start in range(0, len(html), CHUNK_SIZE):
+            parser.feed(html[start:start + CHUNK_SIZE])
+        parser.close()
+        collector.close()
+    except _StopParsing:
+        pass
+    return collector.result()
+
+
+def extract_lxml(html: bytes, max_paragraphs: int = 10, max_chars: int = 5000) -> str:
+    """Extracción en streaming con el parser de lxml (target parser)"""
+    from lxml import etree
+
+    collector = ParagraphCollector(max_paragraphs, max_chars)
+
+    class Target:
+        def start(self, tag, attrib):
+            collector.start(tag)
+
+        def end(self, tag):
+            collector.end(tag)
+
+        def data(self, data):
+            collector.data(data)
+
+        def close(self):
+            collector.close()
+
+    if isinstance(html, str):
+        html = html.encode('utf-8')
+
+    parser = etree.HTMLParser(target=Target(), encoding=_detect_encoding(html))
+    try:
+        for start in range(0, len(html), CHUNK_SIZE):
+            parser.feed(html[start:start + CHUNK_SIZE])
+        parser.close()
+    except _StopParsing:
+        pass
+    return collector.result()
+
+
+def extract_bs4(html: bytes, max_paragraphs: int = 10, max_chars: int = 5000) -> str:
+    """Implementación original: árbol completo de BeautifulSoup con html.parser"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Remover elementos no deseados
+    for element in soup(list(SKIP_TAGS)):
+        element.decompose()
+
+    # Extraer párrafos principales
+    paragraphs = soup.find_all('p')[:max_paragraphs]
+    text = ' '.join(p.get_text(strip=True) for p in paragraphs)
+
+    return text[:max_chars] if text else TEXT_UNAVAILABLE
+
+
+ENGINES: Dict[str, Callable[..., str]] = {
+    'lxml': extract_lxml,
+    'stream': extract_stream,
+    'bs4': extract_bs4,
+}
+
+
+def _lxml_available() -> bool:
+    try:
+        import lxml.etree  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def default_engine() -> str:
+    """
+    Motor por defecto: EXTRACTION_ENGINE del entorno, o el más rápido disponible
+
+    Returns:
+        Nombre del motor
+    """
+    engine = os.getenv('EXTRACTION_ENGINE')
+    if engine in ENGINES:
+        return engine
+    return 'lxml' if _lxml_available() else 'stream'
+
+
+def extract_text(html: bytes, max_paragraphs: int = 10, max_chars: int = 5000, engine: str = None) -> str:
+    """
+    Extrae el texto principal de un documento HTML
+
+    Args:
+        html: Contenido HTML crudo
+        max_paragraphs: Número máximo de párrafos a extraer
+        max_chars: Número máximo de caracteres a retornar
+        engine: Motor a usar (lxml, stream, bs4); None = default_engine()
+
+    Returns:
+        Texto extraído o "Texto no disponible"
+    """
+    name = engine or default_engine()
+    if name not in ENGINES:
+        raise ValueError(f"Motor de extracción desconocido: {name}")
+    return ENGINES[name](html, max_paragraphs, max_chars)
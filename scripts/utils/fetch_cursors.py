@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Cursores de descarga incremental por fuente y por consulta
+Cada combinación fuente + parámetros de búsqueda recuerda hasta qué fecha de
+publicación ya se descargó, de modo que la siguiente ejecución pide solo lo
+nuevo. Si el delta no cabe en las páginas de una ejecución, el cursor guarda
+la ventana pendiente (fecha tope o token de página) y las ejecuciones
+siguientes siguen paginando el rezago hasta agotarlo.
+
+Estado de un cursor:
+    since       Todo lo publicado hasta esta fecha ya se descargó
+    until       Tope exclusivo de la ventana pendiente (rezago anterior a esta fecha)
+    high_water  Fecha más reciente vista mientras se agota el rezago
+    page_token  Token de página pendiente (APIs paginadas por token)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from utils.article_repository import normalize_published_at
+
+DEFAULT_DB_PATH = Path(__file__).resolve().parents[2] / 'data' / 'fetch_cursors.sqlite'
+
+# Parámetros que no definen la consulta (credenciales, paginación y ventana)
+IGNORED_PARAMS = frozenset(['apiKey', 'apikey', 'api-key', 'page', 'pageSize', 'number', 'offset',
+                            'from', 'to', 'earliest-publish-date', 'latest-publish-date'])
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cursors (
+    source TEXT NOT NULL,
+    query TEXT NOT NULL,
+    since TEXT,
+    until TEXT,
+    high_water TEXT,
+    page_token TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (source, query)
+);
+"""
+
+
+def query_key(params: Dict) -> str:
+    """Clave estable de una consulta: parámetros relevantes en JSON ordenado"""
+    relevant = {k: v for k, v in params.items() if k not in IGNORED_PARAMS and v is not None}
+    return json.dumps(relevant, sort_keys=True, ensure_ascii=False)
+
+
+class FetchCursor:
+    """Cursor de una consulta durante una descarga"""
+
+    def __init__(self, store: 'CursorStore', source: str, query: str, state: Dict):
+        self.store = store
+        self.source = source
+        self.query = query
+        self.since: Optional[str] = state.get('since')
+        self.until: Optional[str] = state.get('until')
+        self.high_water: Optional[str] = state.get('high_water')
+        self.page_token: Optional[str] = state.get('page_token')
+
+    @property
+    def pending(self) -> bool:
+        """True si hay un rezago de una ejecución anterior por agotar"""
+        return bool(self.until or self.page_token)
+
+    def accept(self, published_at: str) -> bool:
+        """
+        True si un artículo cae dentro de la ventana por descargar
+
+        Args:
+            published_at: Fecha de publicación tal como la entrega la API
+        """
+        date = normalize_published_at(published_at)
+        if not date:
+            return True
+        if self.since and date <= self.since:
+            return False
+        return not (self.until and date >= self.until)
+
+    @property
+    def until_inclusive(self) -> Optional[str]:
+        """Tope de la ventana para APIs con límite inclusivo (un segundo antes de until)"""
+        if not self.until:
+            return None
+        try:
+            until = datetime.strptime(self.until, '%Y-%m-%dT%H:%M:%SZ') - timedelta(seconds=1)
+        except ValueError:
+            return self.until
+        return until.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+    def update(self, dates: Iterable[str], exhausted: bool, next_token: str = None):
+        """
+        Avanza el cursor tras descargar una ventana y lo guarda
+
+        Args:
+            dates: Fechas de publicación de lo descargado en esta ejecución
+            exhausted: True si la ventana se descargó completa
+            next_token: Token de la página siguiente (APIs por token)
+        """
+        dates = [d for d in (normalize_published_at(d) for d in dates) if d]
+        newest = max(dates) if dates else None
+        high_water = max(filter(None, [self.high_water, newest]), default=None)
+
+        # La primera descarga solo fija el punto de partida: no se pagina el histórico
+        if exhausted or self.since is None:
+            self.since = max(filter(None, [self.since, high_water]), default=None)
+            self.until = self.high_water = self.page_token = None
+        else:
+            self.high_water = high_water
+            if dates:
+                self.until = min(dates)
+            self.page_token = next_token
+
+        self.store.save(self)
+
+
+class CursorStore:
+    """Cursores persistentes en SQLite"""
+
+    def __init__(self, path: str = None):
+        """
+        Inicializa el almacén de cursores
+
+        Args:
+            path: Ruta del archivo SQLite (default: data/fetch_cursors.sqlite)
+        """
+        self.path = Path(path) if path else DEFAULT_DB_PATH
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+
+    def cursor(self, source: str, params: Dict) -> FetchCursor:
+        """
+        Cursor de una fuente para una consulta
+
+        Args:
+            source: Nombre de la fuente
+            params: Parámetros de la consulta (credenciales y paginación se ignoran)
+
+        Returns:
+            Cursor con el estado guardado (vacío si es la primera vez)
+        """
+        query = query_key(params)
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT * FROM cursors WHERE source = ? AND query = ?', (source, query)
+            ).fetchone()
+        return FetchCursor(self, source, query, dict(row) if row else {})
+
+    def save(self, cursor: FetchCursor):
+        """Guarda el estado de un cursor"""
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO cursors (source, query, since, until, high_water, page_token, updated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (cursor.source, cursor.query, cursor.since, cursor.until, cursor.high_water,
+                 cursor.page_token, time.time())
+            )
+            self._conn.commit()
+
+    def reset(self, source: str = None):
+        """Olvida los cursores (de una fuente o todos)"""
+        with self._lock:
+            if source:
+                self._conn.execute('DELETE FROM cursors WHERE source = ?', (source,))
+            else:
+                self._conn.execute('DELETE FROM cursors')
+            self._conn.commit()
+
+    def close(self):
+        """Cierra la conexión a SQLite"""
+        with self._lock:
+            self._conn.close()
+
+
+_default_store: Optional[CursorStore] = None
+_default_lock = threading.Lock()
+
+
+def get_cursor_store() -> Optional[CursorStore]:
+    """
+    Retorna el almacén de cursores compartido del proceso
+
+    Se desactiva con FETCH_CURSORS=0 y su ubicación se cambia con FETCH_CURSORS_DB.
+
+    Returns:
+        Almacén compartido o None si está desactivado
+    """
+    global _default_store
+    if os.getenv('FETCH_CURSORS', '1') == '0':
+        return None
+    if _default_store is None:
+        with _default_lock:
+            if _default_store is None:
+                _default_store = CursorStore(os.getenv('FETCH_CURSORS_DB') or None)
+    return _default_store
+
+
+def open_cursor(source: str, params: Dict) -> Optional[FetchCursor]:
+    """
+    Cursor de una consulta en el almacén compartido
+
+    Returns:
+        Cursor o None si los cursores están desactivados
+    """
+    store = get_cursor_store()
+    return store.cursor(source, params) if store else None
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Cliente HTTP compartido con pools de conexiones persistentes
+Todas las llamadas a APIs y descargas reutilizan la misma sesión (keep-alive),
+con pools dimensionados por host, reintentos con backoff aleatorio, timeouts
+configurables desde .env, el límite de tasa adaptativo por proveedor
+(utils.rate_limit) y un circuit breaker por proveedor (utils.circuit_breaker)
+"""
+
+import os
+import random
+import threading
+from typing import Dict, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils import tracing
+from utils.circuit_breaker import get_circuit_breaker, is_failure_status
+from utils.rate_limit import get_rate_limiter
+
+# Timeouts por defecto (conexión, lectura) en segundos
+DEFAULT_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', '5'))
+DEFAULT_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', '30'))
+
+# Reintentos ante fallos de conexión y respuestas transitorias
+DEFAULT_RETRIES = int(os.getenv('HTTP_RETRIES', '3'))
+DEFAULT_BACKOFF = float(os.getenv('HTTP_BACKOFF', '0.5'))
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+# Reintentos tras un 429 para métodos que urllib3 no reintenta por estado (POST):
+# un 429 garantiza que la petición no se procesó
+RATE_LIMIT_RETRIES = int(os.getenv('RATE_LIMIT_RETRIES', '2'))
+
+# Tamaño de pool por defecto y por host (conexiones reutilizables simultáneas)
+DEFAULT_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', '10'))
+HOST_POOL_SIZES = {
+    'https://api.blackbox.ai': 16,
+    'https://newsapi.org': 4,
+    'https://newsdata.io': 4,
+    'https://api.worldnewsapi.com': 4,
+    'https://apitube.io': 4,
+    'https://api.unsplash.com': 4,
+    'https://picsum.photos': 8,
+    'https://api.vercel.com': 4,
+}
+
+USER_AGENT = 'Mozilla/5.0 (compatible; NewsBot/1.0)'
+
+TimeoutType = Union[float, Tuple[float, float], None]
+
+
+class JitteredRetry(Retry):
+    """Retry de urllib3 con backoff exponencial y jitter completo"""
+
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        if backoff <= 0:
+            return 0
+        # Full jitter: evita que varios hilos reintenten a la vez
+        return random.uniform(0, backoff)
+
+
+def build_retry(retries: int = DEFAULT_RETRIES, backoff: float = DEFAULT_BACKOFF) -> Retry:
+    """
+    Construye la política de reintentos
+
+    Solo se reintentan por estado los métodos idempotentes; los POST
+    únicamente se reintentan ante errores de conexión.
+
+    Args:
+        retries: Número máximo de reintentos
+        backoff: Factor de backoff exponencial
+
+    Returns:
+        Política de reintentos
+    """
+    return JitteredRetry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff,
+        status_forcelist=RETRY_STATUS,
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+
+
+def build_session(retries: int = DEFAULT_RETRIES,
+                  pool_size: int = DEFAULT_POOL_SIZE,
+                  host_pool_sizes: Optional[Dict[str, int]] = None) -> requests.Session:
+    """
+    Crea una sesión con adaptadores por host
+
+    Args:
+        retries: Número máximo de reintentos
+        pool_size: Conexiones por pool para hosts sin configuración propia
+        host_pool_sizes: Prefijo de URL -> tamaño de pool
+
+    Returns:
+        Sesión configurada
+    """
+    session = requests.Session()
+    session.headers.update({'User-Agent': USER_AGENT})
+
+    retry = build_retry(retries)
+    default_adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount('https://', default_adapter)
+    session.mount('http://', default_adapter)
+
+    for prefix, size in (host_pool_sizes or HOST_POOL_SIZES).items():
+        session.mount(prefix, HTTPAdapter(pool_connections=1, pool_maxsize=size, max_retries=retry))
+
+    return session
+
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Retorna la sesión compartida del proceso (se crea al primer uso)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session()
+    return _session
+
+
+def close_session():
+    """Cierra la sesión compartida y sus conexiones"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def request(method: str, url: str, timeout: TimeoutType = None, **kwargs) -> requests.Response:
+    """
+    Ejecuta una petición HTTP con la sesión compartida
+
+    Antes de cada petición se espera el turno del proveedor (solo si su
+    presupuesto, un 429 o sus cabeceras de cuota lo exigen). Si el proveedor
+    encadena fallos su circuito se abre y se lanza CircuitOpen sin esperar.
+
+    Args:
+        method: Método HTTP
+        url: URL destino
+        timeout: Segundos de lectura o tupla (conexión, lectura)
+        **kwargs: Argumentos adicionales de requests
+
+    Returns:
+        Respuesta HTTP
+
+    Raises:
+        CircuitOpen: El circuito del proveedor está abierto
+    """
+    if timeout is None:
+        timeout = (DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT)
+    elif isinstance(timeout, (int, float)):
+        timeout = (min(DEFAULT_CONNECT_TIMEOUT, timeout), timeout)
+
+    breaker = get_circuit_breaker(url)
+    if breaker is None:
+        return _send(method, url, timeout, **kwargs)
+
+    breaker.allow()
+    try:
+        response = _send(method, url, timeout, **kwargs)
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+        breaker.failure()
+        raise
+    except BaseException:
+        breaker.release()
+        raise
+    if is_failure_status(getattr(response, 'status_code', 200)):
+        breaker.failure()
+    else:
+        breaker.success()
+    return response
+
+
+def _trace_response(response, streamed: bool):
+    """Suma a la traza activa la petición, sus bytes y los reintentos de urllib3"""
+    tracing.add('http_requests')
+    content = None if streamed else getattr(response, 'content', None)
+    if isinstance(content, bytes):
+        tracing.add('http_bytes', len(content))
+    retries = getattr(getattr(response, 'raw', None), 'retries', None)
+    tracing.add('http_retries', len(getattr(retries, 'history', None) or ()))
+
+
+def _send(method: str, url: str, timeout: TimeoutType, **kwargs) -> requests.Response:
+    """Envía la petición respetando el límite de tasa (reintenta POST tras un 429)"""
+    limiter = get_rate_limiter()
+    if limiter is None:
+        response = get_session().request(method, url, timeout=timeout, **kwargs)
+        _trace_response(response, kwargs.get('stream', False))
+        return response
+
+    retries = 0 if method.upper() in Retry.DEFAULT_ALLOWED_METHODS else RATE_LIMIT_RETRIES
+    while True:
+        limiter.acquire(url)
+        response = get_session().request(method, url, timeout=timeout, **kwargs)
+        _trace_response(response, kwargs.get('stream', False))
+        if not limiter.observe(url, response) or retries <= 0:
+            return response
+        retries -= 1
+        tracing.add('http_retries')
+        response.close()
+
+
+def get(url: str, timeout: TimeoutType = None, **kwargs) -> requests.Response:
+    """GET con la sesión compartida"""
+    return request('GET', url, timeout=timeout, **kwargs)
+
+
+def post(url: str, timeout: TimeoutType = None, **kwargs) -> requests.Response:
+    """POST con la sesión compartida"""
+    return request('POST', url, timeout=timeout, **kwargs)
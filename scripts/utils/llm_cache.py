@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Caché persistente de respuestas del LLM direccionada por contenido
+La clave es el hash de todo lo que determina la respuesta (modelo, prompt de
+sistema, prompt de usuario, temperatura y max_tokens), de modo que volver a
+ejecutar el orquestador sobre el mismo feed, los tests o una regeneración
+parcial no repiten llamadas pagadas. Las respuestas se guardan comprimidas en
+SQLite, con expulsión LRU por tamaño y TTL opcional.
+
+Configuración (.env):
+    LLM_CACHE          0 desactiva la caché
+    LLM_CACHE_DB       Ruta del archivo SQLite (default: data/cache/llm_cache.sqlite)
+    LLM_CACHE_MAX_MB   Tamaño máximo (default: 100)
+    LLM_CACHE_TTL      Segundos de validez de una respuesta (default: 0 = sin vencimiento)
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Optional
+
+from utils import tracing
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / 'data' / 'cache'
+DEFAULT_TTL = float(os.getenv('LLM_CACHE_TTL', '0'))
+DEFAULT_MAX_BYTES = int(float(os.getenv('LLM_CACHE_MAX_MB', '100')) * 1024 * 1024)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS completions (
+    key TEXT PRIMARY KEY,
+    model TEXT,
+    content BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_completions_accessed ON completions(accessed_at);
+"""
+
+
+def cache_key(payload: Dict, variant: int = 0) -> str:
+    """
+    Hash de los campos de una petición que determinan la respuesta
+
+    Args:
+        payload: Petición de chat (model, messages, temperature, max_tokens)
+        variant: Número de variación cuando el mismo prompt se pide varias
+            veces a propósito (0 = clave solo por contenido)
+
+    Returns:
+        SHA-256 hexadecimal
+    """
+    messages = payload.get('messages', [])
+    system = [m.get('content', '') for m in messages if m.get('role') == 'system']
+    user = [m.get('content', '') for m in messages if m.get('role') != 'system']
+    fields = {
+        'model': payload.get('model'),
+        'system': system,
+        'user': user,
+        'temperature': payload.get('temperature'),
+        'max_tokens': payload.get('max_tokens'),
+    }
+    if variant:
+        fields['variant'] = variant
+    data = json.dumps(fields, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+class LLMCache:
+    """Respuestas del LLM en SQLite con TTL opcional y expulsión LRU por tamaño"""
+
+    def __init__(self, path: str = None, ttl: float = DEFAULT_TTL, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Inicializa la caché
+
+        Args:
+            path: Ruta del archivo SQLite
+            ttl: Segundos de validez de una respuesta (0 = sin vencimiento)
+            max_bytes: Tamaño máximo total de las respuestas comprimidas
+        """
+        self.path = Path(path) if path else DEFAULT_CACHE_DIR / 'llm_cache.sqlite'
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+
+        self.stats = {'hits': 0, 'misses': 0, 'expired': 0, 'evicted': 0}
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Respuesta guardada para una clave (actualiza su último acceso)
+
+        Args:
+            key: Clave de cache_key()
+
+        Returns:
+            Contenido de la respuesta o None si no está o venció
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute('SELECT content, created_at FROM completions WHERE key = ?',
+                                     (key,)).fetchone()
+            if row is None:
+                self.stats['misses'] += 1
+                tracing.add('llm_cache_misses')
+                return None
+            if self.ttl > 0 and now - row['created_at'] >= self.ttl:
+                self._conn.execute('DELETE FROM completions WHERE key = ?', (key,))
+                self._conn.commit()
+                self.stats['expired'] += 1
+                self.stats['misses'] += 1
+                tracing.add('llm_cache_misses')
+                return None
+            self._conn.execute('UPDATE completions SET accessed_at = ? WHERE key = ?', (now, key))
+            self._conn.commit()
+            self.stats['hits'] += 1
+        tracing.add('llm_cache_hits')
+        return zlib.decompress(row['content']).decode('utf-8')
+
+    def put(self, key: str, content: str, model: str = None):
+        """
+        Guarda o reemplaza una respuesta
+
+        Args:
+            key: Clave de cache_key()
+            content: Texto de la respuesta
+            model: Modelo que la generó (informativo)
+        """
+        compressed = zlib.compress(content.encode('utf-8'))
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO completions (key, model, content, size, created_at, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (key, model, compressed, len(compressed), now, now)
+            )
+            self._conn.commit()
+            self._evict()
+
+    def total_size(self) -> int:
+        """Tamaño total en bytes de las respuestas"""
+        with self._lock:
+            return self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM completions').fetchone()[0]
+
+    def _evict(self):
+        """Expulsa las respuestas menos usadas recientemente hasta caber en max_bytes"""
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM completions').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute('SELECT key, size FROM completions ORDER BY accessed_at ASC').fetchall()
+        to_delete = []
+        for row in rows:
+            if total <= self.max_bytes:
+                break
+            to_delete.append((row['key'],))
+            total -= row['size']
+
+        self._conn.executemany('DELETE FROM completions WHERE key = ?', to_delete)
+        self._conn.commit()
+        self.stats['evicted'] += len(to_delete)  # Ya bajo self._lock
+
+    def clear(self):
+        """Elimina todas las respuestas"""
+        with self._lock:
+            self._conn.execute('DELETE FROM completions')
+            self._conn.commit()
+
+    def close(self):
+        """Cierra la conexión a SQLite"""
+        with self._lock:
+            self._conn.close()
+
+
+_default_cache: Optional[LLMCache] = None
+_default_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """
+    Retorna la caché de respuestas LLM compartida del proceso
+
+    Se desactiva con LLM_CACHE=0 y su ubicación se cambia con LLM_CACHE_DB.
+
+    Returns:
+        Caché compartida o None si está desactivada
+    """
+    global _default_cache
+    if os.getenv('LLM_CACHE', '1') == '0':
+        return None
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                _default_cache = LLMCache(os.getenv('LLM_CACHE_DB') or None)
+    return _default_cache
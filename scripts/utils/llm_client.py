@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Cliente LLM compartido con ventana de concurrencia y límite de tasa
+Las llamadas a la API de chat (Blackbox) pasan por un único cliente por
+proceso: un token bucket reparte las peticiones por minuto que permite el plan
+y un pool de hilos acota cuántas hay en vuelo a la vez. Las respuestas se
+guardan en la caché direccionada por contenido (utils.llm_cache): un prompt
+idéntico no vuelve a la API ni consume turno del límite. La interfaz asyncio
+permite lanzar un lote de artículos de golpe y recibir los resultados en el
+orden de entrada; la interfaz síncrona y el modo streaming (SSE, fragmentos
+conforme se generan) respetan los mismos límites. Si el circuito de la API
+está abierto (utils.circuit_breaker) se falla antes de esperar turno.
+
+Configuración (.env):
+    LLM_CONCURRENCY    Peticiones simultáneas (default: 4)
+    LLM_RATE_PER_MIN   Peticiones por minuto (default: 60)
+    LLM_BURST          Ráfaga máxima del token bucket (default: LLM_CONCURRENCY)
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Dict, Iterable, Iterator, List, Optional
+
+from utils import http_client, tracing
+from utils.circuit_breaker import get_circuit_breaker
+from utils.llm_cache import cache_key, get_llm_cache
+from utils.rate_limit import TokenBucket
+
+API_URL = 'https://api.blackbox.ai/chat/completions'
+
+DEFAULT_CONCURRENCY = int(os.getenv('LLM_CONCURRENCY', '4'))
+DEFAULT_RATE_PER_MIN = float(os.getenv('LLM_RATE_PER_MIN', '60'))
+DEFAULT_BURST = int(os.getenv('LLM_BURST', '0')) or DEFAULT_CONCURRENCY
+
+# Aproximación de tokens cuando la respuesta no trae 'usage' (streaming)
+CHARS_PER_TOKEN = 4
+
+
+class LLMClient:
+    """Cliente de chat completions con concurrencia acotada y límite de tasa"""
+
+    def __init__(self, api_url: str = API_URL, concurrency: int = DEFAULT_CONCURRENCY,
+                 rate_per_minute: float = DEFAULT_RATE_PER_MIN, burst: int = DEFAULT_BURST):
+        """
+        Inicializa el cliente
+
+        Args:
+            api_url: Endpoint de chat completions
+            concurrency: Máximo de peticiones en vuelo
+            rate_per_minute: Peticiones por minuto (0 = sin límite)
+            burst: Peticiones que pueden salir de golpe antes de espaciarse
+        """
+        self.api_url = api_url
+        self.concurrency = max(1, concurrency)
+        self.bucket = TokenBucket(rate_per_minute / 60.0, burst)
+        # Ventana de concurrencia compartida por peticiones completas y streams;
+        # el pool permite esperar las completas desde cualquier event loop
+        self._slots = threading.BoundedSemaphore(self.concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='llm')
+
+    def _check_circuit(self):
+        """Lanza CircuitOpen si la API está caída, sin consumir turno del límite"""
+        breaker = get_circuit_breaker(self.api_url)
+        if breaker:
+            breaker.check()
+
+    def _post(self, payload: Dict, headers: Dict, timeout: float) -> str:
+        with self._slots:
+            response = http_client.post(self.api_url, headers=headers, json=payload, timeout=timeout)
+        response.raise_for_status()
+        data = response.json()
+        content = data['choices'][0]['message']['content'].strip()
+        _record_usage(payload, content, data.get('usage'))
+        return content
+
+    def complete(self, payload: Dict, headers: Dict, timeout: float = 90, variant: int = 0) -> str:
+        """
+        Ejecuta una petición de forma síncrona
+
+        Args:
+            payload: Cuerpo de la petición (model, messages, temperature...)
+            headers: Cabeceras con la autorización
+            timeout: Segundos máximos de lectura
+            variant: Número de variación para pedir a propósito otra
+                respuesta al mismo prompt (no comparte entrada de caché)
+
+        Returns:
+            Contenido del primer mensaje de la respuesta
+
+        Raises:
+            requests.exceptions.RequestException: Error de red o HTTP
+            KeyError, IndexError: Respuesta sin el formato esperado
+        """
+        cache, key = get_llm_cache(), cache_key(payload, variant)
+        cached = cache.get(key) if cache else None
+        if cached is not None:
+            return cached
+
+        self._check_circuit()
+        time.sleep(self.bucket.reserve())
+        content = self._executor.submit(tracing.bind(self._post, payload, headers, timeout)).result()
+        if cache:
+            cache.put(key, content, payload.get('model'))
+        return content
+
+    async def acomplete(self, payload: Dict, headers: Dict, timeout: float = 90, variant: int = 0) -> str:
+        """Versión asyncio de complete(): espera su turno sin bloquear el loop"""
+        cache, key = get_llm_cache(), cache_key(payload, variant)
+        cached = cache.get(key) if cache else None
+        if cached is not None:
+            return cached
+
+        self._check_circuit()
+        await asyncio.sleep(self.bucket.reserve())
+        loop = asyncio.get_running_loop()
+        content = await loop.run_in_executor(self._executor, tracing.bind(self._post, payload, headers, timeout))
+        if cache:
+            cache.put(key, content, payload.get('model'))
+        return content
+
+    def stream(self, payload: Dict, headers: Dict, timeout: float = 90, variant: int = 0) -> Iterator[str]:
+        """
+        Ejecuta una petición en modo streaming (SSE)
+
+        Una respuesta en caché se entrega como un único fragmento; una nueva
+        se guarda en caché solo si el stream termina completo.
+
+        Args:
+            payload: Cuerpo de la petición (se envía con stream=True)
+            headers: Cabeceras con la autorización
+            timeout: Segundos máximos entre fragmentos
+            variant: Número de variación (ver complete())
+
+        Yields:
+            Fragmentos de texto conforme el modelo los genera
+
+        Raises:
+            requests.exceptions.RequestException: Error de red o HTTP
+            KeyError, IndexError, ValueError: Evento sin el formato esperado
+        """
+        cache, key = get_llm_cache(), cache_key(payload, variant)
+        cached = cache.get(key) if cache else None
+        if cached is not None:
+            yield cached
+            return
+
+        self._check_circuit()
+        time.sleep(self.bucket.reserve())
+        chunks = []
+        with self._slots:
+            response = http_client.post(self.api_url, headers=headers, json={**payload, 'stream': True},
+                                        timeout=timeout, stream=True)
+            try:
+                response.raise_for_status()
+                for chunk in iter_sse_content(response):
+                    chunks.append(chunk)
+                    yield chunk
+            finally:
+                response.close()
+
+        content = ''.join(chunks).strip()
+        _record_usage(payload, content)
+        if cache and content:
+            cache.put(key, content, payload.get('model'))
+
+    def close(self):
+        """Libera los hilos del pool"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _record_usage(payload: Dict, content: str, usage: Optional[Dict] = None):
+    """Suma a la traza activa la petición y sus tokens (aproximados si no hay 'usage')"""
+    usage = usage or {}
+    prompt_chars = sum(len(message.get('content') or '') for message in payload.get('messages', []))
+    tracing.add('llm_requests')
+    tracing.add('llm_tokens_in', usage.get('prompt_tokens') or prompt_chars // CHARS_PER_TOKEN)
+    tracing.add('llm_tokens_out', usage.get('completion_tokens') or len(content) // CHARS_PER_TOKEN)
+
+
+def iter_sse_content(response) -> Iterator[str]:
+    """
+    Fragmentos de texto de una respuesta de chat completions en streaming
+
+    Lee los eventos 'data:' del stream hasta [DONE]. Si el servidor ignora
+    stream=True y responde JSON completo, entrega el mensaje como un fragmento.
+    Un stream que se cierra sin [DONE] ni finish_reason quedó cortado (p. ej.
+    por una conexión caída): se lanza ValueError para que el llamador no lo
+    publique ni lo guarde en caché.
+
+    Args:
+        response: Respuesta HTTP abierta con stream=True
+
+    Yields:
+        Contenido de cada delta (sin fragmentos vacíos)
+
+    Raises:
+        ValueError: Evento inválido o stream cortado antes de terminar
+    """
+    if 'application/json' in response.headers.get('Content-Type', ''):
+        yield response.json()['choices'][0]['message']['content']
+        return
+
+    finished = False
+    for raw in response.iter_lines():
+        tracing.add('http_bytes', len(raw) + 1)
+        line = raw.decode('utf-8') if isinstance(raw, bytes) else raw
+        if not line.startswith('data:'):
+            continue  # Líneas vacías, comentarios y otros campos del evento
+        data = line[5:].strip()
+        if data == '[DONE]':
+            finished = True
+            break
+        choices = json.loads(data).get('choices') or []
+        if not choices:
+            continue  # Eventos sin texto (p. ej. uso de tokens al final)
+        finished = finished or bool(choices[0].get('finish_reason'))
+        content = (choices[0].get('delta') or choices[0].get('message') or {}).get('content')
+        if content:
+            yield content
+
+    if not finished:
+        raise ValueError("Stream cortado: terminó sin [DONE] ni finish_reason")
+
+
+def run_in_order(coroutines: Iterable[Awaitable]) -> List:
+    """
+    Ejecuta corrutinas concurrentemente y retorna sus resultados en orden
+
+    Args:
+        coroutines: Corrutinas a ejecutar (la concurrencia real la acota el cliente)
+
+    Returns:
+        Resultados en el mismo orden que las corrutinas
+    """
+    async def _gather():
+        return await asyncio.gather(*coroutines)
+    return asyncio.run(_gather())
+
+
+_default_client: Optional[LLMClient] = None
+_default_lock = threading.Lock()
+
+
+def get_llm_client() -> LLMClient:
+    """Retorna el cliente LLM compartido del proceso (se crea al primer uso)"""
+    global _default_client
+    if _default_client is None:
+        with _default_lock:
+            if _default_client is None:
+                _default_client = LLMClient()
+    return _default_client
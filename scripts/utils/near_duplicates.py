@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Detección de noticias casi duplicadas con MinHash + LSH
+Distintos medios publican la misma nota (sindicada o apenas reescrita) con URLs
+diferentes, y cada copia costaría dos llamadas al LLM. Aquí cada artículo se
+reduce a una firma MinHash de sus shingles de palabras (título + texto
+normalizados); LSH por bandas propone candidatos y solo se agrupan los pares
+cuya similitud Jaccard estimada supera el umbral. Todo el cálculo es
+vectorizado con numpy: miles de artículos se agrupan en menos de un segundo.
+
+Uso:
+    python3 utils/near_duplicates.py data/raw/newsapi.ndjson --umbral 0.5
+"""
+
+import itertools
+import os
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+# Ejecutado como script: el paquete utils está en el directorio padre
+if __name__ == '__main__':
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.dedup import normalize_text
+
+DEFAULT_THRESHOLD = float(os.getenv('NEAR_DUP_THRESHOLD', '0.5'))
+DEFAULT_NUM_PERM = 64
+DEFAULT_SHINGLE_SIZE = 3
+# Caracteres del texto que entran en la firma (las copias difieren más al final)
+DEFAULT_MAX_CHARS = 2000
+
+# Shingles por bloque al calcular firmas (bloque x num_perm valores uint32)
+_BLOCK_SHINGLES = 65536
+
+# Multiplicadores para combinar los ids de palabras de un shingle
+_SHINGLE_MULTIPLIERS = np.array([0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9,
+                                 0xD6E8FEB86659FD93, 0xFF51AFD7ED558CCD], dtype=np.uint64)
+
+
+def optimal_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """
+    Bandas y filas de LSH cuyo umbral (1/b)^(1/r) más se acerca al pedido
+
+    Args:
+        threshold: Similitud Jaccard objetivo (0-1)
+        num_perm: Número de permutaciones de la firma
+
+    Returns:
+        (bandas, filas por banda)
+    """
+    best = None
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        error = abs((1 / bands) ** (1 / rows) - threshold)
+        if best is None or error < best[0]:
+            best = (error, bands, rows)
+    return best[1], best[2]
+
+
+def article_text(article: Dict, max_chars: int = DEFAULT_MAX_CHARS) -> str:
+    """Texto normalizado de un artículo para compararlo: título + texto completo"""
+    body = article.get('full_text') or article.get('content') or article.get('description') or ''
+    if body == 'Texto no disponible':
+        body = article.get('description') or ''
+    return normalize_text(f"{article.get('title', '')} {body[:max_chars]}")
+
+
+class NearDuplicateDetector:
+    """Agrupa textos casi duplicados con firmas MinHash y LSH por bandas"""
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, num_perm: int = DEFAULT_NUM_PERM,
+                 shingle_size: int = DEFAULT_SHINGLE_SIZE, seed: int = 1):
+        """
+        Inicializa el detector
+
+        Args:
+            threshold: Similitud Jaccard mínima para considerar duplicados
+            num_perm: Permutaciones de la firma (más = estimación más precisa)
+            shingle_size: Palabras por shingle
+            seed: Semilla de las funciones hash (resultados reproducibles)
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError(f"Umbral fuera de rango (0, 1]: {threshold}")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = optimal_bands(threshold, num_perm)
+
+        # Permutaciones h(x) = (a*x + b) mod 2^32 con a impar (biyectivas)
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(0, 2 ** 31, size=num_perm, dtype=np.uint32) * np.uint32(2) + np.uint32(1)
+        self._b = rng.integers(0, 2 ** 32, size=num_perm, dtype=np.uint32)
+
+    def _shingles(self, words: np.ndarray) -> np.ndarray:
+        """Hashes de 32 bits de los shingles de palabras a partir de sus ids"""
+        if not len(words):
+            return np.zeros(1, dtype=np.uint32)
+        k = min(self.shingle_size, len(words), len(_SHINGLE_MULTIPLIERS))
+        end = len(words) - k + 1
+        shingles = words[:end] * _SHINGLE_MULTIPLIERS[0]
+        for offset in range(1, k):
+            shingles ^= words[offset:end + offset] * _SHINGLE_MULTIPLIERS[offset]
+        return (shingles ^ (shingles >> np.uint64(32))).astype(np.uint32)
+
+    def signatures(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Firmas MinHash de varios textos
+
+        Las palabras se traducen a ids con un vocabulario del lote (más barato
+        que hashear cada palabra) y las permutaciones se aplican a todos los
+        shingles del lote por bloques, reduciendo al mínimo por documento.
+
+        Args:
+            texts: Textos ya normalizados
+
+        Returns:
+            Matriz (len(texts), num_perm) de uint32
+        """
+        vocab = {}
+        new_ids = itertools.count(1)
+        shingles = []
+        with np.errstate(over='ignore'):
+            for text in texts:
+                # Cada palabra nueva toma el siguiente id; las conocidas conservan el suyo
+                ids = np.fromiter(map(vocab.setdefault, text.split(), new_ids), dtype=np.uint64)
+                shingles.append(self._shingles(ids))
+
+            lengths = np.array([len(s) for s in shingles])
+            offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+            todos = np.concatenate(shingles) if shingles else np.zeros(0, dtype=np.uint32)
+
+            signatures = np.empty((len(texts), self.num_perm), dtype=np.uint32)
+            # Bloques de documentos de ~BLOCK shingles para acotar memoria
+            doc = 0
+            while doc < len(texts):
+                last = int(np.searchsorted(offsets, offsets[doc] + _BLOCK_SHINGLES, side='right'))
+                last = max(last, doc + 1)
+                inicio = offsets[doc]
+                fin = offsets[last] if last < len(texts) else len(todos)
+                hashed = self._a[:, None] * todos[None, inicio:fin] + self._b[:, None]
+                signatures[doc:last] = np.minimum.reduceat(hashed, offsets[doc:last] - inicio, axis=1).T
+                doc = last
+        return signatures
+
+    def cluster(self, texts: Sequence[str]) -> List[List[int]]:
+        """
+        Agrupa textos casi duplicados
+
+        Args:
+            texts: Textos ya normalizados
+
+        Returns:
+            Grupos de índices (incluye grupos de uno), cada grupo y la lista
+            en orden de primera aparición
+        """
+        n = len(texts)
+        if n == 0:
+            return []
+        signatures = self.signatures(texts)
+        parent = list(range(n))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for band in range(self.bands):
+            rows = signatures[:, band * self.rows:(band + 1) * self.rows]
+            buckets = defaultdict(list)
+            for idx, key in enumerate(map(bytes, rows)):
+                buckets[key].append(idx)
+
+            for members in buckets.values():
+                if len(members) < 2:
+                    continue
+                first = members[0]
+                # Verificar con la similitud estimada para descartar falsos positivos
+                similarity = (signatures[members[1:]] == signatures[first]).mean(axis=1)
+                for idx, sim in zip(members[1:], similarity):
+                    if sim >= self.threshold:
+                        root_a, root_b = find(first), find(idx)
+                        if root_a != root_b:
+                            parent[max(root_a, root_b)] = min(root_a, root_b)
+
+        groups = defaultdict(list)
+        for idx in range(n):
+            groups[find(idx)].append(idx)
+        return sorted(groups.values(), key=lambda group: group[0])
+
+
+def cluster_articles(articles: List[Dict], threshold: float = DEFAULT_THRESHOLD,
+                     num_perm: int = DEFAULT_NUM_PERM) -> List[List[Dict]]:
+    """
+    Agrupa artículos que cuentan la misma historia
+
+    Args:
+        articles: Artículos normalizados
+        threshold: Similitud Jaccard mínima
+        num_perm: Permutaciones de la firma MinHash
+
+    Returns:
+        Lista de grupos de artículos
+    """
+    detector = NearDuplicateDetector(threshold=threshold, num_perm=num_perm)
+    groups = detector.cluster([article_text(article) for article in articles])
+    return [[articles[idx] for idx in group] for group in groups]
+
+
+def _text_length(article: Dict) -> int:
+    text = article.get('full_text') or ''
+    return 0 if text == 'Texto no disponible' else len(text)
+
+
+def select_representatives(articles: List[Dict], threshold: float = DEFAULT_THRESHOLD,
+                           merge: bool = False) -> List[Dict]:
+    """
+    Un artículo por historia: el de texto más completo de cada grupo
+
+    El representante conserva la posición del primer artículo de su grupo y
+    lleva 'cluster_size' y 'duplicate_urls'. Con merge=True su texto se
+    complementa con los resúmenes de las otras versiones, para que el
+    parafraseo parta de un contexto más amplio.
+
+    Args:
+        articles: Artículos normalizados
+        threshold: Similitud Jaccard mínima
+        merge: Combinar los resúmenes de las copias en el representante
+
+    Returns:
+        Lista de representantes
+    """
+    representatives = []
+    for group in cluster_articles(articles, threshold):
+        if len(group) == 1:
+            representatives.append(group[0])
+            continue
+
+        best = max(group, key=_text_length)
+        representative = dict(best)
+        representative['cluster_size'] = len(group)
+        representative['duplicate_urls'] = [a.get('url', '') for a in group if a is not best]
+
+        if merge:
+            base = representative.get('full_text') or ''
+            extras = [a.get('description') for a in group
+                      if a is not best and a.get('description') and a['description'] not in base]
+            representative['full_text'] = '\n\n'.join(filter(None, [base, *dict.fromkeys(extras)]))
+
+        representatives.append(representative)
+    return representatives
+
+
+def main():
+    """Función principal: reporte de grupos de un almacén de artículos"""
+    import argparse
+    import time
+    from utils.article_store import load_articles
+
+    parser = argparse.ArgumentParser(description='Grupos de noticias casi duplicadas')
+    parser.add_argument('path', help='Archivo .ndjson, .ndjson.zst o .json')
+    parser.add_argument('--umbral', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Similitud Jaccard mínima (default: {DEFAULT_THRESHOLD})')
+    args = parser.parse_args()
+
+    articles = load_articles(args.path)
+    inicio = time.perf_counter()
+    groups = cluster_articles(articles, args.umbral)
+    duracion = (time.perf_counter() - inicio) * 1000
+
+    print(f"📰 {len(articles)} artículos → {len(groups)} historias ({duracion:.0f} ms)")
+    for group in groups:
+        if len(group) > 1:
+            print(f"\n🔗 {len(group)} versiones:")
+            for article in group:
+                print(f"   - {article.get('title', '')[:70]} ({article.get('source_name') or article.get('source')})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Ejecutor de tareas en grafo de dependencias
+Cada tarea declara de qué otras depende y arranca en cuanto estas terminan, en
+un pool de hilos compartido: las etapas independientes se solapan y el tiempo
+total se acerca al camino crítico en lugar de la suma de etapas. Una tarea
+"map" se expande en una tarea por elemento de la lista que produce otra, de
+modo que el trabajo por artículo también corre en paralelo. Las funciones
+async se ejecutan con su propio loop dentro del hilo trabajador, y cada
+tarea o elemento abre su span de utils.tracing.
+
+Configuración (.env):
+    PIPELINE_WORKERS   Hilos del pool (default: 8)
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from utils import tracing
+
+DEFAULT_WORKERS = int(os.getenv('PIPELINE_WORKERS', '8'))
+
+
+class _Node:
+    """Tarea del grafo y su estado durante la ejecución"""
+
+    def __init__(self, name: str, fn: Callable, deps: Sequence[str], over: Optional[str] = None):
+        self.name = name
+        self.fn = fn
+        self.deps = list(deps)
+        self.over = over
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.result: Any = None
+        self.items: List[Any] = []
+        self.remaining = 0
+
+    @property
+    def requires(self) -> List[str]:
+        return self.deps + ([self.over] if self.over and self.over not in self.deps else [])
+
+
+def _call(fn: Callable, *args) -> Any:
+    """Ejecuta una función síncrona o async (con su propio loop) y retorna su resultado"""
+    if asyncio.iscoroutinefunction(fn):
+        return asyncio.run(fn(*args))
+    return fn(*args)
+
+
+def _run_task(name: str, index: Optional[int], fn: Callable, *args) -> Any:
+    """Ejecuta una tarea dentro de su span (utils.tracing)"""
+    if index is None:
+        with tracing.span(name, 'etapa'):
+            return _call(fn, *args)
+    with tracing.span(name, 'elemento', index=index):
+        return _call(fn, *args)
+
+
+class Pipeline:
+    """Grafo de tareas con dependencias ejecutado en un pool de hilos"""
+
+    def __init__(self, max_workers: int = DEFAULT_WORKERS):
+        """
+        Inicializa el grafo vacío
+
+        Args:
+            max_workers: Hilos del pool compartido por todas las tareas
+        """
+        self.max_workers = max(1, max_workers)
+        self._nodes: Dict[str, _Node] = {}
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+
+    def add(self, name: str, fn: Callable, deps: Sequence[str] = ()) -> 'Pipeline':
+        """
+        Agrega una tarea
+
+        Args:
+            name: Nombre único de la tarea
+            fn: Función que recibe los resultados de deps, en ese orden
+            deps: Tareas que deben terminar antes
+
+        Returns:
+            El mismo grafo (para encadenar)
+        """
+        if name in self._nodes:
+            raise ValueError(f"Tarea duplicada: {name}")
+        self._nodes[name] = _Node(name, fn, deps)
+        return self
+
+    def map(self, name: str, fn: Callable, over: str, deps: Sequence[str] = ()) -> 'Pipeline':
+        """
+        Agrega una tarea por elemento de la lista que produce otra tarea
+
+        Args:
+            name: Nombre único de la tarea
+            fn: Función que recibe (elemento, índice desde 1, *resultados de deps)
+            over: Tarea cuyo resultado es la lista a recorrer
+            deps: Otras tareas que deben terminar antes
+
+        Returns:
+            El mismo grafo; el resultado de la tarea es la lista de
+            resultados en el orden de los elementos
+        """
+        if name in self._nodes:
+            raise ValueError(f"Tarea duplicada: {name}")
+        self._nodes[name] = _Node(name, fn, deps, over)
+        return self
+
+    def _validate(self):
+        """Verifica que las dependencias existan y que no haya ciclos"""
+        for node in self._nodes.values():
+            missing = [dep for dep in node.requires if dep not in self._nodes]
+            if missing:
+                raise ValueError(f"{node.name} depende de tareas inexistentes: {', '.join(missing)}")
+
+        visiting, done = set(), set()
+
+        def visit(name: str):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Ciclo de dependencias en {name}")
+            visiting.add(name)
+            for dep in self._nodes[name].requires:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self._nodes:
+            visit(name)
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Ejecuta el grafo completo
+
+        Si una tarea falla no se inicia ninguna más, se esperan las que están
+        en curso y se relanza el primer error.
+
+        Returns:
+            Nombre de tarea -> resultado
+        """
+        self._validate()
+        self._started_at = time.monotonic()
+        results: Dict[str, Any] = {}
+        pending = dict(self._nodes)
+        running = {}
+        error: Optional[BaseException] = None
+
+        def complete(node: _Node, value: Any):
+            node.result = results[node.name] = value
+            node.finished = time.monotonic()
+
+        def start_ready(pool: ThreadPoolExecutor):
+            progress = True
+            while progress:
+                progress = False
+                for name, node in list(pending.items()):
+                    if any(dep not in results for dep in node.requires):
+                        continue
+                    del pending[name]
+                    progress = True
+                    node.started = time.monotonic()
+                    args = [results[dep] for dep in node.deps]
+                    if node.over is None:
+                        running[pool.submit(tracing.bind(_run_task, name, None, node.fn, *args))] = (node, None)
+                        continue
+                    node.items = list(results[node.over] or [])
+                    node.remaining = len(node.items)
+                    if not node.items:
+                        complete(node, [])
+                        continue
+                    node.result = [None] * len(node.items)
+                    for index, item in enumerate(node.items, 1):
+                        future = pool.submit(tracing.bind(_run_task, name, index, node.fn, item, index, *args))
+                        running[future] = (node, index)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='pipeline') as pool:
+            start_ready(pool)
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node, index = running.pop(future)
+                    if future.cancelled():
+                        continue
+                    try:
+                        value = future.result()
+                    except BaseException as e:
+                        error = error or e
+                        continue
+                    if index is None:
+                        complete(node, value)
+                    else:
+                        node.result[index - 1] = value
+                        node.remaining -= 1
+                        if node.remaining == 0:
+                            complete(node, node.result)
+                if error:
+                    for future in running:
+                        future.cancel()
+                else:
+                    start_ready(pool)
+
+        self._finished_at = time.monotonic()
+        if error:
+            raise error
+        return results
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Tiempos de la última ejecución
+
+        Returns:
+            wall_seconds (tiempo real), sum_seconds (lo que habría tardado en
+            serie cada tarea de principio a fin) y por tarea su inicio
+            relativo, duración y número de elementos
+        """
+        if self._started_at is None:
+            return {}
+        tasks = {}
+        for node in self._nodes.values():
+            if node.started is None:
+                continue
+            end = node.finished or self._finished_at
+            tasks[node.name] = {
+                'start': round(node.started - self._started_at, 3),
+                'seconds': round(end - node.started, 3),
+            }
+            if node.over is not None:
+                tasks[node.name]['items'] = len(node.items)
+        return {
+            'wall_seconds': round((self._finished_at or time.monotonic()) - self._started_at, 3),
+            'sum_seconds': round(sum(task['seconds'] for task in tasks.values()), 3),
+            'tasks': tasks,
+        }
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Límite de tasa adaptativo por proveedor
+Reemplaza las pausas fijas entre peticiones: cada proveedor (host) solo se
+frena cuando hace falta, es decir cuando agota su presupuesto configurado,
+cuando responde 429/503 con Retry-After o cuando sus cabeceras de cuota
+(X-RateLimit-Remaining / X-RateLimit-Reset y variantes) indican que quedan
+pocas peticiones en la ventana. Todas las llamadas HTTP pasan por aquí desde
+utils.http_client, así que lo que sale de una caché o de disco nunca espera.
+
+Configuración (.env):
+    RATE_LIMIT            0 desactiva el limitador
+    RATE_LIMIT_MAX_WAIT   Espera máxima en segundos; si un proveedor exige más
+                          se falla de inmediato con RateLimited (default: 120)
+"""
+
+import email.utils
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+DEFAULT_MAX_WAIT = float(os.getenv('RATE_LIMIT_MAX_WAIT', '120'))
+
+# Presupuesto por prefijo de URL: (peticiones, segundos). Los proveedores sin
+# presupuesto solo se frenan por lo que ellos mismos indiquen (429, cabeceras).
+PROVIDER_BUDGETS: Dict[str, Tuple[int, float]] = {
+    'https://api.unsplash.com': (50, 3600),  # Plan demo: 50 peticiones por hora
+}
+
+# Con menos peticiones restantes que esto, se reparten en lo que queda de ventana
+PACE_BELOW_REMAINING = 5
+
+# Espera ante un 429 sin Retry-After (se duplica con cada 429 consecutivo)
+DEFAULT_BACKOFF = 2.0
+MAX_BACKOFF = 60.0
+
+_REMAINING_HEADERS = ('X-RateLimit-Remaining', 'RateLimit-Remaining', 'X-RateLimit-Requests-Remaining')
+_RESET_HEADERS = ('X-RateLimit-Reset', 'RateLimit-Reset', 'X-RateLimit-Requests-Reset')
+
+
+class RateLimited(requests.exceptions.RequestException):
+    """El proveedor exige esperar más de lo permitido: se falla sin esperar"""
+
+
+class TokenBucket:
+    """Token bucket seguro entre hilos: reserva turnos y dice cuánto esperar"""
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Inicializa el bucket lleno
+
+        Args:
+            rate: Tokens por segundo (0 o menos = sin límite)
+            capacity: Tokens máximos acumulables (tamaño de ráfaga)
+        """
+        self.rate = rate
+        self.capacity = max(1.0, float(capacity))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        Toma tokens (aunque el saldo quede negativo) y retorna la espera
+
+        Reservar por adelantado mantiene el orden de llegada: cada llamada
+        queda formada detrás de las anteriores sin volver a competir.
+
+        Returns:
+            Segundos que el llamador debe esperar antes de usar su turno
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+    def refund(self, tokens: float = 1.0):
+        """Devuelve tokens de una reserva que no se usó"""
+        if self.rate <= 0:
+            return
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + tokens)
+
+
+def provider_for(url: str) -> str:
+    """Proveedor de una URL: esquema + host (p. ej. https://api.unsplash.com)"""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def _parse_seconds(value: Optional[str], now: float) -> Optional[float]:
+    """Segundos de Retry-After o de un reset: delta, epoch o fecha HTTP"""
+    if not value:
+        return None
+    try:
+        number = float(value)
+    except ValueError:
+        try:
+            return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - now)
+        except (TypeError, ValueError):
+            return None
+    # Valores tipo epoch (X-RateLimit-Reset de GitHub, Twitter...)
+    return max(0.0, number - now) if number > 1e9 else max(0.0, number)
+
+
+def _first_header(headers, names) -> Optional[str]:
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            return value
+    return None
+
+
+class _ProviderState:
+    """Estado de un proveedor: presupuesto, bloqueo y ritmo aprendidos"""
+
+    def __init__(self, bucket: Optional[TokenBucket]):
+        self.bucket = bucket
+        self.blocked_until = 0.0   # time.monotonic() hasta el que no se puede pedir
+        self.pace = 0.0            # Separación mínima entre peticiones (cabeceras de cuota)
+        self.next_slot = 0.0       # Próximo turno según pace
+        self.backoff = DEFAULT_BACKOFF
+        self.stats = {'requests': 0, 'throttled': 0, 'waited_seconds': 0.0, 'rejected': 0}
+
+
+class AdaptiveRateLimiter:
+    """Frena por proveedor solo cuando su presupuesto o sus respuestas lo piden"""
+
+    def __init__(self, budgets: Dict[str, Tuple[int, float]] = None, max_wait: float = DEFAULT_MAX_WAIT):
+        """
+        Inicializa el limitador
+
+        Args:
+            budgets: Prefijo de URL -> (peticiones, segundos)
+            max_wait: Espera máxima; más allá se lanza RateLimited
+        """
+        self.budgets = PROVIDER_BUDGETS if budgets is None else budgets
+        self.max_wait = max_wait
+        self._providers: Dict[str, _ProviderState] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, provider: str) -> _ProviderState:
+        state = self._providers.get(provider)
+        if state is None:
+            bucket = None
+            for prefix, (count, seconds) in self.budgets.items():
+                if provider_for(prefix) == provider:
+                    bucket = TokenBucket(count / seconds, count)
+            state = self._providers[provider] = _ProviderState(bucket)
+        return state
+
+    def acquire(self, url: str):
+        """
+        Espera el turno de una petición (no espera si no hace falta)
+
+        Args:
+            url: URL de la petición
+
+        Raises:
+            RateLimited: El proveedor exige esperar más de max_wait
+        """
+        provider = provider_for(url)
+        with self._lock:
+            state = self._state(provider)
+            now = time.monotonic()
+            wait = max(0.0, state.blocked_until - now, state.next_slot - now)
+            budget_wait = state.bucket.reserve() if state.bucket else 0.0
+            wait = max(wait, budget_wait)
+
+            if wait > self.max_wait:
+                if state.bucket:
+                    state.bucket.refund()
+                state.stats['rejected'] += 1
+                raise RateLimited(f"{provider}: límite de tasa, habría que esperar {wait:.0f}s")
+
+            if state.pace:
+                state.next_slot = now + wait + state.pace
+            state.stats['requests'] += 1
+            state.stats['waited_seconds'] += wait
+
+        if wait > 0:
+            time.sleep(wait)
+
+    def observe(self, url: str, response) -> bool:
+        """
+        Aprende de una respuesta: 429/503 con Retry-After y cabeceras de cuota
+
+        Args:
+            url: URL de la petición
+            response: Respuesta HTTP
+
+        Returns:
+            True si el proveedor pidió esperar (429 o 503 con Retry-After)
+        """
+        headers = getattr(response, 'headers', None) or {}
+        status = getattr(response, 'status_code', 200)
+        now_wall = time.time()
+
+        with self._lock:
+            state = self._state(provider_for(url))
+            now = time.monotonic()
+
+            retry_after = _parse_seconds(headers.get('Retry-After'), now_wall)
+            if status == 429 or (status == 503 and retry_after is not None):
+                if retry_after is None:
+                    retry_after = state.backoff
+                    state.backoff = min(MAX_BACKOFF, state.backoff * 2)
+                state.blocked_until = max(state.blocked_until, now + retry_after)
+                state.stats['throttled'] += 1
+                return True
+
+            if status < 400:
+                state.backoff = DEFAULT_BACKOFF
+
+            remaining = _first_header(headers, _REMAINING_HEADERS)
+            reset = _parse_seconds(_first_header(headers, _RESET_HEADERS), now_wall)
+            try:
+                remaining = int(float(remaining)) if remaining is not None else None
+            except ValueError:
+                remaining = None
+
+            if remaining is None:
+                return False
+            if remaining <= 0 and reset is not None:
+                # Cuota agotada: nada hasta que se renueve la ventana
+                state.blocked_until = max(state.blocked_until, now + reset)
+            elif reset is not None and remaining < PACE_BELOW_REMAINING:
+                # Quedan pocas: repartirlas en lo que queda de ventana
+                state.pace = reset / remaining
+            else:
+                state.pace = 0.0
+            return False
+
+    def report(self) -> Dict[str, Dict]:
+        """Estadísticas por proveedor (solo los que tuvieron que esperar o fallar)"""
+        with self._lock:
+            return {
+                provider: {**state.stats, 'waited_seconds': round(state.stats['waited_seconds'], 2)}
+                for provider, state in self._providers.items()
+                if state.stats['throttled'] or state.stats['rejected'] or state.stats['waited_seconds']
+            }
+
+
+_default_limiter: Optional[AdaptiveRateLimiter] = None
+_default_lock = threading.Lock()
+
+
+def get_rate_limiter() -> Optional[AdaptiveRateLimiter]:
+    """
+    Retorna el limitador compartido del proceso
+
+    Se desactiva con RATE_LIMIT=0.
+
+    Returns:
+        Limitador compartido o None si está desactivado
+    """
+    global _default_limiter
+    if os.getenv('RATE_LIMIT', '1') == '0':
+        return None
+    if _default_limiter is None:
+        with _default_lock:
+            if _default_limiter is None:
+                _default_limiter = AdaptiveRateLimiter()
+    return _default_limiter
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Caché persistente de respuestas HTTP para páginas de artículos
+Guarda en SQLite el HTML (comprimido), ETag, Last-Modified y el texto ya
+extraído, de modo que una nueva ejecución sobre el mismo feed no repite ni la
+descarga ni el parseo. Las entradas vencidas se revalidan con GET condicional
+y el tamaño total se limita con expulsión LRU.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Optional
+
+from utils import tracing
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / 'data' / 'cache'
+DEFAULT_TTL = float(os.getenv('HTTP_CACHE_TTL', str(24 * 3600)))
+DEFAULT_MAX_BYTES = int(float(os.getenv('HTTP_CACHE_MAX_MB', '200')) * 1024 * 1024)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    body BLOB,
+    text TEXT,
+    extract_key TEXT,
+    size INTEGER NOT NULL DEFAULT 0,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at);
+"""
+
+
+class CacheEntry(dict):
+    """
+    Entrada de la caché; el HTML se descomprime solo al leer entry['body']
+
+    Un hit con el texto ya extraído no necesita el HTML, así que no paga la
+    descompresión.
+    """
+
+    def __init__(self, row: Dict, compressed: Optional[bytes]):
+        super().__init__(row)
+        self._compressed = compressed
+
+    def __missing__(self, key):
+        if key != 'body':
+            raise KeyError(key)
+        self['body'] = zlib.decompress(self._compressed) if self._compressed else b''
+        return self['body']
+
+
+class ResponseCache:
+    """Caché de respuestas HTTP en SQLite con TTL y expulsión LRU por tamaño"""
+
+    def __init__(self, path: str = None, ttl: float = DEFAULT_TTL, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Inicializa la caché
+
+        Args:
+            path: Ruta del archivo SQLite
+            ttl: Segundos durante los que una entrada se usa sin revalidar
+            max_bytes: Tamaño máximo total de las entradas
+        """
+        self.path = Path(path) if path else DEFAULT_CACHE_DIR / 'http_cache.sqlite'
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'evicted': 0}
+
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        Obtiene una entrada y actualiza su último acceso
+
+        Args:
+            url: URL de la página
+
+        Returns:
+            Entrada (el body se descomprime al leerlo) o None
+        """
+        with self._lock:
+            row = self._conn.execute('SELECT * FROM responses WHERE url = ?', (url,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute('UPDATE responses SET accessed_at = ? WHERE url = ?', (time.time(), url))
+            self._conn.commit()
+
+        entry = dict(row)
+        return CacheEntry(entry, entry.pop('body'))
+
+    def record(self, event: str):
+        """Incrementa un contador de estadísticas (hits, revalidated, misses)"""
+        with self._lock:
+            self.stats[event] += 1
+        tracing.add(f'http_cache_{event}')
+
+    def is_fresh(self, entry: Dict) -> bool:
+        """True si la entrada sigue dentro del TTL"""
+        return time.time() - entry['fetched_at'] < self.ttl
+
+    @staticmethod
+    def conditional_headers(entry: Dict) -> Dict[str, str]:
+        """Headers para revalidar la entrada con un GET condicional"""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def put(self, url: str, body: bytes, etag: str = None, last_modified: str = None,
+            text: str = None, extract_key: str = None):
+        """
+        Guarda o reemplaza una respuesta
+
+        Args:
+            url: URL de la página
+            body: Contenido HTML crudo
+            etag: Header ETag de la respuesta
+            last_modified: Header Last-Modified de la respuesta
+            text: Texto ya extraído
+            extract_key: Parámetros de extracción con los que se obtuvo el texto
+        """
+        compressed = zlib.compress(body or b'')
+        size = len(compressed) + len((text or '').encode('utf-8'))
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses '
+                '(url, etag, last_modified, body, text, extract_key, size, fetched_at, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (url, etag, last_modified, compressed, text, extract_key, size, now, now)
+            )
+            self._conn.commit()
+            self._evict()
+
+    def mark_revalidated(self, url: str, etag: str = None, last_modified: str = None):
+        """
+        Renueva el TTL de una entrada tras un 304 Not Modified
+
+        Args:
+            url: URL de la página
+            etag: ETag del 304, si trae uno nuevo
+            last_modified: Last-Modified del 304, si trae uno nuevo
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'UPDATE responses SET fetched_at = ?, accessed_at = ?, etag = COALESCE(?, etag), '
+                'last_modified = COALESCE(?, last_modified) WHERE url = ?',
+                (now, now, etag, last_modified, url)
+            )
+            self._conn.commit()
+
+    def store_text(self, url: str, text: str, extract_key: str):
+        """Actualiza el texto extraído de una entrada existente"""
+        with self._lock:
+            self._conn.execute(
+                'UPDATE responses SET text = ?, extract_key = ?, '
+                'size = length(body) + length(CAST(? AS BLOB)) WHERE url = ?',
+                (text, extract_key, text, url)
+            )
+            self._conn.commit()
+
+    def total_size(self) -> int:
+        """Tamaño total en bytes de las entradas"""
+        with self._lock:
+            return self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    def _evict(self):
+        """Expulsa las entradas menos usadas recientemente hasta caber en max_bytes"""
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute('SELECT url, size FROM responses ORDER BY accessed_at ASC').fetchall()
+        to_delete = []
+        for row in rows:
+            if total <= self.max_bytes:
+                break
+            to_delete.append((row['url'],))
+            total -= row['size']
+
+        self._conn.executemany('DELETE FROM responses WHERE url = ?', to_delete)
+        self._conn.commit()
+        self.stats['evicted'] += len(to_delete)  # Ya bajo self._lock
+
+    def clear(self):
+        """Elimina todas las entradas"""
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+
+    def close(self):
+        """Cierra la conexión a SQLite"""
+        with self._lock:
+            self._conn.close()
+
+
+_default_cache: Optional[ResponseCache] = None
+_default_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Retorna la caché compartida del proceso
+
+    Se desactiva con HTTP_CACHE=0 y su ubicación se cambia con HTTP_CACHE_DIR.
+
+    Returns:
+        Caché compartida o None si está desactivada
+    """
+    global _default_cache
+    if os.getenv('HTTP_CACHE', '1') == '0':
+        return None
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                cache_dir = Path(os.getenv('HTTP_CACHE_DIR', str(DEFAULT_CACHE_DIR)))
+                _default_cache = ResponseCache(str(cache_dir / 'http_cache.sqlite'))
+    return _default_cache
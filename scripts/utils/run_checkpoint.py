@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Puntos de control de las ejecuciones del orquestador en SQLite
+Cada paso guarda sus resultados bajo el run_id en cuanto los obtiene (cada
+artículo parafraseado, cada imagen, la metadata de sitios y templates...), de
+modo que si la ejecución se interrumpe, `--resume RUN_ID` retoma solo lo que
+faltaba sin volver a pagar las llamadas ya hechas.
+
+Los valores se guardan como JSON por (run_id, paso, clave); los resultados de
+un paso completo usan la clave vacía.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    run_id TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    saved_at REAL NOT NULL,
+    PRIMARY KEY (run_id, stage, key)
+);
+"""
+
+RUNNING = 'en_curso'
+COMPLETED = 'completada'
+FAILED = 'fallida'
+
+
+class CheckpointStore:
+    """Resultados parciales de las ejecuciones, por run_id y paso"""
+
+    def __init__(self, path: str):
+        """
+        Inicializa el almacén
+
+        Args:
+            path: Ruta del archivo SQLite
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+
+    def start_run(self, run_id: str):
+        """Registra la ejecución (o la marca de nuevo en curso al reanudarla)"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO runs (run_id, status, created_at, updated_at) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(run_id) DO UPDATE SET status = excluded.status, updated_at = excluded.updated_at',
+                (run_id, RUNNING, now, now)
+            )
+            self._conn.commit()
+
+    def finish_run(self, run_id: str, status: str = COMPLETED):
+        """Marca el final de la ejecución (completada o fallida)"""
+        with self._lock:
+            self._conn.execute('UPDATE runs SET status = ?, updated_at = ? WHERE run_id = ?',
+                               (status, time.time(), run_id))
+            self._conn.commit()
+
+    def run_status(self, run_id: str) -> Optional[str]:
+        """Estado de una ejecución o None si no tiene puntos de control"""
+        with self._lock:
+            row = self._conn.execute('SELECT status FROM runs WHERE run_id = ?', (run_id,)).fetchone()
+        return row[0] if row else None
+
+    def save(self, run_id: str, stage: str, value: Any, key: str = ''):
+        """
+        Guarda un resultado
+
+        Args:
+            run_id: Ejecución
+            stage: Paso que lo produjo
+            value: Valor serializable en JSON
+            key: Elemento del paso (vacío = resultado del paso completo)
+        """
+        data = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO checkpoints (run_id, stage, key, value, saved_at) VALUES (?, ?, ?, ?, ?)',
+                (run_id, stage, str(key), data, time.time())
+            )
+            self._conn.commit()
+
+    def load(self, run_id: str, stage: str, key: str = '') -> Any:
+        """Resultado guardado o None"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value FROM checkpoints WHERE run_id = ? AND stage = ? AND key = ?',
+                (run_id, stage, str(key))
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def load_stage(self, run_id: str, stage: str) -> Dict[str, Any]:
+        """Todos los elementos guardados de un paso: clave -> valor"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT key, value FROM checkpoints WHERE run_id = ? AND stage = ?', (run_id, stage)
+            ).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def close(self):
+        """Cierra la conexión"""
+        with self._lock:
+            self._conn.close()
+
+
+def open_checkpoints(output_dir: Path) -> Optional[CheckpointStore]:
+    """
+    Abre el almacén de puntos de control de un directorio de salida
+
+    Se guarda junto a los run_summary (CHECKPOINTS_DB cambia la ruta) y se
+    desactiva con CHECKPOINTS=0.
+
+    Args:
+        output_dir: Directorio base de los sitios generados
+
+    Returns:
+        Almacén o None si está desactivado
+    """
+    if os.getenv('CHECKPOINTS', '1') == '0':
+        return None
+    return CheckpointStore(os.getenv('CHECKPOINTS_DB') or Path(output_dir) / 'checkpoints.sqlite')
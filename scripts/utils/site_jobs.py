@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Renderizado de sitios en un pool de procesos a partir de trabajos serializados
+Renderizar, escribir el HTML y copiar CSS e imágenes de un sitio es trabajo
+de CPU y disco local que no comparte nada con los demás sitios: cada sitio se
+describe con un trabajo autocontenido (un dict serializable con su metadata,
+template, layout y artículos) y los trabajos se reparten entre procesos para
+usar todos los núcleos sin pelear por el GIL.
+
+Cada trabajo lleva su semilla: el módulo random se siembra con ella antes de
+ejecutarlo (y se restaura después), así que un sitio sale igual sin importar
+en qué proceso ni en qué orden se renderice, y también igual que en serie.
+Si hay una traza activa, los spans y métricas de cada trabajo vuelven con su
+resultado y se incorporan a la traza del proceso padre.
+
+Configuración (.env):
+    RENDER_PROCESSES   Procesos para renderizar sitios (default: -1 = uno por
+                       núcleo; 0 o 1 = en serie en el proceso actual)
+"""
+
+import functools
+import multiprocessing
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from utils import tracing
+
+DEFAULT_PROCESSES = int(os.getenv('RENDER_PROCESSES', '-1'))
+
+
+def site_seed(base: Any, site_num: int) -> str:
+    """Semilla reproducible de un sitio: la misma base y número dan la misma semilla"""
+    return f"{base}:{site_num}"
+
+
+@contextmanager
+def seeded(seed: Any) -> Iterator[None]:
+    """Siembra el módulo random durante el bloque y restaura su estado al salir"""
+    state = random.getstate()
+    random.seed(seed)
+    try:
+        yield
+    finally:
+        random.setstate(state)
+
+
+def _run_job(fn: Callable[[Dict], Any], job: Dict, traced: bool = False) -> Any:
+    """
+    Ejecuta un trabajo con random sembrado con su semilla
+
+    Con traced (en otro proceso, con traza activa en el padre) retorna
+    (resultado, spans exportados) para tracing.merge().
+    """
+    with seeded(job.get('seed')):
+        if traced:
+            return tracing.capture(fn, job)
+        return fn(job)
+
+
+def resolve_processes(processes: Optional[int] = None) -> int:
+    """
+    Número efectivo de procesos
+
+    Args:
+        processes: None = RENDER_PROCESSES, negativo = uno por núcleo
+
+    Returns:
+        Procesos a usar (0 o 1 = en serie)
+    """
+    if processes is None:
+        processes = DEFAULT_PROCESSES
+    if processes < 0:
+        processes = os.cpu_count() or 1
+    return processes
+
+
+def run_jobs(fn: Callable[[Dict], Any], jobs: List[Dict], processes: Optional[int] = None) -> List[Any]:
+    """
+    Ejecuta un trabajo por sitio, en paralelo si se piden varios procesos
+
+    fn debe ser una función de nivel de módulo (se envía por referencia a los
+    procesos) y los trabajos, dicts serializables con su 'seed'. Los spans
+    de los trabajos en otros procesos se incorporan a la traza activa. Si el
+    pool no puede arrancar (sin soporte de multiprocessing en el entorno) se
+    ejecutan en serie.
+
+    Args:
+        fn: Función que recibe un trabajo y retorna su resultado
+        jobs: Trabajos a ejecutar
+        processes: Procesos (ver resolve_processes)
+
+    Returns:
+        Resultados en el orden de los trabajos
+    """
+    processes = min(resolve_processes(processes), len(jobs))
+    if processes > 1:
+        # forkserver/spawn: el orquestador tiene hilos vivos y fork no es seguro con ellos
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+        traced = tracing.active()
+        try:
+            with ProcessPoolExecutor(max_workers=processes, mp_context=context) as pool:
+                results = list(pool.map(functools.partial(_run_job, fn, traced=traced), jobs))
+            if not traced:
+                return results
+            for _, exported in results:
+                tracing.merge(exported)
+            return [result for result, _ in results]
+        except (OSError, NotImplementedError, BrokenProcessPool) as e:
+            print(f"⚠️  Pool de procesos no disponible ({e}), renderizando en serie", flush=True)
+    return [_run_job(fn, job) for job in jobs]
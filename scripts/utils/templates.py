@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Motor de templates HTML compilados con escape automático
+Cada template se traduce una sola vez a una función de Python (texto estático
+pre-unido, expresiones y bloques como código) y queda en caché: renderizar una
+página es llamar a esa función, sin volver a parsear nada. Los parciales
+incluidos se insertan al compilar, así que tampoco cuestan una búsqueda por
+página.
+
+Todo valor interpolado se escapa para HTML salvo que sea Markup (HTML ya
+seguro, por ejemplo otro template renderizado) o lleve el filtro |safe.
+
+Sintaxis:
+    {{ expresión }}                 Valor escapado (None se omite)
+    {{ expresión|safe }}            Valor sin escapar
+    {% if expr %} {% elif expr %} {% else %} {% endif %}
+    {% for a, b in expr %} {% endfor %}
+    {% set nombre = expr %}
+    {% include "parciales/x.html" %}
+    {# comentario #}
+
+Las expresiones son Python; los nombres se buscan en el contexto del render,
+luego en los globales del entorno y por último en los builtins. Un bloque {% %}
+solo en su línea no deja línea en blanco en la salida.
+
+Configuración (.env):
+    TEMPLATES_HTML_DIR   Directorio de templates (default: templates/html)
+"""
+
+import ast
+import builtins
+import hashlib
+import html
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_TEMPLATES_DIR = Path(__file__).resolve().parents[2] / 'templates' / 'html'
+
+_TOKEN_RE = re.compile(r'{{(.*?)}}|{%(.*?)%}|{#.*?#}', re.S)
+
+
+class TemplateError(Exception):
+    """Error de sintaxis o de carga de un template"""
+
+
+class Markup(str):
+    """Cadena de HTML seguro: no se vuelve a escapar al interpolarla"""
+
+    __slots__ = ()
+
+    def __html__(self) -> str:
+        return self
+
+
+def _escape(value: Any) -> str:
+    """Escape usado por los templates compilados (sin envolver en Markup)"""
+    cls = value.__class__
+    if cls is Markup:
+        return value
+    if cls is not str:
+        if value is None:
+            return ''
+        if hasattr(value, '__html__'):
+            return value.__html__()
+        value = str(value)
+    # La mayoría de los valores no tienen nada que escapar: buscar es más barato que reemplazar
+    if '&' in value or '<' in value or '>' in value or '"' in value or "'" in value:
+        return html.escape(value, quote=True)
+    return value
+
+
+def escape(value: Any) -> Markup:
+    """Escapa un valor para HTML (None -> cadena vacía, Markup se respeta)"""
+    return Markup(_escape(value))
+
+
+def _safe(value: Any) -> str:
+    """Valor interpolado con |safe"""
+    return '' if value is None else str(value)
+
+
+def _tokens(source: str) -> List[tuple]:
+    """
+    Divide el template en ('texto'|'expr'|'bloque', contenido)
+
+    Un bloque que ocupa su línea completa se lleva también la sangría y el
+    salto de línea, para que la salida no quede llena de líneas vacías.
+    """
+    tokens = []
+    pos = 0
+    for match in _TOKEN_RE.finditer(source):
+        start, end = match.start(), match.end()
+        expr, block = match.group(1), match.group(2)
+        text = source[pos:start]
+        if expr is None:
+            line_start = text.rfind('\n') + 1
+            line_end = source.find('\n', end)
+            tail = source[end:] if line_end < 0 else source[end:line_end]
+            if not text[line_start:].strip() and not tail.strip() and (line_start or pos == 0 or source[pos - 1] == '\n'):
+                text = text[:line_start]
+                end = len(source) if line_end < 0 else line_end + 1
+        if text:
+            tokens.append(('texto', text))
+        if expr is not None:
+            tokens.append(('expr', expr.strip()))
+        elif block is not None:
+            tokens.append(('bloque', block.strip()))
+        pos = end
+    if pos < len(source):
+        tokens.append(('texto', source[pos:]))
+    return tokens
+
+
+class _Compiler:
+    """Traduce los tokens de un template (con sus parciales) a código Python"""
+
+    def __init__(self, name: str, loader: Optional[Callable[[str], str]]):
+        self.name = name
+        self.loader = loader
+        self.lines: List[str] = []
+        self.names: set = set()
+        self.stack: List[str] = []
+        self.including: List[str] = [name]
+        self.pending: List[str] = []
+
+    def _check(self, expr: str) -> str:
+        try:
+            tree = ast.parse(expr, mode='eval')
+        except SyntaxError as e:
+            raise TemplateError(f"{self.including[-1]}: expresión inválida '{expr}': {e.msg}") from None
+        self.names.update(node.id for node in ast.walk(tree)
+                          if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load))
+        return expr
+
+    def _emit(self, line: str):
+        self._flush()
+        self.lines.append('    ' * (len(self.stack) + 1) + line)
+
+    def _flush(self):
+        """Emite el texto estático acumulado como un solo append"""
+        if self.pending:
+            text = ''.join(self.pending)
+            self.pending = []
+            self.lines.append('    ' * (len(self.stack) + 1) + f'_w({text!r})')
+
+    def _close_empty(self):
+        """Agrega pass si el bloque que se abrió quedó sin cuerpo"""
+        self._flush()
+        if self.lines[-1].rstrip().endswith(':'):
+            self.lines.append('    ' * (len(self.stack) + 1) + 'pass')
+
+    def compile(self, source: str):
+        for kind, value in _tokens(source):
+            if kind == 'texto':
+                self.pending.append(value)
+            elif kind == 'expr':
+                if value.endswith('|safe'):
+                    self._emit(f'_w(_safe({self._check(value[:-5].strip())}))')
+                else:
+                    self._emit(f'_w(_e({self._check(value)}))')
+            else:
+                self._block(value)
+
+    def _block(self, tag: str):
+        keyword, _, rest = tag.partition(' ')
+        rest = rest.strip()
+        if keyword == 'if':
+            self._emit(f'if {self._check(rest)}:')
+            self.stack.append('if')
+        elif keyword in ('elif', 'else'):
+            if not self.stack or self.stack[-1] != 'if':
+                raise TemplateError(f"{self.including[-1]}: {keyword} sin if")
+            self._close_empty()
+            self.stack.pop()
+            self._emit(f'elif {self._check(rest)}:' if keyword == 'elif' else 'else:')
+            self.stack.append('if')
+        elif keyword == 'for':
+            target, sep, iterable = rest.partition(' in ')
+            if not sep:
+                raise TemplateError(f"{self.including[-1]}: for sin 'in': {tag}")
+            self._check(f'[0 for {target} in ()]')
+            self._emit(f'for {target.strip()} in {self._check(iterable.strip())}:')
+            self.stack.append('for')
+        elif keyword in ('endif', 'endfor'):
+            if not self.stack or self.stack[-1] != keyword[3:]:
+                raise TemplateError(f"{self.including[-1]}: {keyword} sin {keyword[3:]}")
+            self._close_empty()
+            self.stack.pop()
+        elif keyword == 'set':
+            target, sep, expr = rest.partition('=')
+            if not sep or not target.strip().isidentifier():
+                raise TemplateError(f"{self.including[-1]}: set inválido: {tag}")
+            self._emit(f'{target.strip()} = {self._check(expr.strip())}')
+        elif keyword == 'include':
+            self._include(rest.strip('\'"'))
+        else:
+            raise TemplateError(f"{self.including[-1]}: bloque desconocido: {tag}")
+
+    def _include(self, name: str):
+        if self.loader is None:
+            raise TemplateError(f"{self.including[-1]}: include sin cargador de templates")
+        if name in self.including:
+            raise TemplateError(f"Include circular: {' -> '.join(self.including + [name])}")
+        self.including.append(name)
+        self.compile(self.loader(name))
+        self.including.pop()
+
+    def source(self) -> str:
+        self._flush()
+        if self.stack:
+            raise TemplateError(f"{self.name}: falta end{self.stack[-1]}")
+        # Nombres libres: del contexto, luego globales del entorno, luego builtins
+        prelude = [
+            f'    {n} = _ctx[{n!r}] if {n!r} in _ctx else _g.get({n!r})'
+            for n in sorted(self.names) if n not in ('_ctx', '_g', '_w', '_e', '_safe')
+        ]
+        body = ['def _render(_ctx):', '    _out = []', '    _w = _out.append', *prelude, *self.lines,
+                "    return _Markup(''.join(_out))"]
+        return '\n'.join(body)
+
+
+class Template:
+    """Template compilado a una función de Python"""
+
+    def __init__(self, source: str, name: str = '<string>', loader: Optional[Callable[[str], str]] = None,
+                 env_globals: Optional[Dict[str, Any]] = None):
+        """
+        Compila el template
+
+        Args:
+            source: Texto del template
+            name: Nombre (aparece en los errores y trazas)
+            loader: Función nombre -> texto para resolver los include
+            env_globals: Funciones y valores disponibles en todos los renders
+        """
+        self.name = name
+        compiler = _Compiler(name, loader)
+        compiler.compile(source)
+        self.code = compiler.source()
+        # Identifica el template compilado con sus parciales (cambia si cambia cualquiera)
+        self.digest = hashlib.sha256(self.code.encode('utf-8')).hexdigest()
+        namespace = {
+            '_g': {**vars(builtins), **(env_globals or {})},
+            '_e': _escape,
+            '_safe': _safe,
+            '_Markup': Markup,
+        }
+        exec(compile(self.code, f'<template {name}>', 'exec'), namespace)
+        self._render = namespace['_render']
+
+    def render(self, context: Optional[Dict[str, Any]] = None, **kwargs) -> Markup:
+        """
+        Renderiza el template
+
+        Args:
+            context: Variables del template
+            **kwargs: Más variables (tienen prioridad sobre context)
+
+        Returns:
+            HTML resultante (Markup)
+        """
+        if context is None:
+            return self._render(kwargs)
+        return self._render({**context, **kwargs} if kwargs else context)
+
+
+class TemplateEnvironment:
+    """Templates de un directorio, compilados una vez y en caché"""
+
+    def __init__(self, directory: Optional[str] = None, env_globals: Optional[Dict[str, Any]] = None):
+        """
+        Inicializa el entorno
+
+        Args:
+            directory: Directorio de templates (default: templates/html)
+            env_globals: Funciones y valores disponibles en todos los templates
+        """
+        self.directory = Path(directory or DEFAULT_TEMPLATES_DIR)
+        self.globals = dict(env_globals or {})
+        self._templates: Dict[str, Template] = {}
+        self._lock = threading.Lock()
+
+    def _load_source(self, name: str) -> str:
+        path = self.directory / name
+        if not path.is_file():
+            raise TemplateError(f"Template no encontrado: {path}")
+        return path.read_text(encoding='utf-8')
+
+    def get_template(self, name: str) -> Template:
+        """Template compilado (se compila la primera vez que se pide)"""
+        template = self._templates.get(name)
+        if template is None:
+            with self._lock:
+                template = self._templates.get(name)
+                if template is None:
+                    template = Template(self._load_source(name), name, self._load_source, self.globals)
+                    self._templates[name] = template
+        return template
+
+    def render(self, name: str, **context) -> Markup:
+        """Renderiza un template del directorio"""
+        return self.get_template(name).render(context)
+
+
+def truncate(text: Any, length: int, suffix: str = '...') -> str:
+    """Recorta un texto a length caracteres agregando suffix si se cortó"""
+    text = '' if text is None else str(text)
+    return text if len(text) <= length else text[:length] + suffix
+
+
+def paragraphs(text: Any) -> List[str]:
+    """Párrafos de un texto plano (separados por línea vacía) con los espacios normalizados"""
+    if not text:
+        return []
+    return [' '.join(p.split()) for p in str(text).strip().split('\n\n') if p.strip()]
+
+
+DEFAULT_GLOBALS = {'truncate': truncate, 'paragraphs': paragraphs}
+
+_default_environment: Optional[TemplateEnvironment] = None
+_default_lock = threading.Lock()
+
+
+def get_environment() -> TemplateEnvironment:
+    """
+    Retorna el entorno de templates compartido del proceso
+
+    Su directorio se cambia con TEMPLATES_HTML_DIR.
+
+    Returns:
+        Entorno compartido (con truncate y paragraphs como globales)
+    """
+    global _default_environment
+    if _default_environment is None:
+        with _default_lock:
+            if _default_environment is None:
+                _default_environment = TemplateEnvironment(os.getenv('TEMPLATES_HTML_DIR') or None,
+                                                           DEFAULT_GLOBALS)
+    return _default_environment
+
+
+def render(name: str, **context) -> Markup:
+    """Renderiza un template del entorno compartido"""
+    return get_environment().render(name, **context)
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Trazas de tiempo y consumo por etapa y por elemento
+Cada paso del flujo (y cada artículo, imagen o sitio dentro de él) abre un
+span que registra su tiempo real; mientras está activo, el cliente HTTP, el
+cliente LLM y las cachés le suman métricas: peticiones, bytes descargados,
+reintentos, tokens de entrada y salida, aciertos y fallos de caché. Las
+métricas de un span también cuentan en sus ancestros, así que cada etapa
+incluye lo de sus elementos.
+
+El span activo viaja en un contextvar: pasa a las tareas de asyncio y a
+asyncio.to_thread por sí solo; para pools de hilos hay que enviar la función
+con bind(). En otro proceso, capture() registra los spans del trabajo con un
+tracer propio y merge() los incorpora al tracer del proceso padre, bajo el
+span activo. Sin un Tracer activo todas las llamadas son no-ops.
+
+El resumen va al run_summary_*.json y, opcionalmente, se escribe un archivo
+de trace events de Chrome (abrir en chrome://tracing o ui.perfetto.dev).
+"""
+
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+_current: contextvars.ContextVar = contextvars.ContextVar('tracing_current', default=None)
+
+
+class Span:
+    """Intervalo de trabajo con sus métricas"""
+
+    __slots__ = ('name', 'category', 'args', 'parent', 'start', 'end', 'thread_id', 'thread_name', 'metrics')
+
+    def __init__(self, name: str, category: str, args: Dict, parent: Optional['Span']):
+        self.name = name
+        self.category = category
+        self.args = args
+        self.parent = parent
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.thread_id = threading.get_ident()
+        self.thread_name = threading.current_thread().name
+        self.metrics: Counter = Counter()
+
+
+class Tracer:
+    """Spans y métricas de una ejecución"""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.spans: List[Span] = []
+        self.totals: Counter = Counter()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def activate(self) -> Iterator['Tracer']:
+        """Hace de este tracer el activo en el contexto actual"""
+        token = _current.set((self, None))
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+
+    def _add(self, span: Optional[Span], metric: str, value: float):
+        with self._lock:
+            self.totals[metric] += value
+            while span is not None:
+                span.metrics[metric] += value
+                span = span.parent
+
+    def _finish(self, span: Span):
+        span.end = time.perf_counter()
+        with self._lock:
+            self.spans.append(span)
+
+    def export(self) -> Dict[str, Any]:
+        """
+        Spans y totales en un dict serializable, para enviarlos a otro proceso
+
+        Los tiempos se pasan a época (time.time) porque perf_counter no es
+        comparable entre procesos.
+
+        Returns:
+            pid, spans (con el índice de su padre) y totals
+        """
+        offset = time.time() - time.perf_counter()
+        with self._lock:
+            spans = list(self.spans)
+            totals = dict(self.totals)
+        index = {id(span): i for i, span in enumerate(spans)}
+        return {
+            'pid': os.getpid(),
+            'spans': [{
+                'name': span.name, 'category': span.category, 'args': span.args,
+                'parent': index.get(id(span.parent)),
+                'start': span.start + offset, 'end': span.end + offset,
+                'thread_name': span.thread_name, 'metrics': dict(span.metrics),
+            } for span in spans],
+            'totals': totals,
+        }
+
+    def merge(self, exported: Dict[str, Any], parent: Optional[Span] = None):
+        """
+        Incorpora los spans exportados por otro proceso (ver export)
+
+        Los spans raíz quedan como hijos de parent, y sus métricas cuentan en
+        parent, sus ancestros y los totales, igual que si se hubieran
+        registrado aquí.
+
+        Args:
+            exported: Resultado de export() en el otro proceso
+            parent: Span bajo el que quedan (None = raíz)
+        """
+        offset = time.time() - time.perf_counter()
+        pid = exported['pid']
+        spans: List[Span] = []
+        for data in exported['spans']:
+            span = Span.__new__(Span)
+            span.name, span.category, span.args = data['name'], data['category'], data['args']
+            span.start, span.end = data['start'] - offset, data['end'] - offset
+            span.thread_id, span.thread_name = pid, f"proceso {pid} ({data['thread_name']})"
+            span.metrics = Counter(data['metrics'])
+            spans.append(span)
+        for span, data in zip(spans, exported['spans']):
+            span.parent = parent if data['parent'] is None else spans[data['parent']]
+        with self._lock:
+            self.spans.extend(spans)
+            self.totals.update(exported['totals'])
+            for span, data in zip(spans, exported['spans']):
+                ancestor = parent if data['parent'] is None else None
+                while ancestor is not None:
+                    ancestor.metrics.update(span.metrics)
+                    ancestor = ancestor.parent
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Resumen por etapa: spans del mismo nombre agregados
+
+        Returns:
+            wall_seconds, totals (métricas de toda la ejecución con las tasas
+            de acierto de caché) y stages: por nombre de span el número de
+            spans, la suma de sus duraciones, su tiempo real (del primer
+            inicio al último fin), el rendimiento en elementos por segundo y
+            la suma de sus métricas
+        """
+        with self._lock:
+            spans = list(self.spans)
+            totals = dict(self.totals)
+
+        stages: Dict[str, Dict[str, Any]] = {}
+        bounds: Dict[str, List[float]] = {}
+        for span in spans:
+            stage = stages.setdefault(span.name, {'count': 0, 'seconds': 0.0})
+            stage['count'] += 1
+            stage['seconds'] += span.end - span.start
+            first, last = bounds.get(span.name, (span.start, span.end))
+            bounds[span.name] = [min(first, span.start), max(last, span.end)]
+            for metric, value in span.metrics.items():
+                stage[metric] = stage.get(metric, 0) + value
+
+        for name, stage in stages.items():
+            wall = bounds[name][1] - bounds[name][0]
+            stage['seconds'] = round(stage['seconds'], 3)
+            stage['wall_seconds'] = round(wall, 3)
+            if stage['count'] > 1 and wall > 0:
+                stage['per_second'] = round(stage['count'] / wall, 2)
+            _add_hit_rates(stage)
+
+        _add_hit_rates(totals)
+        end = max((span.end for span in spans), default=self.origin)
+        return {'wall_seconds': round(end - self.origin, 3), 'totals': totals, 'stages': stages}
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Spans en el formato Trace Event de Chrome (eventos completos 'X')"""
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self.spans)
+        events = []
+        threads = {}
+        for span in spans:
+            threads[span.thread_id] = span.thread_name
+            events.append({
+                'name': span.name if 'index' not in span.args else f"{span.name} #{span.args['index']}",
+                'cat': span.category,
+                'ph': 'X',
+                'ts': round((span.start - self.origin) * 1e6),
+                'dur': round((span.end - span.start) * 1e6),
+                'pid': pid,
+                'tid': span.thread_id,
+                'args': {**span.args, **span.metrics},
+            })
+        for thread_id, thread_name in threads.items():
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': thread_id,
+                           'args': {'name': thread_name}})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write_chrome_trace(self, path: str) -> Path:
+        """Escribe el archivo de trace events y retorna su ruta"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f)
+        return path
+
+
+def _add_hit_rates(metrics: Dict[str, Any]):
+    """Agrega <caché>_hit_rate para cada par <caché>_hits / <caché>_misses"""
+    for key in [k for k in metrics if k.endswith('_hits')]:
+        prefix = key[:-len('_hits')]
+        total = metrics[key] + metrics.get(f'{prefix}_misses', 0)
+        if total:
+            metrics[f'{prefix}_hit_rate'] = round(metrics[key] / total, 3)
+
+
+@contextmanager
+def span(name: str, category: str = 'etapa', **args) -> Iterator[Optional[Span]]:
+    """
+    Abre un span hijo del activo (no-op si no hay tracer activo)
+
+    Args:
+        name: Nombre de la etapa o del tipo de elemento
+        category: Categoría en el trace ('etapa', 'elemento'...)
+        **args: Datos del span (p. ej. index del elemento)
+    """
+    current = _current.get()
+    if current is None:
+        yield None
+        return
+    tracer, parent = current
+    new = Span(name, category, args, parent)
+    token = _current.set((tracer, new))
+    try:
+        yield new
+    finally:
+        _current.reset(token)
+        tracer._finish(new)
+
+
+def add(metric: str, value: float = 1):
+    """Suma a una métrica del span activo, sus ancestros y el total de la ejecución"""
+    current = _current.get()
+    if current is not None and value:
+        tracer, active = current
+        tracer._add(active, metric, value)
+
+
+def active() -> bool:
+    """Indica si hay un tracer activo en el contexto actual"""
+    return _current.get() is not None
+
+
+def capture(fn: Callable, *args, **kwargs) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Ejecuta fn con un tracer propio y retorna su resultado y sus spans exportados
+
+    Para trabajos en otro proceso: el padre pasa lo exportado a merge().
+    """
+    tracer = Tracer()
+    with tracer.activate():
+        result = fn(*args, **kwargs)
+    return result, tracer.export()
+
+
+def merge(exported: Dict[str, Any]):
+    """Incorpora spans de otro proceso bajo el span activo (no-op sin tracer activo)"""
+    current = _current.get()
+    if current is not None:
+        tracer, parent = current
+        tracer.merge(exported, parent)
+
+
+def bind(fn: Callable, *args, **kwargs) -> Callable[[], Any]:
+    """
+    Función sin argumentos que ejecuta fn en una copia del contexto actual
+
+    Para enviar trabajo a un pool de hilos sin perder el span activo
+    (ThreadPoolExecutor y run_in_executor no copian el contexto).
+    """
+    return functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
@@ -4,77 +4,113 @@ Utilidades compartidas para scrapers de noticias
 Funciones comunes de web scraping y guardado de datos
 """
 
-from bs4 import BeautifulSoup
 import requests
-import json
-import pandas as pd
-from datetime import datetime
-from typing import List, Dict
+from utils import http_client
+from utils.response_cache import get_response_cache
+from utils.extraction import extract_text, default_engine, TEXT_UNAVAILABLE
+from utils.article_store import ArticleStore, store_path
+from utils.dedup import get_seen_store
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
 
 HEADERS = {'User-Agent': 'Mozilla/5.0 (compatible; NewsBot/1.0)'}
 
+# Concurrencia de extracción de texto completo
+ENRICH_MAX_WORKERS = 8       # Hilos totales
+ENRICH_PER_HOST = 2          # Peticiones simultáneas por dominio
+ENRICH_DEADLINE = 60.0       # Segundos máximos para todo el lote
 
-def get_full_text(url: str, max_paragraphs: int = 10, max_chars: int = 5000) -> str:
+
+def get_full_text(url: str, max_paragraphs: int = 10, max_chars: int = 5000,
+                  use_cache: bool = True) -> str:
     """
     Extrae el texto completo de un artículo web
     
+    Usa la caché persistente de respuestas: dentro del TTL no se hace ninguna
+    petición ni parseo; al vencer se revalida con ETag/Last-Modified.
+    
     Args:
         url: URL del artículo
         max_paragraphs: Número máximo de párrafos a extraer
         max_chars: Número máximo de caracteres a retornar
+        use_cache: Usar la caché de respuestas en disco
         
     Returns:
         Texto completo del artículo
     """
+    cache = get_response_cache() if use_cache else None
+    engine = default_engine()
+    extract_key = f"{engine}:{max_paragraphs}:{max_chars}"
+    entry = cache.get(url) if cache else None
+    
+    def cached_text(entry: Dict) -> str:
+        if entry['extract_key'] == extract_key and entry['text'] is not None:
+            return entry['text']
+        text = extract_text(entry['body'], max_paragraphs, max_chars, engine)
+        cache.store_text(url, text, extract_key)
+        return text
+    
     try:
-        resp = requests.get(url, headers=HEADERS, timeout=10)
-        resp.raise_for_status()
+        if entry and cache.is_fresh(entry):
+            cache.record('hits')
+            return cached_text(entry)
         
-        soup = BeautifulSoup(resp.content, 'html.parser')
+        headers = dict(HEADERS)
+        if entry:
+            headers.update(cache.conditional_headers(entry))
         
-        # Remover elementos no deseados
-        for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside', 'iframe']):
-            element.decompose()
+        resp = http_client.get(url, headers=headers, timeout=10)
         
-        # Extraer párrafos principales
-        paragraphs = soup.find_all('p')[:max_paragraphs]
-        text = ' '.join(p.get_text(strip=True) for p in paragraphs)
+        if resp.status_code == 304 and entry:
+            cache.record('revalidated')
+            cache.mark_revalidated(url, etag=resp.headers.get('ETag'),
+                                   last_modified=resp.headers.get('Last-Modified'))
+            return cached_text(entry)
         
-        return text[:max_chars] if text else "Texto no disponible"
+        resp.raise_for_status()
+        
+        text = extract_text(resp.content, max_paragraphs, max_chars, engine)
+        
+        if cache:
+            cache.record('misses')
+            cache.put(url, resp.content,
+                      etag=resp.headers.get('ETag'),
+                      last_modified=resp.headers.get('Last-Modified'),
+                      text=text, extract_key=extract_key)
+        
+        return text
         
     except requests.exceptions.RequestException as e:
         print(f"❌ Error extrayendo texto de {url}: {e}")
-        return "Texto no disponible"
+        return TEXT_UNAVAILABLE
     except Exception as e:
         print(f"❌ Error procesando HTML: {e}")
-        return "Texto no disponible"
+        return TEXT_UNAVAILABLE
 
 
-def save_articles(articles: List[Dict], prefix: str, output_dir: str = '.') -> tuple:
+def save_articles(articles: Iterable[Dict], prefix: str, output_dir: str = None,
+                  compress: bool = None) -> str:
     """
-    Guarda artículos en formato JSON y CSV
+    Anexa artículos al almacén NDJSON de la fuente
+    
+    Los artículos se escriben uno a uno, así que acepta cualquier iterable
+    (incluso un generador). Para obtener CSV usar article_store.export_csv.
     
     Args:
-        articles: Lista de artículos a guardar
-        prefix: Prefijo para los nombres de archivo
-        output_dir: Directorio de salida
+        articles: Artículos a guardar
+        prefix: Nombre de la fuente (define el archivo data/raw/<prefix>.ndjson)
+        output_dir: Directorio de salida (default: data/raw)
+        compress: Comprimir con zstd (default: variable ARTICLE_STORE_ZSTD)
         
     Returns:
-        Tupla con (ruta_json, ruta_csv)
+        Ruta del almacén NDJSON
     """
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M')
-    json_file = f'{output_dir}/{prefix}_{timestamp}.json'
-    csv_file = f'{output_dir}/{prefix}_{timestamp}.csv'
-    
-    # Guardar JSON
-    with open(json_file, 'w', encoding='utf-8') as f:
-        json.dump(articles, f, ensure_ascii=False, indent=2)
-    
-    # Guardar CSV
-    df = pd.DataFrame(articles)
-    df.to_csv(csv_file, index=False, encoding='utf-8')
-    
-    return json_file, csv_file
+    with ArticleStore(store_path(prefix, output_dir, compress)) as store:
+        store.extend(articles)
+    return str(store.path)
 
 
 def normalize_article(article: Dict, source: str) -> Dict:
@@ -153,51 +189,180 @@ def normalize_article(article: Dict, source: str) -> Dict:
     return normalized
 
 
-def enrich_with_full_text(articles: List[Dict], source: str, verbose: bool = True) -> List[Dict]:
+def normalize_articles(articles: Iterable[Dict], source: str, dedup: bool = False,
+                       verbose: bool = False) -> List[Dict]:
+    """
+    Normaliza artículos y, opcionalmente, descarta los ya vistos
+    
+    La deduplicación compara el hash de la URL canónica y la huella de
+    título/resumen contra el conjunto persistente de vistos (ver utils.dedup),
+    así que un artículo repetido entre APIs o entre ejecuciones no vuelve a
+    pagar extracción ni llamadas al LLM.
+    
+    Args:
+        articles: Artículos raw de la API
+        source: Nombre de la fuente
+        dedup: Descartar artículos ya vistos (y registrar los nuevos)
+        verbose: Mostrar cuántos duplicados se descartaron
+        
+    Returns:
+        Lista de artículos normalizados (nuevos si dedup)
+    """
+    normalized = [normalize_article(article, source) for article in articles]
+    seen = get_seen_store() if dedup else None
+    if not seen:
+        return normalized
+    
+    nuevos = seen.filter_new(normalized)
+    if verbose and len(nuevos) < len(normalized):
+        print(f"  ♻️  {len(normalized) - len(nuevos)} artículos ya vistos descartados ({len(nuevos)} nuevos)")
+    return nuevos
+
+
+def enrich_with_full_text(articles: List[Dict], source: str, verbose: bool = True,
+                          max_workers: int = ENRICH_MAX_WORKERS,
+                          per_host: int = ENRICH_PER_HOST,
+                          deadline: float = ENRICH_DEADLINE,
+                          sink: Optional[Callable[[Dict], None]] = None,
+                          dedup: bool = False) -> List[Dict]:
     """
     Enriquece artículos con texto completo extraído
     
+    Las descargas se hacen en paralelo con un pool de hilos acotado, limitando
+    las peticiones simultáneas por dominio. Si se agota el plazo global, los
+    artículos pendientes quedan con "Texto no disponible". El orden de entrada
+    se conserva.
+    
     Args:
         articles: Lista de artículos
         source: Nombre de la fuente
         verbose: Mostrar progreso
+        max_workers: Número máximo de descargas simultáneas (1 = secuencial)
+        per_host: Máximo de descargas simultáneas por dominio
+        deadline: Segundos máximos para todo el lote (None = sin límite)
+        sink: Función que recibe cada artículo en cuanto está listo (p.ej.
+              ArticleStore.append); el orden de llamada es el de finalización
+        dedup: Descartar artículos ya vistos antes de descargar su texto
         
     Returns:
         Lista de artículos enriquecidos
     """
-    enriched = []
-    total = len(articles)
+    # Normalizar (y deduplicar) todos los artículos primero: barato, conserva el orden
+    enriched = normalize_articles(articles, source, dedup=dedup, verbose=verbose)
+    total = len(enriched)
+    
+    # Solo se descargan los que no traen full_text
+    pending = [idx for idx, normalized in enumerate(enriched)
+               if not normalized['full_text'] and normalized['url']]
+    
+    if sink:
+        pending_set = set(pending)
+        for idx, normalized in enumerate(enriched):
+            if idx not in pending_set:
+                sink(normalized)
+    
+    if not pending:
+        return enriched
+    
+    if max_workers <= 1:
+        for idx in pending:
+            if verbose:
+                print(f"  [{idx + 1}/{total}] Extrayendo: {enriched[idx].get('title', 'Sin título')[:60]}...")
+            enriched[idx]['full_text'] = get_full_text(enriched[idx]['url'])
+            if sink:
+                sink(enriched[idx])
+        return enriched
+    
+    end_time = time.monotonic() + deadline if deadline else None
     
-    for idx, article in enumerate(articles, 1):
+    # Una cola por dominio: al pool solo se envía una descarga cuando su dominio
+    # tiene cupo, así ningún hilo queda bloqueado esperando a un dominio lento
+    # mientras hay URLs de otros dominios pendientes
+    host_queues = {}
+    for idx in pending:
+        host_queues.setdefault(urlparse(enriched[idx]['url']).netloc.lower(), deque()).append(idx)
+    
+    def fetch(idx: int) -> str:
+        if end_time is not None and time.monotonic() >= end_time:
+            return TEXT_UNAVAILABLE
+        return get_full_text(enriched[idx]['url'])
+    
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(pending)))
+    futures = {}
+    not_done = set()
+    
+    def submit_next(host: str):
+        idx = host_queues[host].popleft()
+        future = executor.submit(fetch, idx)
+        futures[future] = (idx, host)
+        not_done.add(future)
+    
+    for host, queue in host_queues.items():
+        for _ in range(min(max(1, per_host), len(queue))):
+            submit_next(host)
+    done_count = 0
+    
+    try:
+        while not_done:
+            timeout = None if end_time is None else max(0.0, end_time - time.monotonic())
+            done, _ = wait(not_done, timeout=timeout, return_when=FIRST_COMPLETED)
+            
+            if not done:
+                break  # Plazo global agotado
+            
+            for future in done:
+                not_done.discard(future)
+                idx, host = futures[future]
+                try:
+                    enriched[idx]['full_text'] = future.result()
+                except Exception as e:
+                    print(f"❌ Error extrayendo texto de {enriched[idx]['url']}: {e}")
+                    enriched[idx]['full_text'] = TEXT_UNAVAILABLE
+                
+                # El dominio liberó un cupo: enviar su siguiente URL
+                if host_queues[host]:
+                    submit_next(host)
+                
+                if sink:
+                    sink(enriched[idx])
+                done_count += 1
+                if verbose:
+                    print(f"  [{done_count}/{len(pending)}] Extraído: {enriched[idx].get('title', 'Sin título')[:60]}...")
+    finally:
+        # No esperar a los hilos que sigan bloqueados en red
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    # Sin terminar al agotarse el plazo: enviadas al pool o aún en la cola de su dominio
+    unfinished = [futures[future][0] for future in not_done]
+    unfinished += [idx for queue in host_queues.values() for idx in queue]
+    if unfinished:
         if verbose:
-            print(f"  [{idx}/{total}] Extrayendo: {article.get('title', 'Sin título')[:60]}...")
-        
-        # Normalizar artículo
-        normalized = normalize_article(article, source)
-        
-        # Si no tiene full_text, intentar extraerlo
-        if not normalized['full_text'] and normalized['url']:
-            normalized['full_text'] = get_full_text(normalized['url'])
-        
-        enriched.append(normalized)
+            print(f"  ⚠️  Plazo de {deadline:.0f}s agotado: {len(unfinished)} artículos sin texto completo")
+        for idx in sorted(unfinished):
+            enriched[idx]['full_text'] = TEXT_UNAVAILABLE
+            if sink:
+                sink(enriched[idx])
     
     return enriched
 
 
-def print_summary(articles: List[Dict], source: str, json_file: str, csv_file: str):
+def print_summary(articles: List[Dict], source: str, store_file: str, csv_file: str = None):
     """
     Imprime resumen de descarga de artículos
     
     Args:
         articles: Lista de artículos
         source: Nombre de la fuente
-        json_file: Ruta del archivo JSON
-        csv_file: Ruta del archivo CSV
+        store_file: Ruta del almacén NDJSON
+        csv_file: Ruta del archivo CSV (si se exportó)
     """
     print(f"\n{'='*70}")
     print(f"✅ {source.upper()}: Descarga completada")
     print(f"{'='*70}")
     print(f"📰 Artículos descargados: {len(articles)}")
-    print(f"💾 JSON: {json_file}")
-    print(f"💾 CSV: {csv_file}")
+    print(f"💾 NDJSON: {store_file}")
+    if csv_file:
+        print(f"💾 CSV: {csv_file}")
+    else:
+        print(f"💡 CSV bajo demanda: python3 utils/article_store.py export-csv {store_file}")
     print(f"{'='*70}\n")